@@ -9,14 +9,20 @@ import uuid
 import json
 
 from services.app.assistant import BaseAssistantService
+from mixins import metrics
+from mixins.resilience import deadline
 from config.logger import _logger
 
 from dotenv import load_dotenv
 
+import os
 import sqlite3
 
 load_dotenv()
 
+# 채팅 요청 하나가 외부 호출(임베딩, 리랭크, LLM)에 쓸 수 있는 총 시간 (초)
+CHAT_DEADLINE_SECONDS = float(os.environ.get("CHAT_DEADLINE_SECONDS", 90))
+
 router = APIRouter(prefix="/api")
 
 client = AsyncOpenAI()
@@ -29,6 +35,11 @@ def health_check():
     return {"message": "good"}
 
 
+@router.get("/metrics")
+def get_metrics():
+    return metrics.snapshot()
+
+
 @router.post("/chat", response_model=ChatResponseV2)
 @inject
 async def chat(
@@ -49,12 +60,13 @@ async def chat(
         )
         title = completion.choices[0].message.content
 
-    answer = await assistant.pipeline_async(
-        req.question,
-        req.university,
-        req.department,
-        history=req.messages,
-    )
+    with deadline(CHAT_DEADLINE_SECONDS):
+        answer = await assistant.pipeline_async(
+            req.question,
+            req.university,
+            req.department,
+            history=req.messages,
+        )
 
     messages = [*req.messages, {
         "role": "user",
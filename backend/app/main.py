@@ -1,16 +1,26 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from containers import AppContainer
+from mixins.http_client import sessions
+from services.base.embedder import open_backend
 from .api import chat_v3, university
 
 origins = ["http://localhost:5173"]
 
 
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    async with sessions.open(), open_backend():
+        yield
+
+
 def create_app() -> FastAPI:
     container = AppContainer()
 
-    app = FastAPI()
+    app = FastAPI(lifespan=lifespan)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=origins,
@@ -9,6 +9,7 @@ class NoticeCrawlerContainer(containers.DeclarativeContainer):
 
     univ_repo = providers.Singleton(repo.UniversityRepository)
     semester_repo = providers.Singleton(repo.SemesterRepository)
+    checkpoint_repo = providers.Singleton(repo.CrawlCheckpointRepository)
 
     notice_repo = providers.Singleton(repo.NoticeRepository)
     notice_embedder = providers.Singleton(notice.NoticeEmbedder)
@@ -21,6 +22,7 @@ class NoticeCrawlerContainer(containers.DeclarativeContainer):
         notice_crawler=notice_crawler,
         university_repo=univ_repo,
         semester_repo=semester_repo,
+        checkpoint_repo=checkpoint_repo,
     )
 
     me_notice_crawler = providers.Singleton(notice.MENoticeCrawler)
@@ -32,4 +34,5 @@ class NoticeCrawlerContainer(containers.DeclarativeContainer):
         notice_crawler=me_notice_crawler,
         university_repo=univ_repo,
         semester_repo=semester_repo,
+        checkpoint_repo=checkpoint_repo,
     )
@@ -8,6 +8,7 @@ class PNUNoticeCrawlerContainer(containers.DeclarativeContainer):
     config = providers.Configuration()
 
     semester_repo = providers.Singleton(repo.SemesterRepository)
+    checkpoint_repo = providers.Singleton(repo.CrawlCheckpointRepository)
 
     notice_repo = providers.Singleton(repo.PNUNoticeRepository)
     notice_embedder = providers.Singleton(notice.NoticeEmbedder)
@@ -19,4 +20,5 @@ class PNUNoticeCrawlerContainer(containers.DeclarativeContainer):
         notice_embedder=notice_embedder,
         notice_crawler=notice_crawler,
         semester_repo=semester_repo,
+        checkpoint_repo=checkpoint_repo,
     )
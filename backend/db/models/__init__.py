@@ -4,3 +4,4 @@ from .professor import *
 from .subject import *
 from .support import *
 from .university import *
+from .crawl import *
@@ -0,0 +1,56 @@
+from datetime import datetime
+from enum import Enum
+
+from sqlalchemy import DateTime, Index, Integer, String, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from db.common import Base, SQLEnum
+
+
+class CrawlStatusEnum(Enum):
+    """게시글 url별 크롤링 단계"""
+    discovered = "discovered"
+    scraped = "scraped"
+    embedded = "embedded"
+    persisted = "persisted"
+
+
+class CrawlCheckpointModel(Base):
+    """크롤링 체크포인트 테이블
+
+    (source, department, category)별로 목록 페이지에서 찾은 게시글 url(frontier)과 처리 단계를 기록합니다.
+    크롤링이 끝나면 삭제되므로, 남아 있는 행은 중단된 크롤링을 의미합니다. (`--resume`으로 이어서 실행)
+
+    Attributes:
+        source: 크롤러 구분 (notice / pnu_notice / support_notice)
+        department: 학과 (없으면 빈 문자열)
+        category: 게시판 분류 (없으면 빈 문자열)
+        run_id: 목록 페이지를 스크랩한 실행 ID
+        position: 목록 페이지에서의 순서
+        url: 게시글 url
+        status: 처리 단계
+        updated_at: 마지막 상태 변경 시각
+    """
+
+    __tablename__ = "crawl_checkpoints"
+
+    __table_args__ = (
+        UniqueConstraint("source", "department", "category", "url"),
+        Index("ix_crawl_checkpoint_key", "source", "department", "category", "position"),
+    )
+
+    source: Mapped[str] = mapped_column(String, nullable=False)
+    department: Mapped[str] = mapped_column(String, nullable=False, default="")
+    category: Mapped[str] = mapped_column(String, nullable=False, default="")
+
+    run_id: Mapped[str] = mapped_column(String, nullable=False)
+    position: Mapped[int] = mapped_column(Integer, nullable=False)
+    url: Mapped[str] = mapped_column(String, nullable=False)
+    status = mapped_column(SQLEnum(CrawlStatusEnum), nullable=False, default=CrawlStatusEnum.discovered)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Boolean, Date, ForeignKey, Index, String
+from sqlalchemy import Boolean, Date, ForeignKey, Index, Integer, String
 from pgvector.sqlalchemy import Vector, SPARSEVEC
 from sqlalchemy.orm import mapped_column, relationship, Mapped
 from db.common import N_DIM, V_DIM, Base
@@ -14,11 +14,19 @@ class NoticeModel(Base):
 
     __tablename__ = "notices"
 
-    __table_args__ = (Index(
-        'ix_notice_department_semester',
-        'department_id',
-        'semester_id',
-    ), )
+    __table_args__ = (
+        Index(
+            'ix_notice_department_semester',
+            'department_id',
+            'semester_id',
+        ),
+        Index(
+            'ix_notice_department_category_source_seq',
+            'department_id',
+            'category',
+            'source_seq',
+        ),
+    )
 
     url: Mapped[str] = mapped_column(String, nullable=False, unique=True)
     is_important: Mapped[bool] = mapped_column(Boolean, nullable=True, index=True)
@@ -32,6 +40,10 @@ class NoticeModel(Base):
     content: Mapped[str] = mapped_column(String, nullable=False)
     date: Mapped[datetime] = mapped_column(Date, nullable=False)
     author: Mapped[str] = mapped_column(String, nullable=True)
+    # 제목 / 본문 / 작성일 / 첨부파일 목록 해시 (`render.content_hash`), 같으면 다시 임베딩하지 않음
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    # 게시판 글 번호 (crawler의 `source_seq`), (학과, 분류)별 최댓값부터 증분 크롤링
+    source_seq: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
 
     title_vector = mapped_column(Vector(N_DIM), nullable=True)
     title_sparse_vector = mapped_column(SPARSEVEC(V_DIM), nullable=True)
@@ -72,6 +84,8 @@ class NoticeChunkModel(Base):
     )
 
     chunk_content: Mapped[str] = mapped_column(String, nullable=False)
+    # 임베딩한 원문 해시 (`render.content_hash`)
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
     chunk_vector = mapped_column(Vector(N_DIM))
     chunk_sparse_vector = mapped_column(SPARSEVEC(dim=V_DIM))
 
@@ -91,6 +105,10 @@ class PNUNoticeModel(Base):
     content: Mapped[str] = mapped_column(String, nullable=False)
     date: Mapped[datetime] = mapped_column(Date, nullable=False)
     author: Mapped[str] = mapped_column(String, nullable=True)
+    # 제목 / 본문 / 작성일 / 첨부파일 목록 해시 (`render.content_hash`), 같으면 다시 임베딩하지 않음
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    # 게시판 글 번호 (`board_seq`), 최댓값부터 증분 크롤링
+    source_seq: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, index=True)
 
     title_vector = mapped_column(Vector(N_DIM), nullable=True)
     title_sparse_vector = mapped_column(SPARSEVEC(V_DIM), nullable=True)
@@ -129,6 +147,8 @@ class PNUNoticeChunkModel(Base):
     )
 
     chunk_content: Mapped[str] = mapped_column(String, nullable=False)
+    # 임베딩한 원문 해시 (`render.content_hash`)
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
     chunk_vector = mapped_column(Vector(N_DIM))
     chunk_sparse_vector = mapped_column(SPARSEVEC(dim=V_DIM))
 
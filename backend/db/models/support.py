@@ -18,6 +18,8 @@ class SupportModel(Base):
     title: Mapped[str] = mapped_column(String, nullable=False)
     url: Mapped[str] = mapped_column(String, nullable=False, unique=True)
     content: Mapped[str] = mapped_column(String, nullable=False)
+    # 제목 / 본문 / 첨부파일 목록 해시 (`render.content_hash`), 같으면 다시 임베딩하지 않음
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
 
     title_vector = mapped_column(Vector(dim=N_DIM), nullable=True)
     title_sparse_vector = mapped_column(SPARSEVEC(dim=V_DIM), nullable=True)
@@ -56,6 +58,8 @@ class SupportChunkModel(Base):
     )
 
     chunk_content: Mapped[str] = mapped_column(String, nullable=False)
+    # 임베딩한 원문 해시 (`render.content_hash`)
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
 
     chunk_vector = mapped_column(Vector(dim=N_DIM), nullable=True)
     chunk_sparse_vector = mapped_column(SPARSEVEC(dim=V_DIM), nullable=True)
@@ -5,3 +5,4 @@ from .university import *
 from .support import *
 from .calendar import *
 from .subject import *
+from .crawl import *
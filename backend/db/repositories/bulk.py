@@ -0,0 +1,261 @@
+"""게시글 / 첨부파일 / 청크 대량 저장 (binary COPY + `INSERT ... ON CONFLICT`)
+
+`dto2orm`으로 만든 ORM 객체(게시글과 `attachments`, `content_chunks`)를 세션에 추가하지 않고
+
+1. 임시 테이블(`_bulk_<table>`)에 binary COPY로 적재 (pgvector 값은 `vector_recv` / `sparsevec_recv` 형식)
+2. 하나의 SQL 문으로 게시글은 url 기준 upsert, 기존 첨부파일 / 청크는 삭제 후 다시 저장
+
+하며, url별 게시글 id만 반환합니다. ORM 경로(`add_all` + `flush`)는 청크마다 INSERT ... RETURNING을 보내므로
+청크가 많은 배치에서 느립니다. 두 경로는 `scripts/bench/bulk_upsert.py`로 비교합니다.
+
+`DB_INGEST_MODE`로 크롤링 저장 단계의 경로를 선택합니다.
+
+- `orm` (default): `create_all`
+- `copy`: `upsert_bulk`
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime
+from functools import lru_cache
+import io
+import os
+import struct
+from typing import Any, Callable, Dict, List, Literal, Optional, Sequence, Tuple, Type
+
+from pgvector.sqlalchemy import SPARSEVEC, Vector
+from pgvector.utils import SparseVector, Vector as VectorValue
+from sqlalchemy import Boolean, Column, Date, Integer, String
+from sqlalchemy.orm import Session
+
+from db.common import Base
+
+IngestMode = Literal["orm", "copy"]
+INGEST_MODES = ("orm", "copy")
+
+INGEST_MODE = os.getenv("DB_INGEST_MODE", "orm")
+
+if INGEST_MODE not in INGEST_MODES:
+    raise ValueError(f"지원하지 않는 DB_INGEST_MODE입니다: {INGEST_MODE}")
+
+_COPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack("!ii", 0, 0)
+_COPY_TRAILER = struct.pack("!h", -1)
+_NULL = struct.pack("!i", -1)
+_PG_EPOCH = date(2000, 1, 1)
+
+
+def _encode_text(value: Any) -> bytes:
+    return str(value).encode("utf-8")
+
+
+def _encode_bool(value: Any) -> bytes:
+    return b"\x01" if value else b"\x00"
+
+
+def _encode_int(value: Any) -> bytes:
+    return struct.pack("!i", int(value))
+
+
+def _encode_date(value: Any) -> bytes:
+    # 스크랩한 작성일은 문자열("2025-03-02")로 들어옴
+    if isinstance(value, str):
+        value = date.fromisoformat(value[:10])
+    if isinstance(value, datetime):
+        value = value.date()
+    return struct.pack("!i", (value - _PG_EPOCH).days)
+
+
+def _encode_vector(value: Any) -> bytes:
+    return (value if isinstance(value, VectorValue) else VectorValue(value)).to_binary()
+
+
+def _encode_sparsevec(value: Any) -> bytes:
+    return (value if isinstance(value, SparseVector) else SparseVector(value)).to_binary()
+
+
+def _column_type(column: Column) -> Tuple[str, Callable[[Any], bytes]]:
+    """컬럼의 임시 테이블 타입과 binary COPY 인코더"""
+    if isinstance(column.type, Vector):
+        return "vector", _encode_vector
+    if isinstance(column.type, SPARSEVEC):
+        return "sparsevec", _encode_sparsevec
+    if isinstance(column.type, Boolean):
+        return "bool", _encode_bool
+    if isinstance(column.type, Integer):
+        return "int4", _encode_int
+    if isinstance(column.type, Date):
+        return "date", _encode_date
+    if isinstance(column.type, String):
+        return "text", _encode_text
+
+    raise TypeError(f"binary COPY를 지원하지 않는 컬럼입니다: {column}")
+
+
+@dataclass(frozen=True)
+class _Table:
+    """임시 테이블 하나 (`keys`는 배치 안에서만 쓰는 게시글 / 첨부파일 번호)"""
+    name: str
+    keys: Tuple[str, ...]
+    columns: Tuple[Column, ...]
+
+    @property
+    def staging(self) -> str:
+        return f"_bulk_{self.name}"
+
+    def ddl(self) -> str:
+        keys = [f"{key} int4" for key in self.keys]
+        columns = [f"{column.name} {_column_type(column)[0]}" for column in self.columns]
+        return f"CREATE TEMP TABLE IF NOT EXISTS {self.staging} ({', '.join([*keys, *columns])})"
+
+    def copy_sql(self) -> str:
+        names = [*self.keys, *(column.name for column in self.columns)]
+        return f"COPY {self.staging} ({', '.join(names)}) FROM STDIN WITH (FORMAT binary)"
+
+    def encode(self, rows: Sequence[Tuple[Sequence[Optional[int]], Base]]) -> bytes:
+        """(keys, ORM 객체) 목록을 binary COPY 데이터로 변환"""
+        encoders = [_column_type(column)[1] for column in self.columns]
+        n_fields = struct.pack("!h", len(self.keys) + len(self.columns))
+
+        buf = io.BytesIO()
+        buf.write(_COPY_HEADER)
+        for keys, obj in rows:
+            buf.write(n_fields)
+            values = [(key, _encode_int) for key in keys]
+            values += [(getattr(obj, column.key), encode) for column, encode in zip(self.columns, encoders)]
+            for value, encode in values:
+                if value is None:
+                    buf.write(_NULL)
+                    continue
+                data = encode(value)
+                buf.write(struct.pack("!i", len(data)))
+                buf.write(data)
+        buf.write(_COPY_TRAILER)
+        return buf.getvalue()
+
+
+def _foreign_key(model: Type[Base], target: Type[Base]) -> Column:
+    table = model.__table__
+    return next(column for column in table.columns if any(fk.column.table is target.__table__
+                                                          for fk in column.foreign_keys))
+
+
+@dataclass(frozen=True)
+class BulkSpec:
+    """게시글(`url` unique) / 첨부파일 / 청크 모델, 첨부파일 청크는 게시글의 `content_chunks`에도 포함됨"""
+    parent: Type[Base]
+    attachment: Type[Base]
+    chunk: Type[Base]
+
+    @property
+    def parent_fk(self) -> Tuple[Column, Column]:
+        return _foreign_key(self.attachment, self.parent), _foreign_key(self.chunk, self.parent)
+
+    @property
+    def attachment_fk(self) -> Column:
+        return _foreign_key(self.chunk, self.attachment)
+
+    def tables(self) -> Tuple[_Table, _Table, _Table]:
+        attachment_fk, chunk_fk = self.parent_fk
+
+        def columns(model: Type[Base], *exclude: Column) -> Tuple[Column, ...]:
+            excluded = {"id", *(column.name for column in exclude)}
+            return tuple(column for column in model.__table__.columns if column.name not in excluded)
+
+        return (
+            _Table(self.parent.__tablename__, ("_key", ), columns(self.parent)),
+            _Table(self.attachment.__tablename__, ("_key", "_parent_key"), columns(self.attachment, attachment_fk)),
+            _Table(self.chunk.__tablename__, ("_parent_key", "_attachment_key"),
+                   columns(self.chunk, chunk_fk, self.attachment_fk)),
+        )
+
+
+@lru_cache(maxsize=None)
+def merge_sql(spec: BulkSpec) -> str:
+    """임시 테이블의 게시글을 url 기준 upsert하고 기존 첨부파일 / 청크를 바꾸는 SQL 문 (url, id 반환)
+
+    첨부파일 id는 청크가 참조하므로 `nextval`로 미리 받아 INSERT합니다.
+    """
+    parent, attachment, chunk = spec.tables()
+    attachment_fk, chunk_fk = (column.name for column in spec.parent_fk)
+    chunk_attachment_fk = spec.attachment_fk.name
+
+    parent_cols = [column.name for column in parent.columns]
+    attachment_cols = [column.name for column in attachment.columns]
+    chunk_cols = [column.name for column in chunk.columns]
+    updates = ", ".join(f"{name} = EXCLUDED.{name}" for name in parent_cols if name != "url")
+
+    return f"""
+        WITH parents AS (
+            INSERT INTO {parent.name} ({", ".join(parent_cols)})
+            SELECT {", ".join(parent_cols)} FROM {parent.staging} ORDER BY _key
+            ON CONFLICT (url) DO UPDATE SET {updates}
+            RETURNING id, url
+        ), keyed AS (
+            SELECT s._key, p.id FROM {parent.staging} s JOIN parents p ON p.url = s.url
+        ), deleted_chunks AS (
+            DELETE FROM {chunk.name} t USING keyed k WHERE t.{chunk_fk} = k.id
+        ), deleted_attachments AS (
+            DELETE FROM {attachment.name} t USING keyed k WHERE t.{attachment_fk} = k.id
+        ), new_attachments AS (
+            SELECT s.*, nextval(pg_get_serial_sequence('{attachment.name}', 'id')) AS id FROM {attachment.staging} s
+        ), attachments AS (
+            INSERT INTO {attachment.name} (id, {attachment_fk}, {", ".join(attachment_cols)})
+            SELECT a.id, k.id, {", ".join(f"a.{name}" for name in attachment_cols)}
+            FROM new_attachments a JOIN keyed k ON k._key = a._parent_key
+        ), chunks AS (
+            INSERT INTO {chunk.name} ({chunk_fk}, {chunk_attachment_fk}, {", ".join(chunk_cols)})
+            SELECT k.id, a.id, {", ".join(f"s.{name}" for name in chunk_cols)}
+            FROM {chunk.staging} s
+            JOIN keyed k ON k._key = s._parent_key
+            LEFT JOIN new_attachments a ON a._key = s._attachment_key
+        )
+        SELECT url, id FROM parents
+    """
+
+
+def stage_rows(spec: BulkSpec, objects: List[Base]) -> Tuple[List, List, List]:
+    """게시글 / 첨부파일 / 청크를 임시 테이블 행 ((keys), 객체)으로 변환, 같은 url은 마지막 게시글만 저장"""
+    parents = list({obj.url: obj for obj in objects}.values())
+    parent_rows, attachment_rows, chunk_rows = [], [], []
+
+    for parent_key, obj in enumerate(parents):
+        parent_rows.append(((parent_key, ), obj))
+
+        attachment_keys: Dict[int, int] = {}
+        for att in obj.attachments:
+            attachment_key = len(attachment_rows)
+            attachment_rows.append(((attachment_key, parent_key), att))
+            attachment_keys.update({id(chunk): attachment_key for chunk in att.content_chunks})
+
+        # 첨부파일 청크는 게시글의 `content_chunks`와 첨부파일의 `content_chunks`에 모두 들어 있음
+        chunks = {id(chunk): chunk for chunk in [*obj.content_chunks, *(c for att in obj.attachments
+                                                                         for c in att.content_chunks)]}
+        chunk_rows += [((parent_key, attachment_keys.get(key)), chunk) for key, chunk in chunks.items()]
+
+    return parent_rows, attachment_rows, chunk_rows
+
+
+def bulk_upsert(session: Session, spec: BulkSpec, objects: List[Base]) -> Dict[str, int]:
+    """`objects`(세션에 추가하지 않은 ORM 객체)를 저장하고 url별 게시글 id 반환
+
+    임시 테이블 준비 1회, COPY 3회, upsert 1회 요청합니다. 호출한 쪽의 트랜잭션 안에서 실행됩니다.
+    """
+    if not objects:
+        return {}
+
+    tables = spec.tables()
+    rows = stage_rows(spec, objects)
+
+    cursor = session.connection().connection.cursor()
+    try:
+        ddl = "; ".join(table.ddl() for table in tables)
+        cursor.execute(f"{ddl}; TRUNCATE {', '.join(table.staging for table in tables)}")
+
+        for table, table_rows in zip(tables, rows):
+            if table_rows:
+                cursor.copy_expert(table.copy_sql(), io.BytesIO(table.encode(table_rows)))
+
+        cursor.execute(merge_sql(spec))
+        return dict(cursor.fetchall())
+
+    finally:
+        cursor.close()
@@ -0,0 +1,79 @@
+from datetime import datetime
+from typing import List
+
+from sqlalchemy import and_, delete, insert, update
+
+from db.models.crawl import CrawlCheckpointModel, CrawlStatusEnum
+from db.repositories.base import BaseRepository
+
+
+class CrawlCheckpointRepository(BaseRepository[CrawlCheckpointModel]):
+
+    def _key_filter(self, source: str, department: str = "", category: str = ""):
+        return and_(
+            CrawlCheckpointModel.source == source,
+            CrawlCheckpointModel.department == department,
+            CrawlCheckpointModel.category == category,
+        )
+
+    def create_frontier(
+        self,
+        run_id: str,
+        urls: List[str],
+        source: str,
+        department: str = "",
+        category: str = "",
+    ) -> int:
+        """이전 체크포인트를 지우고 새로 찾은 url 목록 기록"""
+        self.session.execute(delete(CrawlCheckpointModel).where(self._key_filter(source, department, category)))
+
+        urls = list(dict.fromkeys(urls))
+        if urls:
+            self.session.execute(
+                insert(CrawlCheckpointModel),
+                [{
+                    "source": source,
+                    "department": department,
+                    "category": category,
+                    "run_id": run_id,
+                    "position": position,
+                    "url": url,
+                    "status": CrawlStatusEnum.discovered,
+                } for position, url in enumerate(urls)],
+            )
+        self.session.flush()
+        return len(urls)
+
+    def find_frontier(self, source: str, department: str = "", category: str = "") -> List[CrawlCheckpointModel]:
+        """목록 페이지 순서대로 체크포인트 조회"""
+        return (
+            self.session.query(CrawlCheckpointModel).filter(self._key_filter(source, department, category))
+            .order_by(CrawlCheckpointModel.position).all()
+        )
+
+    def update_status(
+        self,
+        urls: List[str],
+        status: CrawlStatusEnum,
+        source: str,
+        department: str = "",
+        category: str = "",
+    ) -> int:
+        if not urls:
+            return 0
+
+        result = self.session.execute(
+            update(CrawlCheckpointModel).where(
+                self._key_filter(source, department, category),
+                CrawlCheckpointModel.url.in_(urls),
+            ).values(status=status, updated_at=datetime.now())
+        )
+        self.session.flush()
+        return result.rowcount
+
+    def delete_frontier(self, source: str, department: str = "", category: str = "") -> int:
+        result = self.session.execute(
+            delete(CrawlCheckpointModel).where(self._key_filter(source, department, category))
+        )
+        self.session.flush()
+        return result.rowcount
@@ -2,13 +2,14 @@ from abc import abstractmethod
 from typing import Dict, Generic, List, NotRequired, Optional, TypeVar, TypedDict, Unpack
 
 from pgvector.sqlalchemy import SparseVector
-from sqlalchemy import Integer, cast, desc, func, and_, or_
-from db.models import NoticeModel, NoticeChunkModel, DepartmentModel
+from sqlalchemy import func, and_, or_, update
+from db.models import AttachmentModel, NoticeModel, NoticeChunkModel, DepartmentModel
 from db.common import V_DIM
 from db.models.calendar import SemesterModel
-from db.models.notice import PNUNoticeChunkModel, PNUNoticeModel
+from db.models.notice import PNUNoticeAttachmentModel, PNUNoticeChunkModel, PNUNoticeModel
 from services.base.types.calendar import DateRangeType
 from .base import BaseRepository
+from .bulk import BulkSpec, bulk_upsert
 
 NoticeModelT = TypeVar("NoticeModelT", NoticeModel, PNUNoticeModel)
 
@@ -33,6 +34,22 @@ class PNUNoticeSearchFilterType(TypedDict, total=False):
     urls: NotRequired[List[str]]
 
 
+def _update_semesters(session, model: type, semesters: List[SemesterModel], filter) -> int:
+    """게시글 / 학교 공지사항 테이블 공통 학기 갱신, 이미 같은 학기인 행은 다시 쓰지 않음 (변경된 행 수 반환)"""
+    if not semesters:
+        return 0
+
+    query = (
+        update(model)
+        .where(model.date.between(SemesterModel.st_date, SemesterModel.ed_date))
+        .where(SemesterModel.id.in_([semester.id for semester in semesters]))
+        .where(model.semester_id.is_distinct_from(SemesterModel.id))
+        .where(filter)
+        .values(semester_id=SemesterModel.id)
+    )
+    return session.execute(query, execution_options={"synchronize_session": False}).rowcount
+
+
 class INoticeRepository(
     Generic[NoticeModelT],
 ):
@@ -42,17 +59,15 @@ class INoticeRepository(
         pass
 
     @abstractmethod
-    def update_semester(
+    def update_semesters(
         self,
-        semester: SemesterModel,
-        batch: Optional[int] = None,
-        offset: Optional[int] = None,
+        semesters: List[SemesterModel],
         **kwargs: Unpack[NoticeSearchFilterType],
-    ) -> List[NoticeModelT]:
+    ) -> int:
         pass
 
     @abstractmethod
-    def find_last_notice(self, **kwargs: Unpack[NoticeSearchFilterType]):
+    def find_last_seq(self, **kwargs: Unpack[NoticeSearchFilterType]) -> Optional[int]:
         pass
 
     @abstractmethod
@@ -95,19 +110,59 @@ class PNUNoticeRepository(
     BaseRepository[PNUNoticeModel],
 ):
 
-    def find_last_notice(self):
-        notice_id = cast(func.split_part(PNUNoticeModel.url, '=', 6), Integer).label("pnu_notice_id")
-        last_notice = self.session.query(PNUNoticeModel, notice_id).order_by(desc(notice_id)).first()
-
-        return last_notice[0] if last_notice else None
+    def find_last_seq(self) -> Optional[int]:
+        """저장된 게시글의 가장 큰 `source_seq` (`ix_pnu_notices_source_seq`로 조회)"""
+        return self.session.query(func.max(PNUNoticeModel.source_seq)).scalar()
 
     def delete_all(self, urls: List[str] = []):
         if urls:
-            affected = self.session.query(PNUNoticeModel).filter(NoticeModel.url.in_(urls)).delete()
+            affected = self.session.query(PNUNoticeModel).filter(PNUNoticeModel.url.in_(urls)).delete()
         else:
             affected = self.session.query(PNUNoticeModel).delete()
         return affected
 
+    def find_content_hashes(self, urls: List[str]):
+        """url별 (url, content_hash, is_important), 벡터 / 청크는 불러오지 않음"""
+        if not urls:
+            return []
+
+        query = self.session.query(PNUNoticeModel.url, PNUNoticeModel.content_hash, PNUNoticeModel.is_important)
+        return query.filter(PNUNoticeModel.url.in_(urls)).all()
+
+    def find_unparsed_attachments(self, **kwargs: Unpack[PNUNoticeSearchFilterType]):
+        """청크가 하나도 저장되지 않은 첨부파일의 (게시글 url, 첨부파일 이름, 첨부파일 url)"""
+        if "urls" in kwargs and not kwargs["urls"]:
+            return []
+
+        query = self.session.query(
+            PNUNoticeModel.url,
+            PNUNoticeAttachmentModel.name,
+            PNUNoticeAttachmentModel.url.label("attachment_url"),
+        )
+        query = query.join(PNUNoticeAttachmentModel, PNUNoticeAttachmentModel.pnu_notice_id == PNUNoticeModel.id)
+        query = query.outerjoin(PNUNoticeChunkModel, PNUNoticeChunkModel.attachment_id == PNUNoticeAttachmentModel.id)
+        if kwargs:
+            query = query.filter(self._get_filters(**kwargs))
+        return query.filter(PNUNoticeChunkModel.id.is_(None)).all()
+
+    def find_all_by_urls(self, urls: List[str]) -> List[PNUNoticeModel]:
+        if not urls:
+            return []
+
+        return self.session.query(PNUNoticeModel).filter(PNUNoticeModel.url.in_(urls)).all()
+
+    def update_important(self, urls: List[str], is_important: bool) -> int:
+        if not urls:
+            return 0
+
+        query = update(PNUNoticeModel).where(PNUNoticeModel.url.in_(urls)).values(is_important=is_important)
+        return self.session.execute(query).rowcount
+
+    def upsert_bulk(self, objects: List[PNUNoticeModel]) -> Dict[str, int]:
+        """게시글 / 첨부파일 / 청크를 binary COPY + url 기준 upsert로 저장하고 url별 id 반환 (`bulk.bulk_upsert`)"""
+        spec = BulkSpec(PNUNoticeModel, PNUNoticeAttachmentModel, PNUNoticeChunkModel)
+        return bulk_upsert(self.session, spec, objects)
+
     def _get_filters(self, **kwargs: Unpack[PNUNoticeSearchFilterType]):
         filters = []
 
@@ -151,25 +206,9 @@ class PNUNoticeRepository(
 
         return filter
 
-    def update_semester(self, semester, batch=None, offset=None, **kwargs):
-
-        filter = self._get_filters(**kwargs)
-
-        st, ed = semester.st_date, semester.ed_date
-        date_filter = and_(PNUNoticeModel.date >= st, PNUNoticeModel.date <= ed)
-        query = self.session.query(PNUNoticeModel).filter(date_filter).filter(filter)
-        if batch:
-            query.limit(batch)
-        if offset:
-            query.offset(offset)
-
-        notices = query.all()
-
-        for notice in notices:
-            setattr(notice, "semester_id", semester.id)
-            self.session.flush()
-
-        return notices
+    def update_semesters(self, semesters, **kwargs):
+        """작성일이 학기 기간에 포함되는 게시글의 `semester_id`를 UPDATE ... FROM semesters 한 번으로 갱신"""
+        return _update_semesters(self.session, PNUNoticeModel, semesters, self._get_filters(**kwargs))
 
     def search_total_records(self, **kwargs: Unpack[PNUNoticeSearchFilterType]):
         filter = self._get_filters(**kwargs)
@@ -240,6 +279,43 @@ class NoticeRepository(BaseRepository[NoticeModel]):
         affected = self.session.query(NoticeModel).filter(filter).delete()
         return affected
 
+    def find_content_hashes(self, urls: List[str]):
+        """url별 (url, content_hash, is_important), 벡터 / 청크는 불러오지 않음"""
+        if not urls:
+            return []
+
+        query = self.session.query(NoticeModel.url, NoticeModel.content_hash, NoticeModel.is_important)
+        return query.filter(NoticeModel.url.in_(urls)).all()
+
+    def find_unparsed_attachments(self, **kwargs: Unpack[NoticeSearchFilterType]):
+        """청크가 하나도 저장되지 않은 첨부파일의 (게시글 url, 첨부파일 이름, 첨부파일 url)"""
+        if "urls" in kwargs and not kwargs["urls"]:
+            return []
+
+        query = self.session.query(NoticeModel.url, AttachmentModel.name, AttachmentModel.url.label("attachment_url"))
+        query = query.join(AttachmentModel, AttachmentModel.notice_id == NoticeModel.id)
+        query = query.outerjoin(NoticeChunkModel, NoticeChunkModel.attachment_id == AttachmentModel.id)
+        if kwargs:
+            query = query.filter(self._get_filters(**kwargs))
+        return query.filter(NoticeChunkModel.id.is_(None)).all()
+
+    def find_all_by_urls(self, urls: List[str]) -> List[NoticeModel]:
+        if not urls:
+            return []
+
+        return self.session.query(NoticeModel).filter(NoticeModel.url.in_(urls)).all()
+
+    def update_important(self, urls: List[str], is_important: bool) -> int:
+        if not urls:
+            return 0
+
+        query = update(NoticeModel).where(NoticeModel.url.in_(urls)).values(is_important=is_important)
+        return self.session.execute(query).rowcount
+
+    def upsert_bulk(self, objects: List[NoticeModel]) -> Dict[str, int]:
+        """게시글 / 첨부파일 / 청크를 binary COPY + url 기준 upsert로 저장하고 url별 id 반환 (`bulk.bulk_upsert`)"""
+        return bulk_upsert(self.session, BulkSpec(NoticeModel, AttachmentModel, NoticeChunkModel), objects)
+
     def _get_filters(self, **kwargs: Unpack[NoticeSearchFilterType]):
         filters = []
 
@@ -295,43 +371,19 @@ class NoticeRepository(BaseRepository[NoticeModel]):
 
         return filter
 
-    def update_semester(self, semester, batch=None, offset=None, **kwargs):
-
-        filter = self._get_filters(**kwargs)
-
-        st, ed = semester.st_date, semester.ed_date
-        date_filter = and_(NoticeModel.date >= st, NoticeModel.date <= ed)
-        query = self.session.query(NoticeModel).filter(date_filter).filter(filter)
-        if batch:
-            query = query.limit(batch)
-        if offset:
-            query = query.offset(offset)
-
-        notices = query.all()
-
-        for notice in notices:
-            setattr(notice, "semester_id", semester.id)
-            self.session.flush()
-
-        return notices
+    def update_semesters(self, semesters, **kwargs):
+        """작성일이 학기 기간에 포함되는 게시글의 `semester_id`를 UPDATE ... FROM semesters 한 번으로 갱신"""
+        return _update_semesters(self.session, NoticeModel, semesters, self._get_filters(**kwargs))
 
     def search_total_records(self, **kwargs: Unpack[NoticeSearchFilterType]):
         filter = self._get_filters(**kwargs)
         count = self.session.query(NoticeModel).filter(filter).count()
         return count
 
-    def find_last_notice(self, **kwargs):
+    def find_last_seq(self, **kwargs) -> Optional[int]:
+        """(학과, 분류)의 가장 큰 `source_seq` (`ix_notice_department_category_source_seq`로 조회)"""
         filter = self._get_filters(**kwargs)
-
-        if "is_me" in kwargs:
-            notice_seq = cast(func.substring(NoticeModel.url, r'seq=(\d+)'), Integer)
-
-        else:
-            notice_seq = cast(func.split_part(NoticeModel.url, '/', 7), Integer).label("notice_id")
-
-        last_notice = self.session.query(NoticeModel, notice_seq).where(filter).order_by(desc(notice_seq)).first()
-
-        return last_notice[0] if last_notice else None
+        return self.session.query(func.max(NoticeModel.source_seq)).where(filter).scalar()
 
     def delete_by_department(self, department: str):
         department_model = self.session.query(DepartmentModel).filter(DepartmentModel.name == department).one_or_none()
@@ -2,6 +2,7 @@ from abc import abstractmethod
 from typing import Dict, List, Optional
 from db.models.support import SupportAttachmentModel, SupportModel, SupportChunkModel
 from db.repositories.base import BaseRepository
+from db.repositories.bulk import BulkSpec, bulk_upsert
 from pgvector.sqlalchemy import SparseVector
 from db.common import V_DIM
 from sqlalchemy import func
@@ -9,14 +10,49 @@ from sqlalchemy import func
 
 class ISupportRepository(BaseRepository[SupportModel]):
 
-    def delete_all(self):
-        affected = self.session.query(SupportModel).delete()
+    def delete_all(self, urls: List[str] = []):
+        if urls:
+            affected = self.session.query(SupportModel).filter(SupportModel.url.in_(urls)).delete()
+        else:
+            affected = self.session.query(SupportModel).delete()
         return affected
 
     def find_all(self):
         supports = self.session.query(SupportModel).all()
         return supports
 
+    def find_content_hashes(self, urls: List[str]):
+        """url별 (url, content_hash), 벡터 / 청크는 불러오지 않음"""
+        if not urls:
+            return []
+
+        query = self.session.query(SupportModel.url, SupportModel.content_hash)
+        return query.filter(SupportModel.url.in_(urls)).all()
+
+    def find_unparsed_attachments(self, urls: List[str]):
+        """`urls` 중 청크가 하나도 저장되지 않은 첨부파일의 (게시글 url, 첨부파일 이름, 첨부파일 url)"""
+        if not urls:
+            return []
+
+        query = self.session.query(
+            SupportModel.url,
+            SupportAttachmentModel.name,
+            SupportAttachmentModel.url.label("attachment_url"),
+        )
+        query = query.join(SupportAttachmentModel, SupportAttachmentModel.support_id == SupportModel.id)
+        query = query.outerjoin(SupportChunkModel, SupportChunkModel.attachment_id == SupportAttachmentModel.id)
+        return query.filter(SupportModel.url.in_(urls), SupportChunkModel.id.is_(None)).all()
+
+    def find_all_by_urls(self, urls: List[str]) -> List[SupportModel]:
+        if not urls:
+            return []
+
+        return self.session.query(SupportModel).filter(SupportModel.url.in_(urls)).all()
+
+    def upsert_bulk(self, objects: List[SupportModel]) -> Dict[str, int]:
+        """항목 / 첨부파일 / 청크를 binary COPY + url 기준 upsert로 저장하고 url별 id 반환 (`bulk.bulk_upsert`)"""
+        return bulk_upsert(self.session, BulkSpec(SupportModel, SupportAttachmentModel, SupportChunkModel), objects)
+
     @abstractmethod
     def search_supports(
         self,
@@ -32,14 +68,49 @@ class ISupportRepository(BaseRepository[SupportModel]):
 class SupportRepository(BaseRepository[SupportModel]):
     """deprecated"""
 
-    def delete_all(self):
-        affected = self.session.query(SupportModel).delete()
+    def delete_all(self, urls: List[str] = []):
+        if urls:
+            affected = self.session.query(SupportModel).filter(SupportModel.url.in_(urls)).delete()
+        else:
+            affected = self.session.query(SupportModel).delete()
         return affected
 
     def find_all(self):
         supports = self.session.query(SupportModel).all()
         return supports
 
+    def find_content_hashes(self, urls: List[str]):
+        """url별 (url, content_hash), 벡터 / 청크는 불러오지 않음"""
+        if not urls:
+            return []
+
+        query = self.session.query(SupportModel.url, SupportModel.content_hash)
+        return query.filter(SupportModel.url.in_(urls)).all()
+
+    def find_unparsed_attachments(self, urls: List[str]):
+        """`urls` 중 청크가 하나도 저장되지 않은 첨부파일의 (게시글 url, 첨부파일 이름, 첨부파일 url)"""
+        if not urls:
+            return []
+
+        query = self.session.query(
+            SupportModel.url,
+            SupportAttachmentModel.name,
+            SupportAttachmentModel.url.label("attachment_url"),
+        )
+        query = query.join(SupportAttachmentModel, SupportAttachmentModel.support_id == SupportModel.id)
+        query = query.outerjoin(SupportChunkModel, SupportChunkModel.attachment_id == SupportAttachmentModel.id)
+        return query.filter(SupportModel.url.in_(urls), SupportChunkModel.id.is_(None)).all()
+
+    def find_all_by_urls(self, urls: List[str]) -> List[SupportModel]:
+        if not urls:
+            return []
+
+        return self.session.query(SupportModel).filter(SupportModel.url.in_(urls)).all()
+
+    def upsert_bulk(self, objects: List[SupportModel]) -> Dict[str, int]:
+        """항목 / 첨부파일 / 청크를 binary COPY + url 기준 upsert로 저장하고 url별 id 반환 (`bulk.bulk_upsert`)"""
+        return bulk_upsert(self.session, BulkSpec(SupportModel, SupportAttachmentModel, SupportChunkModel), objects)
+
     def search_supports_content_hybrid(
         self,
         dense_vector: List[float],
@@ -1,55 +1,414 @@
-from asyncio import Semaphore
 import asyncio
 from contextlib import asynccontextmanager
 from functools import wraps
-from typing import Callable, Optional
+from typing import Callable, Deque, Dict, Optional, TypeVar
+from collections import deque
+import os
 import time
 import logging
+import weakref
 from config.logger import _logger
+from mixins import metrics
+from mixins.http_client import UpstreamStatusError
+from mixins.resilience import Policy, attempt_timed_out
 
 logger = _logger(__name__)
 
-_Semaphore: Optional[Semaphore] = None
+T = TypeVar("T")
 
+DEFAULT_LIMIT = 10
 
-@asynccontextmanager
-async def semaphore(limit: int = 10):
-    global _Semaphore
 
-    if _Semaphore is None:
-        _Semaphore = Semaphore(limit)
+def _parse_limits(raw: str, cast: Callable[[str], T] = int) -> Dict[str, T]:
+    """`"embed=16,university=4,onestop.pusan.ac.kr=2"` 형식의 설정 파싱"""
+    limits: Dict[str, T] = {}
+    for item in raw.split(","):
+        if "=" in item:
+            name, limit = item.split("=", 1)
+            limits[name.strip()] = cast(limit)
+    return limits
+
+
+# upstream(서비스 또는 호스트)별 동시 요청 수
+LIMITS: Dict[str, int] = {
+    "embed": 16,
+    "rerank": 8,
+    "document_parser": 4,
+    "document_parser_large": 1,
+    "university": 4,
+    **_parse_limits(os.environ.get("CONCURRENCY_LIMITS", "")),
+}
+
+# 목표 지연 시간(초)이 설정된 upstream은 `AdaptiveLimiter`를 사용하며, `LIMITS` 값이 최대 동시 요청 수가 됨
+LATENCY_TARGETS: Dict[str, float] = {
+    "embed": 2.0,
+    "rerank": 1.0,
+    "document_parser": 60.0,
+    **_parse_limits(os.environ.get("LIMITER_LATENCY_TARGETS", ""), cast=float),
+}
+
+
+class Limiter:
+    """upstream별 동시 실행 수 제한
+
+    세마포어는 이벤트 루프마다 따로 생성되며, 대기열 길이와 대기 시간을 메트릭으로 기록합니다.
+    """
+
+    def __init__(self, name: str, limit: int):
+        self.name = name
+        self.limit = limit
+        self._semaphores: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = \
+            weakref.WeakKeyDictionary()
+
+        self._queue_depth = metrics.gauge(f"limiter.{name}.queue_depth")
+        self._in_flight = metrics.gauge(f"limiter.{name}.in_flight")
+        self._wait = metrics.histogram(f"limiter.{name}.wait_seconds")
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.limit)
+        return semaphore
 
-    semaphore = _Semaphore
+    @asynccontextmanager
+    async def acquire(self):
+        semaphore = self._semaphore()
 
-    try:
-        async with semaphore:
+        st = time.perf_counter()
+        self._queue_depth.inc()
+        try:
+            await semaphore.acquire()
+        finally:
+            self._queue_depth.dec()
+        self._wait.observe(time.perf_counter() - st)
+
+        self._in_flight.inc()
+        try:
             yield
+        finally:
+            self._in_flight.dec()
+            semaphore.release()
 
-    except Exception as e:
-        logger(f"비동기 작업 중 오류가 발생했습니다. ({e})", level=logging.ERROR)
-        raise e
 
+class AdaptiveLimiter(Limiter):
+    """AIMD 방식으로 동시 요청 수를 조절하는 limiter
 
-def retry_async(times: int = 10, delay: float = 5.0, is_success=lambda _: True):
+    응답 시간이 `latency_target` 이하인 요청이 끝날 때마다 제한을 `1 / limit`씩(대략 limit개 요청마다 1) 늘리고,
+    타임아웃, 429, 5xx 응답이 발생하면 절반으로 줄입니다. 한 번의 과부하 구간에서 연속으로 줄어들지 않도록
+    감소 후 `latency_target` 동안은 다시 줄이지 않습니다.
+    """
 
-    def decorator(func):
+    def __init__(self, name: str, max_limit: int, latency_target: float, min_limit: int = 1):
+        super().__init__(name, max_limit)
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.latency_target = latency_target
+        self.current = float(max(min_limit, max_limit // 2))
 
-        @wraps(func)
-        async def wrapped(*args, **kwargs):
-            for _ in range(times):
-                try:
-                    result = await func(*args, **kwargs)
-                    if not is_success(result):
-                        continue
-                    if isinstance(result, BaseException):
-                        raise result
-                    return result
-                except Exception as e:
-                    logger(f"요청을 재시도 합니다: {e}", level=logging.WARNING)
-                    await asyncio.sleep(delay)
-            raise TimeoutError(f'{times}번의 재시도에 실패했습니다.')
+        self._in_flight_by_loop: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, int] = \
+            weakref.WeakKeyDictionary()
+        self._waiters: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Deque[asyncio.Future]] = \
+            weakref.WeakKeyDictionary()
+        self._last_decrease = 0.0
 
-        return wrapped
+        self._limit = metrics.gauge(f"limiter.{name}.limit")
+        self._overloads = metrics.counter(f"limiter.{name}.overloads")
+        self._limit.set(self.current)
+
+    @staticmethod
+    def is_overload(e: BaseException) -> bool:
+        if isinstance(e, UpstreamStatusError):
+            return e.status == 429 or e.status >= 500
+        # 정책의 시도당 제한 시간은 호출을 취소하므로 limiter 안에서는 TimeoutError가 아닌 CancelledError로 보임
+        if isinstance(e, asyncio.CancelledError):
+            return attempt_timed_out()
+        return isinstance(e, TimeoutError)
+
+    def _on_success(self, latency: float):
+        if latency <= self.latency_target:
+            self.current = min(self.max_limit, self.current + 1 / self.current)
+            self._limit.set(self.current)
+
+    def _on_overload(self):
+        self._overloads.inc()
+        now = time.perf_counter()
+        if now - self._last_decrease < self.latency_target:
+            return
+
+        self._last_decrease = now
+        self.current = max(self.min_limit, self.current / 2)
+        self._limit.set(self.current)
+        logger(f"[{self.name}] 과부하로 동시 요청 수를 {int(self.current)}개로 줄입니다.", level=logging.WARNING)
+
+    def _wake(self, loop: asyncio.AbstractEventLoop):
+        waiters = self._waiters.get(loop)
+        while waiters and self._in_flight_by_loop.get(loop, 0) < int(self.current):
+            waiter = waiters.popleft()
+            if not waiter.done():
+                self._in_flight_by_loop[loop] += 1
+                waiter.set_result(None)
+
+    @asynccontextmanager
+    async def acquire(self):
+        loop = asyncio.get_running_loop()
+        self._in_flight_by_loop.setdefault(loop, 0)
+
+        st = time.perf_counter()
+        if self._in_flight_by_loop[loop] < int(self.current) and not self._waiters.get(loop):
+            self._in_flight_by_loop[loop] += 1
+        else:
+            waiter = loop.create_future()
+            self._waiters.setdefault(loop, deque()).append(waiter)
+            self._queue_depth.inc()
+            try:
+                await waiter
+            except BaseException:
+                if waiter.done() and not waiter.cancelled():
+                    self._in_flight_by_loop[loop] -= 1
+                    self._wake(loop)
+                raise
+            finally:
+                self._queue_depth.dec()
+        self._wait.observe(time.perf_counter() - st)
+
+        self._in_flight.inc()
+        st = time.perf_counter()
+        try:
+            yield
+
+        except BaseException as e:
+            if self.is_overload(e):
+                self._on_overload()
+            raise
+
+        else:
+            self._on_success(time.perf_counter() - st)
+
+        finally:
+            self._in_flight.dec()
+            self._in_flight_by_loop[loop] -= 1
+            self._wake(loop)
+
+
+# 대학 서버 호스트별 초당 요청 수 / 한 번에 보낼 수 있는 요청 수(burst), "default"는 지정하지 않은 호스트
+HOST_RATE_LIMITS: Dict[str, float] = {
+    "default": 4.0,
+    **_parse_limits(os.environ.get("HOST_RATE_LIMITS", ""), cast=float),
+}
+HOST_BURST_LIMITS: Dict[str, int] = {
+    "default": 4,
+    **_parse_limits(os.environ.get("HOST_BURST_LIMITS", "")),
+}
+# 응답 시간의 이동 평균이 지금까지의 최솟값의 `HOST_LATENCY_FACTOR`배와 `HOST_LATENCY_MIN`초를 모두 넘으면 요청 속도를 줄임
+HOST_LATENCY_FACTOR = float(os.environ.get("HOST_LATENCY_FACTOR", 3.0))
+HOST_LATENCY_MIN = float(os.environ.get("HOST_LATENCY_MIN", 1.0))
+
+
+class RequestTiming:
+    """`RateLimiter.acquire` 슬롯의 응답 시간 측정
+
+    응답 헤더를 받은 뒤 `headers_received()`를 호출하면 본문 전송(첨부파일 다운로드 등) 시간은 응답 시간에서 제외합니다.
+    호출하지 않으면 슬롯을 반납할 때까지의 시간을 사용합니다.
+    """
+
+    __slots__ = ("started", "latency")
+
+    def __init__(self, started: float):
+        self.started = started
+        self.latency: Optional[float] = None
+
+    def headers_received(self):
+        if self.latency is None:
+            self.latency = time.monotonic() - self.started
+
+
+class RateLimiter:
+    """호스트별 요청 속도 제한 (token bucket)
+
+    초당 `max_rate`개씩 토큰이 채워지고 최대 `burst`개까지 쌓이며, 요청마다 토큰 하나를 예약한 뒤 차례가 올 때까지
+    기다립니다. 429 / 503 응답이나 타임아웃이 발생하거나 응답 시간이 늘어나면 요청 속도를 절반으로 줄이고(쌓인 토큰도 비움),
+    정상 응답마다 `max_rate / 50`씩 다시 늘립니다. 응답 시간은 `RequestTiming.headers_received()`를 호출했다면 응답 헤더까지만
+    측정합니다. 동시에 실패한 요청들로 연속해서 줄어들지 않도록 감소 후 1초(요청 간격이 더 길면
+    요청 간격) 동안은 다시 줄이지 않습니다.
+    """
+
+    def __init__(self, name: str, max_rate: float, burst: int, min_rate: float = 0.1):
+        self.name = name
+        self.max_rate = max_rate
+        self.min_rate = min(min_rate, max_rate)
+        self.burst = max(1, burst)
+        self.rate = max_rate
+
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._last_decrease = 0.0
+        self._latency: Optional[float] = None
+        self._min_latency: Optional[float] = None
+        self._first_request: Optional[float] = None
+        self._last_request: Optional[float] = None
+
+        self._rate = metrics.gauge(f"ratelimit.{name}.rate")
+        self._requests = metrics.counter(f"ratelimit.{name}.requests")
+        self._backoffs = metrics.counter(f"ratelimit.{name}.backoffs")
+        self._wait = metrics.histogram(f"ratelimit.{name}.wait_seconds")
+        self._rate.set(self.rate)
+
+    @staticmethod
+    def is_overload(e: BaseException) -> bool:
+        if isinstance(e, UpstreamStatusError):
+            return e.status in (429, 503)
+        return isinstance(e, TimeoutError)
+
+    def _reserve(self) -> float:
+        """토큰 하나를 예약하고 기다려야 할 시간(초) 반환"""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def _backoff(self, reason: str):
+        self._backoffs.inc()
+        now = time.monotonic()
+        if now - self._last_decrease < max(1.0, 1 / self.rate):
+            return
+
+        self._last_decrease = now
+        self.rate = max(self.min_rate, self.rate / 2)
+        self._tokens = min(self._tokens, 0.0)
+        self._rate.set(self.rate)
+        logger(f"[{self.name}] {reason}, 요청 속도를 {self.rate:.2f}/s로 줄입니다.", level=logging.WARNING)
+
+    def _on_success(self, latency: float):
+        self._latency = latency if self._latency is None else 0.8 * self._latency + 0.2 * latency
+        self._min_latency = self._latency if self._min_latency is None else min(self._min_latency, self._latency)
+
+        if self._latency > max(self._min_latency * HOST_LATENCY_FACTOR, HOST_LATENCY_MIN):
+            self._backoff(f"응답 시간 증가({self._latency:.2f}s)")
+            # 줄인 속도에서 다시 측정
+            self._latency = None
+            return
+
+        self.rate = min(self.max_rate, self.rate + self.max_rate / 50)
+        self._rate.set(self.rate)
+
+    @asynccontextmanager
+    async def acquire(self):
+        wait = self._reserve()
+        try:
+            if wait > 0:
+                await asyncio.sleep(wait)
+        except BaseException:
+            self._tokens += 1
+            raise
+        self._wait.observe(wait)
+
+        now = time.monotonic()
+        self._first_request = self._first_request or now
+        self._last_request = now
+        self._requests.inc()
+
+        timing = RequestTiming(now)
+        try:
+            yield timing
+
+        except BaseException as e:
+            if self.is_overload(e):
+                self._backoff(f"과부하({e})")
+            raise
+
+        else:
+            self._on_success(timing.latency if timing.latency is not None else time.monotonic() - now)
+
+    def achieved_rate(self) -> float:
+        """첫 요청부터 마지막 요청까지의 실제 초당 요청 수"""
+        if self._first_request is None or self._last_request is None:
+            return 0.0
+        elapsed = self._last_request - self._first_request
+        count = self._requests.snapshot()
+        return (count - 1) / elapsed if elapsed > 0 else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "requests": self._requests.snapshot(),
+            "achieved_rate": round(self.achieved_rate(), 2),
+            "rate": round(self.rate, 2),
+            "max_rate": self.max_rate,
+            "backoffs": self._backoffs.snapshot(),
+        }
+
+
+_LIMITERS: Dict[str, Limiter] = {}
+_RATE_LIMITERS: Dict[str, RateLimiter] = {}
+
+
+def limiter(name: str, key: Optional[str] = None) -> Limiter:
+    """`name` upstream의 limiter 반환
+
+    `key`(예: 호스트)가 주어지면 `name:key`별로 따로 제한하며, 제한값은 `key` → `name` 순으로 찾습니다.
+    """
+    full_name = f"{name}:{key}" if key else name
+    _limiter = _LIMITERS.get(full_name)
+    if _limiter is None:
+        limit = LIMITS.get(key or name, LIMITS.get(name, DEFAULT_LIMIT))
+        latency_target = LATENCY_TARGETS.get(name)
+        _limiter = _LIMITERS.setdefault(
+            full_name,
+            AdaptiveLimiter(full_name, limit, latency_target) if latency_target else Limiter(full_name, limit),
+        )
+    return _limiter
+
+
+def rate_limiter(host: str) -> RateLimiter:
+    """대학 서버 호스트의 요청 속도 제한 (모든 크롤러가 공유, 설정은 `host` → "default" 순으로 찾음)"""
+    _limiter = _RATE_LIMITERS.get(host)
+    if _limiter is None:
+        _limiter = _RATE_LIMITERS.setdefault(
+            host,
+            RateLimiter(
+                host,
+                HOST_RATE_LIMITS.get(host, HOST_RATE_LIMITS["default"]),
+                HOST_BURST_LIMITS.get(host, HOST_BURST_LIMITS["default"]),
+            ),
+        )
+    return _limiter
+
+
+@asynccontextmanager
+async def university_request(host: str):
+    """대학 서버 요청 슬롯: 호스트별 동시 요청 수(`limiter("university")`)와 요청 속도(`rate_limiter`)를 모두 지킴
+
+    요청 속도 limiter의 응답 시간에는 동시 요청 수 대기가 포함되지 않으며, 응답 헤더를 받으면
+    `RequestTiming.headers_received()`를 호출해 본문 전송 시간을 제외합니다.
+    """
+    async with limiter("university", key=host).acquire(), rate_limiter(host).acquire() as timing:
+        yield timing
+
+
+def rate_stats() -> Dict[str, Dict[str, float]]:
+    """호스트별 요청 수 / 실제 초당 요청 수 / 현재 제한"""
+    return {host: _limiter.stats() for host, _limiter in _RATE_LIMITERS.items()}
+
+
+def retry_async(times: int = 10, delay: float = 5.0, is_success=lambda _: True):
+    """고정 간격 재시도 (`mixins.resilience.Policy` 호환용 래퍼)
+
+    현재 context의 마감 시간(`mixins.resilience.deadline`)을 넘기면 남은 재시도 없이 `DeadlineExceeded`를 발생시킵니다.
+    """
+
+    def decorator(func):
+        policy = Policy(
+            func.__qualname__,
+            attempts=times,
+            base_delay=delay,
+            max_delay=delay,
+            multiplier=1.0,
+            jitter=False,
+            is_success=lambda result: is_success(result) and not isinstance(result, BaseException),
+            retry_on=lambda _: True,
+        )
+        return policy(func)
 
     return decorator
 
@@ -1,14 +1,26 @@
 from abc import ABCMeta
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from functools import wraps
-from typing import Callable, Dict, Any
+from typing import Callable, Dict, Any, Optional
+import os
 
 import aiohttp
 import logging
-from mixins.asyncio import semaphore
+from mixins import metrics
 
 logger = logging.getLogger(__name__)
 
 
+class UpstreamStatusError(Exception):
+    """upstream이 실패 상태 코드로 응답한 경우 (429, 5xx는 `AdaptiveLimiter`에서 과부하로 간주)"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"{message} (status: {status})")
+        self.status = status
+
+
 class HTTPMetaclass(ABCMeta):
 
     def __new__(cls, name, bases, attrs):
@@ -39,8 +51,12 @@ def session_wrapper(func):
 
     @wraps(func)
     async def wrapped(*args, **kwargs):
-        async with semaphore():
+        try:
             if 'session' not in kwargs or kwargs['session'] is None:
+                if sessions.is_open:
+                    kwargs['session'] = sessions.get("default")
+                    return await func(*args, **kwargs)
+
                 timeout = aiohttp.ClientTimeout(total=600)
                 async with aiohttp.ClientSession(timeout=timeout) as sess:
                     kwargs['session'] = sess
@@ -48,4 +64,115 @@ def session_wrapper(func):
 
             return await func(*args, **kwargs)
 
+        except Exception as e:
+            logger.error(f"비동기 작업 중 오류가 발생했습니다. ({e})")
+            raise e
+
     return wrapped
+
+
+@dataclass
+class Upstream:
+    """upstream별 커넥션 풀 / 타임아웃 설정 (`HTTP_<NAME>_TIMEOUT`, `HTTP_<NAME>_LIMIT_PER_HOST`로 변경 가능)"""
+    name: str
+    timeout: float
+    connect_timeout: float = 10
+    limit: int = 100
+    limit_per_host: int = 0
+    keepalive_timeout: float = 30
+    ttl_dns_cache: int = 300
+
+    def __post_init__(self):
+        prefix = f"HTTP_{self.name.upper()}"
+        self.timeout = float(os.environ.get(f"{prefix}_TIMEOUT", self.timeout))
+        self.limit_per_host = int(os.environ.get(f"{prefix}_LIMIT_PER_HOST", self.limit_per_host))
+
+
+UPSTREAMS = [
+    Upstream("default", timeout=600),
+    Upstream("embed", timeout=120, connect_timeout=5, limit_per_host=32),
+    Upstream("rerank", timeout=30, connect_timeout=5, limit_per_host=16),
+    Upstream("document_parser", timeout=600, limit_per_host=8),
+    Upstream("university", timeout=60, limit_per_host=8),
+]
+
+
+class SessionRegistry:
+    """upstream별로 하나의 `ClientSession`을 열어두고 재사용
+
+    `open()` 범위 안에서는 `resolve(name, session)`이 해당 upstream 세션을, 밖에서는 전달받은 세션을 반환합니다.
+    """
+
+    def __init__(self, upstreams: list[Upstream]):
+        self.upstreams = {upstream.name: upstream for upstream in upstreams}
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def is_open(self) -> bool:
+        try:
+            return self._loop is asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+
+    def _create_session(self, upstream: Upstream) -> aiohttp.ClientSession:
+        created = metrics.counter(f"http.{upstream.name}.connections_created")
+        reused = metrics.counter(f"http.{upstream.name}.connections_reused")
+        reuse_ratio = metrics.gauge(f"http.{upstream.name}.reuse_ratio")
+
+        def update_ratio():
+            total = created.snapshot() + reused.snapshot()
+            reuse_ratio.set(reused.snapshot() / total if total else 0.0)
+
+        async def on_connection_create_end(*_):
+            created.inc()
+            update_ratio()
+
+        async def on_connection_reuseconn(*_):
+            reused.inc()
+            update_ratio()
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+
+        connector = aiohttp.TCPConnector(
+            limit=upstream.limit,
+            limit_per_host=upstream.limit_per_host,
+            keepalive_timeout=upstream.keepalive_timeout,
+            ttl_dns_cache=upstream.ttl_dns_cache,
+            use_dns_cache=True,
+        )
+        timeout = aiohttp.ClientTimeout(total=upstream.timeout, connect=upstream.connect_timeout)
+        return aiohttp.ClientSession(connector=connector, timeout=timeout, trace_configs=[trace_config])
+
+    @asynccontextmanager
+    async def open(self):
+        """현재 이벤트 루프에서 세션을 열고, 범위를 벗어나면 모두 닫음"""
+        if self.is_open:
+            yield self
+            return
+
+        self._loop = asyncio.get_running_loop()
+        self._sessions = {name: self._create_session(upstream) for name, upstream in self.upstreams.items()}
+        try:
+            yield self
+
+        finally:
+            sessions, self._sessions, self._loop = self._sessions, {}, None
+            await asyncio.gather(*[session.close() for session in sessions.values()])
+
+    def get(self, name: str) -> aiohttp.ClientSession:
+        if not self.is_open:
+            raise RuntimeError("HTTP 세션이 열려있지 않습니다.")
+
+        return self._sessions.get(name) or self._sessions["default"]
+
+    def resolve(self, name: str, session: aiohttp.ClientSession) -> aiohttp.ClientSession:
+        return self.get(name) if self.is_open else session
+
+    def stats(self):
+        return metrics.snapshot("http.")
+
+
+sessions = SessionRegistry(UPSTREAMS)
@@ -0,0 +1,113 @@
+"""프로세스 내 간단한 메트릭 레지스트리 (counter / gauge / histogram)"""
+
+from bisect import bisect_left
+from threading import Lock
+from typing import Dict, List, Optional, Sequence
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Counter:
+
+    def __init__(self, name: str):
+        self.name = name
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+    def reset(self):
+        self.value = 0.0
+
+    def snapshot(self):
+        return self.value
+
+
+class Gauge:
+
+    def __init__(self, name: str):
+        self.name = name
+        self.value = 0.0
+
+    def set(self, value: float):
+        self.value = value
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.value -= amount
+
+    def snapshot(self):
+        return self.value
+
+
+class Histogram:
+
+    def __init__(self, name: str, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.buckets = tuple(sorted(buckets))
+        self.reset()
+
+    def reset(self):
+        self.counts: List[int] = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """버킷 상한값 기준 근사 분위수"""
+        if self.count == 0:
+            return 0.0
+
+        rank, acc = q * self.count, 0
+        for idx, count in enumerate(self.counts):
+            acc += count
+            if acc >= rank:
+                return min(self.buckets[idx], self.max) if idx < len(self.buckets) else self.max
+
+        return self.max
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "max": self.max,
+        }
+
+
+_REGISTRY: Dict[str, Counter | Gauge | Histogram] = {}
+_LOCK = Lock()
+
+
+def _get_or_create(name: str, factory):
+    metric = _REGISTRY.get(name)
+    if metric is None:
+        with _LOCK:
+            metric = _REGISTRY.setdefault(name, factory())
+    return metric
+
+
+def counter(name: str) -> Counter:
+    return _get_or_create(name, lambda: Counter(name))
+
+
+def gauge(name: str) -> Gauge:
+    return _get_or_create(name, lambda: Gauge(name))
+
+
+def histogram(name: str, buckets: Optional[Sequence[float]] = None) -> Histogram:
+    return _get_or_create(name, lambda: Histogram(name, buckets or DEFAULT_BUCKETS))
+
+
+def snapshot(prefix: str = ""):
+    return {name: metric.snapshot() for name, metric in sorted(_REGISTRY.items()) if name.startswith(prefix)}
@@ -0,0 +1,296 @@
+"""외부 호출 복원력 정책 (재시도 backoff, 마감 시간, hedging, circuit breaker)
+
+```python
+EMBED_POLICY = Policy("embed", attempts=5, base_delay=0.5, timeout=60, hedge_quantile=0.95, breaker="embed")
+
+@EMBED_POLICY
+async def _embed_async(...): ...
+
+with deadline(30):  # 이 범위 안의 모든 정책 호출은 남은 시간 안에서만 재시도/대기
+    await assistant.pipeline_async(...)
+```
+"""
+
+import asyncio
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+import logging
+import random
+import time
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+from config.logger import _logger
+from mixins import metrics
+from mixins.http_client import UpstreamStatusError
+
+logger = _logger(__name__)
+
+T = TypeVar("T")
+
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+_attempt_timeout: ContextVar[Optional[asyncio.Timeout]] = ContextVar("attempt_timeout", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+class CircuitOpenError(Exception):
+
+    def __init__(self, name: str):
+        super().__init__(f"[{name}] upstream 장애로 요청을 차단했습니다.")
+        self.name = name
+
+
+@contextmanager
+def deadline(seconds: float):
+    """현재 context의 마감 시간을 `seconds` 이내로 제한 (바깥 마감 시간이 더 이르면 유지)"""
+    at = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(at if current is None else min(current, at))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """남은 시간 (초), 마감 시간이 없으면 None"""
+    at = _deadline.get()
+    return None if at is None else at - time.monotonic()
+
+
+def attempt_timed_out() -> bool:
+    """현재 정책 시도의 제한 시간이 지났는지 (제한 시간 초과로 취소된 호출 안에서 `CancelledError`와 구분)"""
+    timeout = _attempt_timeout.get()
+    return timeout is not None and timeout.expired()
+
+
+class CircuitBreaker:
+    """연속 `failure_threshold`번 실패하면 `reset_timeout` 동안 요청을 바로 실패시키고,
+    이후 한 번의 시험 요청(half-open)이 성공하면 다시 연결합니다."""
+
+    CLOSED, HALF_OPEN, OPEN = 0, 1, 2
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+
+        self._state = metrics.gauge(f"circuit.{name}.state")
+        self._rejections = metrics.counter(f"circuit.{name}.rejections")
+
+    def _set_state(self, state: int):
+        if state != self.state:
+            level = logging.WARNING if state == self.OPEN else logging.INFO
+            logger(f"[{self.name}] circuit {('closed', 'half-open', 'open')[state]}", level=level)
+        self.state = state
+        self._state.set(state)
+
+    def allow(self) -> bool:
+        """요청 허용 여부 확인, 시험 요청(half-open)이면 True (끝나면 `record_*` 또는 `release_probe` 호출)"""
+        if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self._set_state(self.HALF_OPEN)
+
+        if self.state == self.OPEN or (self.state == self.HALF_OPEN and self._probing):
+            self._rejections.inc()
+            raise CircuitOpenError(self.name)
+
+        if self.state == self.HALF_OPEN:
+            self._probing = True
+            return True
+
+        return False
+
+    def release_probe(self):
+        """결과를 기록하지 못하고 끝난 시험 요청(취소, 마감 시간 초과 등) 정리, 다음 요청이 다시 시험"""
+        self._probing = False
+
+    def record_success(self):
+        self.failures = 0
+        self._probing = False
+        self._set_state(self.CLOSED)
+
+    def record_failure(self):
+        self.failures += 1
+        self._probing = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            self._set_state(self.OPEN)
+
+
+_BREAKERS: Dict[str, CircuitBreaker] = {}
+
+
+def circuit_breaker(name: str, **kwargs) -> CircuitBreaker:
+    breaker = _BREAKERS.get(name)
+    if breaker is None:
+        breaker = _BREAKERS.setdefault(name, CircuitBreaker(name, **kwargs))
+    return breaker
+
+
+def is_retryable(e: BaseException) -> bool:
+    """4xx(429 제외) 응답과 circuit 차단은 재시도하지 않음 (openai `APIStatusError`는 `status_code`로 판단)"""
+    if isinstance(e, CircuitOpenError):
+        return False
+    status = e.status if isinstance(e, UpstreamStatusError) else getattr(e, "status_code", None)
+    if isinstance(status, int):
+        return status == 429 or status >= 500
+    return True
+
+
+@dataclass
+class Policy:
+    """호출 지점별 재시도 정책
+
+    Args:
+        name: 메트릭 / 로그 이름
+        attempts: 최대 시도 횟수
+        base_delay, max_delay, multiplier: 재시도 간격 `min(max_delay, base_delay * multiplier ** n)`
+        jitter: True면 간격을 `[0, delay]`에서 무작위로 선택 (full jitter)
+        timeout: 시도당 제한 시간 (초)
+        hedge_quantile: 응답이 최근 지연 시간의 이 분위수보다 늦으면 같은 요청을 한 번 더 보내고 먼저 온 응답 사용
+        breaker: circuit breaker 이름 (None이면 사용 안 함)
+        is_success: 결과 검증 함수 (False면 실패로 보고 재시도)
+        retry_on: 예외별 재시도 여부
+    """
+    name: str
+    attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 10.0
+    multiplier: float = 2.0
+    jitter: bool = True
+    timeout: Optional[float] = None
+    hedge_quantile: Optional[float] = None
+    hedge_min_samples: int = 20
+    breaker: Optional[str] = None
+    is_success: Callable[[Any], bool] = lambda _: True
+    retry_on: Callable[[BaseException], bool] = is_retryable
+    _latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=200), repr=False)
+
+    def __post_init__(self):
+        self._retries = metrics.counter(f"policy.{self.name}.retries")
+        self._hedges = metrics.counter(f"policy.{self.name}.hedges")
+        self._failures = metrics.counter(f"policy.{self.name}.failures")
+        self._latency = metrics.histogram(f"policy.{self.name}.latency_seconds")
+
+    def __call__(self, func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+
+        @wraps(func)
+        async def wrapped(*args, **kwargs):
+            return await self.call(func, *args, **kwargs)
+
+        return wrapped
+
+    def backoff(self, attempt: int) -> float:
+        delay = min(self.max_delay, self.base_delay * self.multiplier**attempt)
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def _hedge_after(self) -> Optional[float]:
+        if self.hedge_quantile is None or len(self._latencies) < self.hedge_min_samples:
+            return None
+        latencies = sorted(self._latencies)
+        return latencies[min(len(latencies) - 1, int(self.hedge_quantile * len(latencies)))]
+
+    async def _attempt(self, func: Callable[..., Awaitable[T]], args, kwargs) -> T:
+        timeout = self.timeout
+        left = remaining()
+        if left is not None:
+            if left <= 0:
+                raise DeadlineExceeded(f"[{self.name}] 마감 시간이 지났습니다.")
+            timeout = left if timeout is None else min(timeout, left)
+
+        async with asyncio.timeout(timeout) as cm:
+            token = _attempt_timeout.set(cm)
+            try:
+                hedge_after = self._hedge_after()
+                if hedge_after is None:
+                    return await func(*args, **kwargs)
+
+                return await self._hedged(func, args, kwargs, hedge_after)
+            finally:
+                _attempt_timeout.reset(token)
+
+    async def _hedged(self, func: Callable[..., Awaitable[T]], args, kwargs, hedge_after: float) -> T:
+        pending = {asyncio.ensure_future(func(*args, **kwargs))}
+        error: Optional[BaseException] = None
+        try:
+            done, pending = await asyncio.wait(pending, timeout=hedge_after)
+            if not done:
+                self._hedges.inc()
+                pending.add(asyncio.ensure_future(func(*args, **kwargs)))
+
+            while True:
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+
+                if not pending:
+                    assert error is not None
+                    raise error
+
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def call(self, func: Callable[..., Awaitable[T]], *args, **kwargs) -> T:
+        breaker = circuit_breaker(self.breaker) if self.breaker else None
+        error: Optional[BaseException] = None
+
+        for attempt in range(self.attempts):
+            probe = breaker.allow() if breaker else False
+
+            st = time.monotonic()
+            try:
+                result = await self._attempt(func, args, kwargs)
+
+            except DeadlineExceeded:
+                raise
+
+            except Exception as e:
+                error = e
+                self._failures.inc()
+                # upstream 장애(5xx / 429 / 타임아웃 / 연결 오류)만 기록, 요청 오류(4xx)로는 circuit을 열지 않음
+                if breaker and is_retryable(e):
+                    breaker.record_failure()
+                if not self.retry_on(e):
+                    raise
+
+                logger(f"[{self.name}] 요청을 재시도 합니다: {e!r}", level=logging.WARNING)
+
+            else:
+                latency = time.monotonic() - st
+                self._latencies.append(latency)
+                self._latency.observe(latency)
+                if breaker:
+                    breaker.record_success()
+                if self.is_success(result):
+                    return result
+
+            finally:
+                # 취소 / 마감 시간 초과로 결과를 기록하지 못해도 half-open 시험 요청을 해제
+                if probe:
+                    breaker.release_probe()
+
+            if attempt + 1 == self.attempts:
+                break
+
+            self._retries.inc()
+            delay = self.backoff(attempt)
+            left = remaining()
+            if left is not None and left <= delay:
+                raise DeadlineExceeded(f"[{self.name}] 마감 시간 안에 재시도할 수 없습니다.") from error
+            await asyncio.sleep(delay)
+
+        raise TimeoutError(f'{self.attempts}번의 재시도에 실패했습니다.') from error
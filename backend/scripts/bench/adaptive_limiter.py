@@ -0,0 +1,117 @@
+"""고정 동시 요청 수 vs AIMD(`AdaptiveLimiter`) goodput 벤치마크
+
+로컬 임베딩 서버를 별도 프로세스에서 처리 용량(`max_concurrency`)과 대기열 상한(`max_queue`, 초과 시 429),
+무작위 503 응답으로 과부하 상황처럼 띄운 뒤, 다수의 호출자가 `duration`초 동안 `HTTPEmbeddingBackend.embed`(재시도 포함)를
+반복 호출합니다.
+성공한 텍스트 수 / 초(goodput), 호출 지연, 서버가 거절한 요청 수를 비교합니다.
+
+Usage:
+    poetry run python3 scripts/bench/adaptive_limiter.py
+        -c, --callers: 동시 호출자 수 (default: 128)
+        -d, --duration: 모드별 측정 시간 (초, default: 10)
+        -l, --limit: 고정 동시 요청 수 / AIMD 최대값 (default: 32)
+        -t, --latency-target: AIMD 목표 지연 (ms, default: 200)
+        -r, --retry-delay: 재시도 간격 (초, default: 1)
+"""
+
+import argparse
+import asyncio
+import statistics
+import subprocess
+import sys
+import time
+
+import aiohttp
+
+from mixins import asyncio as asyncio_mixin
+from mixins.asyncio import AdaptiveLimiter, Limiter, retry_async
+from services.base.embedding_backend import HTTPEmbeddingBackend
+
+PORT = 8093
+BASE_URL = f"http://127.0.0.1:{PORT}"
+
+
+async def run(callers: int, duration: float, retry_delay: float, session: aiohttp.ClientSession):
+    backend = HTTPEmbeddingBackend(BASE_URL, BASE_URL)
+    embed = retry_async(delay=retry_delay)(HTTPEmbeddingBackend.embed.__wrapped__)
+    latencies, texts = [], 0
+    deadline = time.perf_counter() + duration
+
+    async def caller(idx: int):
+        nonlocal texts
+        seq = 0
+        while time.perf_counter() < deadline:
+            st = time.perf_counter()
+            batch = [f"텍스트 {idx}-{seq}-{i}" for i in range(4)]
+            try:
+                await embed(backend, batch, session=session, chunking=False, html=False)
+            except TimeoutError:
+                continue
+
+            if time.perf_counter() <= deadline:
+                latencies.append(time.perf_counter() - st)
+                texts += len(batch)
+            seq += 1
+
+    await asyncio.gather(*[caller(idx) for idx in range(callers)])
+    return texts / duration, latencies
+
+
+async def main(callers: int, duration: float, limit: int, latency_target: float, retry_delay: float):
+    server = subprocess.Popen(
+        [
+            sys.executable, "scripts/bench/embed_server.py", "-p", str(PORT), "-l", "40", "-il", "2.5", "-mc", "4",
+            "-mq", "8", "-fr", "0.01"
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    try:
+        await asyncio.sleep(2)
+        print(f"{'mode':>8} | {'goodput(texts/s)':>16} | {'p50(ms)':>8} | {'p95(ms)':>8} | {'429':>6} | "
+              f"{'503':>5} | {'limit':>5}")
+
+        connector = aiohttp.TCPConnector(limit=0)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            modes = {
+                "fixed": Limiter("bench.fixed", limit),
+                "aimd": AdaptiveLimiter("bench.aimd", limit, latency_target),
+            }
+            for mode, _limiter in modes.items():
+                asyncio_mixin._LIMITERS["embed"] = _limiter
+                await session.post(f"{BASE_URL}/stats/reset")
+
+                goodput, latencies = await run(callers, duration, retry_delay, session)
+                async with session.get(f"{BASE_URL}/stats") as res:
+                    stats = await res.json()
+
+                quantiles = statistics.quantiles(latencies, n=20) if len(latencies) > 1 else [0.0] * 19
+                final_limit = int(_limiter.current) if isinstance(_limiter, AdaptiveLimiter) else limit
+
+                print(f"{mode:>8} | {goodput:>16.1f} | {quantiles[9] * 1000:>8.0f} | {quantiles[18] * 1000:>8.0f} | "
+                      f"{stats['rejected']:>6} | {stats['failed']:>5} | {final_limit:>5}")
+
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-c", "--callers", dest="callers", default="128")
+    parser.add_argument("-d", "--duration", dest="duration", default="10")
+    parser.add_argument("-l", "--limit", dest="limit", default="32")
+    parser.add_argument("-t", "--latency-target", dest="latency_target", default="200")
+    parser.add_argument("-r", "--retry-delay", dest="retry_delay", default="1")
+    args = parser.parse_args()
+
+    asyncio.run(
+        main(
+            int(args.callers),
+            float(args.duration),
+            int(args.limit),
+            float(args.latency_target) / 1000,
+            float(args.retry_delay),
+        )
+    )
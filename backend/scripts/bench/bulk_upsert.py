@@ -0,0 +1,128 @@
+"""크롤링 저장 방식(`DB_INGEST_MODE`)별 처리량 벤치마크
+
+`DB_*` 환경 변수의 Postgres(pgvector 설치 필요)에 임시 스키마를 만들고 학교 공지사항 테이블만 생성한 뒤,
+임의의 1024차원 벡터를 가진 게시글 / 첨부파일 / 청크를 배치 단위로 저장하며 초당 저장 행 수를 측정합니다.
+측정이 끝나면 스키마를 삭제합니다.
+
+- orm: 기존 url 삭제 후 `create_all` (add_all + flush)
+- copy (insert): 새 url을 `upsert_bulk`로 저장
+- copy (upsert): 같은 url을 다시 `upsert_bulk`로 저장 (ON CONFLICT + 기존 첨부파일 / 청크 교체)
+
+Usage:
+    poetry run python3 scripts/bench/bulk_upsert.py
+        -n, --notices: 게시글 수 (default: 2000)
+        -c, --chunks: 게시글당 첨부파일 페이지 청크 수 (default: 8)
+        -b, --batch-size: 배치당 게시글 수 (default: 50)
+"""
+
+import argparse
+import time
+from typing import List
+
+import numpy as np
+from pgvector.sqlalchemy import SparseVector
+from sqlalchemy import event, text
+from sqlalchemy.orm import sessionmaker
+
+from db.common import N_DIM, V_DIM, get_engine, session_context_var
+from db.models.notice import PNUNoticeAttachmentModel, PNUNoticeChunkModel, PNUNoticeModel
+from db.repositories.base import transaction
+from db.repositories.notice import PNUNoticeRepository
+
+SCHEMA = "bench_bulk_upsert"
+
+
+def notice(rng: np.random.Generator, idx: int, chunks: int) -> PNUNoticeModel:
+
+    def chunk(content: str) -> PNUNoticeChunkModel:
+        return PNUNoticeChunkModel(
+            chunk_content=content,
+            content_hash=content,
+            chunk_vector=rng.random(N_DIM, dtype=np.float32),
+            chunk_sparse_vector=SparseVector({int(key): 0.5 for key in rng.integers(0, V_DIM, 32)}, V_DIM),
+        )
+
+    pages = [chunk(f"{idx}번 첨부파일 {page}쪽 " * 40) for page in range(chunks)]
+    return PNUNoticeModel(
+        url=f"https://www.pusan.ac.kr/kor/CMS/Board/Board.do?mode=view&board_seq={idx}",
+        title=f"{idx}번 공지 장학금 신청 안내",
+        content=f"{idx}번 공지 본문입니다. " * 40,
+        date="2025-03-02",
+        author="학생과",
+        is_important=False,
+        content_hash=str(idx),
+        title_vector=rng.random(N_DIM, dtype=np.float32),
+        title_sparse_vector=SparseVector({int(key): 1.0 for key in rng.integers(0, V_DIM, 16)}, V_DIM),
+        attachments=[PNUNoticeAttachmentModel(name=f"안내문{idx}.pdf", url=f"https://file/{idx}", content_chunks=pages)],
+        content_chunks=[chunk(f"{idx}번 공지 본문입니다. " * 40), *pages],
+    )
+
+
+def measure(name: str, batches: List[List[PNUNoticeModel]], save) -> float:
+    rows = sum(1 + len(obj.attachments) + len(obj.content_chunks) for batch in batches for obj in batch)
+    st = time.perf_counter()
+    for batch in batches:
+        with transaction():
+            save(batch)
+    elapsed = time.perf_counter() - st
+
+    print(f"{name:<16} {elapsed:>8.2f}s {rows / elapsed:>10.0f} rows/s")
+    return elapsed
+
+
+def main(n: int, chunks: int, batch_size: int):
+    engine = get_engine()
+    with engine.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+
+    @event.listens_for(engine, "connect")
+    def set_search_path(dbapi_connection, _):
+        with dbapi_connection.cursor() as cursor:
+            cursor.execute(f"SET search_path TO {SCHEMA}, public")
+
+    engine.dispose()
+    tables = [PNUNoticeModel.__table__, PNUNoticeAttachmentModel.__table__, PNUNoticeChunkModel.__table__]
+    tables[0].metadata.create_all(engine, tables=tables)
+
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    session_context_var.set(session)
+    repo = PNUNoticeRepository()
+
+    def batches(offset: int) -> List[List[PNUNoticeModel]]:
+        rng = np.random.default_rng(offset)
+        objects = [notice(rng, offset + idx, chunks) for idx in range(n)]
+        return [objects[st:st + batch_size] for st in range(0, n, batch_size)]
+
+    print(f"{n} notices x {chunks + 1} chunks, batch {batch_size}")
+    try:
+
+        def orm_save(batch):
+            repo.delete_all(urls=[obj.url for obj in batch])
+            repo.create_all(batch)
+
+        orm = measure("orm", batches(0), orm_save)
+        session.expunge_all()
+
+        insert = measure("copy (insert)", batches(n), repo.upsert_bulk)
+        upsert = measure("copy (upsert)", batches(n), repo.upsert_bulk)
+
+        counts = session.execute(text("SELECT count(*) FROM pnu_notice_content_chunks")).scalar()
+        assert counts == n * 2 * (chunks + 1), counts
+        print(f"speedup: insert x{orm / insert:.1f}, upsert x{orm / upsert:.1f}")
+
+    finally:
+        session.close()
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--notices", dest="notices", default="2000")
+    parser.add_argument("-c", "--chunks", dest="chunks", default="8")
+    parser.add_argument("-b", "--batch-size", dest="batch_size", default="50")
+    args = parser.parse_args()
+
+    main(int(args.notices), int(args.chunks), int(args.batch_size))
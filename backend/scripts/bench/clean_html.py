@@ -0,0 +1,85 @@
+"""`preprocess.clean_html`(한 번의 순회) vs `clean_html_fixpoint`(기존 반복 구현) 문서 크기 / 깊이별 벤치마크
+
+첨부파일(HWP) 변환 결과처럼 서식 태그가 깊게 중첩된 문단을 `paragraphs`개 가진 문서를 만들고, 문서 크기를 두 배씩 늘리며
+두 구현의 실행 시간(파싱 제외)을 비교합니다. 기존 구현은 중첩이 한 단계 풀릴 때마다 문서 전체를 다시 순회하므로 깊이에 비례해 느려집니다.
+
+Usage:
+    poetry run python3 scripts/bench/clean_html.py
+        -p, --paragraphs: 가장 작은 문서의 문단 수 (default: 100)
+        -st, --steps: 문서 크기를 두 배씩 늘릴 횟수 (default: 5)
+        -dp, --depths: 문단 중첩 깊이 목록 (default: 2,6,12)
+"""
+
+import argparse
+import time
+
+from bs4 import BeautifulSoup
+
+from services.base.crawler.preprocess import clean_html
+
+from scripts.test import clean_html as reference
+from scripts.test.clean_html import clean_html_fixpoint
+
+
+def hwp_paragraph(idx: int, depth: int) -> str:
+    inner = (f"<span style='font-size:10pt'> {idx}. 학사 일정 </span><br/>"
+             f"<span class='hwp'>수강 신청</span><span>&nbsp;</span><u><b>기간 {idx}</b></u>")
+    for level in range(depth):
+        tag = ("span", "b", "u", "p")[level % 4]
+        inner = f"<{tag} class='hwp_{level}' style='line-height:160%'>{inner}<span> </span></{tag}>"
+    return f"<div class='hwp_p'><table><tr><td colspan='2'>{inner}</td></tr></table><p><br/></p></div>"
+
+
+def hwp_document(paragraphs: int, depth: int) -> str:
+    return "<div class='hwp_body'>" + "".join(hwp_paragraph(idx, depth) for idx in range(paragraphs)) + "</div>"
+
+
+def measure(func, html: str) -> float:
+    soup = BeautifulSoup(html, "html.parser")
+    st = time.perf_counter()
+    func(soup)
+    return time.perf_counter() - st
+
+
+def count_passes(html: str) -> int:
+    passes, clean_tag = 0, reference.clean_html_tag
+
+    def counting(soup, element):
+        nonlocal passes
+        if element is first:
+            passes += 1
+        return clean_tag(soup, element)
+
+    soup = BeautifulSoup(html, "html.parser")
+    first = soup.contents[0]
+    reference.clean_html_tag = counting
+    try:
+        clean_html_fixpoint(soup)
+    finally:
+        reference.clean_html_tag = clean_tag
+    return passes
+
+
+def main(paragraphs: int, steps: int, depths: list[int]):
+    print(f"{'depth':>5} | {'paragraphs':>10} | {'size(KB)':>8} | {'passes':>6} | {'fixpoint(ms)':>12} | "
+          f"{'single(ms)':>10} | {'speedup':>7}")
+    for depth in depths:
+        for step in range(steps):
+            count = paragraphs * 2**step
+            html = hwp_document(count, depth)
+            assert str(clean_html_fixpoint(html)) == str(clean_html(html))
+
+            fixpoint = measure(clean_html_fixpoint, html)
+            single = measure(clean_html, html)
+            print(f"{depth:>5} | {count:>10} | {len(html) / 1024:>8.0f} | {count_passes(html):>6} | "
+                  f"{fixpoint * 1000:>12.0f} | {single * 1000:>10.0f} | {fixpoint / single:>6.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-p", "--paragraphs", dest="paragraphs", default="100")
+    parser.add_argument("-st", "--steps", dest="steps", default="5")
+    parser.add_argument("-dp", "--depths", dest="depths", default="2,6,12")
+    args = parser.parse_args()
+
+    main(int(args.paragraphs), int(args.steps), [int(depth) for depth in args.depths.split(",")])
@@ -0,0 +1,66 @@
+"""`embed_async` 요청 묶음 처리(coalescer) 벤치마크
+
+로컬 임베딩 서버(`scripts/bench/embed_server.py`)를 띄운 뒤 동시 호출자 수(1/10/100)별 처리량을
+coalescer 비활성화/활성화 상태로 비교합니다.
+
+Usage:
+    poetry run python3 scripts/bench/coalescer.py
+        -n, --requests: 호출자당 요청 수 (default: 20)
+        -c, --concurrency: 동시 호출자 수 목록 (default: 1,10,100)
+        -w, --window: coalescer 대기 시간 (ms, default: 5)
+"""
+
+import argparse
+import asyncio
+import time
+
+import aiohttp
+
+from services.base import embedder
+from services.base.embedding_backend import HTTPEmbeddingBackend
+from services.base.standin import serve
+
+
+async def run_callers(concurrency: int, requests: int, session: aiohttp.ClientSession):
+
+    async def caller(idx: int):
+        for seq in range(requests):
+            await embedder.embed_async(f"질문 {idx}-{seq}", session=session, chunking=False, html=False)
+
+    st = time.perf_counter()
+    await asyncio.gather(*[caller(idx) for idx in range(concurrency)])
+    return time.perf_counter() - st
+
+
+async def main(requests: int, concurrencies: list[int], window: float):
+    async with serve(port=8091) as (base_url, app):
+        embedder.backend = HTTPEmbeddingBackend(base_url, base_url)
+        stats = app["stats"]
+
+        print(f"{'callers':>8} | {'mode':>9} | {'req/s':>9} | {'server calls':>12} | {'mean batch':>10} | {'p95 wait(ms)':>12}")
+        async with aiohttp.ClientSession() as session:
+            for concurrency in concurrencies:
+                for mode, _window in (("direct", 0.0), ("coalesced", window)):
+                    embedder.embed_coalescer.window = _window
+                    embedder.embed_coalescer.reset_stats()
+                    stats.embed_requests = 0
+
+                    elapsed = await run_callers(concurrency, requests, session)
+                    total = concurrency * requests
+                    coalescer_stats = embedder.embed_coalescer.stats()
+
+                    print(
+                        f"{concurrency:>8} | {mode:>9} | {total / elapsed:>9.1f} | {stats.embed_requests:>12} | "
+                        f"{coalescer_stats['batch_size']['mean']:>10.2f} | "
+                        f"{coalescer_stats['queue_wait_seconds']['p95'] * 1000:>12.2f}"
+                    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--requests", dest="requests", default="20")
+    parser.add_argument("-c", "--concurrency", dest="concurrency", default="1,10,100")
+    parser.add_argument("-w", "--window", dest="window", default="5")
+    args = parser.parse_args()
+
+    asyncio.run(main(int(args.requests), [int(c) for c in args.concurrency.split(",")], float(args.window) / 1000))
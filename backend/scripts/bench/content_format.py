@@ -0,0 +1,85 @@
+"""본문 저장 형식(`CONTENT_FORMAT`)별 크기 / 토큰 수 비교
+
+`scripts/test/corpus`의 상세 페이지를 각 crawler로 파싱한 본문과, 첨부파일(HWP) 변환 결과처럼 중첩된 문서
+(`scripts/bench/clean_html.py`)를 `html`(prettify) / `markdown` 형식으로 렌더링하여 바이트 수와 토큰 수를 비교합니다.
+토큰 수는 임베딩 packing과 같은 tiktoken 인코딩(`EMBED_PACK_ENCODING`)으로 계산하며, 인코딩을 불러올 수 없으면 생략합니다.
+
+Usage:
+    poetry run python3 scripts/bench/content_format.py
+        -c, --corpus: corpus 경로 (default: scripts/test/corpus)
+        -a, --attachments: 첨부파일 문서 수 (default: 5)
+"""
+
+import argparse
+from functools import partial
+from typing import Callable, List, Optional
+
+from scripts.bench.clean_html import hwp_document
+from scripts.test.html_parser import CORPUS, iter_pages
+from services.base.crawler import render
+from services.base.crawler.scrape import parse_html
+from services.base.embedder import count_tokens
+
+
+def contents(result) -> List[str]:
+    if not isinstance(result, dict):
+        return []
+
+    content = result.get("info", {}).get("content", [])
+    return content if isinstance(content, list) else [content]
+
+
+def load_counter() -> Optional[Callable[[str], int]]:
+    try:
+        count_tokens("")
+        return count_tokens
+    except Exception as e:
+        print(f"토큰 수를 계산할 수 없어 바이트 수만 비교합니다: {type(e).__name__}")
+        return None
+
+
+def render_page(func: Callable, html: str, content_format: render.ContentFormat) -> List[str]:
+    """crawler 상세 페이지 파싱 함수는 `render.CONTENT_FORMAT`을 따름 (본문이 없는 페이지는 제외)"""
+    render.CONTENT_FORMAT = content_format
+    try:
+        return contents(func(parse_html(html, "html5lib")))
+    except Exception:
+        return []
+
+
+def render_attachment(html: str, content_format: render.ContentFormat) -> List[str]:
+    return [render.render_content(html, content_format)]
+
+
+def main(corpus: str, attachments: int):
+    counter = load_counter()
+    documents = [(f"{page} {name}", partial(render_page, func), html)
+                 for page, name, func, html in iter_pages(corpus) if "detail" in page]
+    documents += [(f"attachment#{idx} (hwp)", render_attachment, hwp_document(20 * (idx + 1), 6))
+                  for idx in range(attachments)]
+
+    print(f"{'document':<48} | {'html(B)':>8} | {'md(B)':>7} | {'html(tok)':>9} | {'md(tok)':>7} | {'ratio':>5}")
+    totals = [0, 0, 0, 0]
+    for name, func, html in documents:
+        html_texts, md_texts = func(html, "html"), func(html, "markdown")
+        if not any(html_texts):
+            continue
+
+        sizes = [sum(len(text.encode("utf-8")) for text in texts) for texts in (html_texts, md_texts)]
+        tokens = [sum(counter(text) for text in texts) for texts in (html_texts, md_texts)] if counter else [0, 0]
+        totals = [total + value for total, value in zip(totals, [*sizes, *tokens])]
+
+        ratio = (tokens[0] / tokens[1] if counter else sizes[0] / sizes[1]) if sizes[1] else 0.0
+        print(f"{name:<48} | {sizes[0]:>8} | {sizes[1]:>7} | {tokens[0]:>9} | {tokens[1]:>7} | {ratio:>4.1f}x")
+
+    ratio = (totals[2] / totals[3] if counter else totals[0] / totals[1]) if totals[1] else 0.0
+    print(f"{'total':<48} | {totals[0]:>8} | {totals[1]:>7} | {totals[2]:>9} | {totals[3]:>7} | {ratio:>4.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-c", "--corpus", dest="corpus", default=CORPUS)
+    parser.add_argument("-a", "--attachments", dest="attachments", default="5")
+    args = parser.parse_args()
+
+    main(args.corpus, int(args.attachments))
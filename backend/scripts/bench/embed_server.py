@@ -0,0 +1,36 @@
+"""벤치마크용 로컬 임베딩/리랭크 서버 (`services.base.standin`)
+
+Usage:
+    poetry run python3 scripts/bench/embed_server.py
+        -p, --port: 포트 (default: 8090)
+        -l, --latency: 요청당 지연 (ms, default: 20)
+        -il, --per-item-latency: 텍스트당 지연 (ms, default: 0.5)
+        -mc, --max-concurrency: 동시 처리 요청 수 (default: 4)
+        -mq, --max-queue: 최대 대기 요청 수, 0이면 무제한 (default: 0)
+        -fr, --failure-rate: 503 응답 확률 (default: 0)
+"""
+
+import argparse
+
+from aiohttp import web
+
+from services.base.standin import create_app
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-p", "--port", dest="port", default="8090")
+    parser.add_argument("-l", "--latency", dest="latency", default="20")
+    parser.add_argument("-il", "--per-item-latency", dest="per_item_latency", default="0.5")
+    parser.add_argument("-mc", "--max-concurrency", dest="max_concurrency", default="4")
+    parser.add_argument("-mq", "--max-queue", dest="max_queue", default="0")
+    parser.add_argument("-fr", "--failure-rate", dest="failure_rate", default="0")
+    args = parser.parse_args()
+
+    app = create_app(
+        latency=float(args.latency) / 1000,
+        per_item_latency=float(args.per_item_latency) / 1000,
+        max_concurrency=int(args.max_concurrency),
+        max_queue=int(args.max_queue),
+        failure_rate=float(args.failure_rate),
+    )
+    web.run_app(app, port=int(args.port))
@@ -0,0 +1,124 @@
+"""임베딩 응답 형식(`EMBED_ENCODING`)별 디코딩 처리량 / 최대 메모리 벤치마크
+
+로컬 임베딩 서버(`scripts/bench/embed_server.py`)를 별도 프로세스로 띄운 뒤,
+형식(json / base64 / binary) x dense 타입(float32 / float16)마다 새 프로세스에서
+`embed_async` 결과를 모두 메모리에 유지한 채 처리량과 최대 RSS를 측정합니다.
+
+Usage:
+    poetry run python3 scripts/bench/embed_transport.py
+        -n, --texts: 임베딩할 텍스트 수 (default: 5000)
+        -b, --batch-size: 요청당 텍스트 수 (default: 32)
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+import aiohttp
+
+PORT = 8092
+MODES = [("json", "float32"), ("base64", "float32"), ("base64", "float16"), ("binary", "float32"),
+         ("binary", "float16")]
+
+
+def max_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def worker(texts: int, batch_size: int):
+    """환경 변수로 형식이 지정된 상태에서 실행되는 측정 프로세스"""
+    from services.base import embedder, vector_codec
+    from services.base.embedding_backend import load_embedding_backend
+
+    backend = embedder.backend = load_embedding_backend()
+    backend.embed_url = f"http://127.0.0.1:{PORT}"
+    batches = [[f"텍스트 {idx}" for idx in range(st, min(st + batch_size, texts))] for st in range(0, texts, batch_size)]
+
+    async with aiohttp.ClientSession() as session:
+        # 응답 본문만 따로 받아 순수 디코딩 시간 측정
+        body = {"inputs": batches[0], "chunking": False, "truncate": True, "html": False}
+        if backend.encoding != "json":
+            body.update(encoding=backend.encoding, dtype=backend.dtype)
+        async with session.post(f"{backend.embed_url}/embed", json=body) as res:
+            payload = await res.read()
+
+        decode = {
+            "json": json.loads,
+            "base64": lambda buf: vector_codec.decode_base64(json.loads(buf), dtype=backend.dtype),
+            "binary": vector_codec.decode_binary,
+        }[backend.encoding]
+
+        repeat = 200
+        st = time.perf_counter()
+        for _ in range(repeat):
+            decode(payload)
+        decode_elapsed = time.perf_counter() - st
+
+        rss_before = max_rss_mb()
+        st = time.perf_counter()
+        results = []
+        for batch in batches:
+            results += await embedder.embed_async(batch, session=session, chunking=False, html=False)
+        elapsed = time.perf_counter() - st
+
+    print(
+        json.dumps({
+            "payload_kb": len(payload) / len(batches[0]) / 1024,
+            "decode_per_sec": repeat * len(batches[0]) / decode_elapsed,
+            "end_to_end_per_sec": len(results) / elapsed,
+            "rss_mb": max_rss_mb(),
+            "rss_growth_mb": max_rss_mb() - rss_before,
+        })
+    )
+
+
+def main(texts: int, batch_size: int):
+    server = subprocess.Popen(
+        [sys.executable, "scripts/bench/embed_server.py", "-p", str(PORT), "-l", "0", "-il", "0", "-mc", "8"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        time.sleep(2)
+        print(f"{'encoding':>8} | {'dtype':>7} | {'KB/vec':>6} | {'decode/s':>9} | {'e2e/s':>7} | "
+              f"{'peak RSS(MB)':>12} | {'RSS growth(MB)':>14}")
+
+        for encoding, dtype in MODES:
+            env = {
+                **os.environ,
+                "EMBED_ENCODING": encoding,
+                "EMBED_DTYPE": dtype,
+                "EMBED_COALESCE_WINDOW_MS": "0",
+                "EMBED_CACHE_PATH": "",
+            }
+            out = subprocess.run(
+                [sys.executable, __file__, "--worker", "-n", str(texts), "-b", str(batch_size)],
+                env=env,
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            res = json.loads(out.stdout.strip().splitlines()[-1])
+            print(f"{encoding:>8} | {dtype:>7} | {res['payload_kb']:>6.1f} | {res['decode_per_sec']:>9.0f} | "
+                  f"{res['end_to_end_per_sec']:>7.0f} | {res['rss_mb']:>12.1f} | {res['rss_growth_mb']:>14.1f}")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--texts", dest="texts", default="5000")
+    parser.add_argument("-b", "--batch-size", dest="batch_size", default="32")
+    parser.add_argument("--worker", dest="worker", action="store_true")
+    args = parser.parse_args()
+
+    if args.worker:
+        asyncio.run(worker(int(args.texts), int(args.batch_size)))
+    else:
+        main(int(args.texts), int(args.batch_size))
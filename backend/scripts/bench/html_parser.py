@@ -0,0 +1,79 @@
+"""HTML 파서 backend(`HTML_PARSER`)별 페이지 처리량 벤치마크
+
+`scripts/test/corpus` 페이지마다 backend별로 파싱 + crawler 파싱 함수 실행을 반복하여 pages/s를 측정합니다.
+목록 페이지는 `rows`개의 행을 가지도록 일반 게시글 행을 복제하여 `row=500` 요청 결과와 비슷한 크기로 만듭니다.
+
+Usage:
+    poetry run python3 scripts/bench/html_parser.py
+        -p, --parsers: 측정할 파서 목록 (default: 설치된 모든 파서)
+        -rw, --rows: 목록 페이지 행 수 (default: 500)
+        -d, --duration: 페이지 / 파서별 측정 시간 (초, default: 1)
+"""
+
+import argparse
+import copy
+import time
+from typing import List
+
+from bs4 import BeautifulSoup
+
+from services.base.crawler.scrape import parse_html
+from scripts.test.html_parser import CORPUS, available_parsers, iter_pages
+
+
+def expand_rows(html: str, rows: int) -> str:
+    """게시글 링크가 있는 마지막 `tr`(고정 공지 다음의 일반 게시글)을 복제하여 표의 행 수를 `rows`로 맞춤"""
+    soup = BeautifulSoup(html, "html5lib")
+    row = next((tr for tr in reversed(soup.select("tr")) if tr.select_one("a[href]")), None)
+    if row is None:
+        return html
+
+    for _ in range(rows - len(row.parent.select(":scope > tr"))):
+        row.insert_after(copy.copy(row))
+
+    return str(soup)
+
+
+def measure(func, html: str, parser: str, duration: float) -> float:
+    pages, st = 0, time.perf_counter()
+    while time.perf_counter() - st < duration:
+        try:
+            func(parse_html(html, parser))  # type: ignore
+        except Exception:
+            pass
+        pages += 1
+
+    return pages / (time.perf_counter() - st)
+
+
+def main(parsers: List[str], rows: int, duration: float):
+    print(f"{'page':>26} | {'check':>34} | {'KB':>6} | " + " | ".join(f"{parser + '/s':>11}" for parser in parsers))
+
+    totals = {parser: 0.0 for parser in parsers}
+    for page, name, func, html in iter_pages(CORPUS):
+        if page.split("/")[-1].startswith("list"):
+            html = expand_rows(html, rows)
+
+        results = {parser: measure(func, html, parser, duration) for parser in parsers}
+        for parser, pages_per_sec in results.items():
+            totals[parser] += 1 / pages_per_sec
+
+        print(f"{page:>26} | {name:>34} | {len(html.encode()) / 1024:>6.0f} | " +
+              " | ".join(f"{results[parser]:>11.1f}" for parser in parsers))
+
+    baseline = totals["html5lib"] if "html5lib" in totals else None
+    print("\n" + " | ".join(
+        f"{parser}: {total:.3f}s/corpus" + (f" (x{baseline / total:.1f})" if baseline else "")
+        for parser, total in totals.items()
+    ))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-p", "--parsers", dest="parsers", default=None)
+    parser.add_argument("-rw", "--rows", dest="rows", default="500")
+    parser.add_argument("-d", "--duration", dest="duration", default="1")
+    args = parser.parse_args()
+
+    parsers = args.parsers.split(",") if args.parsers else available_parsers()
+    main(parsers, int(args.rows), float(args.duration))
@@ -0,0 +1,80 @@
+"""목록 페이지 전체 파싱 vs `list_strainer` 부분 파싱 / 선택자 미리 컴파일 벤치마크
+
+`scripts/test/corpus`의 목록 페이지를 `rows`개 행으로 늘린 뒤(`row=500` 요청 결과 크기), crawler 목록 파싱 함수마다
+다음 방식의 파싱 + 행 추출 시간을 비교합니다.
+
+- `full`: 전체 페이지를 `HTML_PARSER`(html5lib)로 파싱
+- `strainer`: crawler의 `list_strainer`에 해당하는 요소만 트리로 생성 (lxml)
+
+행 선택자는 문자열(soupsieve 캐시 조회 포함)과 미리 컴파일한 선택자로 각각 측정합니다.
+
+Usage:
+    poetry run python3 scripts/bench/list_parse.py
+        -rw, --rows: 목록 페이지 행 수 (default: 500)
+        -n, --repeat: 측정 반복 횟수 (default: 5)
+"""
+
+import argparse
+import time
+
+from scripts.bench.html_parser import expand_rows
+from scripts.test.html_parser import CHECKS, CORPUS, STRAINERS
+from services.base.crawler.scrape import parse_html
+from services.notice.crawler import default, me, pnu
+
+# 목록 파싱 함수가 사용하는 (행 선택자, 행 안의 선택자들)
+ROW_SELECTORS = {
+    "notice": (default.SELECTORs["list"], default.SELECTORs["row"]),
+    "me_notice": (me.SELECTORs["list"], me.SELECTORs["row"]),
+    "pnu_notice": (pnu.SELECTORs["list"], pnu.SELECTORs["row"]),
+}
+
+
+def best(func, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        st = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - st)
+    return min(times)
+
+
+def select_rows(soup, rows, cells, compiled: bool):
+    if not compiled:
+        rows, cells = rows.pattern, {key: cell.pattern for key, cell in cells.items()}
+    for row in soup.select(rows):
+        for cell in cells.values():
+            row.select_one(cell)
+
+
+def main(rows: int, repeat: int):
+    print(f"{'page':>22} | {'check':>32} | {'full(ms)':>8} | {'strainer(ms)':>12} | {'speedup':>7}")
+    for crawler, strainer in STRAINERS.items():
+        with open(f"{CORPUS}/{crawler}/list.html", encoding="utf-8") as f:
+            html = expand_rows(f.read(), rows)
+
+        for name, func in CHECKS[crawler]["list"]:
+            full = best(lambda: func(parse_html(html, "html5lib")), repeat)
+            strained = best(lambda: func(parse_html(html, "html5lib", strainer)), repeat)
+            print(f"{crawler + '/list.html':>22} | {name:>32} | {full * 1000:>8.1f} | {strained * 1000:>12.1f} | "
+                  f"{full / strained:>6.1f}x")
+
+    print(f"\n{'page':>22} | {'rows':>5} | {'str selector(ms)':>16} | {'compiled(ms)':>12} | {'speedup':>7}")
+    for crawler, (row_selector, cells) in ROW_SELECTORS.items():
+        with open(f"{CORPUS}/{crawler}/list.html", encoding="utf-8") as f:
+            soup = parse_html(expand_rows(f.read(), rows), "html5lib", STRAINERS[crawler])
+
+        n_rows = len(soup.select(row_selector))
+        plain = best(lambda: select_rows(soup, row_selector, cells, compiled=False), repeat)
+        compiled = best(lambda: select_rows(soup, row_selector, cells, compiled=True), repeat)
+        print(f"{crawler + '/list.html':>22} | {n_rows:>5} | {plain * 1000:>16.1f} | {compiled * 1000:>12.1f} | "
+              f"{plain / compiled:>6.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-rw", "--rows", dest="rows", default="500")
+    parser.add_argument("-n", "--repeat", dest="repeat", default="5")
+    args = parser.parse_args()
+
+    main(int(args.rows), int(args.repeat))
@@ -0,0 +1,113 @@
+"""`scrape_async` 파싱 단계(이벤트 루프 vs 프로세스 풀) 크롤링 시간 벤치마크
+
+`scripts/test/corpus/notice`의 목록(`rows`행으로 확장) / 상세 페이지를 로컬 서버로 제공하고, `NoticeCrawler`로
+목록 `lists`개와 상세 `details`개를 `scrape_async`로 크롤링하는 전체 시간과 이벤트 루프 최대 지연(10ms 주기 heartbeat
+기준)을 `HTML_PARSE_WORKERS=0`(이벤트 루프에서 파싱)과 프로세스 풀에서 비교합니다.
+
+Usage:
+    poetry run python3 scripts/bench/scrape_pool.py
+        -l, --lists: 목록 페이지 수 (default: 30)
+        -dt, --details: 상세 페이지 수 (default: 300)
+        -rw, --rows: 목록 페이지 행 수 (default: 500)
+        -w, --workers: 프로세스 수 (default: CPU 수)
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+import aiohttp
+from aiohttp import web
+
+from mixins.asyncio import HOST_BURST_LIMITS, HOST_RATE_LIMITS
+from services.base.crawler import scrape
+from services.notice.crawler.default import NoticeCrawler
+from scripts.bench.html_parser import expand_rows
+from scripts.test.html_parser import CORPUS
+
+PORT = 8095
+
+
+def create_corpus_app(rows: int) -> web.Application:
+    with open(os.path.join(CORPUS, "notice", "list.html"), encoding="utf-8") as f:
+        list_html = expand_rows(f.read(), rows).encode()
+    with open(os.path.join(CORPUS, "notice", "detail.html"), encoding="utf-8") as f:
+        detail_html = f.read().encode()
+
+    async def list_page(_: web.Request):
+        return web.Response(body=list_html, content_type="text/html", charset="utf-8")
+
+    async def detail_page(_: web.Request):
+        return web.Response(body=detail_html, content_type="text/html", charset="utf-8")
+
+    app = web.Application()
+    app.router.add_get("/list/{page}", list_page)
+    app.router.add_get("/detail/{seq}", detail_page)
+    return app
+
+
+async def crawl(crawler: NoticeCrawler, lists: int, details: int, session: aiohttp.ClientSession):
+    base_url = f"http://127.0.0.1:{PORT}"
+    max_lag, running = 0.0, True
+
+    async def heartbeat():
+        nonlocal max_lag
+        while running:
+            st = time.perf_counter()
+            await asyncio.sleep(0.01)
+            max_lag = max(max_lag, time.perf_counter() - st - 0.01)
+
+    beat = asyncio.create_task(heartbeat())
+    st = time.perf_counter()
+
+    paths = await scrape.scrape_async(
+        url=[f"{base_url}/list/{page}" for page in range(lists)],
+        session=session,
+        post_process=crawler._parse_paths_from_table_element,
+    )
+    dtos = await crawler.scrape_detail_async([f"{base_url}/detail/{seq}" for seq in range(details)], session=session)
+
+    elapsed = time.perf_counter() - st
+    running = False
+    await beat
+
+    assert all(isinstance(p, list) for p in paths) and len(dtos) == details
+    return elapsed, max_lag
+
+
+async def main(lists: int, details: int, rows: int, workers: int):
+    runner = web.AppRunner(create_corpus_app(rows))
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", PORT).start()
+    # 파싱 비용만 비교하도록 로컬 서버는 요청 속도를 제한하지 않음
+    HOST_RATE_LIMITS["127.0.0.1"], HOST_BURST_LIMITS["127.0.0.1"] = 1000, 1000
+
+    crawler = NoticeCrawler()
+    print(f"{'mode':>12} | {'wall(s)':>8} | {'pages/s':>8} | {'max loop lag(ms)':>16}")
+
+    try:
+        async with aiohttp.ClientSession() as session:
+            for mode, _workers in (("event loop", 0), (f"pool({workers})", workers)):
+                scrape.shutdown_parse_pool()
+                scrape.HTML_PARSE_WORKERS = _workers
+                if scrape.parse_pool() is not None:
+                    # 워커 프로세스 기동 / 모듈 import 시간은 제외
+                    await crawl(crawler, 1, workers, session)
+
+                elapsed, max_lag = await crawl(crawler, lists, details, session)
+                print(f"{mode:>12} | {elapsed:>8.2f} | {(lists + details) / elapsed:>8.1f} | {max_lag * 1000:>16.0f}")
+    finally:
+        scrape.shutdown_parse_pool()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-l", "--lists", dest="lists", default="30")
+    parser.add_argument("-dt", "--details", dest="details", default="300")
+    parser.add_argument("-rw", "--rows", dest="rows", default="500")
+    parser.add_argument("-w", "--workers", dest="workers", default=str(os.cpu_count() or 1))
+    args = parser.parse_args()
+
+    asyncio.run(main(int(args.lists), int(args.details), int(args.rows), int(args.workers)))
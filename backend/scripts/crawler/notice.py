@@ -6,21 +6,23 @@ Usage:
         -d, --delay: Interval간의 딜레이 (초 단위, default: 0)
         -dp, --department: 학과 (default: ALL)
         -r, --reset: 테이블 초기화 여부 (default: false)
+        -rs, --resume: 중단된 크롤링을 체크포인트에서 이어서 실행 (체크포인트가 없는 게시판은 기존과 같이 실행)
         -rw, --rows: 목록 페이지에서 한 번에 불러올 게시글 수 (기계공학부 제외, default: 500)
         -y, --last-year: 마지막 년도
         -pa, --parse-attachment: 첨부파일 파싱 여부
+        -c, --concurrency: 동시에 크롤링할 게시판 수 (default: CRAWL_CONCURRENCY)
+        -hc, --host-concurrency: 같은 호스트에서 동시에 크롤링할 게시판 수 (default: CRAWL_HOST_CONCURRENCY)
 """
 
 import argparse
 import asyncio
-from typing import Dict
 
 from config.config import get_universities
 from containers.crawler.notice import NoticeCrawlerContainer
 from db.repositories import transaction
 import logging
-import time
 
+from services.base.orchestrator import CRAWL_CONCURRENCY, CRAWL_HOST_CONCURRENCY, Orchestrator, summary_table
 from services.notice.crawler.default import DepartmentNoticeCrawlerService
 
 import logging
@@ -28,6 +30,10 @@ import logging
 import warnings
 from config.logger import _logger
 from services.notice.crawler.me import MENoticeCrawlerService
+from mixins.asyncio import rate_stats
+from mixins.http_client import sessions
+from services.base.crawler import attachment, scrape
+from services.base.embedder import embedding_cache, open_backend
 
 warnings.filterwarnings("ignore")
 
@@ -42,11 +48,16 @@ def init_args():
     parser.add_argument("-d", "--delay", dest="delay", action="store", default="0")
     parser.add_argument("-dp", "--department", dest="department", action="store", default="ALL")
     parser.add_argument("-r", '--reset', dest="reset", action=argparse.BooleanOptionalAction)
+    parser.add_argument("-rs", '--resume', dest="resume", action=argparse.BooleanOptionalAction)
     parser.add_argument("-rw", '--rows', dest="rows", action="store", default="500")
     parser.add_argument("-y", '--last-year', dest="last_year", action="store", default="2000")
     parser.add_argument("-st", '--st-year', dest="st_year", action="store", default="2000")
     parser.add_argument("-ed", '--ed-year', dest="ed_year", action="store", default="2025")
     parser.add_argument("-pa", '--parse-attachment', dest="parse_attachment", action=argparse.BooleanOptionalAction)
+    parser.add_argument("-c", "--concurrency", dest="concurrency", action="store", default=str(CRAWL_CONCURRENCY))
+    parser.add_argument(
+        "-hc", "--host-concurrency", dest="host_concurrency", action="store", default=str(CRAWL_HOST_CONCURRENCY)
+    )
 
     args = parser.parse_args()
 
@@ -54,11 +65,14 @@ def init_args():
         "interval": int(args.interval),
         "delay": float(args.delay),
         "reset": bool(args.reset),
+        "resume": bool(args.resume),
         "department": str(args.department),
         "rows": int(args.rows),
         "st_year": int(args.st_year),
         "ed_year": int(args.ed_year),
         "parse_attachment": bool(args.parse_attachment),
+        "concurrency": int(args.concurrency),
+        "host_concurrency": int(args.host_concurrency),
     }
 
     return kwargs
@@ -66,6 +80,8 @@ def init_args():
 
 @inject
 @transaction()
+@sessions.open()
+@open_backend()
 async def main(
     notice_service: DepartmentNoticeCrawlerService = Provide[NoticeCrawlerContainer.notice_service],
     me_notice_service: MENoticeCrawlerService = Provide[NoticeCrawlerContainer.me_notice_service],
@@ -81,52 +97,56 @@ async def main(
         departments = [[dep for dep in deps] for deps in univs.values()]
         departments = list(chain(*departments)) if department_str == "ALL" else department_str.split(",")
 
-        reset = kwargs.get("reset", False)
-        rows = kwargs.get("rows", 500)
         st_year = kwargs.get("st_year")
         ed_year = kwargs.get("ed_year")
-        parse_attachment = kwargs.get("parse_attachment")
-
-        failed_departments: Dict = {}
+        options = {
+            "interval": kwargs.get('interval'),
+            "delay": kwargs.get('delay'),
+            "reset": kwargs.get("reset", False),
+            "resume": kwargs.get("resume", False),
+            "rows": kwargs.get("rows", 500),
+            "st_date": f"{st_year}-01-01" if st_year else None,
+            "ed_date": f"{ed_year}-12-31" if ed_year else None,
+            "parse_attachment": kwargs.get("parse_attachment"),
+        }
+
+        jobs = []
         for _dep in departments:
             try:
                 if _dep == "기계공학부":
-                    await me_notice_service.run_crawling_pipeline(
-                        interval=kwargs.get('interval'),
-                        delay=kwargs.get('delay'),
-                        reset=reset,
-                        rows=rows,
-                        st_date=f"{st_year}-01-01" if st_year else None,
-                        ed_date=f"{ed_year}-12-31" if ed_year else None,
-                        parse_attachment=parse_attachment
-                    )
+                    jobs += me_notice_service.crawl_jobs(**options)
                 else:
-                    st = time.time()
-                    await notice_service.run_crawling_pipeline(
-                        interval=kwargs.get('interval'),
-                        delay=kwargs.get('delay'),
-                        department=_dep,
-                        reset=reset,
-                        rows=rows,
-                        st_date=f"{st_year}-01-01" if st_year else None,
-                        ed_date=f"{ed_year}-12-31" if ed_year else None,
-                        parse_attachment=parse_attachment
-                    )
-                    ed = time.time()
-                    logger(f"[{_dep}] total: {ed - st:.0f} sec")
-
+                    jobs += notice_service.crawl_jobs(department=_dep, **options)
             except Exception as e:
-                failed_departments[_dep] = e
                 logger(f"[{_dep}] 일시적인 오류가 발생했습니다. {e}", logging.ERROR)
-            continue
+
+        orchestrator = Orchestrator(kwargs.get("concurrency"), kwargs.get("host_concurrency"))
+        results = await orchestrator.run(jobs)
+        logger(f"크롤링 결과\n{summary_table(results)}")
 
     except Exception as e:
         logging.exception(f"Error while scraping({e})")
 
+    if embedding_cache():
+        logger(f"임베딩 캐시: {embedding_cache().stats()}")
+
+    await attachment.drain_deferred(timeout=attachment.ATTACHMENT_LARGE_WAIT)
+    logger(f"첨부파일 분류: {attachment.triage_stats()}")
+    logger(f"첨부파일 파싱: {scrape.document_stats()}")
+    if scrape.document_cache():
+        logger(f"첨부파일 캐시: {scrape.document_cache().stats()}")
+
+    logger(f"HTTP 커넥션: {sessions.stats()}")
+    logger(f"호스트별 요청 속도: {rate_stats()}")
+
 
 if __name__ == "__main__":
     notice_container = NoticeCrawlerContainer()
     notice_container.init_resources()
     notice_container.wire(modules=[__name__])
 
-    asyncio.run(main())
+    try:
+        asyncio.run(main())
+    finally:
+        # HTML 파싱 프로세스 풀 종료
+        scrape.shutdown_parse_pool()
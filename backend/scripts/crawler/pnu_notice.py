@@ -5,6 +5,7 @@ Usage:
         -i, --interval: 한 번에 스크랩 할 게시글 수 (default: 10)
         -d, --delay: Interval간의 딜레이 (초 단위, default: 0)
         -r, --reset: 테이블 초기화 여부 (default: false)
+        -rs, --resume: 중단된 크롤링을 체크포인트에서 이어서 실행
 """
 
 import argparse
@@ -20,8 +21,16 @@ import logging
 
 import warnings
 
+from config.logger import _logger
+from mixins.asyncio import rate_stats
+from mixins.http_client import sessions
+from services.base.crawler import attachment, scrape
+from services.base.embedder import embedding_cache, open_backend
+
 warnings.filterwarnings("ignore")
 
+logger = _logger(__name__)
+
 from dependency_injector.wiring import Provide, inject
 
 
@@ -30,6 +39,7 @@ def init_args():
     parser.add_argument("-i", "--interval", dest="interval", action="store", default="10")
     parser.add_argument("-d", "--delay", dest="delay", action="store", default="0")
     parser.add_argument("-r", '--reset', dest="reset", action=argparse.BooleanOptionalAction)
+    parser.add_argument("-rs", '--resume', dest="resume", action=argparse.BooleanOptionalAction)
 
     args = parser.parse_args()
 
@@ -37,6 +47,7 @@ def init_args():
         "interval": int(args.interval),
         "delay": float(args.delay),
         "reset": bool(args.reset),
+        "resume": bool(args.resume),
     }
 
     return kwargs
@@ -44,6 +55,8 @@ def init_args():
 
 @inject
 @transaction()
+@sessions.open()
+@open_backend()
 async def main(notice_service: BaseNoticeCrawlerService = Provide[PNUNoticeCrawlerContainer.notice_service]):
 
     kwargs = init_args()
@@ -56,6 +69,7 @@ async def main(notice_service: BaseNoticeCrawlerService = Provide[PNUNoticeCrawl
                 interval=kwargs.get('interval'),
                 delay=kwargs.get('delay'),
                 reset=reset,
+                resume=kwargs.get("resume", False),
             )
         except Exception as e:
             logging.exception(f"일시적인 오류가 발생했습니다.")
@@ -63,6 +77,18 @@ async def main(notice_service: BaseNoticeCrawlerService = Provide[PNUNoticeCrawl
     except Exception as e:
         logging.exception(f"Error while scraping({e})")
 
+    if embedding_cache():
+        logger(f"임베딩 캐시: {embedding_cache().stats()}")
+
+    await attachment.drain_deferred(timeout=attachment.ATTACHMENT_LARGE_WAIT)
+    logger(f"첨부파일 분류: {attachment.triage_stats()}")
+    logger(f"첨부파일 파싱: {scrape.document_stats()}")
+    if scrape.document_cache():
+        logger(f"첨부파일 캐시: {scrape.document_cache().stats()}")
+
+    logger(f"HTTP 커넥션: {sessions.stats()}")
+    logger(f"호스트별 요청 속도: {rate_stats()}")
+
 
 if __name__ == "__main__":
     notice_container = PNUNoticeCrawlerContainer()
@@ -70,4 +96,8 @@ if __name__ == "__main__":
     notice_container.init_resources()
     notice_container.wire(modules=[__name__])
 
-    asyncio.run(main())
+    try:
+        asyncio.run(main())
+    finally:
+        # HTML 파싱 프로세스 풀 종료
+        scrape.shutdown_parse_pool()
@@ -10,14 +10,23 @@ import argparse
 import asyncio
 
 from config.config import get_universities
+from config.logger import _logger
 from db.repositories import transaction
+from mixins.asyncio import rate_stats
+from mixins.http_client import sessions
+from services.base.crawler import scrape
+from services.base.embedder import open_backend
 
 import logging
 
 from services.professor import create_professor_service
 
+logger = _logger(__name__)
+
 
 @transaction()
+@sessions.open()
+@open_backend()
 async def main(**kwargs):
     from itertools import chain
 
@@ -45,6 +54,8 @@ async def main(**kwargs):
             logging.exception(f"[{department}] 일시적인 오류가 발생했습니다. ({e})")
             continue
 
+    logger(f"호스트별 요청 속도: {rate_stats()}")
+
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
@@ -70,4 +81,8 @@ if __name__ == "__main__":
         "department": str(args.department),
     }
 
-    asyncio.run(main(**kwargs))
+    try:
+        asyncio.run(main(**kwargs))
+    finally:
+        # HTML 파싱 프로세스 풀 종료
+        scrape.shutdown_parse_pool()
@@ -23,8 +23,16 @@ import warnings
 
 from services.support.service.crawler import SupportCrawlerService
 
+from config.logger import _logger
+from mixins.asyncio import rate_stats
+from mixins.http_client import sessions
+from services.base.crawler import attachment, scrape
+from services.base.embedder import embedding_cache, open_backend
+
 warnings.filterwarnings("ignore")
 
+logger = _logger(__name__)
+
 
 def init_args():
     parser = argparse.ArgumentParser()
@@ -44,6 +52,8 @@ def init_args():
 
 
 @inject
+@sessions.open()
+@open_backend()
 async def main(service: SupportCrawlerService = Provide[SupportCrawlerContainer.support_service]):
 
     kwargs = init_args()
@@ -58,10 +68,26 @@ async def main(service: SupportCrawlerService = Provide[SupportCrawlerContainer.
     except Exception as e:
         logging.exception(f"Error while scraping({e})")
 
+    if embedding_cache():
+        logger(f"임베딩 캐시: {embedding_cache().stats()}")
+
+    await attachment.drain_deferred(timeout=attachment.ATTACHMENT_LARGE_WAIT)
+    logger(f"첨부파일 분류: {attachment.triage_stats()}")
+    logger(f"첨부파일 파싱: {scrape.document_stats()}")
+    if scrape.document_cache():
+        logger(f"첨부파일 캐시: {scrape.document_cache().stats()}")
+
+    logger(f"HTTP 커넥션: {sessions.stats()}")
+    logger(f"호스트별 요청 속도: {rate_stats()}")
+
 
 if __name__ == "__main__":
     container = SupportCrawlerContainer()
     container.init_resources()
     container.wire(modules=[__name__])
 
-    asyncio.run(main())
+    try:
+        asyncio.run(main())
+    finally:
+        # HTML 파싱 프로세스 풀 종료
+        scrape.shutdown_parse_pool()
@@ -0,0 +1,162 @@
+"""첨부파일 분류(`attachment.parse_attachments_async`) 검증 스크립트
+
+첨부파일과 `/extract_text`를 흉내 내는 로컬 서버를 띄우고 형식 / 크기별 분류, HEAD를 지원하지 않는 서버의
+Range 요청 판별, 큰 문서가 배치를 지연시키지 않는지(대기 시간 초과 시 연기 후 캐시 저장, 다음 크롤링에서
+해당 게시글을 다시 처리)를 확인합니다.
+실패하면 AssertionError로 종료됩니다.
+
+Usage:
+    poetry run python3 scripts/test/attachment_triage.py
+        -p, --port: 로컬 서버 포트 (default: 8096)
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+
+import aiohttp
+from aiohttp import web
+
+from mixins.asyncio import HOST_BURST_LIMITS, HOST_RATE_LIMITS
+from db.models.notice import PNUNoticeModel
+from services.base.cache import DocumentCache
+from services.base.crawler import attachment, scrape
+from services.notice.base import BasePNUNoticeService
+from services.notice.crawler.base import BaseNoticeCrawlerService
+
+LARGE_PARSE_SECONDS = 1.0
+
+
+class FakeNoticeRepository:
+    """청크가 없는 첨부파일 (게시글 url, 첨부파일 이름, 첨부파일 url)"""
+
+    def __init__(self, rows):
+        self.rows = [SimpleNamespace(url=url, name=name, attachment_url=att_url) for url, name, att_url in rows]
+
+    def find_unparsed_attachments(self, **kwargs):
+        return self.rows
+
+
+class FakePNUNoticeCrawlerService(BaseNoticeCrawlerService[PNUNoticeModel], BasePNUNoticeService):
+
+    def __init__(self, notice_repo: FakeNoticeRepository):
+        self.notice_repo = notice_repo
+
+    async def prepare_batch(self, urls, **kwargs):
+        return []
+
+    async def run_crawling_pipeline(self, **kwargs):
+        return []
+
+
+def create_attachment_app() -> web.Application:
+    """
+    - `/files/{name}`: 확장자로 Content-Type을 정하고, `big`이 포함된 파일은 64KB
+    - `/download.do?name=...`: HEAD는 405, GET은 Content-Disposition으로 파일명 전달 (Range 요청 판별 확인용)
+    - `/extract_text`: url별 `{"0": "<p>url</p>"}` 반환, 큰 문서는 `LARGE_PARSE_SECONDS`초 뒤 응답
+    """
+    app = web.Application()
+    app["parsed"] = []
+
+    content_types = {"pdf": "application/pdf", "png": "image/png", "zip": "application/zip", "hwp": "application/x-hwp"}
+
+    async def files(req: web.Request):
+        name = req.match_info["name"]
+        body = b"%PDF" + b"0" * (64 * 1024 if "big" in name else 16)
+        return web.Response(body=body, content_type=content_types[name.rsplit(".", 1)[1]])
+
+    async def download(req: web.Request):
+        if req.method == "HEAD":
+            raise web.HTTPMethodNotAllowed("HEAD", ["GET"])
+        name = req.query["name"]
+        return web.Response(
+            body=b"\xd0\xcf\x11\xe0" + b"0" * 16,
+            content_type="application/octet-stream",
+            headers={"Content-Disposition": f'attachment; filename="{name}"'},
+        )
+
+    async def extract_text(req: web.Request):
+        urls = (await req.json())["url"]
+        app["parsed"].extend(urls)
+        if any("big" in url for url in urls):
+            await asyncio.sleep(LARGE_PARSE_SECONDS)
+        return web.json_response([{"0": f"<p>{url}</p>"} for url in urls])
+
+    app.router.add_get("/files/{name}", files)
+    app.router.add_route("*", "/download.do", download)
+    app.router.add_post("/extract_text", extract_text)
+    return app
+
+
+async def main(port: int):
+    app = create_attachment_app()
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    base_url = f"http://127.0.0.1:{port}"
+    scrape.DOCUMENT_PARSER_URL = base_url
+    attachment.ATTACHMENT_LARGE_MB = 32 / 1024
+    attachment.ATTACHMENT_MAX_MB = 1
+    attachment.ATTACHMENT_LARGE_WAIT = LARGE_PARSE_SECONDS / 4
+    # 로컬 서버는 요청 속도를 제한하지 않음
+    HOST_RATE_LIMITS["127.0.0.1"], HOST_BURST_LIMITS["127.0.0.1"] = 1000, 1000
+    parsed: list = app["parsed"]
+
+    pdf, big, image, archive = (f"{base_url}/files/{name}" for name in ("a.pdf", "big.pdf", "b.png", "c.zip"))
+    hwp, xlsx = f"{base_url}/download.do?name=d.hwp", f"{base_url}/download.do?name=e.xlsx"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        async with aiohttp.ClientSession() as session:
+
+            # 1. 형식 / 크기 분류 (HEAD를 지원하지 않으면 Range 요청의 Content-Disposition으로 판별)
+            urls = (pdf, big, image, archive, hwp, xlsx)
+            probes = {url: await attachment.probe_attachment(url, session) for url in urls}
+            routes = {url: probe.route for url, probe in probes.items()}
+            assert routes == {
+                pdf: "parse", big: "large", image: "skip", archive: "skip", hwp: "parse", xlsx: "skip"
+            }, routes
+            assert probes[hwp].kind == "hwp" and probes[xlsx].kind == "xlsx"
+            print("triage: ok")
+
+            # 2. 캐시가 없으면 대기 시간을 넘긴 큰 문서는 취소하고 배치는 기다리지 않음
+            scrape._document_cache, scrape._document_cache_loaded = None, True
+            st = time.monotonic()
+            results = await attachment.parse_attachments_async([pdf, image, big, hwp, pdf], session)
+            elapsed = time.monotonic() - st
+            assert elapsed < LARGE_PARSE_SECONDS, elapsed
+            assert results == [{"0": f"<p>{pdf}</p>"}, {}, {}, {"0": f"<p>{hwp}</p>"}, {"0": f"<p>{pdf}</p>"}], results
+            assert image not in parsed and archive not in parsed
+            print(f"large document does not stall batch: ok ({elapsed * 1000:.0f}ms)")
+
+            # 3. 캐시가 있으면 연기된 큰 문서를 백그라운드에서 파싱하고 다음 배치에서 사용
+            scrape._document_cache = DocumentCache(os.path.join(tmp, "documents.db"), max_bytes=1024**2)
+            assert await attachment.parse_attachments_async([big], session) == [{}]
+            await attachment.drain_deferred()
+            parsed.clear()
+            assert await attachment.parse_attachments_async([big], session) == [{"0": f"<p>{big}</p>"}]
+            assert parsed == []
+
+            # 연기되었던 첨부파일이 있는 게시글만 다시 크롤링 대상 (파싱하지 못한 다른 첨부파일은 제외)
+            assert scrape._document_cache.cached_urls([big, image]) == {big}
+            service = FakePNUNoticeCrawlerService(FakeNoticeRepository([
+                ("https://notice/1", "big.pdf", big),
+                ("https://notice/2", "b.png", image),
+            ]))
+            assert await service.deferred_urls() == ["https://notice/1"]
+            print("deferred large document cached: ok (notice re-queued)")
+
+            print(f"triage: {attachment.triage_stats()}, parse: {scrape.document_stats()}")
+            scrape._document_cache.close()
+
+    await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-p", "--port", dest="port", default="8096")
+    args = parser.parse_args()
+
+    asyncio.run(main(int(args.port)))
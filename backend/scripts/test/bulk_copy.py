@@ -0,0 +1,163 @@
+"""대량 저장(`db.repositories.bulk`) binary COPY 데이터 검증 스크립트
+
+DB 없이 `stage_rows` / `_Table.encode`가 만드는 binary COPY 데이터를 다시 읽어 다음을 확인합니다.
+(Postgres에 실제로 저장하는 경로는 `scripts/bench/bulk_upsert.py`에서 확인)
+실패하면 AssertionError로 종료됩니다.
+
+- 게시글 / 첨부파일 / 청크가 배치 안의 번호로 연결되고, 첨부파일 청크는 한 번만 적재됨
+- 같은 url의 게시글은 마지막 게시글만 적재됨
+- 문자열 / 날짜 / bool / NULL / dense / sparse 벡터가 Postgres binary 형식으로 인코딩됨
+- 공지사항 / 학교 공지사항 / 학지시 모델의 upsert SQL에 외래 키가 맞게 들어감
+
+Usage:
+    poetry run python3 scripts/test/bulk_copy.py
+        -n, --notices: 게시글 수 (default: 20)
+"""
+
+import argparse
+from datetime import date, timedelta
+import struct
+from typing import Any, List, Optional
+
+import numpy as np
+from pgvector.sqlalchemy import SparseVector
+from pgvector.utils import SparseVector as SparseVectorValue, Vector as VectorValue
+
+from db.common import N_DIM, V_DIM
+from db.models import AttachmentModel, NoticeChunkModel, NoticeModel
+from db.models.notice import PNUNoticeAttachmentModel, PNUNoticeChunkModel, PNUNoticeModel
+from db.models.support import SupportAttachmentModel, SupportChunkModel, SupportModel
+from db.repositories.bulk import BulkSpec, _column_type, merge_sql, stage_rows
+
+SPEC = BulkSpec(PNUNoticeModel, PNUNoticeAttachmentModel, PNUNoticeChunkModel)
+
+
+def read_copy(data: bytes) -> List[List[Optional[bytes]]]:
+    """binary COPY 데이터를 행별 필드(bytes, NULL은 None) 목록으로 변환"""
+    assert data[:11] == b"PGCOPY\n\xff\r\n\x00"
+    pos = 19
+    rows = []
+    while True:
+        (n_fields, ) = struct.unpack_from("!h", data, pos)
+        pos += 2
+        if n_fields == -1:
+            assert pos == len(data)
+            return rows
+
+        fields: List[Optional[bytes]] = []
+        for _ in range(n_fields):
+            (length, ) = struct.unpack_from("!i", data, pos)
+            pos += 4
+            if length == -1:
+                fields.append(None)
+                continue
+            fields.append(data[pos:pos + length])
+            pos += length
+        rows.append(fields)
+
+
+def decode(pg_type: str, value: Optional[bytes]) -> Any:
+    if value is None:
+        return None
+    if pg_type == "int4":
+        return struct.unpack("!i", value)[0]
+    if pg_type == "bool":
+        return value == b"\x01"
+    if pg_type == "date":
+        return date(2000, 1, 1) + timedelta(days=struct.unpack("!i", value)[0])
+    if pg_type == "vector":
+        return VectorValue.from_binary(value).to_numpy()
+    if pg_type == "sparsevec":
+        sparse = SparseVectorValue.from_binary(value)
+        return dict(zip(sparse.indices(), sparse.values())), sparse.dimensions()
+    return value.decode("utf-8")
+
+
+def chunk(rng: np.random.Generator, content: str) -> PNUNoticeChunkModel:
+    return PNUNoticeChunkModel(
+        chunk_content=content,
+        content_hash=f"hash-{content}",
+        chunk_vector=rng.random(N_DIM, dtype=np.float32),
+        chunk_sparse_vector=SparseVector({3: 0.5, 250001: 1.25}, V_DIM),
+    )
+
+
+def notice(rng: np.random.Generator, idx: int, title: Optional[str] = None) -> PNUNoticeModel:
+    pages = [chunk(rng, f"{idx}-page-{page}") for page in range(2)]
+    return PNUNoticeModel(
+        url=f"https://www.pusan.ac.kr/board_seq={idx}",
+        title=title or f"공지 {idx}",
+        content=f"본문 {idx}",
+        date="2025-03-02",
+        author=None,
+        is_important=idx % 2 == 0,
+        content_hash=f"hash-{idx}",
+        title_vector=rng.random(N_DIM, dtype=np.float32),
+        title_sparse_vector=SparseVector({idx: 1.0}, V_DIM),
+        attachments=[PNUNoticeAttachmentModel(name=f"첨부{idx}.pdf", url=f"https://file/{idx}", content_chunks=pages)],
+        content_chunks=[chunk(rng, f"{idx}-content"), *pages],
+    )
+
+
+def main(n: int):
+    rng = np.random.default_rng(0)
+    notices = [notice(rng, idx) for idx in range(n)]
+    duplicate = notice(rng, 0, title="공지 0 (수정)")
+    parent_table, attachment_table, chunk_table = SPEC.tables()
+
+    # 1. 번호로 연결, 첨부파일 청크는 한 번만, 같은 url은 마지막 게시글만
+    parent_rows, attachment_rows, chunk_rows = stage_rows(SPEC, [*notices, duplicate])
+    assert len(parent_rows) == n and parent_rows[0][1] is duplicate
+    assert all(att is not notices[0].attachments[0] for _, att in attachment_rows)
+    assert [keys[1] for keys, _ in attachment_rows] == list(range(n))
+    assert len(chunk_rows) == n * 3
+    for (parent_key, attachment_key), row in chunk_rows:
+        assert parent_key == int(row.chunk_content.split("-")[0])
+        assert (attachment_key is None) == row.chunk_content.endswith("content")
+    print(f"staging keys: ok ({len(parent_rows)} notices, {len(attachment_rows)} attachments, "
+          f"{len(chunk_rows)} chunks)")
+
+    # 2. binary COPY 인코딩
+    for table, rows in zip(SPEC.tables(), (parent_rows, attachment_rows, chunk_rows)):
+        decoded = read_copy(table.encode(rows))
+        assert len(decoded) == len(rows)
+        types = ["int4"] * len(table.keys) + [_column_type(column)[0] for column in table.columns]
+        assert len(types) == len(decoded[0])
+
+        for (keys, obj), fields in zip(rows, decoded):
+            values = [decode(pg_type, field) for pg_type, field in zip(types, fields)]
+            assert values[:len(keys)] == list(keys)
+            for column, value in zip(table.columns, values[len(keys):]):
+                expected = getattr(obj, column.key)
+                if isinstance(expected, np.ndarray):
+                    assert np.array_equal(value, expected)
+                elif isinstance(expected, SparseVectorValue):
+                    assert value == (dict(zip(expected.indices(), expected.values())), V_DIM)
+                elif column.name == "date":
+                    assert value == date(2025, 3, 2)
+                else:
+                    assert value == expected, (column.name, value, expected)
+    assert "title_vector vector" in parent_table.ddl() and "chunk_sparse_vector sparsevec" in chunk_table.ddl()
+    print("binary encoding: ok (text, date, bool, NULL, vector, sparsevec)")
+
+    # 3. 모델별 upsert SQL
+    for spec, fk in [
+        (BulkSpec(NoticeModel, AttachmentModel, NoticeChunkModel), "notice_id"),
+        (SPEC, "pnu_notice_id"),
+        (BulkSpec(SupportModel, SupportAttachmentModel, SupportChunkModel), "support_id"),
+    ]:
+        sql = merge_sql(spec)
+        parent = spec.parent.__tablename__
+        assert f"INSERT INTO {parent} (" in sql and "ON CONFLICT (url) DO UPDATE SET" in sql
+        assert f"INSERT INTO {spec.attachment.__tablename__} (id, {fk}, " in sql
+        assert f"INSERT INTO {spec.chunk.__tablename__} ({fk}, attachment_id, " in sql
+        assert "url = EXCLUDED.url" not in sql and " id = EXCLUDED.id" not in sql
+    print("merge sql: ok (notices, pnu_notices, supports)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--notices", dest="notices", default="20")
+    args = parser.parse_args()
+
+    main(int(args.notices))
@@ -0,0 +1,240 @@
+"""공지사항 변경 감지(`content_hash`) 검증 스크립트
+
+메모리에 게시글을 저장하는 가짜 저장소와, 임베딩한 텍스트 수를 세는 hashing 임베딩 backend로
+학교 전체 공지사항 크롤링 파이프라인(스크랩 → 변경 감지 → 임베딩 → 저장)을 실행해 다음을 확인합니다.
+실패하면 AssertionError로 종료됩니다.
+
+- 처음 크롤링하면 모든 제목 / 본문 / 첨부파일 페이지를 임베딩하고, 게시글과 청크에 해시(게시글은 글 번호도)가 저장됨
+- 바뀌지 않은 게시글을 다시 크롤링하면 임베딩 / 저장하지 않음
+- 주요 공지 배치에서 바뀌지 않은 게시글은 `is_important`만 갱신
+- 첨부파일 하나를 다시 올리면(새 url) 해당 첨부파일 페이지만 다시 임베딩하고, 나머지 청크는 저장된 벡터를 재사용
+- 첨부파일 페이지 청크에는 해당 페이지의 임베딩이 저장됨
+- `parse_attachment`이면 파싱 결과가 저장되지 않은 첨부파일이 있는 게시글은 내용이 같아도 다시 파싱 (이미지 등 제외)
+
+Usage:
+    poetry run python3 scripts/test/change_detection.py
+        -n, --notices: 게시글 수 (default: 12)
+"""
+
+import argparse
+import asyncio
+from copy import deepcopy
+from types import SimpleNamespace
+from typing import Dict, List
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from db.common import session_context_var
+from db.models.notice import PNUNoticeModel
+from mixins import metrics
+from services.base import embedder as embedder_module
+from services.base.crawler import render
+from services.base.embedding_backend import HashingEmbeddingBackend
+from services.notice.base import BasePNUNoticeService
+from services.notice.crawler.base import BaseNoticeCrawlerService
+from services.notice.crawler.pnu import PNUNoticeCrawler
+from services.notice.dto import NoticeDTO
+from services.notice.embedder import NoticeEmbedder
+
+
+class CountingBackend(HashingEmbeddingBackend):
+
+    def __init__(self):
+        super().__init__()
+        self.texts: List[str] = []
+
+    async def embed(self, texts, session, chunking=True, truncate=True, html=True):
+        self.texts += [texts] if isinstance(texts, str) else texts
+        return await super().embed(texts, session, chunking=chunking, truncate=truncate, html=html)
+
+
+class FakePNUNoticeRepository:
+
+    def __init__(self):
+        self.rows: Dict[str, PNUNoticeModel] = {}
+
+    def find_content_hashes(self, urls):
+        return [self.rows[url] for url in urls if url in self.rows]
+
+    def find_all_by_urls(self, urls):
+        return [self.rows[url] for url in urls if url in self.rows]
+
+    def find_unparsed_attachments(self, urls):
+        return [
+            SimpleNamespace(url=url, name=att.name, attachment_url=att.url)
+            for url in urls if url in self.rows
+            for att in self.rows[url].attachments if not att.content_chunks
+        ]
+
+    def update_important(self, urls, is_important):
+        for url in urls:
+            self.rows[url].is_important = is_important
+        return len(urls)
+
+    def delete_all(self, urls=[]):
+        deleted = [self.rows.pop(url) for url in urls if url in self.rows]
+        return len(deleted)
+
+    def create_all(self, objects):
+        for obj in objects:
+            assert obj.url not in self.rows, f"중복 url: {obj.url}"
+            self.rows[obj.url] = obj
+        return objects
+
+
+class FakePNUNoticeCrawlerService(BaseNoticeCrawlerService[PNUNoticeModel], BasePNUNoticeService):
+
+    def __init__(self, pages: Dict[str, NoticeDTO]):
+        self.notice_repo = FakePNUNoticeRepository()
+        self.notice_crawler = PNUNoticeCrawler()
+        self.notice_embedder = NoticeEmbedder()
+        self.pages = pages
+        # 첨부파일 url별 파싱 결과 (`parse_attachment`, 없으면 빈 결과)
+        self.parsed: Dict[str, List[str]] = {}
+
+    async def prepare_batch(self, urls, **kwargs):
+        return [deepcopy(self.pages[url]) for url in urls]
+
+    async def parse_batch(self, notices):
+        return [
+            NoticeDTO(**{
+                **notice,
+                "attachments": [{**att, "content": self.parsed.get(att["url"], [])} for att in notice["attachments"]],
+            }) for notice in notices
+        ]
+
+    def add_semester_info(self, semesters=[], urls=None):
+        return 0
+
+    async def run_crawling_pipeline(self, **kwargs):
+        parse_attachment = kwargs.get("parse_attachment", False)
+        dtos, _ = await self.run_batches(kwargs["urls"], interval=4, name="[test]", parse_attachment=parse_attachment)
+        return dtos
+
+
+def notice_page(idx: int) -> NoticeDTO:
+    return NoticeDTO(
+        url=f"https://www.pusan.ac.kr/kor/CMS/Board/Board.do?mCode=MN095&mode=view&board_seq={1000 + idx}",
+        info={
+            "title": f"{idx}번 공지 장학금 신청 안내",
+            "content": f"{idx}번 공지 본문입니다. 신청 기간과 제출 서류를 확인하세요.",
+            "date": "2025-03-02",
+            "author": "학생과",
+        },
+        attachments=[
+            {"name": f"안내문{idx}.pdf", "url": f"https://www.pusan.ac.kr/files/{idx}-a.pdf",
+             "content": [f"{idx}번 안내문 1쪽", f"{idx}번 안내문 2쪽"]},
+            {"name": f"신청서{idx}.hwp", "url": f"https://www.pusan.ac.kr/files/{idx}-b.hwp",
+             "content": [f"{idx}번 신청서 양식"]},
+        ],
+    )
+
+
+async def main(n: int):
+    session_context_var.set(sessionmaker(bind=create_engine("sqlite://"))())
+
+    backend = CountingBackend()
+    embedder_module.backend = backend
+
+    # tiktoken 인코딩을 불러올 수 없으면(오프라인) 글자 수로 packing
+    try:
+        embedder_module.count_tokens("")
+    except Exception:
+        embedder_module.count_tokens = len
+    dense = backend.embedder.dense
+
+    pages = {page["url"]: page for page in map(notice_page, range(n))}
+    urls = list(pages)
+    service = FakePNUNoticeCrawlerService(pages)
+    rows = service.notice_repo.rows
+
+    # 1. 처음 크롤링: 제목 / 본문 / 첨부파일 페이지 모두 임베딩
+    dtos = await service.run_crawling_pipeline(urls=urls)
+    assert len(dtos) == n and len(rows) == n
+    assert len(backend.texts) == n * 5, len(backend.texts)
+    assert all(row.content_hash and all(chunk.content_hash for chunk in row.content_chunks) for row in rows.values())
+    assert [row.source_seq for row in rows.values()] == [1000 + idx for idx in range(n)]
+
+    # 첨부파일 페이지 청크에는 해당 페이지의 임베딩이 저장됨
+    for row in rows.values():
+        for att in row.attachments:
+            for chunk in att.content_chunks:
+                assert np.allclose(chunk.chunk_vector, dense(chunk.chunk_content)), chunk.chunk_content
+    print(f"initial crawl: ok ({n} notices, {len(backend.texts)} texts embedded)")
+
+    # 2. 바뀌지 않은 게시글: 임베딩 / 저장하지 않음
+    backend.texts.clear()
+    before = {url: id(row) for url, row in rows.items()}
+    dtos = await service.run_crawling_pipeline(urls=urls)
+    assert dtos == [] and backend.texts == [], backend.texts
+    assert {url: id(row) for url, row in rows.items()} == before
+    print("unchanged: ok (0 texts embedded)")
+
+    # 3. 주요 공지: `is_important`만 갱신
+    important_urls = urls[:3]
+    dtos, _ = await service.run_crawling_batch(important_urls, is_important=True)
+    assert dtos == [] and backend.texts == []
+    assert [url for url, row in rows.items() if row.is_important] == important_urls
+    assert {url: id(row) for url, row in rows.items()} == before
+    print(f"important flag only: ok ({len(important_urls)} notices)")
+
+    # 4. 첨부파일을 다시 올리면 해당 첨부파일 페이지만 다시 임베딩
+    changed_url = urls[1]
+    stored = rows[changed_url]
+    stored_vectors = {chunk.content_hash: chunk.chunk_vector for chunk in stored.content_chunks}
+    pages[changed_url]["attachments"][1] = {
+        "name": "신청서1(수정).hwp",
+        "url": "https://www.pusan.ac.kr/files/1-b-v2.hwp",
+        "content": ["1번 신청서 양식 (제출 기한 변경)"],
+    }
+
+    reused = metrics.counter("embed.reused").value
+    dtos = await service.run_crawling_pipeline(urls=urls)
+    assert [dto["url"] for dto in dtos] == [changed_url]
+    assert backend.texts == ["1번 신청서 양식 (제출 기한 변경)"], backend.texts
+    assert metrics.counter("embed.reused").value - reused == 4
+
+    replaced = rows[changed_url]
+    assert replaced is not stored and replaced.content_hash != stored.content_hash
+    assert replaced.is_important, "주요 공지 표시가 유지되지 않았습니다."
+    for chunk in replaced.content_chunks:
+        if chunk.content_hash in stored_vectors:
+            assert np.allclose(chunk.chunk_vector, stored_vectors[chunk.content_hash])
+        else:
+            assert chunk.content_hash == render.content_hash("1번 신청서 양식 (제출 기한 변경)")
+            assert np.allclose(chunk.chunk_vector, dense(chunk.chunk_content))
+    print("changed attachment: ok (1 text embedded, 4 reused)")
+
+    # 5. 파싱 결과가 없는 첨부파일(파싱 실패 / 연기)은 내용이 같아도 다음 크롤링에서 다시 파싱
+    page = notice_page(n)
+    page["attachments"].append({"name": "포스터.png", "url": "https://www.pusan.ac.kr/files/poster.png"})
+    pages[page["url"]] = page
+    pdf, hwp = page["attachments"][0], page["attachments"][1]
+    service.parsed = {pdf["url"]: pdf["content"]}
+
+    backend.texts.clear()
+    dtos = await service.run_crawling_pipeline(urls=[*urls, page["url"]], parse_attachment=True)
+    assert [dto["url"] for dto in dtos] == [page["url"]]
+    assert [len(att.content_chunks) for att in rows[page["url"]].attachments] == [2, 0, 0]
+
+    backend.texts.clear()
+    service.parsed[hwp["url"]] = hwp["content"]
+    dtos = await service.run_crawling_pipeline(urls=[*urls, page["url"]], parse_attachment=True)
+    assert [dto["url"] for dto in dtos] == [page["url"]]
+    assert backend.texts == hwp["content"], backend.texts
+    assert [len(att.content_chunks) for att in rows[page["url"]].attachments] == [2, 1, 0]
+
+    # 이미지는 파싱 결과가 없어도 다시 처리하지 않음
+    dtos = await service.run_crawling_pipeline(urls=[*urls, page["url"]], parse_attachment=True)
+    assert dtos == []
+    print("unparsed attachment: ok (re-parsed once, image skipped)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--notices", dest="notices", default="12")
+    args = parser.parse_args()
+
+    asyncio.run(main(int(args.notices)))
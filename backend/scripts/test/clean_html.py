@@ -0,0 +1,198 @@
+"""`preprocess.clean_html`(한 번의 후위 순회) vs `clean_html_fixpoint`(기존 반복 구현) 결과 비교 스크립트
+
+`scripts/test/corpus`의 모든 페이지 본문과, 첨부파일 변환 결과처럼 깊게 중첩된 무작위 문서(`seed` 고정)에 대해
+`prettify()` 결과가 바이트 단위로 같은지 비교합니다. 다른 결과가 있으면 AssertionError로 종료됩니다.
+(`clean_html_fixpoint`는 a 태그 제거를 변경으로 세지 않아 고정점 전에 멈추던 문제를 고친 버전입니다.)
+
+Usage:
+    poetry run python3 scripts/test/clean_html.py
+        -n, --documents: 무작위 문서 수 (default: 2000)
+        -s, --seed: 무작위 시드 (default: 0)
+"""
+
+import argparse
+import os
+import random
+
+from bs4 import BeautifulSoup, Tag
+from bs4.element import NavigableString, PageElement
+
+from services.base.crawler import preprocess
+from services.base.crawler.preprocess import clean_html
+
+CORPUS = os.path.join(os.path.dirname(__file__), "corpus")
+
+TAGS = ["div", "p", "span", "strong", "b", "u", "a", "li", "ul", "td", "th", "tr", "table", "font", "em", "h2"]
+VOIDS = ["<br>", "<br/>", "<img src='x.png'>", "<hr>"]
+TEXTS = ["가나다", " 라마 ", "\n", " ", "", "&nbsp;", "바사\n아", "<!-- 주석 -->", "1. 일정", "\\\\",
+         "<script>var a = 1;</script>", "<style>p { margin: 0 }</style>"]
+ATTRS = ["", " class='hwp'", " style='font-size:10pt'", " colspan='2'", " href='#ref'", " id='ref'", " rowspan=3"]
+
+
+def random_html(rand: random.Random, depth: int) -> str:
+    if depth == 0 or rand.random() < 0.2:
+        return rand.choice(TEXTS + VOIDS)
+
+    tag = rand.choice(TAGS)
+    children = "".join(random_html(rand, depth - 1) for _ in range(rand.randint(0, 4)))
+    return f"<{tag}{rand.choice(ATTRS)}>{children}</{tag}>"
+
+
+def corpus_documents():
+    for crawler in sorted(os.listdir(CORPUS)):
+        for filename in sorted(os.listdir(os.path.join(CORPUS, crawler))):
+            with open(os.path.join(CORPUS, crawler, filename), encoding="utf-8") as f:
+                html = f.read()
+            yield f"{crawler}/{filename}", html
+            body = BeautifulSoup(html, "html5lib").body
+            if body:
+                yield f"{crawler}/{filename}#body", str(body)
+
+
+def clean_html_fixpoint(html: str | BeautifulSoup | Tag) -> BeautifulSoup | Tag:
+    """변경이 없을 때까지 전체 순회를 반복하는 기존 구현 (비교 기준)"""
+
+    soup = preprocess._to_soup(html)
+
+    while True:
+        affected = sum([
+            clean_html_tag(soup, child) if isinstance(child, Tag) else preprocess._clean_html_string(soup, child)
+            for child in list(soup.descendants)
+        ])
+
+        if affected == 0:
+            break
+
+    return soup
+
+
+def clean_html_tag(soup: Tag | BeautifulSoup, element: Tag) -> int:
+    """Clean `Tag` instance"""
+
+    if not element.parent and element != soup:
+        return 0
+
+    if len(element.contents) == 0:
+        element.extract()
+        return 1
+
+    affected = 0
+
+    children = list(element.children)
+
+    def test_child(child: PageElement):
+        match child:
+            case NavigableString():
+                return True
+            case Tag(name="br"):
+                return True
+            case _:
+                return False
+
+    only_string = all(test_child(child) for child in children)
+
+    for attr in [*element.attrs.keys()]:
+        if attr not in preprocess.ALLOWED_ATTRS:
+            del element[attr]
+
+    if only_string and len(children) == 1:
+        inner_text = element.get_text(strip=True)
+        if inner_text == "" or inner_text == " ":
+            element.extract()
+            return 1
+
+    if only_string and len(children) > 1:
+        combined_text = ""
+        for child in children:
+            if isinstance(child, NavigableString):
+                combined_text += child.get_text(strip=True)
+                child.extract()
+            else:
+                child.insert_before(NavigableString(combined_text))
+                combined_text = ""
+
+        element.append(NavigableString(combined_text))
+
+        affected += 1
+
+    match element:
+        case Tag(name="strong"):
+            element.unwrap()
+            return affected + 1
+
+        case Tag(name="a", attrs={"href": str(href)}):
+            if not href.startswith("#"):
+                return affected
+            target = soup.select_one(href)
+            if not target:
+                return affected
+            target.extract()
+            element.replace_with(target)
+            return affected + 1
+
+        case Tag(
+            name="a" | "span" | "p" | "u" | "b" | "strong",
+            parent=Tag(name="span" | "p" | "li" | "td" | "th" | "b" | "u"),
+        ):
+            if element.name == "a":
+                element.extract()
+                return affected + 1
+
+            if not only_string:
+                return affected
+
+            if element.next_sibling is not None and element.name == "p":
+                element.append(NavigableString(" "))
+
+            element.unwrap()
+            return affected + 1
+
+        case Tag(name="img"):
+            element.extract()
+            return affected + 1
+
+        case _ if len(children) == 0 or element.string == "":
+            element.extract()
+            return affected + 1
+
+        case _:
+            return affected
+
+
+def compare(html: str, as_tag: bool) -> tuple[str, str]:
+    if as_tag:
+        # 크롤러처럼 파싱된 Tag를 전달하는 경우
+        expected = str(clean_html_fixpoint(BeautifulSoup(html, "html5lib").body).prettify())  # type: ignore
+        actual = str(clean_html(BeautifulSoup(html, "html5lib").body).prettify())  # type: ignore
+    else:
+        expected = str(clean_html_fixpoint(html).prettify())
+        actual = str(clean_html(html).prettify())
+    return expected, actual
+
+
+def main(documents: int, seed: int):
+    rand = random.Random(seed)
+    cases = list(corpus_documents())
+    cases += [(f"random#{idx}", random_html(rand, rand.randint(2, 9))) for idx in range(documents)]
+
+    failures = []
+    for name, html in cases:
+        for as_tag in (False, True):
+            expected, actual = compare(html, as_tag)
+            if expected != actual:
+                failures.append((name, as_tag, html, expected, actual))
+
+    print(f"{len(cases) * 2 - len(failures)} / {len(cases) * 2} identical")
+    for name, as_tag, html, expected, actual in failures[:5]:
+        print(f"\n[{name}] tag={as_tag}\n{html}\n--- fixpoint\n{expected}\n--- single pass\n{actual}")
+
+    assert not failures, f"{len(failures)}개의 결과가 기존 구현과 다릅니다."
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--documents", dest="documents", default="2000")
+    parser.add_argument("-s", "--seed", dest="seed", default="0")
+    args = parser.parse_args()
+
+    main(int(args.documents), int(args.seed))
@@ -0,0 +1,56 @@
+"""요청 묶음 처리(`services.base.coalescer.Coalescer`) 검증 스크립트
+
+배치 전송 함수를 흉내 내 동시에 들어온 요청이 최대 배치 크기를 넘지 않게 묶이는지(요청 하나가 더 큰 경우 제외),
+결과가 호출자별로 올바르게 나뉘는지 확인합니다. 실패하면 AssertionError로 종료됩니다.
+
+Usage:
+    poetry run python3 scripts/test/coalescer.py
+        -m, --max-batch-size: 최대 배치 크기 (default: 8)
+"""
+
+import argparse
+import asyncio
+import random
+
+from services.base.coalescer import Coalescer, scatter_in_order
+
+
+async def main(max_batch_size: int):
+    batches = []
+
+    async def send(key, texts, session):
+        batches.append(len(texts))
+        await asyncio.sleep(0)
+        return [f"{key}:{text}" for text in texts]
+
+    coalescer = Coalescer("test.coalescer", send, scatter_in_order, window=0.01, max_batch_size=max_batch_size)
+    session = object()
+
+    # 1. 최대 배치 크기: 대기 중인 요청에 더하면 넘치는 요청은 다음 배치로
+    random.seed(0)
+    sizes = [random.randint(1, max_batch_size) for _ in range(50)] + [max_batch_size * 2 + 1]
+    requests = [[f"{idx}-{seq}" for seq in range(size)] for idx, size in enumerate(sizes)]
+    results = await asyncio.gather(*(coalescer.submit("k", texts, session) for texts in requests))
+
+    assert sum(batches) == sum(sizes), batches
+    assert all(size <= max_batch_size for size in batches if size != max_batch_size * 2 + 1), batches
+    print(f"max batch size: ok ({len(sizes)} requests -> {len(batches)} batches, largest {max(batches)})")
+
+    # 2. 결과 분배: 호출자별로 자신의 입력 순서대로 받음
+    for texts, result in zip(requests, results):
+        assert result == [f"k:{text}" for text in texts], (texts, result)
+    print("scatter: ok")
+
+    # 3. key별로 따로 묶음
+    batches.clear()
+    a, b = await asyncio.gather(coalescer.submit("a", ["x"], session), coalescer.submit("b", ["y"], session))
+    assert (a, b) == (["a:x"], ["b:y"]) and batches == [1, 1], batches
+    print("grouping by key: ok")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-m", "--max-batch-size", dest="max_batch_size", default="8")
+    args = parser.parse_args()
+
+    asyncio.run(main(int(args.max_batch_size)))
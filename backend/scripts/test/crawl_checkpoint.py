@@ -0,0 +1,152 @@
+"""크롤링 체크포인트(`crawl_checkpoints`) 검증 스크립트
+
+SQLite 메모리 DB에 체크포인트 테이블만 만들고, 가짜 scrape / embed / persist 단계를 쓰는 공지사항 크롤링 서비스로
+다음을 확인합니다. 실패하면 AssertionError로 종료됩니다.
+
+- 크롤링이 중간에 실패하면 url별 처리 단계(discovered / scraped / embedded / persisted)가 남음
+- `resume_frontier`는 저장하지 못한 url만 목록 순서대로 반환하고, 이어서 실행하면 나머지 url만 처리됨
+- 모든 url을 저장하면 체크포인트가 삭제됨
+
+Usage:
+    poetry run python3 scripts/test/crawl_checkpoint.py
+        -n, --urls: 게시글 수 (default: 24)
+"""
+
+import argparse
+import asyncio
+from collections import Counter
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from db.common import session_context_var
+from db.models.crawl import CrawlCheckpointModel, CrawlStatusEnum
+from db.repositories.base import transaction
+from db.repositories.crawl import CrawlCheckpointRepository
+from services.notice.crawler.base import BaseNoticeCrawlerService
+
+
+def sqlite_session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+
+    # pysqlite의 SAVEPOINT 처리 (중첩 트랜잭션)
+    @event.listens_for(engine, "connect")
+    def do_connect(dbapi_connection, _):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def do_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    CrawlCheckpointModel.__table__.create(engine)
+    return sessionmaker(bind=engine, expire_on_commit=False)()
+
+
+class FakeNoticeRepository:
+
+    def __init__(self):
+        self.saved = []
+
+    def create_all(self, objects):
+        self.saved += objects
+        return objects
+
+    def find_content_hashes(self, urls):
+        return []
+
+    def find_all_by_urls(self, urls):
+        return []
+
+
+class FakeNoticeCrawlerService(BaseNoticeCrawlerService):
+
+    def __init__(self, fail_url=None):
+        self.notice_repo = FakeNoticeRepository()
+        self.checkpoint_repo = CrawlCheckpointRepository()
+        self.fail_url = fail_url
+        self.calls = Counter()
+
+    async def prepare_batch(self, urls, **kwargs):
+        self.calls["scrape"] += len(urls)
+        await asyncio.sleep(0.01)
+        return [{"url": url, "info": {}, "attachments": []} for url in urls]
+
+    async def embed_batch(self, notices):
+        self.calls["embed"] += len(notices)
+        await asyncio.sleep(0.01)
+        if any(notice["url"] == self.fail_url for notice in notices):
+            raise TimeoutError("embed timeout")
+        return notices
+
+    def notice_hash(self, dto):
+        return dto["url"]
+
+    def dto2orm(self, dto, **kwargs):
+        return dto
+
+    def orm2dto(self, orm, **kwargs):
+        return orm
+
+    def add_semester_info(self, semesters=[], urls=None):
+        return 0
+
+    async def run_crawling_pipeline(self, **kwargs):
+        checkpoint = self.checkpoint_key("정보컴퓨터공학부", "공지사항")
+        urls = await self.resume_frontier(checkpoint) if kwargs.get("resume") else None
+        if urls is None:
+            urls = kwargs["urls"]
+            await self.start_frontier(urls, checkpoint)
+
+        dtos, _ = await self.run_batches(urls, interval=4, name="[test]", checkpoint=checkpoint)
+        await self.finish_frontier(checkpoint)
+        return dtos
+
+
+async def main(n: int):
+    session_context_var.set(sqlite_session())
+    repo = CrawlCheckpointRepository()
+    urls = [f"https://cse.pusan.ac.kr/bbs/cse/2605/{1000 - idx}/artclView.do" for idx in range(n)]
+    checkpoint = {"source": "notice", "department": "정보컴퓨터공학부", "category": "공지사항"}
+
+    with transaction():
+        # 1. 중간에 실패하면 url별 처리 단계가 남음
+        failing = FakeNoticeCrawlerService(fail_url=urls[n // 2])
+        try:
+            await failing.run_crawling_pipeline(urls=urls)
+            raise AssertionError("예외가 전달되지 않았습니다.")
+        except TimeoutError:
+            pass
+
+        rows = repo.find_frontier(**checkpoint)
+        statuses = Counter(row.status for row in rows)
+        persisted = {row.url for row in rows if row.status == CrawlStatusEnum.persisted}
+        assert [row.url for row in rows] == urls
+        assert len({row.run_id for row in rows}) == 1
+        assert persisted == {notice["url"] for notice in failing.notice_repo.saved}, statuses
+        assert 0 < len(persisted) < n, statuses
+        print(f"checkpoint after failure: ok ({dict((status.value, count) for status, count in statuses.items())})")
+
+        # 2. 이어서 실행하면 저장하지 못한 url만 처리
+        resumed = FakeNoticeCrawlerService()
+        pending = await resumed.resume_frontier(checkpoint)
+        assert pending == [url for url in urls if url not in persisted]
+
+        dtos = await resumed.run_crawling_pipeline(resume=True)
+        assert resumed.calls["scrape"] == len(pending)
+        assert sorted(dto["url"] for dto in dtos) == sorted(pending)
+        assert {dto["url"] for dto in failing.notice_repo.saved + resumed.notice_repo.saved} == set(urls)
+        print(f"resume: ok ({len(persisted)} persisted, {len(pending)} resumed)")
+
+        # 3. 모두 저장하면 체크포인트 삭제, 체크포인트가 없으면 새로 크롤링
+        assert repo.find_frontier(**checkpoint) == []
+        assert await resumed.resume_frontier(checkpoint) is None
+        print("checkpoint cleared: ok")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--urls", dest="urls", default="24")
+    args = parser.parse_args()
+
+    asyncio.run(main(int(args.urls)))
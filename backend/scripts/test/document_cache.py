@@ -0,0 +1,110 @@
+"""첨부파일 파싱 중복 제거 / 캐시(`scrape.extract_documents_async`) 검증 스크립트
+
+첨부파일과 `/extract_text`를 흉내 내는 로컬 서버를 띄우고, 배치 안의 중복 url 제거, 캐시 적중,
+ETag 변경 시 재파싱, 검증 헤더가 없는 파일의 크기(약한 검증자) 사용을 확인합니다. 실패하면 AssertionError로 종료됩니다.
+
+Usage:
+    poetry run python3 scripts/test/document_cache.py
+        -p, --port: 로컬 서버 포트 (default: 8095)
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+
+import aiohttp
+from aiohttp import web
+
+from services.base.cache import DocumentCache
+from services.base.crawler import scrape
+
+
+def create_document_app() -> web.Application:
+    """
+    - `/etag/{name}`: `ETag: "<name>-<version>"` 헤더와 함께 응답 (`app["versions"]`로 파일 변경)
+    - `/raw/{name}`: ETag / Last-Modified 없이 `name`으로 정해지는 내용만 응답, GET 요청 수를 `app["downloads"]`에 기록
+    - `/extract_text`: url 목록을 받아 url별 `{"0": "<p>url</p>"}` 반환, 요청받은 url을 `app["parsed"]`에 기록
+    """
+    app = web.Application()
+    app["versions"], app["parsed"], app["downloads"] = {}, [], 0
+
+    async def etag(req: web.Request):
+        name = req.match_info["name"]
+        version = app["versions"].get(name, 1)
+        return web.Response(body=f"{name}-{version}".encode(), headers={"ETag": f'"{name}-{version}"'})
+
+    async def raw(req: web.Request):
+        if req.method == "GET":
+            app["downloads"] += 1
+        return web.Response(body=req.match_info["name"].encode())
+
+    async def extract_text(req: web.Request):
+        urls = (await req.json())["url"]
+        app["parsed"].extend(urls)
+        return web.json_response([{"0": f"<p>{url}</p>"} for url in urls])
+
+    app.router.add_get("/etag/{name}", etag)
+    app.router.add_get("/raw/{name}", raw)
+    app.router.add_post("/extract_text", extract_text)
+    return app
+
+
+async def main(port: int):
+    app = create_document_app()
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    base_url = f"http://127.0.0.1:{port}"
+    scrape.DOCUMENT_PARSER_URL = base_url
+    parsed: list = app["parsed"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        async with aiohttp.ClientSession() as session:
+
+            async def extract(urls):
+                parsed.clear()
+                results = await scrape.extract_documents_async(urls, session)
+                assert results == [{"0": f"<p>{url}</p>"} for url in urls], results
+                return sorted(parsed)
+
+            a, b, c = (f"{base_url}/etag/{name}" for name in "abc")
+            raw_x, raw_y = f"{base_url}/raw/x", f"{base_url}/raw/yy"
+
+            # 1. 캐시 없이도 배치 안의 중복 url은 한 번만 파싱
+            scrape._document_cache, scrape._document_cache_loaded = None, True
+            assert await extract([a, b, a, c, b]) == [a, b, c]
+            print("dedupe without cache: ok")
+
+            # 2. 캐시 적중 시 파서를 호출하지 않음
+            scrape._document_cache = DocumentCache(os.path.join(tmp, "documents.db"), max_bytes=1024**2)
+            assert await extract([a, b]) == [a, b]
+            assert await extract([a, b, a]) == []
+            print("cache hit: ok")
+
+            # 3. ETag가 바뀐 파일만 다시 파싱
+            app["versions"]["a"] = 2
+            assert await extract([a, b, c]) == [a, c]
+            print("etag change: ok")
+
+            # 4. 검증 헤더가 없으면 파일을 내려받지 않고 url + 파일 크기로 캐시
+            assert await extract([raw_x, raw_y]) == [raw_x, raw_y]
+            assert await extract([raw_x, raw_y]) == []
+            assert app["downloads"] == 0, app["downloads"]
+            assert await scrape.document_validator(raw_y, session) == "length:2"
+            print("size validator without download: ok")
+
+            stats = scrape.document_stats()
+            assert stats["saved"] == stats["requested"] - stats["parsed"] > 0
+            print(f"stats: {stats}, cache: {scrape._document_cache.stats()}")
+            scrape._document_cache.close()
+
+    await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-p", "--port", dest="port", default="8095")
+    args = parser.parse_args()
+
+    asyncio.run(main(int(args.port)))
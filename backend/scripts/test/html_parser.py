@@ -0,0 +1,187 @@
+"""HTML 파서 backend(`HTML_PARSER`) 동등성 검증 스크립트
+
+`scripts/test/corpus/<crawler>/` 아래 페이지를 backend별로 파싱하여 각 crawler의 파싱 결과(경로 목록, DTO)가
+html5lib 결과와 같은지 비교합니다. 파일 이름이 `list`로 시작하면 목록 페이지, `detail`로 시작하면 상세 페이지로
+처리하며, 목록 페이지는 crawler의 `list_strainer`로 부분 파싱한 결과(`+strainer`)도 비교합니다.
+기본 corpus는 각 사이트의 구조와 흔한 마크업 오류(닫히지 않은 태그, 누락된 tbody 등)를 재현한 페이지이며,
+`--fetch`로 실제 페이지를 추가할 수 있습니다. 다른 결과가 있으면 AssertionError로 종료됩니다.
+
+Usage:
+    poetry run python3 scripts/test/html_parser.py
+        -p, --parsers: 검증할 파서 목록 (default: 설치된 모든 파서)
+        -c, --corpus: corpus 경로 (default: scripts/test/corpus)
+        -f, --fetch: corpus에 저장할 페이지 url
+        -o, --out: `--fetch` 저장 경로 (예: notice/detail_cse.html)
+"""
+
+import argparse
+from datetime import date
+import importlib.util
+import json
+import os
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from bs4 import BeautifulSoup, SoupStrainer
+import requests
+
+from services.base.crawler.scrape import HTML_PARSERS, parse_html
+from services.notice.crawler.default import NoticeCrawler
+from services.notice.crawler.me import MENoticeCrawler
+from services.notice.crawler.pnu import PNUNoticeCrawler
+from services.professor.crawler.default import ProfessorCrawler
+from services.support.crawler import SupportCrawler
+
+CORPUS = os.path.join(os.path.dirname(__file__), "corpus")
+
+Check = Tuple[str, Callable[[BeautifulSoup], Any]]
+
+notice, me_notice, pnu_notice = NoticeCrawler(), MENoticeCrawler(), PNUNoticeCrawler()
+support, professor = SupportCrawler(), ProfessorCrawler()
+
+# corpus 디렉토리 -> 페이지 종류 -> (이름, 파싱 함수) 목록
+CHECKS: Dict[str, Dict[str, List[Check]]] = {
+    "notice": {
+        "list": [
+            ("NoticeCrawler.paths", lambda soup: notice._parse_paths_from_table_element(soup)),
+            ("NoticeCrawler.paths(important)", lambda soup: notice._parse_paths_from_table_element(
+                soup,
+                is_important=True,
+            )),
+            ("NoticeCrawler.paths(common)", lambda soup: notice._parse_paths_from_table_element(
+                soup,
+                is_important=True,
+                is_common=True,
+            )),
+        ],
+        "detail": [("NoticeCrawler.detail", lambda soup: notice._parse_detail(soup))],
+    },
+    "me_notice": {
+        "list": [
+            ("MENoticeCrawler.seqs", lambda soup: me_notice._parse_seq_list(soup, date(2025, 1, 1))),
+            ("MENoticeCrawler.important_seqs", lambda soup: me_notice._parse_important_seqs(soup)),
+            ("MENoticeCrawler.last_seq", lambda soup: me_notice._parse_last_seq(soup)),
+        ],
+        "detail": [("MENoticeCrawler.detail", lambda soup: me_notice._parse_detail(soup))],
+    },
+    "pnu_notice": {
+        "list": [
+            ("PNUNoticeCrawler.paths", lambda soup: pnu_notice._parse_paths_from_table_element(soup)),
+            ("PNUNoticeCrawler.paths(important)", lambda soup: pnu_notice._parse_paths_from_table_element(
+                soup,
+                is_important=True,
+            )),
+        ],
+        "detail": [("PNUNoticeCrawler.detail", lambda soup: pnu_notice._parse_detail(soup))],
+    },
+    "support": {
+        "detail": [("SupportCrawler.detail", lambda soup: support._parse_detail(soup))],
+    },
+    "professor": {
+        "list": [("ProfessorCrawler.paths", lambda soup: professor._parse_paths(soup))],
+        "detail": [("ProfessorCrawler.detail", lambda soup: professor._parse_detail({"info": {}}, soup))],
+    },
+}
+
+# 목록 페이지 부분 파싱 대상
+STRAINERS: Dict[str, Optional[SoupStrainer]] = {
+    "notice": notice.list_strainer,
+    "me_notice": me_notice.list_strainer,
+    "pnu_notice": pnu_notice.list_strainer,
+}
+
+
+def available_parsers() -> List[str]:
+    modules = {"html5lib": "html5lib", "lxml": "lxml", "lexbor": "selectolax"}
+    return [parser for parser in HTML_PARSERS if importlib.util.find_spec(modules[parser]) is not None]
+
+
+def run_check(
+    func: Callable[[BeautifulSoup], Any],
+    html: str,
+    parser: str,
+    parse_only: Optional[SoupStrainer] = None,
+) -> str:
+    """파싱 결과를 비교할 수 있는 JSON 문자열로 변환 (예외는 호출한 쪽으로 전달)"""
+    result = func(parse_html(html, parser, parse_only))  # type: ignore
+    return json.dumps(result, default=str, ensure_ascii=False, sort_keys=True)
+
+
+def iter_pages(corpus: str):
+    for crawler, pages in CHECKS.items():
+        directory = os.path.join(corpus, crawler)
+        if not os.path.isdir(directory):
+            continue
+
+        for filename in sorted(os.listdir(directory)):
+            kind = filename.split("_")[0].removesuffix(".html")
+            if not filename.endswith(".html") or kind not in pages:
+                continue
+
+            with open(os.path.join(directory, filename), encoding="utf-8") as f:
+                html = f.read()
+
+            for name, func in pages[kind]:
+                yield f"{crawler}/{filename}", name, func, html
+
+
+def main(parsers: List[str], corpus: str):
+    variants = [(parser, False) for parser in parsers] + [(parser, True) for parser in parsers]
+    print(f"{'page':>26} | {'check':>34} | " +
+          " | ".join(f"{parser + ('+strainer' if strained else ''):>17}" for parser, strained in variants))
+
+    failures = []
+    for page, name, func, html in iter_pages(corpus):
+        # 기준(html5lib) 파싱이 실패하면 다른 파서와 같은 예외여도 실패로 처리
+        try:
+            expected = run_check(func, html, "html5lib")
+        except Exception as e:
+            print(f"{page:>26} | {name:>34} | html5lib ERROR")
+            failures.append((page, name, "html5lib", f"{type(e).__name__}: {e}", ""))
+            continue
+
+        strainer = STRAINERS.get(page.split("/")[0]) if page.split("/")[-1].startswith("list") else None
+        row = []
+        for parser, strained in variants:
+            if strained and strainer is None:
+                row.append("-")
+                continue
+
+            try:
+                actual = run_check(func, html, parser, strainer if strained else None)
+            except Exception as e:
+                actual = f"{type(e).__name__}: {e}"
+            row.append("ok" if actual == expected else "DIFF")
+            if actual != expected:
+                failures.append((page, name, parser + ("+strainer" if strained else ""), expected, actual))
+
+        print(f"{page:>26} | {name:>34} | " + " | ".join(f"{cell:>17}" for cell in row))
+
+    for page, name, parser, expected, actual in failures:
+        # 처음 달라지는 위치 주변만 출력
+        st = next((idx for idx, (a, b) in enumerate(zip(expected, actual)) if a != b), min(len(expected), len(actual)))
+        st = max(0, st - 80)
+        print(f"\n[{parser}] {page} {name}")
+        print(f"  html5lib: ...{expected[st:st + 200]!r}\n  {parser}: ...{actual[st:st + 200]!r}")
+
+    assert not failures, f"{len(failures)}개의 결과가 html5lib과 다릅니다."
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-p", "--parsers", dest="parsers", default=None)
+    parser.add_argument("-c", "--corpus", dest="corpus", default=CORPUS)
+    parser.add_argument("-f", "--fetch", dest="fetch", default=None)
+    parser.add_argument("-o", "--out", dest="out", default=None)
+    args = parser.parse_args()
+
+    if args.fetch:
+        if not args.out:
+            raise ValueError("'--out' must be provided")
+
+        res = requests.get(args.fetch, timeout=60)
+        res.raise_for_status()
+        with open(os.path.join(args.corpus, args.out), "w", encoding="utf-8") as f:
+            f.write(res.text)
+
+    parsers = args.parsers.split(",") if args.parsers else available_parsers()
+    main(parsers, args.corpus)
@@ -0,0 +1,76 @@
+"""`services.base.orchestrator.Orchestrator` 검증 스크립트
+
+지연만 있는 가짜 크롤링 작업으로 다음을 확인합니다. 실패하면 AssertionError로 종료됩니다.
+
+- 전체 동시 작업 수가 `concurrency`를 넘지 않고, 같은 호스트의 작업은 `host_concurrency`개씩만 실행됨
+- 차례로 실행할 때보다 빠름
+- 한 작업이 실패해도 나머지 작업은 완료되고, 실패한 작업은 결과표에 기록됨
+
+Usage:
+    poetry run python3 scripts/test/orchestrator.py
+        -j, --jobs: 작업 수 (default: 12)
+        -l, --latency: 작업당 소요 시간 (초, default: 0.1)
+"""
+
+import argparse
+import asyncio
+from collections import Counter
+from functools import partial
+import time
+
+from services.base.orchestrator import CrawlJob, Orchestrator, summary_table
+
+
+async def main(jobs: int, latency: float):
+    running, max_running = Counter(), Counter()
+
+    async def run(name: str, host: str):
+        running[host] += 1
+        running["*"] += 1
+        max_running[host] = max(max_running[host], running[host])
+        max_running["*"] = max(max_running["*"], running["*"])
+        try:
+            await asyncio.sleep(latency)
+            if name == "job3":
+                raise ConnectionError("connection reset")
+            return [name] * 2, 1
+        finally:
+            running[host] -= 1
+            running["*"] -= 1
+
+    hosts = ["a.pusan.ac.kr", "b.pusan.ac.kr", "c.pusan.ac.kr"]
+    crawl_jobs = [
+        CrawlJob(name=f"job{idx}", host=hosts[idx % len(hosts)], run=partial(run, f"job{idx}", hosts[idx % len(hosts)]))
+        for idx in range(jobs)
+    ]
+
+    st = time.perf_counter()
+    results = await Orchestrator(concurrency=4, host_concurrency=1).run(crawl_jobs)
+    elapsed = time.perf_counter() - st
+
+    assert max_running["*"] <= 4, max_running
+    assert all(max_running[host] == 1 for host in hosts), max_running
+    print(f"concurrency: ok (max {max_running['*']} jobs, 1 per host)")
+
+    assert elapsed < jobs * latency * 0.5, elapsed
+    print(f"overlap: ok (sequential {jobs * latency:.2f}s -> {elapsed:.2f}s)")
+
+    assert [result.name for result in results] == [job.name for job in crawl_jobs]
+    failed = [result for result in results if result.error]
+    assert [result.name for result in failed] == ["job3"] and isinstance(failed[0].error, ConnectionError)
+    assert sum(result.items for result in results) == (jobs - 1) * 2
+    print("failure isolation: ok")
+
+    table = summary_table(results)
+    assert "ConnectionError: connection reset" in table
+    assert f"total {jobs} jobs, 1 failed, {(jobs - 1) * 2} notices, {jobs - 1} pages" in table
+    print(table)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-j", "--jobs", dest="jobs", default="12")
+    parser.add_argument("-l", "--latency", dest="latency", default="0.1")
+    args = parser.parse_args()
+
+    asyncio.run(main(int(args.jobs), float(args.latency)))
@@ -0,0 +1,92 @@
+"""`services.base.pipeline.Pipeline` 검증 스크립트
+
+단계마다 지연을 주는 가짜 scrape / embed / persist 단계로 다음을 확인합니다. 실패하면 AssertionError로 종료됩니다.
+
+- 모든 배치가 한 번씩 마지막 단계까지 처리되고, 기존처럼 배치를 차례로 처리할 때(lockstep)보다 빠름
+- 큐 크기 제한으로 처리 중이거나 대기 중인 배치 수가 제한됨 (backpressure)
+- 한 단계의 예외가 그대로 전달되고 나머지 단계가 취소됨
+
+Usage:
+    poetry run python3 scripts/test/pipeline.py
+        -b, --batches: 배치 수 (default: 12)
+        -l, --latency: 단계별 배치 처리 시간 (초, default: 0.05)
+"""
+
+import argparse
+import asyncio
+import time
+
+from services.base.pipeline import Pipeline, Stage
+
+
+async def main(batches: int, latency: float):
+    in_flight, max_in_flight = 0, 0
+
+    async def scrape(urls):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(latency)
+        return [f"dto:{url}" for url in urls]
+
+    async def embed(dtos):
+        await asyncio.sleep(latency * 2)
+        return [f"{dto}:embedded" for dto in dtos]
+
+    def persist(dtos):
+        nonlocal in_flight
+        time.sleep(latency)
+        in_flight -= 1
+        return dtos
+
+    items = [[f"url{idx}-{n}" for n in range(3)] for idx in range(batches)]
+
+    # 1. lockstep (기존 방식)
+    st = time.perf_counter()
+    for batch in items:
+        persist(await embed(await scrape(batch)))
+    lockstep = time.perf_counter() - st
+
+    # 2. pipeline
+    in_flight, max_in_flight = 0, 0
+    pipeline = Pipeline([
+        Stage("scrape", scrape, workers=2),
+        Stage("embed", embed, workers=2),
+        Stage("persist", persist, blocking=True),
+    ], name="[test]", queue_size=1, report_interval=0)
+
+    st = time.perf_counter()
+    results = await pipeline.run(items)
+    pipelined = time.perf_counter() - st
+
+    assert sorted(sum(results, [])) == sorted(f"dto:{url}:embedded" for batch in items for url in batch)
+    assert pipeline.stats["persist"].items == batches * 3
+    assert pipelined < lockstep * 0.7, (lockstep, pipelined)
+    print(f"overlap: ok (lockstep {lockstep:.2f}s -> pipeline {pipelined:.2f}s)")
+
+    # 작업 중(scrape 2 + embed 2 + persist 1) + 큐 대기(단계별 1) 이상으로 배치가 쌓이지 않음
+    assert max_in_flight <= 2 + 2 + 1 + 3, max_in_flight
+    print(f"backpressure: ok (max in-flight batches {max_in_flight})")
+
+    # 3. 예외 전달
+    async def fail(dtos):
+        if any("url3" in dto for dto in dtos):
+            raise TimeoutError("embed timeout")
+        return await embed(dtos)
+
+    try:
+        await Pipeline([Stage("scrape", scrape), Stage("embed", fail)], report_interval=0).run(items)
+        raise AssertionError("예외가 전달되지 않았습니다.")
+    except TimeoutError as e:
+        assert str(e) == "embed timeout"
+    print("error propagation: ok")
+    print(pipeline.report())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-b", "--batches", dest="batches", default="12")
+    parser.add_argument("-l", "--latency", dest="latency", default="0.05")
+    args = parser.parse_args()
+
+    asyncio.run(main(int(args.batches), float(args.latency)))
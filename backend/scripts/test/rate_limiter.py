@@ -0,0 +1,146 @@
+"""호스트별 요청 속도 제한(`mixins.asyncio.RateLimiter`) 검증 스크립트
+
+초당 요청 수를 넘으면 429로 응답하고, 설정한 구간에서는 응답이 느려지는 로컬 서버에 `scrape_async`로 요청을 보내
+다음을 확인합니다. 실패하면 AssertionError로 종료됩니다.
+
+- 한 번에 요청을 보내도 처음 `burst`개 이후에는 설정한 초당 요청 수에 맞춰 요청하고, 실제 요청 속도가 보고됨
+- 429 응답을 받으면 요청 속도를 줄이고, 정상 응답이 이어지면 다시 늘림
+- 응답 시간이 늘어나면 요청 속도를 줄이고, 첨부파일 검증자 확인은 본문을 기다리지 않음
+
+Usage:
+    poetry run python3 scripts/test/rate_limiter.py
+        -p, --port: 로컬 서버 포트 (default: 8097)
+        -r, --rate: 초당 요청 수 (default: 20)
+"""
+
+import argparse
+import asyncio
+import time
+
+import aiohttp
+from aiohttp import web
+
+from mixins import asyncio as asyncio_mixin
+from mixins.asyncio import HOST_BURST_LIMITS, HOST_RATE_LIMITS, rate_limiter, rate_stats
+from services.base.crawler import scrape
+
+
+def create_app(server_rate: float) -> web.Application:
+    """
+    - `/page/{n}`: 직전 1초 동안 `server_rate`개를 넘게 요청하면 429
+    - `/slow/{n}`: `app["state"]["latency"]`초 뒤 응답
+    - `/download/{n}`: 헤더는 바로 보내고 `app["state"]["latency"]`초 뒤 본문 전송 (검증자 헤더, Content-Length 없음)
+    """
+    app = web.Application()
+    app["arrivals"], app["state"] = [], {"rejected": 0, "latency": 0.0}
+
+    async def page(req: web.Request):
+        now = time.monotonic()
+        app["arrivals"].append(now)
+        if sum(1 for at in app["arrivals"] if now - at <= 1.0) > server_rate:
+            app["state"]["rejected"] += 1
+            raise web.HTTPTooManyRequests()
+        return web.Response(text="<p>ok</p>", content_type="text/html")
+
+    async def slow(req: web.Request):
+        app["arrivals"].append(time.monotonic())
+        await asyncio.sleep(app["state"]["latency"])
+        return web.Response(text="<p>ok</p>", content_type="text/html")
+
+    async def download(req: web.Request):
+        res = web.StreamResponse(headers={"Content-Type": "application/pdf"})
+        await res.prepare(req)
+        if req.method != "HEAD":
+            await asyncio.sleep(app["state"]["latency"])
+            try:
+                await res.write(b"%PDF-1.4 ok")
+            except ConnectionResetError:
+                # 본문을 읽지 않고 연결을 닫은 요청
+                pass
+        return res
+
+    app.router.add_get("/page/{n}", page)
+    app.router.add_get("/slow/{n}", slow)
+    app.router.add_get("/download/{n}", download)
+    return app
+
+
+async def main(port: int, rate: float):
+    burst = 5
+    HOST_RATE_LIMITS["127.0.0.1"], HOST_BURST_LIMITS["127.0.0.1"] = rate, burst
+    HOST_RATE_LIMITS["localhost"], HOST_BURST_LIMITS["localhost"] = rate, burst
+
+    # burst만큼은 초과 허용
+    app = create_app(server_rate=rate + burst)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    arrivals, state = app["arrivals"], app["state"]
+
+    async with aiohttp.ClientSession() as session:
+
+        # 1. 한 번에 보내도 burst 이후에는 초당 `rate`개
+        n = int(rate * 2)
+        results = await scrape.scrape_async([f"http://127.0.0.1:{port}/page/{idx}" for idx in range(n)], session)
+        assert all(not isinstance(result, BaseException) for result in results), results
+        assert state["rejected"] == 0, state
+
+        elapsed = arrivals[-1] - arrivals[0]
+        expected = (n - burst) / rate
+        assert expected * 0.9 <= elapsed <= expected * 1.3, (elapsed, expected)
+
+        achieved = rate_limiter("127.0.0.1").achieved_rate()
+        assert rate * 0.8 <= achieved <= rate * 1.5, achieved
+        print(f"steady rate: ok ({n} requests in {elapsed:.2f}s, achieved {achieved:.1f}/s, limit {rate}/s)")
+
+        # 2. 429 응답 → 요청 속도 감소, 이후 정상 응답으로 회복
+        limiter = asyncio_mixin.RateLimiter("throttled", max_rate=rate, burst=burst)
+        async with limiter.acquire():
+            pass
+        try:
+            async with limiter.acquire():
+                raise scrape.UpstreamStatusError(429, "페이지를 불러오지 못했습니다.")
+        except scrape.UpstreamStatusError:
+            pass
+        assert limiter.rate == rate / 2 and limiter.stats()["backoffs"] == 1, limiter.stats()
+
+        for _ in range(25):
+            async with limiter.acquire():
+                pass
+        assert abs(limiter.rate - rate) < 1e-6, limiter.stats()
+        print(f"backoff on 429: ok ({rate}/s -> {rate / 2}/s -> {limiter.rate:.1f}/s)")
+
+        # 3. 응답 시간 증가 → 요청 속도 감소 (다른 호스트 이름으로 새 limiter 사용)
+        asyncio_mixin.HOST_LATENCY_MIN = 0.1
+        slow = rate_limiter("localhost")
+        state["latency"] = 0.01
+        for idx in range(10):
+            await scrape.scrape_async(f"http://localhost:{port}/slow/{idx}", session)
+        assert slow.rate == rate, slow.stats()
+
+        # 검증 헤더도 크기도 없는 첨부파일은 본문을 기다리지 않고 캐시하지 않음 (본문 전송 시간으로 backoff 하지 않음)
+        state["latency"] = 0.3
+        st = time.monotonic()
+        for idx in range(5):
+            validator = await scrape.document_validator(f"http://localhost:{port}/download/{idx}", session)
+            assert validator is None, validator
+        assert time.monotonic() - st < 5 * state["latency"], time.monotonic() - st
+        assert slow.rate == rate and slow.stats()["backoffs"] == 0, slow.stats()
+        print("slow download body: ok (not downloaded, no backoff)")
+
+        for idx in range(5):
+            await scrape.scrape_async(f"http://localhost:{port}/slow/late-{idx}", session)
+        assert slow.rate < rate and slow.stats()["backoffs"] >= 1, slow.stats()
+        print(f"backoff on latency: ok ({rate}/s -> {slow.rate:.1f}/s)")
+
+    print(f"stats: {rate_stats()}")
+    await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-p", "--port", dest="port", default="8097")
+    parser.add_argument("-r", "--rate", dest="rate", default="20")
+    args = parser.parse_args()
+
+    asyncio.run(main(int(args.port), float(args.rate)))
@@ -0,0 +1,212 @@
+"""`mixins.resilience` 정책 검증 스크립트
+
+장애를 주입하는 로컬 서버를 띄우고 재시도, 4xx 즉시 실패, hedging, circuit breaker(시험 요청 취소, 4xx 제외), 마감 시간,
+`retry_async` 호환 동작, 시도당 제한 시간 초과 시 `AdaptiveLimiter` 감소를 확인합니다. 실패하면 AssertionError로 종료됩니다.
+
+Usage:
+    poetry run python3 scripts/test/resilience.py
+        -p, --port: 장애 주입 서버 포트 (default: 8094)
+"""
+
+import argparse
+import asyncio
+from collections import Counter
+import random
+import time
+
+import aiohttp
+from aiohttp import web
+
+from mixins.asyncio import AdaptiveLimiter, retry_async
+from mixins.http_client import UpstreamStatusError
+from mixins.resilience import CircuitOpenError, DeadlineExceeded, Policy, circuit_breaker, deadline
+
+
+def create_fault_app() -> web.Application:
+    """
+    - `/flaky/{key}?fail=n`: key별로 처음 n번은 503
+    - `/status/{code}`: 항상 해당 상태 코드
+    - `/slow`: 10% 확률로 1초, 나머지는 20ms 뒤 응답
+    - `/hang`: 10초 뒤 응답
+    """
+    app = web.Application()
+    hits: Counter = Counter()
+    app["hits"] = hits
+
+    async def flaky(req: web.Request):
+        key = req.match_info["key"]
+        hits[key] += 1
+        if hits[key] <= int(req.query.get("fail", 2)):
+            raise web.HTTPServiceUnavailable()
+        return web.json_response({"ok": True})
+
+    async def status(req: web.Request):
+        code = int(req.match_info["code"])
+        hits[f"status:{code}"] += 1
+        return web.Response(status=code)
+
+    async def slow(_: web.Request):
+        hits["slow"] += 1
+        await asyncio.sleep(1.0 if random.random() < 0.1 else 0.02)
+        return web.json_response({"ok": True})
+
+    async def hang(_: web.Request):
+        await asyncio.sleep(10)
+        return web.json_response({"ok": True})
+
+    app.router.add_get("/flaky/{key}", flaky)
+    app.router.add_get("/status/{code}", status)
+    app.router.add_get("/slow", slow)
+    app.router.add_get("/hang", hang)
+    return app
+
+
+async def main(port: int):
+    app = create_fault_app()
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    base_url = f"http://127.0.0.1:{port}"
+    hits: Counter = app["hits"]
+
+    async with aiohttp.ClientSession() as session:
+
+        async def get(path: str):
+            async with session.get(f"{base_url}{path}") as res:
+                if res.status != 200:
+                    raise UpstreamStatusError(res.status, path)
+                return await res.json()
+
+        # 1. 일시적인 5xx는 backoff 후 재시도하여 성공
+        policy = Policy("test.flaky", attempts=5, base_delay=0.01)
+        assert await policy.call(get, "/flaky/a?fail=2") == {"ok": True}
+        assert hits["a"] == 3
+        print("retry with backoff: ok")
+
+        # 2. 4xx는 재시도하지 않음
+        try:
+            await Policy("test.status", attempts=5, base_delay=0.01).call(get, "/status/404")
+            raise AssertionError("404 응답이 성공으로 처리되었습니다.")
+        except UpstreamStatusError as e:
+            assert e.status == 404 and hits["status:404"] == 1
+        print("no retry on 4xx: ok")
+
+        # 3. hedging: 느린 응답(10%)이 p90 이후 두 번째 요청으로 대체되어 꼬리 지연 감소
+        async def measure(policy: Policy, n: int = 150):
+            latencies = []
+            for _ in range(n):
+                st = time.monotonic()
+                await policy.call(get, "/slow")
+                latencies.append(time.monotonic() - st)
+            return sorted(latencies)[int(n * 0.95)]
+
+        random.seed(0)
+        plain_p95 = await measure(Policy("test.plain", attempts=1))
+        hedged = Policy("test.hedged", attempts=1, hedge_quantile=0.8, hedge_min_samples=20)
+        hedged_p95 = await measure(hedged)
+        assert hedged_p95 < plain_p95 / 2, (plain_p95, hedged_p95)
+        print(f"hedging: ok (p95 {plain_p95 * 1000:.0f}ms -> {hedged_p95 * 1000:.0f}ms)")
+
+        # 4. circuit breaker: 연속 실패 후 서버를 호출하지 않고 바로 실패, reset_timeout 뒤 시험 요청
+        circuit_breaker("test.down", failure_threshold=3, reset_timeout=0.3)
+        down = Policy("test.down", attempts=10, base_delay=0.01, breaker="test.down")
+        try:
+            await down.call(get, "/status/503")
+            raise AssertionError("503 응답이 성공으로 처리되었습니다.")
+        except CircuitOpenError:
+            assert hits["status:503"] == 3
+
+        st = time.monotonic()
+        try:
+            await down.call(get, "/status/503")
+        except CircuitOpenError:
+            assert hits["status:503"] == 3 and time.monotonic() - st < 0.05
+
+        await asyncio.sleep(0.35)
+        try:
+            await down.call(get, "/status/503")
+        except CircuitOpenError:
+            assert hits["status:503"] == 4
+
+        # 취소된 시험 요청은 half-open 상태를 막지 않음
+        await asyncio.sleep(0.35)
+        try:
+            await asyncio.wait_for(down.call(get, "/hang"), timeout=0.05)
+            raise AssertionError("시험 요청이 취소되지 않았습니다.")
+        except asyncio.TimeoutError:
+            pass
+        try:
+            await down.call(get, "/status/503")
+        except CircuitOpenError:
+            assert hits["status:503"] == 5
+        print("circuit breaker: ok")
+
+        # 4xx(요청 오류)는 circuit을 열지 않음
+        circuit_breaker("test.client", failure_threshold=3, reset_timeout=10)
+        client = Policy("test.client", attempts=1, breaker="test.client")
+        for _ in range(5):
+            try:
+                await client.call(get, "/status/400")
+            except UpstreamStatusError:
+                pass
+        breaker = circuit_breaker("test.client")
+        assert hits["status:400"] == 5 and breaker.state == breaker.CLOSED, breaker.state
+        print("4xx does not open circuit: ok")
+
+        # 5. 마감 시간: 시도당 제한 시간보다 남은 시간이 짧으면 남은 시간 안에서 실패
+        st = time.monotonic()
+        try:
+            with deadline(0.3):
+                await Policy("test.hang", attempts=5, base_delay=0.01, timeout=5).call(get, "/hang")
+            raise AssertionError("마감 시간이 적용되지 않았습니다.")
+        except DeadlineExceeded:
+            assert time.monotonic() - st < 0.5
+        print("deadline: ok")
+
+        # 6. retry_async 호환: 고정 간격 재시도, 모두 실패하면 TimeoutError
+        @retry_async(times=3, delay=0.01)
+        async def always_fail():
+            return await get("/status/500")
+
+        try:
+            await always_fail()
+            raise AssertionError("500 응답이 성공으로 처리되었습니다.")
+        except TimeoutError:
+            assert hits["status:500"] == 3
+        print("retry_async shim: ok")
+
+        # 7. 정책 + AdaptiveLimiter: 시도당 제한 시간 초과(취소)는 과부하로 보고 제한을 절반으로, 일반 취소는 무시
+        limiter = AdaptiveLimiter("test.adaptive", max_limit=16, latency_target=0.5)
+
+        @Policy("test.limited", attempts=1, timeout=0.05)
+        async def limited_hang():
+            async with limiter.acquire():
+                return await get("/hang")
+
+        try:
+            await limited_hang()
+            raise AssertionError("제한 시간이 적용되지 않았습니다.")
+        except TimeoutError:
+            assert limiter.current == 4.0, limiter.current
+
+        async def unlimited_hang():
+            async with limiter.acquire():
+                return await get("/hang")
+
+        limiter._last_decrease = 0.0
+        task = asyncio.create_task(unlimited_hang())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        assert limiter.current == 4.0, limiter.current
+        print("policy timeout with adaptive limiter: ok")
+
+    await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-p", "--port", dest="port", default="8094")
+    args = parser.parse_args()
+
+    asyncio.run(main(int(args.port)))
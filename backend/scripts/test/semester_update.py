@@ -0,0 +1,111 @@
+"""게시글 학기 지정(`add_semester_info`) 검증 스크립트
+
+SQLite 메모리 DB에 학기 / 학교 공지사항 테이블만 만들고 다음을 확인합니다. 실패하면 AssertionError로 종료됩니다.
+
+- 작성일이 학기 기간에 포함되는 게시글에 해당 학기가 지정되고, 기간 밖의 게시글은 그대로 유지됨
+- 학기 수와 관계없이 UPDATE 문 하나로 처리되고, 게시글(벡터 / 청크)을 불러오지 않음
+- `urls`를 지정하면 해당 게시글만 갱신하고, 이미 같은 학기인 게시글은 다시 쓰지 않음
+
+Usage:
+    poetry run python3 scripts/test/semester_update.py
+        -n, --notices: 게시글 수 (default: 400)
+"""
+
+import argparse
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from db.common import session_context_var
+from db.models.calendar import SemesterModel, SemesterTypeEnum
+from db.models.notice import PNUNoticeModel
+from db.repositories.calendar import SemesterRepository
+from db.repositories.notice import PNUNoticeRepository
+from services.notice.base import BasePNUNoticeService
+from services.notice.crawler.base import DEFAULT_SEMESTERS, BaseNoticeCrawlerService
+
+SEMESTERS = [
+    (SemesterTypeEnum.spring_semester, date(2024, 3, 1), date(2024, 6, 21)),
+    (SemesterTypeEnum.summer_vacation, date(2024, 6, 22), date(2024, 8, 31)),
+    (SemesterTypeEnum.fall_semester, date(2024, 9, 1), date(2024, 12, 20)),
+    (SemesterTypeEnum.winter_vacation, date(2024, 12, 21), date(2025, 2, 28)),
+]
+
+
+class FakePNUNoticeCrawlerService(BaseNoticeCrawlerService[PNUNoticeModel], BasePNUNoticeService):
+
+    def __init__(self):
+        self.notice_repo = PNUNoticeRepository()
+        self.semester_repo = SemesterRepository()
+
+    async def prepare_batch(self, urls, **kwargs):
+        return []
+
+    async def run_crawling_pipeline(self, **kwargs):
+        return []
+
+
+def main(n: int):
+    engine = create_engine("sqlite://")
+    SemesterModel.__table__.create(engine)
+    PNUNoticeModel.__table__.create(engine)
+
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    session_context_var.set(session)
+    session.add_all([SemesterModel(year=2024, type_=type_, st_date=st, ed_date=ed) for type_, st, ed in SEMESTERS])
+
+    # 2024-02-01부터 하루 간격, 학기 기간(2024-03-01 ~ 2025-02-28) 밖의 게시글 포함
+    dates = [date(2024, 2, 1) + timedelta(days=idx) for idx in range(n)]
+    session.add_all([
+        PNUNoticeModel(url=f"https://www.pusan.ac.kr/board_seq={idx}", title=f"공지 {idx}", content="", date=day)
+        for idx, day in enumerate(dates)
+    ])
+    session.commit()
+
+    semester_ids = {type_: id_ for id_, type_ in session.query(SemesterModel.id, SemesterModel.type_)}
+
+    def expected(day: date):
+        return next((semester_ids[type_] for type_, st, ed in SEMESTERS if st <= day <= ed), None)
+
+    service = FakePNUNoticeCrawlerService()
+    semesters = [semester for semester in DEFAULT_SEMESTERS if semester["year"] == 2024]
+
+    # 1. 일부 url만 갱신
+    urls = [f"https://www.pusan.ac.kr/board_seq={idx}" for idx in range(0, n, 10)]
+    partial = service.add_semester_info(semesters, urls=urls)
+    rows = dict(session.query(PNUNoticeModel.url, PNUNoticeModel.semester_id))
+    assert partial == sum(1 for url in urls if rows[url] is not None)
+    assert all(rows[url] is None for url in rows if url not in urls)
+    print(f"urls only: ok ({partial}/{len(urls)} notices)")
+
+    # 2. 전체 갱신은 UPDATE 한 번, 게시글을 SELECT하지 않음
+    statements.clear()
+    affected = service.add_semester_info(semesters)
+    updates = [statement for statement in statements if statement.startswith("UPDATE")]
+    selects = [statement for statement in statements if statement.startswith("SELECT")]
+    assert len(updates) == 1 and all("FROM pnu_notices" not in statement for statement in selects), statements
+
+    rows = session.query(PNUNoticeModel.date, PNUNoticeModel.semester_id).all()
+    assert all(semester_id == expected(day) for day, semester_id in rows)
+    assignable = sum(1 for day in dates if expected(day) is not None)
+    assert affected == assignable - partial, affected
+    print(f"all notices: ok ({affected} updated, {n - assignable} outside semesters, {len(statements)} statements)")
+
+    # 3. 이미 같은 학기면 다시 쓰지 않음
+    assert service.add_semester_info(semesters) == 0
+    print("unchanged: ok (0 updated)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--notices", dest="notices", default="400")
+    args = parser.parse_args()
+
+    main(int(args.notices))
@@ -1,4 +1,4 @@
-from mixins.asyncio import retry_async
+from mixins.resilience import CircuitOpenError, Policy
 from services.base.service import BaseService
 
 from .schemas import (
@@ -17,6 +17,17 @@ from openai.types.chat import ChatCompletionMessageParam
 from openai.types.chat_model import ChatModel
 from services.base.service import BaseService
 
+LLM_POLICY = Policy(
+    "llm",
+    attempts=4,
+    base_delay=1,
+    max_delay=10,
+    timeout=60,
+    breaker="openai",
+    is_success=lambda res: res is not None,
+    retry_on=lambda e: not isinstance(e, (CircuitOpenError, openai.BadRequestError, openai.AuthenticationError)),
+)
+
 
 class P0_Base(BaseService, Generic[ResponseFormatT]):
 
@@ -45,7 +56,7 @@ class P0_Base(BaseService, Generic[ResponseFormatT]):
             "content": self._system_prompt,
         }
 
-    @retry_async(is_success=lambda res: res is not None)
+    @LLM_POLICY
     async def inference(
         self,
         question: str,
@@ -0,0 +1,362 @@
+"""임베딩 / 리랭크 / 첨부파일 파싱 캐시
+
+- `EmbeddingCache`: (정규화된 텍스트, 모델, 요청 옵션) 해시를 key로 dense/sparse 벡터를 float32 blob으로
+  SQLite에 저장합니다. 크기 상한을 넘으면 가장 오래 조회되지 않은 항목부터 삭제합니다(LRU).
+- `DocumentCache`: 첨부파일 url + 검증자(ETag, 파일 크기 + Last-Modified 또는 파일 크기)를 key로
+  `DOCUMENT_PARSER_URL` 추출 결과(페이지별 HTML)를 SQLite에 저장합니다. 크기 상한은 `EmbeddingCache`와 같은 LRU입니다.
+- `RerankCache`: (정규화된 질의, chunk id, chunk 내용 해시)별 리랭크 점수를 프로세스 메모리에 LRU로 보관합니다.
+"""
+
+from array import array
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import unicodedata
+from typing import Dict, Hashable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from config.logger import _logger
+from mixins import metrics
+from services.base.dto import EmbedResult
+
+logger = _logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    key BLOB PRIMARY KEY,
+    chunk TEXT,
+    dense BLOB NOT NULL,
+    sparse_indices BLOB NOT NULL,
+    sparse_values BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_embeddings_accessed_at ON embeddings (accessed_at);
+"""
+
+_DOCUMENT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    key BLOB PRIMARY KEY,
+    url TEXT,
+    pages TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_documents_accessed_at ON documents (accessed_at);
+CREATE INDEX IF NOT EXISTS ix_documents_url ON documents (url);
+"""
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class _SQLiteCache:
+    """SQLite(WAL)에 저장하고 크기 상한을 넘으면 가장 오래 조회되지 않은 항목부터 삭제하는(LRU) 캐시
+
+    `table`의 첫 열은 key, 마지막 두 열은 size / accessed_at이어야 합니다.
+    """
+
+    table: str
+    schema: str
+    label: str
+
+    def __init__(self, path: str, max_bytes: int, metric_prefix: str):
+        self.path = path
+        self.max_bytes = max_bytes
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.schema)
+
+        row = self._conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {self.table}").fetchone()
+        self._total_bytes: int = row[0]
+
+        self._hits = metrics.counter(f"{metric_prefix}.hits")
+        self._misses = metrics.counter(f"{metric_prefix}.misses")
+        self._evictions = metrics.counter(f"{metric_prefix}.evictions")
+        self._bytes = metrics.gauge(f"{metric_prefix}.bytes")
+        self._bytes.set(self._total_bytes)
+
+    def _select(self, columns: str, keys: Sequence[bytes]) -> List[tuple]:
+        """key 목록으로 조회하고 조회 시각 갱신 (첫 열은 key)"""
+        rows: List[tuple] = []
+        unique_keys = list(set(keys))
+        for st in range(0, len(unique_keys), 500):
+            part = unique_keys[st:st + 500]
+            placeholders = ",".join("?" * len(part))
+            rows += self._conn.execute(
+                f"SELECT key, {columns} FROM {self.table} WHERE key IN ({placeholders})",
+                part,
+            ).fetchall()
+
+        if rows:
+            now = time.time()
+            self._conn.executemany(
+                f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?",
+                [(now, row[0]) for row in rows],
+            )
+
+        found = {row[0] for row in rows}
+        hits = sum(1 for key in keys if key in found)
+        self._hits.inc(hits)
+        self._misses.inc(len(keys) - hits)
+
+        return rows
+
+    def _replace(self, rows: Sequence[tuple]):
+        if not rows:
+            return
+
+        placeholders = ",".join("?" * len(rows[0]))
+        self._conn.execute("BEGIN")
+        for row in rows:
+            prev = self._conn.execute(f"SELECT size FROM {self.table} WHERE key = ?", (row[0], )).fetchone()
+            self._total_bytes -= prev[0] if prev else 0
+            self._conn.execute(f"INSERT OR REPLACE INTO {self.table} VALUES ({placeholders})", row)
+            self._total_bytes += row[-2]
+        self._conn.execute("COMMIT")
+
+        if self._total_bytes > self.max_bytes:
+            self._evict()
+
+        self._bytes.set(self._total_bytes)
+
+    def _evict(self):
+        """`max_bytes`의 90%가 될 때까지 오래된 항목부터 삭제"""
+        target = int(self.max_bytes * 0.9)
+        evicted = 0
+
+        self._conn.execute("BEGIN")
+        while self._total_bytes > target:
+            rows = self._conn.execute(f"SELECT key, size FROM {self.table} ORDER BY accessed_at LIMIT 500").fetchall()
+            if not rows:
+                break
+
+            for key, size in rows:
+                if self._total_bytes <= target:
+                    break
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key, ))
+                self._total_bytes -= size
+                evicted += 1
+        self._conn.execute("COMMIT")
+
+        self._evictions.inc(evicted)
+        logger(f"{self.label} {evicted}개 항목 삭제 ({self._total_bytes / 1024**2:.1f}MB)")
+
+    def stats(self):
+        hits, misses = self._hits.snapshot(), self._misses.snapshot()
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "evictions": self._evictions.snapshot(),
+            "bytes": self._total_bytes,
+        }
+
+    def close(self):
+        self._conn.close()
+
+
+class EmbeddingCache(_SQLiteCache):
+
+    table = "embeddings"
+    schema = _SCHEMA
+    label = "임베딩 캐시"
+
+    def __init__(self, path: str, model: str, max_bytes: int):
+        self.model = model
+        super().__init__(path, max_bytes, "embed.cache")
+
+    def key(self, text: str, chunking: bool, truncate: bool, html: bool) -> bytes:
+        raw = json.dumps([normalize_text(text), self.model, chunking, truncate, html], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).digest()
+
+    def get_many(self, keys: Sequence[bytes]) -> Dict[bytes, EmbedResult]:
+        if not keys:
+            return {}
+
+        rows = self._select("chunk, dense, sparse_indices, sparse_values", keys)
+        return {key: self._decode(chunk, dense, indices, values) for key, chunk, dense, indices, values in rows}
+
+    def put_many(self, items: Sequence[tuple[bytes, EmbedResult]]):
+        if not items:
+            return
+
+        now = time.time()
+        rows = []
+        for key, result in items:
+            chunk, dense, indices, values = self._encode(result)
+            size = len(key) + len(dense) + len(indices) + len(values) + len(chunk.encode("utf-8") if chunk else b"")
+            rows.append((key, chunk, dense, indices, values, size, now))
+
+        self._replace(rows)
+
+    @staticmethod
+    def _encode(result: EmbedResult):
+        sparse = result["sparse"]
+        dense = np.asarray(result["dense"], dtype="<f4").tobytes()
+        indices = array("i", [int(idx) for idx in sparse.keys()]).tobytes()
+        values = array("f", sparse.values()).tobytes()
+        return result.get("chunk"), dense, indices, values
+
+    @staticmethod
+    def _decode(chunk: Optional[str], dense: bytes, indices: bytes, values: bytes) -> EmbedResult:
+        _dense, _indices, _values = array("f"), array("i"), array("f")
+        _dense.frombytes(dense)
+        _indices.frombytes(indices)
+        _values.frombytes(values)
+
+        result = EmbedResult(dense=_dense.tolist(), sparse=dict(zip(_indices.tolist(), _values.tolist())))
+        if chunk is not None:
+            result["chunk"] = chunk
+        return result
+
+def load_embedding_cache(model: Optional[str] = None) -> Optional[EmbeddingCache]:
+    """`EMBED_CACHE_PATH`가 설정된 경우에만 캐시 생성 (`model`이 없으면 `EMBED_MODEL`)"""
+    path = os.environ.get("EMBED_CACHE_PATH")
+    if not path:
+        return None
+
+    model = model or os.environ.get("EMBED_MODEL", "bge-m3")
+    max_bytes = int(float(os.environ.get("EMBED_CACHE_MAX_MB", 2048)) * 1024**2)
+    return EmbeddingCache(path, model=model, max_bytes=max_bytes)
+
+
+class DocumentCache(_SQLiteCache):
+    """첨부파일 파싱 결과 캐시
+
+    key는 url + 검증자이므로 다른 url로 올라온 같은 파일은 따로 파싱합니다. 검증자가 파일 크기뿐이면(약한 검증자)
+    같은 url에서 크기가 같은 파일로 바뀐 경우는 감지하지 못합니다.
+    """
+
+    table = "documents"
+    schema = _DOCUMENT_SCHEMA
+    label = "첨부파일 캐시"
+
+    def __init__(self, path: str, max_bytes: int):
+        super().__init__(path, max_bytes, "document_parser.cache")
+
+    @staticmethod
+    def key(url: str, validator: str) -> bytes:
+        raw = json.dumps([url, validator], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).digest()
+
+    def get_many(self, keys: Sequence[bytes]) -> Dict[bytes, Dict[str, str]]:
+        if not keys:
+            return {}
+
+        return {key: json.loads(pages) for key, pages in self._select("pages", keys)}
+
+    def put_many(self, items: Sequence[Tuple[bytes, str, Dict[str, str]]]):
+        """(key, url, 페이지별 추출 결과) 저장"""
+        now = time.time()
+        rows = []
+        for key, url, pages in items:
+            raw = json.dumps(pages, ensure_ascii=False)
+            rows.append((key, url, raw, len(key) + len(url.encode("utf-8")) + len(raw.encode("utf-8")), now))
+
+        self._replace(rows)
+
+    def cached_urls(self, urls: Sequence[str]) -> Set[str]:
+        """캐시된 파싱 결과가 있는 url (검증자는 확인하지 않음)"""
+        found: Set[str] = set()
+        unique_urls = list(set(urls))
+        for st in range(0, len(unique_urls), 500):
+            part = unique_urls[st:st + 500]
+            placeholders = ",".join("?" * len(part))
+            rows = self._conn.execute(f"SELECT DISTINCT url FROM {self.table} WHERE url IN ({placeholders})", part)
+            found.update(url for url, in rows)
+        return found
+
+
+def load_document_cache() -> Optional[DocumentCache]:
+    """`DOCUMENT_CACHE_PATH`가 설정된 경우에만 캐시 생성"""
+    path = os.environ.get("DOCUMENT_CACHE_PATH")
+    if not path:
+        return None
+
+    max_bytes = int(float(os.environ.get("DOCUMENT_CACHE_MAX_MB", 1024)) * 1024**2)
+    return DocumentCache(path, max_bytes=max_bytes)
+
+
+RerankKey = Tuple[str, bool, str, Hashable, bytes]
+
+
+class RerankCache:
+    """질의-chunk 쌍의 리랭크 점수 LRU 캐시
+
+    chunk 내용 해시가 key에 포함되므로 크롤링으로 chunk가 다시 쓰이면(id 재사용 포함) 이전 점수는 조회되지 않고,
+    LRU에 의해 자연스럽게 밀려납니다.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._scores: OrderedDict[RerankKey, float] = OrderedDict()
+
+        self._hits = metrics.counter("rerank.cache.hits")
+        self._misses = metrics.counter("rerank.cache.misses")
+        self._evictions = metrics.counter("rerank.cache.evictions")
+        self._size = metrics.gauge("rerank.cache.entries")
+
+    @staticmethod
+    def key(
+        query: str,
+        chunk_id: Hashable,
+        content: str,
+        truncate: bool = True,
+        truncation_direction: str = "Right",
+    ) -> RerankKey:
+        content_hash = hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest()
+        return normalize_text(query), truncate, truncation_direction, chunk_id, content_hash
+
+    def get_many(self, keys: Sequence[RerankKey]) -> Dict[int, float]:
+        """캐시된 점수를 `{입력 위치: 점수}`로 반환"""
+        found: Dict[int, float] = {}
+        for idx, key in enumerate(keys):
+            score = self._scores.get(key)
+            if score is not None:
+                self._scores.move_to_end(key)
+                found[idx] = score
+
+        self._hits.inc(len(found))
+        self._misses.inc(len(keys) - len(found))
+        return found
+
+    def put_many(self, items: Sequence[Tuple[RerankKey, float]]):
+        for key, score in items:
+            self._scores[key] = score
+            self._scores.move_to_end(key)
+
+        evicted = 0
+        while len(self._scores) > self.max_entries:
+            self._scores.popitem(last=False)
+            evicted += 1
+
+        self._evictions.inc(evicted)
+        self._size.set(len(self._scores))
+
+    def clear(self):
+        self._scores.clear()
+        self._size.set(0)
+
+    def stats(self):
+        hits, misses = self._hits.snapshot(), self._misses.snapshot()
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "evictions": self._evictions.snapshot(),
+            "entries": len(self._scores),
+        }
+
+
+def load_rerank_cache() -> Optional[RerankCache]:
+    """`RERANK_CACHE_SIZE`가 0이면 비활성화"""
+    max_entries = int(os.environ.get("RERANK_CACHE_SIZE", 10000))
+    return RerankCache(max_entries) if max_entries > 0 else None
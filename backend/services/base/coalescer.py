@@ -0,0 +1,160 @@
+"""동시에 들어온 소규모 임베딩/리랭크 요청을 하나의 배치 요청으로 묶는 coalescer"""
+
+import asyncio
+from bisect import bisect_right
+from dataclasses import dataclass, field
+import time
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, List, Optional, Set, Tuple, TypeVar
+
+from aiohttp import ClientSession
+
+from mixins import metrics
+from mixins.http_client import sessions
+
+T = TypeVar("T")
+
+
+@dataclass
+class _Pending(Generic[T]):
+    texts: List[str]
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class Coalescer(Generic[T]):
+    """`window` 동안 같은 key의 요청을 모아 한 번에 전송한 뒤 결과를 호출자별로 나눠 반환
+
+    요청은 key와 세션별로 묶으며, `upstream`이 주어지면 공유 세션(`sessions.resolve`)으로 바꾼 뒤 묶습니다.
+
+    Args:
+        name: 메트릭 이름 접두사
+        send: 묶인 요청을 실제로 전송하는 함수 `(key, texts, session) -> results`
+        scatter: 전체 결과를 호출자별로 분배하는 함수 `(results, sizes) -> [results]`
+        window: 최대 대기 시간 (초)
+        max_batch_size: 한 배치의 최대 텍스트 수 (요청 하나가 더 크면 그 요청만 따로 전송)
+        upstream: 공유 세션 이름
+    """
+
+    def __init__(
+        self,
+        name: str,
+        send: Callable[[Hashable, List[str], ClientSession], Awaitable[List[T]]],
+        scatter: Callable[[List[T], List[int]], List[List[T]]],
+        window: float = 0.005,
+        max_batch_size: int = 32,
+        upstream: Optional[str] = None,
+    ):
+        self.name = name
+        self.send = send
+        self.scatter = scatter
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self.upstream = upstream
+
+        self._queues: Dict[Tuple[Hashable, ClientSession], List[_Pending[T]]] = {}
+        self._timers: Dict[Tuple[Hashable, ClientSession], asyncio.TimerHandle] = {}
+        # 전송 중인 배치 (완료 전에 GC되지 않도록 참조 유지)
+        self._dispatching: Set[asyncio.Task] = set()
+
+        self._batch_size = metrics.histogram(f"{name}.batch_size", buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256))
+        self._queue_wait = metrics.histogram(f"{name}.queue_wait_seconds")
+        self._batches = metrics.counter(f"{name}.batches")
+        self._requests = metrics.counter(f"{name}.requests")
+
+    @property
+    def enabled(self) -> bool:
+        return self.window > 0 and self.max_batch_size > 1
+
+    async def submit(self, key: Hashable, texts: List[str], session: ClientSession) -> List[T]:
+        loop = asyncio.get_running_loop()
+        pending = _Pending(texts=texts, future=loop.create_future())
+        self._requests.inc()
+
+        # 다른 세션의 요청을 한 세션으로 보내지 않도록 세션별로 묶음
+        if self.upstream is not None:
+            session = sessions.resolve(self.upstream, session)
+        group = (key, session)
+
+        # 이번 요청을 더하면 최대 배치 크기를 넘는 경우 대기 중인 요청을 먼저 전송
+        queued = sum(len(p.texts) for p in self._queues.get(group, []))
+        if queued and queued + len(texts) > self.max_batch_size:
+            self._flush(group)
+
+        queue = self._queues.setdefault(group, [])
+        queue.append(pending)
+
+        if sum(len(p.texts) for p in queue) >= self.max_batch_size:
+            self._flush(group)
+        elif group not in self._timers:
+            self._timers[group] = loop.call_later(self.window, self._flush, group)
+
+        return await pending.future
+
+    def _flush(self, group: Tuple[Hashable, ClientSession]):
+        timer = self._timers.pop(group, None)
+        if timer is not None:
+            timer.cancel()
+
+        batch = self._queues.pop(group, [])
+        if batch:
+            task = asyncio.ensure_future(self._dispatch(*group, batch))
+            self._dispatching.add(task)
+            task.add_done_callback(self._dispatching.discard)
+
+    async def _dispatch(self, key: Hashable, session: ClientSession, batch: List[_Pending[T]]):
+        now = time.perf_counter()
+        for pending in batch:
+            self._queue_wait.observe(now - pending.enqueued_at)
+
+        texts = [text for pending in batch for text in pending.texts]
+        self._batches.inc()
+        self._batch_size.observe(len(texts))
+
+        try:
+            results = await self.send(key, texts, session)
+            parts = self.scatter(results, [len(pending.texts) for pending in batch])
+            for pending, part in zip(batch, parts):
+                if not pending.future.done():
+                    pending.future.set_result(part)
+
+        except BaseException as e:
+            for pending in batch:
+                if not pending.future.done():
+                    pending.future.set_exception(e)
+
+    def reset_stats(self):
+        for metric in (self._batch_size, self._queue_wait, self._batches, self._requests):
+            metric.reset()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "batches": self._batches.snapshot(),
+            "requests": self._requests.snapshot(),
+            "batch_size": self._batch_size.snapshot(),
+            "queue_wait_seconds": self._queue_wait.snapshot(),
+        }
+
+
+def scatter_in_order(results: List[T], sizes: List[int]) -> List[List[T]]:
+    """입력 순서대로 반환되는 결과(`/embed`)를 요청 크기별로 분할"""
+    parts, offset = [], 0
+    for size in sizes:
+        parts.append(results[offset:offset + size])
+        offset += size
+    return parts
+
+
+def scatter_by_index(results: List[Dict[str, Any]], sizes: List[int]) -> List[List[Dict[str, Any]]]:
+    """`index` 필드로 입력 위치를 알려주는 결과(`/rerank`)를 요청별로 분할하고 index를 재조정"""
+    offsets, acc = [], 0
+    for size in sizes:
+        offsets.append(acc)
+        acc += size
+
+    parts: List[List[Dict[str, Any]]] = [[] for _ in sizes]
+    for result in results:
+        index = result["index"]
+        part = bisect_right(offsets, index) - 1
+        parts[part].append({**result, "index": index - offsets[part]})
+
+    return parts
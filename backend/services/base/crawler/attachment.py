@@ -0,0 +1,238 @@
+"""첨부파일 분류(triage)
+
+문서 파서로 보내기 전에 HEAD 요청(실패하면 앞부분만 받는 Range 요청)으로 첨부파일의 형식과 크기를 확인합니다.
+
+- `parse`: 지원하는 문서, 일반 대기열에서 파싱
+- `large`: `ATTACHMENT_LARGE_MB`보다 큰 문서, 동시 요청 수가 적은 낮은 우선순위 대기열(`document_parser_large`)에서
+  하나씩 파싱하며 배치는 최대 `ATTACHMENT_LARGE_WAIT`초만 기다림. 시간 안에 끝나지 않으면 `DOCUMENT_CACHE_PATH`가
+  있을 때만 백그라운드에서 계속 파싱해 캐시에 저장하고, 다음 크롤링에서 해당 게시글을 다시 처리합니다
+  (`BaseNoticeCrawlerService.deferred_urls`). 캐시가 없으면 파싱을 취소하며 결과는 버려집니다.
+- `skip`: 이미지 / 압축 파일 등 `ATTACHMENT_TYPES`에 없는 형식이거나 `ATTACHMENT_MAX_MB`보다 큰 파일, 파싱하지 않음
+
+형식과 크기를 알 수 없는 첨부파일은 기존과 같이 `parse`로 분류합니다.
+"""
+
+import asyncio
+from dataclasses import dataclass
+import logging
+import os
+import re
+from typing import Dict, List, Literal, Mapping, Optional, Set
+from urllib.parse import unquote, urlparse
+
+import aiohttp
+
+from config.logger import _logger
+from mixins import metrics
+from mixins.asyncio import university_request
+from mixins.http_client import sessions
+from services.base.crawler import scrape
+
+logger = _logger(__name__)
+
+AttachmentRoute = Literal["parse", "large", "skip"]
+
+# 문서 파서가 처리하는 확장자
+ATTACHMENT_TYPES = {
+    ext.strip().lower()
+    for ext in os.getenv("ATTACHMENT_TYPES", "pdf,hwp,hwpx,ppt,pptx,doc,docx").split(",") if ext.strip()
+}
+ATTACHMENT_LARGE_MB = float(os.getenv("ATTACHMENT_LARGE_MB", 10))
+ATTACHMENT_MAX_MB = float(os.getenv("ATTACHMENT_MAX_MB", 100))
+ATTACHMENT_LARGE_WAIT = float(os.getenv("ATTACHMENT_LARGE_WAIT", 120))
+
+MIME_TYPES = {
+    "application/pdf": "pdf",
+    "application/x-hwp": "hwp",
+    "application/haansofthwp": "hwp",
+    "application/vnd.hancom.hwp": "hwp",
+    "application/vnd.hancom.hwpx": "hwpx",
+    "application/msword": "doc",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": "docx",
+    "application/vnd.ms-powerpoint": "ppt",
+    "application/vnd.openxmlformats-officedocument.presentationml.presentation": "pptx",
+    "application/vnd.ms-excel": "xls",
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": "xlsx",
+    "application/zip": "zip",
+    "application/x-zip-compressed": "zip",
+    "application/x-7z-compressed": "7z",
+    "application/x-rar-compressed": "rar",
+    "text/html": "html",
+}
+
+# Range 요청으로 받은 앞부분으로 판별 (hwp / ppt(OLE), pptx / hwpx(zip)처럼 같은 시그니처를 쓰는 형식은 제외)
+SIGNATURES = {
+    b"%PDF": "pdf",
+    b"\x89PNG": "png",
+    b"\xff\xd8\xff": "jpg",
+    b"GIF8": "gif",
+}
+
+_EXTENSION = re.compile(r"\.([A-Za-z0-9]{2,5})$")
+
+# 확장자처럼 보이지만 다운로드 페이지인 경로
+_PAGE_EXTENSIONS = {"do", "jsp", "php", "asp", "aspx", "cgi"}
+
+
+@dataclass
+class AttachmentProbe:
+    url: str
+    route: AttachmentRoute = "parse"
+    kind: Optional[str] = None
+    size: Optional[int] = None
+    validator: Optional[str] = None
+    reason: str = ""
+
+
+def _extension(name: str) -> Optional[str]:
+    match = _EXTENSION.search(unquote(name).strip().strip('"').lower())
+    return match.group(1) if match and match.group(1) not in _PAGE_EXTENSIONS else None
+
+
+def parseable(name: str, url: str) -> bool:
+    """파일명 / url 경로의 확장자로 파싱하지 않는 형식임을 알 수 있으면 False (알 수 없으면 True)"""
+    kind = _extension(name) or _extension(urlparse(url).path)
+    return kind is None or kind in ATTACHMENT_TYPES
+
+
+def attachment_kind(url: str, headers: Mapping[str, str], head: bytes = b"") -> Optional[str]:
+    """파일명(Content-Disposition) → url 경로 → Content-Type → 시그니처 순으로 형식 판별"""
+    disposition = headers.get("Content-Disposition", "")
+    for name in re.findall(r"filename\*?=(?:UTF-8'')?\"?([^\";]+)", disposition, flags=re.IGNORECASE):
+        if kind := _extension(name):
+            return kind
+
+    if kind := _extension(urlparse(url).path):
+        return kind
+
+    content_type = headers.get("Content-Type", "").split(";")[0].strip().lower()
+    if content_type in MIME_TYPES:
+        return MIME_TYPES[content_type]
+    if content_type.split("/")[0] in ("image", "video", "audio"):
+        return content_type.split("/")[0]
+
+    return next((kind for signature, kind in SIGNATURES.items() if head.startswith(signature)), None)
+
+
+def _size(headers: Mapping[str, str]) -> Optional[int]:
+    content_range = re.match(r"bytes \d+-\d+/(\d+)", headers.get("Content-Range", ""))
+    if content_range:
+        return int(content_range.group(1))
+
+    length = headers.get("Content-Length", "")
+    return int(length) if length.isdigit() else None
+
+
+def classify(probe: AttachmentProbe) -> AttachmentProbe:
+    if probe.kind is not None and probe.kind not in ATTACHMENT_TYPES:
+        probe.route, probe.reason = "skip", f"지원하지 않는 형식({probe.kind})"
+    elif probe.size is not None and probe.size > ATTACHMENT_MAX_MB * 1024**2:
+        probe.route, probe.reason = "skip", f"크기 초과({probe.size / 1024**2:.0f}MB)"
+    elif probe.size is not None and probe.size > ATTACHMENT_LARGE_MB * 1024**2:
+        probe.route, probe.reason = "large", f"큰 문서({probe.size / 1024**2:.0f}MB)"
+    else:
+        probe.route = "parse"
+    return probe
+
+
+async def probe_attachment(url: str, session: aiohttp.ClientSession) -> AttachmentProbe:
+    """HEAD 요청으로 형식 / 크기 / 검증자 확인, HEAD가 실패하거나 형식과 크기를 모두 알 수 없으면 앞 8바이트만 요청"""
+    probe = AttachmentProbe(url)
+    host = urlparse(url).hostname or ""
+    session = sessions.resolve("university", session)
+    try:
+        async with university_request(host) as timing, session.head(url, allow_redirects=True) as res:
+            timing.headers_received()
+            if res.ok:
+                probe.kind, probe.size = attachment_kind(url, res.headers), _size(res.headers)
+                probe.validator = scrape.header_validator(res.headers)
+
+        if probe.kind is None and probe.size is None:
+            async with university_request(host) as timing, session.get(url, headers={"Range": "bytes=0-7"}) as res:
+                timing.headers_received()
+                if res.ok:
+                    head = await res.content.read(8)
+                    probe.kind, probe.size = attachment_kind(url, res.headers, head), _size(res.headers)
+                    probe.validator = probe.validator or scrape.header_validator(res.headers)
+
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger(f"첨부파일 정보를 확인하지 못했습니다. ({url}, {e})", logging.WARNING)
+
+    return classify(probe)
+
+
+# 배치 대기 시간을 넘겨 백그라운드에서 파싱 중인 큰 문서 (결과는 `scrape.document_cache()`에 저장)
+_deferred: Set[asyncio.Task] = set()
+
+
+async def parse_attachments_async(urls: List[str], session: aiohttp.ClientSession) -> List[Dict[int, str]]:
+    """첨부파일을 분류한 뒤 파싱 (`scrape.extract_documents_async`와 같이 입력 순서대로 반환)
+
+    `skip`으로 분류되었거나 대기 시간 안에 파싱하지 못한 큰 문서는 빈 결과를 반환합니다.
+    큰 문서는 캐시가 있으면 백그라운드에서 계속 파싱해 캐시에 저장하고(다음 크롤링에서 게시글을 다시 처리할 때 사용),
+    없으면 취소합니다.
+    """
+    if not urls:
+        return []
+
+    unique_urls = list(dict.fromkeys(urls))
+    probes = await asyncio.gather(*[probe_attachment(url, session) for url in unique_urls])
+    validators = {probe.url: probe.validator for probe in probes if probe.validator}
+
+    for probe in probes:
+        metrics.counter(f"attachment.triage.{probe.route}").inc()
+        if probe.route != "parse":
+            logger(f"첨부파일 {probe.route}: {probe.reason} ({probe.url})")
+
+    normal = [probe.url for probe in probes if probe.route == "parse"]
+    large_tasks = {
+        probe.url: asyncio.create_task(
+            scrape.extract_documents_async([probe.url], session, validators, batch_size=1, lane="document_parser_large")
+        ) for probe in probes if probe.route == "large"
+    }
+
+    results: Dict[str, Dict[int, str]] = dict(
+        zip(normal, await scrape.extract_documents_async(normal, session, validators))
+    )
+
+    if large_tasks:
+        await asyncio.wait(large_tasks.values(), timeout=ATTACHMENT_LARGE_WAIT)
+
+    for url, task in large_tasks.items():
+        if task.done():
+            results[url] = task.result()[0]
+            continue
+
+        metrics.counter("attachment.triage.deferred").inc()
+        if scrape.document_cache() is None:
+            task.cancel()
+            logger(f"첨부파일 파싱 취소 (대기 시간 초과): {url}", logging.WARNING)
+        else:
+            _deferred.add(task)
+            task.add_done_callback(_deferred.discard)
+            logger(f"첨부파일 파싱 연기 (대기 시간 초과, 완료되면 캐시에 저장): {url}", logging.WARNING)
+
+    return [results.get(url, {}) for url in urls]
+
+
+async def drain_deferred(timeout: Optional[float] = None):
+    """연기된 큰 문서 파싱이 끝날 때까지 대기 (크롤링 종료 전, `timeout`이 지나면 취소)"""
+    if not _deferred:
+        return
+
+    logger(f"연기된 첨부파일 {len(_deferred)}개 파싱 대기 중...")
+    _, pending = await asyncio.wait(list(_deferred), timeout=timeout)
+    for task in pending:
+        task.cancel()
+
+
+def count_pages(dtos: List[Dict]) -> int:
+    """DTO 목록에서 파싱한 첨부파일 페이지 수"""
+    return sum(len(att["content"]) for dto in dtos for att in dto.get("attachments", []) if "content" in att)
+
+
+def triage_stats() -> Dict[str, float]:
+    return {
+        route: metrics.counter(f"attachment.triage.{route}").snapshot()
+        for route in ("parse", "large", "skip", "deferred")
+    }
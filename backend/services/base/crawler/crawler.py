@@ -1,10 +1,10 @@
 from abc import abstractmethod
 from typing import Generic, List, Optional, Generic, cast
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 
 from mixins.http_client import HTTPMetaclass
-from .scrape import scrape_async
+from .scrape import HTMLParser, scrape_async
 from services.base.dto import DTO
 
 from aiohttp import ClientSession
@@ -19,6 +19,16 @@ class ParseHTMLException(Exception):
 
 class BaseCrawler(Generic[DTO], metaclass=HTTPMetaclass):
 
+    # None이면 `HTML_PARSER` 사용
+    parser: Optional[HTMLParser] = None
+
+    # 목록 페이지에서 트리를 만들 요소 (None이면 전체 페이지 파싱)
+    list_strainer: Optional[SoupStrainer] = None
+
+    def __init__(self, parser: Optional[HTMLParser] = None):
+        if parser is not None:
+            self.parser = parser
+
     async def scrape_detail_async(
         self,
         urls: List[str],
@@ -43,6 +53,7 @@ class BaseCrawler(Generic[DTO], metaclass=HTTPMetaclass):
             url=urls,
             session=session,
             post_process=self._parse_detail,
+            parser=self.parser,
         )
 
         dtos_: List[DTO] = []
@@ -1,3 +1,5 @@
+from typing import List, Tuple
+
 from bs4 import BeautifulSoup, Tag
 from bs4.element import NavigableString, PageElement
 from config.logger import _logger
@@ -19,143 +21,152 @@ def preprocess_text(text: str):
     return text
 
 
-def clean_html(html: str | BeautifulSoup | Tag) -> BeautifulSoup | Tag:
-    """Clean html string or `BeautifulSoup` instance"""
-
+def _to_soup(html: str | BeautifulSoup | Tag) -> BeautifulSoup | Tag:
     match html:
         case str():
             html = html.replace("<br/>", " ")
             html = html.replace("<br />", " ")
             html = html.replace("<br>", " ")
-            soup = BeautifulSoup(html, "html.parser")
+            return BeautifulSoup(html, "html.parser")
         case Tag():
-            soup = html
+            return html
 
-    while True:
-        affected = sum([
-            _clean_html_tag(soup, child) if isinstance(child, Tag) else _clean_html_string(soup, child)
-            for child in list(soup.descendants)
-        ])
 
-        if affected == 0:
-            break
+def clean_html(html: str | BeautifulSoup | Tag) -> BeautifulSoup | Tag:
+    """Clean html string or `BeautifulSoup` instance
+
+    기존 구현(변경이 없을 때까지 전체 순회 반복, `scripts/test/clean_html.py`)과 같은 결과를 한 번의 순회로 만듭니다.
+    기존 구현에서 부모가 자식보다 먼저 결정되는 경우(strong 제거, 문자열/br만 있는 태그)는 진입 시 처리하고,
+    자식 정리 결과에 따라 달라지는 문자열 병합과 unwrap은 자식을 모두 정리한 뒤 처리합니다.
+    """
+    soup = _to_soup(html)
+
+    stack: List[Tuple[PageElement, bool]] = [(child, False) for child in reversed(soup.contents)]
+    while stack:
+        element, visited = stack.pop()
+        if not isinstance(element, Tag):
+            _clean_html_string(soup, element)
+        elif visited:
+            _clean_tag_exit(element)
+        else:
+            revisit, children = _clean_tag_enter(element)
+            if revisit:
+                stack.append((element, True))
+            stack.extend((child, False) for child in reversed(children))
 
     return soup
 
 
-def _clean_html_string(soup: Tag | BeautifulSoup, element: PageElement) -> int:
-    """Clean `NavigableString` instance"""
-    if not element.parent and element != soup:
-        return 0
+INLINE_TAGS = ("span", "p", "u", "b")
+INLINE_PARENTS = ("span", "p", "li", "td", "th", "b", "u")
 
-    text = element.get_text(strip=True)
-    if text == "" or text == " ":
-        element.extract()
-        return 1
 
-    return 0
+def _is_inline_child(element: Tag) -> bool:
+    return element.parent is not None and element.parent.name in INLINE_PARENTS
 
 
-UNUSED_ATTRS = [
-    "class", "style", "id", "title", "tabindex", "role", "hidden", "aria-hidden", "aria-expanded", "aria-controls",
-    "aria-label", "aria-labelledby", "aria-describedby", "data-toggle", "data-target", "data-dismiss", "data-parent",
-    "draggable", "spellcheck", "translate", "contenteditable", "autocapitalize", "autocorrect", "autocomplete", "dir",
-    "lang", "accesskey", "contextmenu", "ondrag", "ondragstart", "ondragend", "ondragover", "ondragleave", "ondrop",
-    "onmouseover", "onmouseout", "onmouseenter", "onmouseleave", "onclick", "ondblclick", "onmousedown", "onmouseup",
-    "onmousemove", "onwheel", "onkeydown", "onkeyup", "onkeypress", "onfocus", "onblur", "oninput", "onchange", "valign"
-]
+def _clean_tag_enter(element: Tag) -> Tuple[bool, List[PageElement]]:
+    """자식을 정리하기 전 처리, (자식 정리 후 다시 처리할지 여부, 순회할 자식)을 반환"""
 
-ALLOWED_ATTRS = ["colspan", "rowspan", "scope", "headers"]
+    for attr in [*element.attrs.keys()]:
+        if attr not in ALLOWED_ATTRS:
+            del element[attr]
 
+    children = list(element.children)
+    if len(children) == 0 or (element.name == "a" and _is_inline_child(element)):
+        element.extract()
+        return False, []
 
-def _clean_html_tag(soup: Tag | BeautifulSoup, element: Tag) -> int:
-    """Clean `Tag` instance"""
+    if all(isinstance(child, NavigableString) or child.name == "br" for child in children):
+        _clean_leaf_tag(element, children)
+        return False, []
 
-    if not element.parent and element != soup:
-        return 0
+    if element.name == "strong":
+        # 자식은 부모가 바뀐 상태로 정리
+        element.unwrap()
+        return False, children
+
+    return True, children
 
-    if len(element.contents) == 0:
+
+def _clean_leaf_tag(element: Tag, children: List[PageElement]):
+    """문자열과 br만 있는 태그 정리 (br 사이 문자열은 각각 공백을 제거해 이어 붙임)"""
+
+    unwrap = element.name == "strong" or (element.name in INLINE_TAGS and _is_inline_child(element))
+
+    if len(children) == 1:
+        # script / style 문자열은 태그의 get_text에는 포함되지만 문자열 정리 시 제거됨
+        if element.get_text(strip=True) == "" or children[0].get_text(strip=True) == "":
+            element.extract()
+        elif unwrap:
+            element.unwrap()
+        return
+
+    pieces, piece = [], ""
+    for child in children:
+        if isinstance(child, NavigableString):
+            piece += child.get_text(strip=True)
+        else:
+            pieces.append(piece)
+            piece = ""
+    pieces.append(piece)
+
+    # unwrap되는 경우 br로 나뉜 문자열은 부모에서 각각의 문자열로 남음
+    strings = [piece for piece in pieces if piece] if unwrap else ["".join(pieces)]
+    if not any(strings):
         element.extract()
-        return 1
+        return
 
-    affected = 0
+    element.clear()
+    for string in strings:
+        element.append(NavigableString(string))
 
-    children = list(element.children)
+    if unwrap:
+        element.unwrap()
 
-    def test_child(child: PageElement):
-        match child:
-            case NavigableString():
-                return True
-            case Tag(name="br"):
-                return True
-            case _:
-                return False
 
-    only_string = all(test_child(child) for child in children)
+def _clean_tag_exit(element: Tag):
+    """자식이 모두 정리된 뒤 처리 (br과 공백 문자열은 이미 제거됨)"""
 
-    for attr in [*element.attrs.keys()]:
-        if attr not in ALLOWED_ATTRS:
-            del element[attr]
+    children = list(element.children)
+    if len(children) == 0:
+        element.extract()
+        return
 
-    if only_string and len(children) == 1:
-        inner_text = element.get_text(strip=True)
-        if inner_text == "" or inner_text == " ":
-            element.extract()
-            return 1
+    if not all(isinstance(child, NavigableString) for child in children):
+        return
 
-    if only_string and len(children) > 1:
-        combined_text = ""
-        for child in children:
-            if isinstance(child, NavigableString):
-                combined_text += child.get_text(strip=True)
-                child.extract()
-            else:
-                child.insert_before(NavigableString(combined_text))
-                combined_text = ""
+    if len(children) > 1:
+        text = "".join(child.get_text(strip=True) for child in children)
+        element.clear()
+        element.append(NavigableString(text))
 
-        element.append(NavigableString(combined_text))
+    if element.get_text(strip=True) == "":
+        element.extract()
+    elif element.name in INLINE_TAGS and _is_inline_child(element):
+        element.unwrap()
 
-        affected += 1
 
-    match element:
-        case Tag(name="strong"):
-            element.unwrap()
-            return affected + 1
-
-        case Tag(name="a", attrs={"href": str(href)}):
-            if not href.startswith("#"):
-                return affected
-            target = soup.select_one(href)
-            if not target:
-                return affected
-            target.extract()
-            element.replace_with(target)
-            return affected + 1
-
-        case Tag(
-            name="a" | "span" | "p" | "u" | "b" | "strong",
-            parent=Tag(name="span" | "p" | "li" | "td" | "th" | "b" | "u"),
-        ):
-            if element.name == "a":
-                element.extract()
-                return affected
-
-            if not only_string:
-                return affected
-
-            if element.next_sibling is not None and element.name == "p":
-                element.append(NavigableString(" "))
+def _clean_html_string(soup: Tag | BeautifulSoup, element: PageElement) -> int:
+    """Clean `NavigableString` instance"""
+    if not element.parent and element != soup:
+        return 0
 
-            element.unwrap()
-            return affected + 1
+    text = element.get_text(strip=True)
+    if text == "" or text == " ":
+        element.extract()
+        return 1
 
-        case Tag(name="img"):
-            element.extract()
-            return affected + 1
+    return 0
 
-        case _ if len(children) == 0 or element.string == "":
-            element.extract()
-            return affected + 1
 
-        case _:
-            return affected
+UNUSED_ATTRS = [
+    "class", "style", "id", "title", "tabindex", "role", "hidden", "aria-hidden", "aria-expanded", "aria-controls",
+    "aria-label", "aria-labelledby", "aria-describedby", "data-toggle", "data-target", "data-dismiss", "data-parent",
+    "draggable", "spellcheck", "translate", "contenteditable", "autocapitalize", "autocorrect", "autocomplete", "dir",
+    "lang", "accesskey", "contextmenu", "ondrag", "ondragstart", "ondragend", "ondragover", "ondragleave", "ondrop",
+    "onmouseover", "onmouseout", "onmouseenter", "onmouseleave", "onclick", "ondblclick", "onmousedown", "onmouseup",
+    "onmousemove", "onwheel", "onkeydown", "onkeyup", "onkeypress", "onfocus", "onblur", "oninput", "onchange", "valign"
+]
+
+ALLOWED_ATTRS = ["colspan", "rowspan", "scope", "headers"]
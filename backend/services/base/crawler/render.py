@@ -0,0 +1,147 @@
+"""정리된 HTML(`preprocess.clean_html`)을 저장 / 임베딩 / LLM 컨텍스트용 텍스트로 변환
+
+`CONTENT_FORMAT`으로 크롤링한 본문과 첨부파일 페이지의 저장 형식을 선택합니다.
+
+- `markdown` (default): markdown 텍스트, 표는 colspan / rowspan을 펼친 markdown 표
+- `html`: `prettify()`한 HTML (기존 형식)
+"""
+
+from functools import lru_cache
+import hashlib
+import os
+import re
+from typing import Dict, List, Literal, Optional, Tuple
+
+from bs4 import BeautifulSoup, Tag
+from markdownify import MarkdownConverter
+
+from services.base.crawler import preprocess
+
+ContentFormat = Literal["markdown", "html"]
+CONTENT_FORMATS = ("markdown", "html")
+
+CONTENT_FORMAT = os.getenv("CONTENT_FORMAT", "markdown")
+
+if CONTENT_FORMAT not in CONTENT_FORMATS:
+    raise ValueError(f"지원하지 않는 CONTENT_FORMAT입니다: {CONTENT_FORMAT}")
+
+# 잘못된 colspan / rowspan 값으로 표가 커지지 않도록 제한
+MAX_SPAN = 100
+
+# HTML 태그 / 주석으로 시작하는 본문 (`<2025학년도 ...>`, `<https://...>` 같은 markdown 텍스트는 제외)
+_HTML_START = re.compile(r"\s*<(?:[a-zA-Z][a-zA-Z0-9-]*[\s/>]|/[a-zA-Z]|!)")
+
+
+def _span(cell: Tag, attr: str) -> int:
+    try:
+        return min(MAX_SPAN, max(1, int(str(cell.get(attr, 1)).strip())))
+    except ValueError:
+        return 1
+
+
+def _cell_text(cell: Tag) -> str:
+    return re.sub(r"\s+", " ", cell.get_text(" ", strip=True)).replace("|", "\\|")
+
+
+def table_grid(table: Tag) -> List[List[Optional[Tag]]]:
+    """colspan / rowspan을 펼쳐 모든 행의 열 수가 같은 셀 격자로 변환 (병합된 칸은 같은 셀을 반복)"""
+
+    rows = [tr for tr in table.find_all("tr") if tr.find_parent("table") is table]
+    grid: Dict[Tuple[int, int], Tag] = {}
+
+    for row, tr in enumerate(rows):
+        col = 0
+        for cell in tr.find_all(["td", "th"], recursive=False):
+            while (row, col) in grid:
+                col += 1
+
+            colspan, rowspan = _span(cell, "colspan"), min(_span(cell, "rowspan"), len(rows) - row)
+            for r in range(row, row + rowspan):
+                for c in range(col, col + colspan):
+                    grid.setdefault((r, c), cell)
+            col += colspan
+
+    if not grid:
+        return []
+
+    n_cols = max(col for _, col in grid) + 1
+    return [[grid.get((row, col)) for col in range(n_cols)] for row in range(len(rows))]
+
+
+class ContentConverter(MarkdownConverter):
+    """표를 colspan / rowspan을 반영한 markdown 표로 변환하는 `MarkdownConverter`
+
+    열이 하나뿐인 표(HWP 변환 결과의 레이아웃용 표)는 표 없이 셀 내용을 차례로 변환합니다.
+    """
+
+    def convert_table(self, el, text, *args, **kwargs):
+        grid = table_grid(el)
+        texts = [[_cell_text(cell) if cell else "" for cell in row] for row in grid]
+
+        # 빈 행 / 열과 모든 행에서 왼쪽 셀의 colspan으로만 채워진 열 제거
+        rows = [idx for idx, row in enumerate(texts) if any(row)]
+        cols = [
+            col for col in range(len(texts[0]) if texts else 0) if any(texts[row][col] for row in rows) and
+            (col == 0 or any(grid[row][col] is not grid[row][col - 1] for row in rows))
+        ]
+
+        if len(cols) == 1:
+            cells = list(dict.fromkeys(grid[row][cols[0]] for row in rows))
+            return "\n\n" + "\n\n".join(self.convert(cell.decode_contents()).strip() for cell in cells if cell) + "\n\n"
+
+        if not cols:
+            return ""
+
+        lines = ["| " + " | ".join(texts[row][col] for col in cols) + " |" for row in rows]
+        lines.insert(1, "| " + " | ".join("---" for _ in cols) + " |")
+        return "\n\n" + "\n".join(lines) + "\n\n"
+
+
+def _converter() -> ContentConverter:
+    return ContentConverter(heading_style="ATX", bullets="-", escape_asterisks=False, escape_underscores=False)
+
+
+def html_to_markdown(html: str | BeautifulSoup | Tag) -> str:
+    if not isinstance(html, str):
+        html = html.decode_contents() if isinstance(html, BeautifulSoup) else str(html)
+
+    text = _converter().convert(html)
+    text = re.sub(r"[ \t]+\n", "\n", text)
+    text = re.sub(r"\n{3,}", "\n\n", text)
+    return text.strip()
+
+
+def render_content(html: str | BeautifulSoup | Tag, content_format: Optional[ContentFormat] = None) -> str:
+    """`clean_html` 후 `content_format`(default: `CONTENT_FORMAT`) 형식으로 변환"""
+
+    soup = preprocess.clean_html(html)
+    if (content_format or CONTENT_FORMAT) == "html":
+        return str(soup.prettify())
+
+    return html_to_markdown(soup)
+
+
+@lru_cache(maxsize=1024)
+def compact_content(content: str) -> str:
+    """컨텍스트에 넣을 본문, 이전 형식(HTML)으로 저장된 본문은 markdown으로 변환"""
+
+    if CONTENT_FORMAT == "html" or not _HTML_START.match(content):
+        return content
+
+    return html_to_markdown(content)
+
+
+def context_content(content: str | List[str]) -> str:
+    """LLM 컨텍스트에 넣을 본문 (페이지 / 청크 리스트는 줄바꿈으로 연결)"""
+    contents = content if isinstance(content, list) else [content]
+    return "\n".join(compact_content(content) for content in contents)
+
+
+def content_hash(*parts: Optional[str | List[str]]) -> str:
+    """변경 감지용 sha256 해시 (공백 차이는 무시, 리스트는 펼쳐서 연결)
+
+    게시글은 제목 / 본문 등 필드를, 청크는 임베딩한 원문을 해시해 `content_hash` 컬럼에 저장합니다.
+    """
+    texts = [text for part in parts for text in (part if isinstance(part, list) else [part])]
+    normalized = "\0".join(" ".join(str(text).split()) if text is not None else "" for text in texts)
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
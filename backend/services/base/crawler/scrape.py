@@ -1,13 +1,130 @@
 import asyncio
-from typing import Callable, Dict, List, Optional, Tuple, overload, TypeVar, Any
-from bs4 import BeautifulSoup
-from mixins.asyncio import retry_async
-import random
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import importlib.util
+import logging
+import multiprocessing
+import os
+import pickle
+import re
+from types import MethodType
+from typing import Callable, Dict, Hashable, List, Literal, Mapping, Optional, Tuple, overload, TypeVar, Any
+from bs4 import BeautifulSoup, SoupStrainer
+from config.logger import _logger
+from mixins import metrics
+from mixins.asyncio import limiter, university_request
+from mixins.http_client import UpstreamStatusError, sessions
+from mixins.resilience import CircuitOpenError, Policy
+from urllib.parse import urlparse
+
+from services.base.cache import DocumentCache, load_document_cache
 
 import aiohttp
 
+logger = _logger(__name__)
+
 T = TypeVar("T")
 
+HTMLParser = Literal["html5lib", "lxml", "lexbor"]
+HTML_PARSERS = ("html5lib", "lxml", "lexbor")
+
+# crawler에 `parser`가 지정되지 않은 경우 사용할 HTML 파서
+HTML_PARSER = os.getenv("HTML_PARSER", "html5lib")
+
+if HTML_PARSER not in HTML_PARSERS:
+    raise ValueError(f"지원하지 않는 HTML_PARSER입니다: {HTML_PARSER}")
+
+# lexbor는 선택 의존성(selectolax)이 필요하므로 크롤링 도중이 아닌 시작할 때 확인
+if HTML_PARSER == "lexbor" and importlib.util.find_spec("selectolax") is None:
+    raise ValueError("HTML_PARSER=lexbor를 사용하려면 selectolax를 설치해야 합니다. (pip install selectolax)")
+
+
+def parse_html(
+    html: str,
+    parser: Optional[HTMLParser] = None,
+    parse_only: Optional[SoupStrainer] = None,
+) -> BeautifulSoup:
+    """
+    - `html5lib`: 브라우저와 같은 HTML5 파싱 (tbody 삽입, 태그 보정), 가장 느림
+    - `lxml`: libxml2 파서, 빠르지만 누락된 tbody 등을 보정하지 않음
+    - `lexbor`: selectolax(lexbor, HTML5 표준 파서)로 보정한 문서를 lxml로 다시 읽음 (html5lib과 같은 트리를 lxml 속도로)
+
+    `parse_only`가 주어지면 해당 요소만 트리로 만듭니다. html5lib은 `SoupStrainer`를 지원하지 않으므로 lxml로 파싱하며,
+    tbody 보정이 없으므로 선택자는 tbody 유무와 관계없이 작성해야 합니다.
+    """
+    match parser or HTML_PARSER:
+        case "html5lib":
+            if parse_only is not None:
+                return BeautifulSoup(html, "lxml", parse_only=parse_only)
+            return BeautifulSoup(html, "html5lib")
+        case "lxml":
+            return BeautifulSoup(html, "lxml", parse_only=parse_only)
+        case "lexbor":
+            from selectolax.lexbor import LexborHTMLParser
+            return BeautifulSoup(LexborHTMLParser(html).html or "", "lxml", parse_only=parse_only)
+        case _:
+            raise ValueError(f"지원하지 않는 HTML 파서입니다: {parser}")
+
+
+# HTML 파싱 + `post_process`를 실행할 프로세스 수 (0이면 이벤트 루프에서 실행)
+HTML_PARSE_WORKERS = int(os.getenv("HTML_PARSE_WORKERS", os.cpu_count() or 1))
+
+_parse_pool: Optional[ProcessPoolExecutor] = None
+
+
+def parse_pool() -> Optional[ProcessPoolExecutor]:
+    global _parse_pool
+    if _parse_pool is None and HTML_PARSE_WORKERS > 0:
+        # 이벤트 루프 / 커넥션 스레드가 있는 프로세스를 fork하지 않도록 forkserver 사용
+        _parse_pool = ProcessPoolExecutor(HTML_PARSE_WORKERS, mp_context=multiprocessing.get_context("forkserver"))
+    return _parse_pool
+
+
+def shutdown_parse_pool():
+    global _parse_pool
+    if _parse_pool is not None:
+        _parse_pool.shutdown(cancel_futures=True)
+        _parse_pool = None
+
+
+def parse_page(
+    body: bytes,
+    encoding: str,
+    post_process: Optional[Callable[[BeautifulSoup], T]] = None,
+    parser: Optional[HTMLParser] = None,
+    parse_only: Optional[SoupStrainer] = None,
+) -> T | BeautifulSoup:
+    """응답 본문을 파싱하고 `post_process` 결과(DTO 또는 `ParseHTMLException`)를 반환"""
+    soup = parse_html(body.decode(encoding, errors="ignore"), parser, parse_only)
+    return post_process(soup) if post_process else soup
+
+
+# `_picklable` 확인 결과 (`_pickle_key`별)
+_picklable_cache: Dict[Hashable, bool] = {}
+
+
+def _pickle_key(func: Callable) -> Hashable:
+    """함수는 코드 객체, partial / bound method는 감싼 함수와 인자 / 인스턴스 타입 기준 (같은 key는 같은 결과로 봄)"""
+    if isinstance(func, partial):
+        args = tuple(type(arg) for arg in func.args)
+        keywords = tuple((key, type(value)) for key, value in sorted(func.keywords.items()))
+        return (_pickle_key(func.func), args, keywords)
+    if isinstance(func, MethodType):
+        return (_pickle_key(func.__func__), type(func.__self__))
+    return getattr(func, "__code__", type(func))
+
+
+def _picklable(func: Callable) -> bool:
+    """호출마다 pickle하지 않도록 `_pickle_key`별로 한 번만 확인"""
+    key = _pickle_key(func)
+    if key not in _picklable_cache:
+        try:
+            pickle.dumps(func)
+            _picklable_cache[key] = True
+        except Exception:
+            _picklable_cache[key] = False
+    return _picklable_cache[key]
+
 
 @overload
 async def scrape_async(
@@ -15,7 +132,8 @@ async def scrape_async(
     session: aiohttp.ClientSession,
     post_process: Optional[Callable[[BeautifulSoup], T]] = None,
     retry_delay: float = 5.0,
-    delay_range: Tuple[float, float] = (0, 1)
+    parser: Optional[HTMLParser] = None,
+    parse_only: Optional[SoupStrainer] = None,
 ) -> List[T]:
     pass
 
@@ -26,30 +144,76 @@ async def scrape_async(
     session: aiohttp.ClientSession,
     post_process: Optional[Callable[[BeautifulSoup], T]] = None,
     retry_delay: float = 5.0,
-    delay_range: Tuple[float, float] = (0, 1)
+    parser: Optional[HTMLParser] = None,
+    parse_only: Optional[SoupStrainer] = None,
 ) -> T:
     pass
 
 
+_SCRAPE_POLICIES: Dict[Tuple[str, float], Policy] = {}
+
+
+def _scrape_policy(host: str, retry_delay: float) -> Policy:
+    """호스트별 재시도 정책 (4xx 응답과 파싱 실패로 반환된 예외도 재시도, 호스트 장애 시 circuit 차단)"""
+    policy = _SCRAPE_POLICIES.get((host, retry_delay))
+    if policy is None:
+        policy = _SCRAPE_POLICIES.setdefault(
+            (host, retry_delay),
+            Policy(
+                f"scrape.{host}",
+                attempts=8,
+                base_delay=retry_delay / 5,
+                max_delay=retry_delay * 6,
+                timeout=60,
+                breaker=f"university:{host}",
+                is_success=lambda result: not isinstance(result, BaseException),
+                retry_on=lambda e: not isinstance(e, CircuitOpenError),
+            ),
+        )
+    return policy
+
+
 async def scrape_async(
     url: str | List[str],
     session: aiohttp.ClientSession,
     post_process: Optional[Callable[[BeautifulSoup], T]] = None,
     retry_delay: float = 5.0,
-    delay_range: Tuple[float, float] = (0, 1)
+    parser: Optional[HTMLParser] = None,
+    parse_only: Optional[SoupStrainer] = None,
 ) -> T | List[T]:
 
-    @retry_async(delay=retry_delay, times=25)
-    async def help(_url: str) -> Any:
-        await asyncio.sleep(random.uniform(*delay_range))
-        async with session.get(_url) as res:
-            if res.ok:
-                html = await res.text(errors="ignore")
-                soup = BeautifulSoup(html, "html5lib")
-                result = post_process(soup) if post_process else soup
-                return result
+    parser = parser or HTML_PARSER  # type: ignore
+
+    # soup은 프로세스 간에 전달하지 않고, 전달할 수 없는 `post_process`(lambda 등)는 이벤트 루프에서 실행
+    pool = parse_pool() if post_process is not None else None
+    if pool is not None and not _picklable(post_process):
+        logger(f"post_process를 pickle할 수 없어 이벤트 루프에서 파싱합니다: {post_process!r}", logging.WARNING)
+        pool = None
+
+    async def fetch(_url: str, host: str) -> Any:
+        async with university_request(host) as timing, sessions.resolve("university", session).get(_url) as res:
+            timing.headers_received()
+            if not res.ok:
+                raise UpstreamStatusError(res.status, "페이지를 불러오지 못했습니다.")
+
+            body, encoding = await res.read(), res.get_encoding()
 
-            raise aiohttp.ClientError
+        if pool is None:
+            return parse_page(body, encoding, post_process, parser, parse_only)
+
+        return await asyncio.get_running_loop().run_in_executor(
+            pool,
+            parse_page,
+            body,
+            encoding,
+            post_process,
+            parser,
+            parse_only,
+        )
+
+    async def help(_url: str) -> Any:
+        host = urlparse(_url).hostname or ""
+        return await _scrape_policy(host, retry_delay).call(fetch, _url, host)
 
     if isinstance(url, str):
         return await help(url)
@@ -57,24 +221,149 @@ async def scrape_async(
     return await asyncio.gather(*[help(url) for url in url])
 
 
-import os
-
 DOCUMENT_PARSER_URL = os.getenv("DOCUMENT_PARSER_URL")
 
 
-@retry_async(delay=3)
+@Policy("document_parser", attempts=4, base_delay=2, max_delay=30, timeout=600, breaker="document_parser")
 async def parse_document_async(
     url: str | List[str],
     session: aiohttp.ClientSession,
+    lane: str = "document_parser",
 ) -> List[Dict[int, str]]:
+    """`lane`: 동시 요청 수를 제한할 limiter 이름 (큰 문서는 `document_parser_large`)"""
     if isinstance(url, list) and not url:
         return []
 
     body = {"url": url}
 
-    async with session.post(f"{DOCUMENT_PARSER_URL}/extract_text", json=body) as res:
+    session = sessions.resolve("document_parser", session)
+    async with limiter(lane).acquire(), \
+            session.post(f"{DOCUMENT_PARSER_URL}/extract_text", json=body) as res:
         if res.ok:
             data = await res.json()
             return data
 
-        raise Exception("Failed parse document")
+        raise UpstreamStatusError(res.status, "Failed parse document")
+
+
+# `extract_documents_async`에서 한 번의 `/extract_text` 요청에 담을 첨부파일 수
+DOCUMENT_PARSER_BATCH = int(os.getenv("DOCUMENT_PARSER_BATCH", 8))
+
+_document_cache: Optional[DocumentCache] = None
+_document_cache_loaded = False
+
+
+def document_cache() -> Optional[DocumentCache]:
+    """`DOCUMENT_CACHE_PATH`가 설정된 경우 첨부파일 파싱 캐시 (HTML 파싱 프로세스에서는 열지 않도록 처음 사용할 때 생성)"""
+    global _document_cache, _document_cache_loaded
+    if not _document_cache_loaded:
+        _document_cache, _document_cache_loaded = load_document_cache(), True
+    return _document_cache
+
+
+def header_validator(headers: Mapping[str, str]) -> Optional[str]:
+    """응답 헤더의 ETag 또는 파일 크기 + Last-Modified, 둘 다 없으면 파일 크기만 (약한 검증자, url과 함께 key로 사용)
+
+    Range 응답(206)이면 Content-Length 대신 Content-Range의 전체 크기를 사용합니다.
+    """
+    if headers.get("ETag"):
+        return f"etag:{headers['ETag']}"
+
+    content_range = re.match(r"bytes \d+-\d+/(\d+)", headers.get("Content-Range", ""))
+    size = content_range.group(1) if content_range else headers.get("Content-Length", "")
+    if not size.isdigit() or int(size) == 0:
+        return None
+    if headers.get("Last-Modified"):
+        return f"length:{size};modified:{headers['Last-Modified']}"
+    return f"length:{size}"
+
+
+async def document_validator(url: str, session: aiohttp.ClientSession) -> Optional[str]:
+    """첨부파일이 바뀌었는지 판단할 검증자
+
+    HEAD 응답 헤더(`header_validator`)를 사용하고, HEAD로 알 수 없으면 첫 바이트만 요청(Range)해 확인합니다.
+    큰 파일을 두 번 내려받지 않도록 본문은 읽지 않으며, 확인할 수 없으면 `None` (캐시하지 않음)
+    """
+    host = urlparse(url).hostname or ""
+    session = sessions.resolve("university", session)
+    try:
+        async with university_request(host) as timing, session.head(url, allow_redirects=True) as res:
+            timing.headers_received()
+            if res.ok and (validator := header_validator(res.headers)):
+                return validator
+
+        # Range를 무시하고 전체 파일로 응답하는 서버도 본문은 읽지 않고 헤더만 사용
+        async with university_request(host) as timing, session.get(url, headers={"Range": "bytes=0-0"}) as res:
+            timing.headers_received()
+            return header_validator(res.headers) if res.ok else None
+
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger(f"첨부파일 검증자를 확인하지 못했습니다. ({url}, {e})", logging.WARNING)
+        return None
+
+
+async def extract_documents_async(
+    urls: List[str],
+    session: aiohttp.ClientSession,
+    validators: Optional[Dict[str, str]] = None,
+    batch_size: Optional[int] = None,
+    lane: str = "document_parser",
+) -> List[Dict[int, str]]:
+    """여러 게시글의 첨부파일을 한 번에 파싱 (`parse_document_async`와 같이 입력 순서대로 반환)
+
+    같은 url은 한 번만 요청하고, `document_cache()`가 있으면 캐시된 결과를 사용한 뒤 나머지만
+    `batch_size`(default: `DOCUMENT_PARSER_BATCH`)개씩 나누어 파싱합니다. 빈 결과는 일시적인 실패일 수 있으므로 캐시하지 않습니다.
+    `validators`로 이미 확인한 검증자(`attachment.probe_attachment`)를 넘기면 해당 url은 다시 확인하지 않습니다.
+    """
+    if not urls:
+        return []
+
+    unique_urls = list(dict.fromkeys(urls))
+    results: Dict[str, Dict[int, str]] = {}
+    keys: Dict[str, bytes] = {}
+
+    cache = document_cache()
+    if cache is not None:
+        known = validators or {}
+        probed = await asyncio.gather(*[
+            document_validator(url, session) for url in unique_urls if not known.get(url)
+        ])
+        probed_validators = dict(zip([url for url in unique_urls if not known.get(url)], probed))
+        keys = {
+            url: cache.key(url, validator)
+            for url in unique_urls if (validator := known.get(url) or probed_validators.get(url))
+        }
+        found = cache.get_many(list(keys.values()))
+        results = {url: found[key] for url, key in keys.items() if key in found}
+
+    misses = [url for url in unique_urls if url not in results]
+    batch_size = batch_size or DOCUMENT_PARSER_BATCH
+    batches = [misses[st:st + batch_size] for st in range(0, len(misses), batch_size)]
+    parsed = await asyncio.gather(*[parse_document_async(batch, session, lane=lane) for batch in batches])
+
+    fetched = dict(zip(misses, [pages for part in parsed for pages in part]))
+    results.update(fetched)
+    if cache is not None:
+        cache.put_many([(keys[url], url, pages) for url, pages in fetched.items() if url in keys and pages])
+
+    metrics.counter("document_parser.requested").inc(len(urls))
+    metrics.counter("document_parser.cache_hits").inc(len(unique_urls) - len(misses))
+    metrics.counter("document_parser.parsed").inc(len(misses))
+    metrics.counter("document_parser.calls").inc(len(batches))
+    logger(f"첨부파일 {len(urls)}개 (중복 제외 {len(unique_urls)}개, 캐시 {len(unique_urls) - len(misses)}개) "
+           f"-> 파싱 {len(misses)}개")
+
+    return [results.get(url, {}) for url in urls]
+
+
+def document_stats() -> Dict[str, float]:
+    """실행 중 첨부파일 파싱 통계 (`saved`: 중복 제거와 캐시로 파서에 보내지 않은 첨부파일 수)"""
+    requested = metrics.counter("document_parser.requested").snapshot()
+    parsed = metrics.counter("document_parser.parsed").snapshot()
+    return {
+        "requested": requested,
+        "cache_hits": metrics.counter("document_parser.cache_hits").snapshot(),
+        "parsed": parsed,
+        "calls": metrics.counter("document_parser.calls").snapshot(),
+        "saved": requested - parsed,
+    }
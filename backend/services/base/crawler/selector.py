@@ -0,0 +1,30 @@
+"""crawler 선택자 / 부분 파싱 도구
+
+```python
+SELECTORs = compile_selectors({"list": "table.board > tbody > tr", "detail": {"title": "h2"}})
+soup.select(SELECTORs["list"])  # 페이지 / 행마다 선택자를 다시 해석하지 않음
+
+list_strainer = SoupStrainer("table", class_=has_class("board"))  # 목록 표만 트리로 생성
+```
+"""
+
+import re
+from typing import Any, Dict
+
+import soupsieve
+
+
+def compile_selectors(selectors: Dict[str, Any]) -> Dict[str, Any]:
+    """`SELECTORs` 형식(중첩 dict)의 CSS 선택자를 미리 컴파일 (`Tag.select`에 그대로 전달 가능)"""
+    return {
+        key: compile_selectors(value) if isinstance(value, dict) else soupsieve.compile(value)
+        for key, value in selectors.items()
+    }
+
+
+def has_class(name: str) -> re.Pattern:
+    """`SoupStrainer`용 class 조건
+
+    파싱 중에는 class 속성이 나뉘기 전 문자열("a b")로 비교되므로 `class_="a"`는 여러 class를 가진 요소와 맞지 않음
+    """
+    return re.compile(rf"(?:^|\s){re.escape(name)}(?:\s|$)")
@@ -1,4 +1,6 @@
 from typing import Dict, List, NotRequired, Optional, Required, TypedDict, TypeVar
+import numpy as np
+from numpy.typing import NDArray
 from pydantic import BaseModel, HttpUrl
 
 
@@ -21,7 +23,7 @@ class EmbedResultV2(BaseModel):
 
 class EmbedResult(TypedDict):
     chunk: NotRequired[str]
-    dense: List[float]
+    dense: List[float] | NDArray[np.floating]  # `EMBED_ENCODING`이 base64/binary이면 ndarray
     sparse: Dict[int, float]
 
 
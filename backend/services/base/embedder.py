@@ -1,21 +1,66 @@
 from abc import ABC, abstractmethod
-from typing import Generic, List, Optional, overload
+import asyncio
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from itertools import chain
+from typing import Dict, Generic, Hashable, List, Optional, Sequence, overload
 
 from aiohttp import ClientSession
 import requests
 
-from mixins.asyncio import retry_async, retry_sync
+from mixins import metrics
+from mixins.asyncio import retry_sync
 from mixins.http_client import HTTPMetaclass
 from dotenv import load_dotenv
 import os
 
+from services.base.cache import EmbeddingCache, load_embedding_cache, load_rerank_cache
+from services.base.coalescer import Coalescer, scatter_by_index, scatter_in_order
+from services.base.crawler import render
 from services.base.dto import DTO, EmbedResult, RerankResult
+from services.base.embedding_backend import load_embedding_backend
 
 load_dotenv()
 
 EMBED_URL = os.environ.get("EMBED_URL")
 TEI_URL = os.environ.get("TEI_URL")
 
+# `EMBED_BACKEND` (http | hashing | standin)
+backend = load_embedding_backend()
+
+
+@asynccontextmanager
+async def open_backend():
+    """범위를 벗어나면 backend를 닫음 (standin 서버 종료, `sessions.open()`과 같이 사용)"""
+    try:
+        yield backend
+    finally:
+        await backend.close()
+
+# 동시 요청 묶음 처리 설정 (window가 0이면 비활성화)
+COALESCE_WINDOW_MS = float(os.environ.get("EMBED_COALESCE_WINDOW_MS", 5))
+COALESCE_MAX_BATCH = int(os.environ.get("EMBED_COALESCE_MAX_BATCH", 32))
+
+# 크롤링 시 임베딩 요청 packing 설정 (토큰 수는 tiktoken 기준 근사치)
+PACK_ENCODING = os.environ.get("EMBED_PACK_ENCODING", "cl100k_base")
+PACK_MAX_TOKENS = int(os.environ.get("EMBED_PACK_MAX_TOKENS", 16384))
+PACK_MAX_ITEMS = int(os.environ.get("EMBED_PACK_MAX_ITEMS", 64))
+PACK_CONCURRENCY = int(os.environ.get("EMBED_PACK_CONCURRENCY", 4))
+
+_embed_cache: Optional[EmbeddingCache] = None
+_embed_cache_loaded = False
+
+
+def embedding_cache() -> Optional[EmbeddingCache]:
+    """`EMBED_CACHE_PATH`가 설정된 경우 임베딩 캐시 (HTML 파싱 프로세스에서는 열지 않도록 처음 사용할 때 생성)"""
+    global _embed_cache, _embed_cache_loaded
+    if not _embed_cache_loaded:
+        _embed_cache, _embed_cache_loaded = load_embedding_cache(model=backend.model), True
+    return _embed_cache
+
+# `RERANK_CACHE_SIZE`가 0이면 None
+rerank_cache = load_rerank_cache()
+
 
 @overload
 async def embed_async(
@@ -24,6 +69,7 @@ async def embed_async(
     chunking: bool = True,
     truncate: bool = True,
     html: bool = True,
+    coalesce: bool = True,
 ) -> List[EmbedResult]:
     pass
 
@@ -35,30 +81,75 @@ async def embed_async(
     chunking: bool = True,
     truncate: bool = True,
     html: bool = True,
+    coalesce: bool = True,
 ) -> EmbedResult:
     pass
 
 
-@retry_async(delay=3)
 async def embed_async(
     texts: str | List[str],
     session: ClientSession,
     chunking: bool = True,
     truncate: bool = True,
     html: bool = True,
+    coalesce: bool = True,
+) -> EmbedResult | List[EmbedResult]:
+    """`coalesce=False`면 다른 요청과 묶지 않고 그대로 요청 (토큰 수 기준으로 이미 묶은 `embed_packed_async` 그룹)"""
+    send = _embed_coalesced_async if coalesce else _embed_async
+
+    # 청킹 시에는 입력과 결과가 1:1로 대응되지 않으므로 캐시하지 않음
+    embed_cache = None if chunking else embedding_cache()
+    if embed_cache is None:
+        return await send(texts, session, chunking=chunking, truncate=truncate, html=html)
+
+    _texts = [texts] if isinstance(texts, str) else texts
+    keys = [embed_cache.key(text, chunking, truncate, html) for text in _texts]
+    found = embed_cache.get_many(keys)
+
+    missing = {key: text for key, text in zip(keys, _texts) if key not in found}
+    if missing:
+        results = await send(
+            list(missing.values()),
+            session,
+            chunking=chunking,
+            truncate=truncate,
+            html=html,
+        )
+        fetched = list(zip(missing.keys(), results))
+        embed_cache.put_many(fetched)
+        found.update(fetched)
+
+    results = [found[key] for key in keys]
+    return results[0] if isinstance(texts, str) else results
+
+
+async def _embed_coalesced_async(
+    texts: str | List[str],
+    session: ClientSession,
+    chunking: bool = True,
+    truncate: bool = True,
+    html: bool = True,
 ) -> EmbedResult | List[EmbedResult]:
-    body = {
-        "inputs": texts,
-        "chunking": chunking,
-        "truncate": truncate,
-        "html": html,
-    }
-    async with session.post(f"{EMBED_URL}/embed", json=body) as res:
-        if res.status == 200:
-            data = await res.json()
-            return data
+    # 청킹 시에는 입력과 결과가 1:1로 대응되지 않으므로 묶지 않음
+    if chunking or not embed_coalescer.enabled:
+        return await _embed_async(texts, session, chunking=chunking, truncate=truncate, html=html)
 
-        raise Exception("텍스트 임베딩에 실패했습니다.")
+    _texts = [texts] if isinstance(texts, str) else texts
+    if not _texts or len(_texts) >= embed_coalescer.max_batch_size:
+        return await _embed_async(_texts, session, chunking=chunking, truncate=truncate, html=html)
+
+    results = await embed_coalescer.submit((chunking, truncate, html), _texts, session)
+    return results[0] if isinstance(texts, str) else results
+
+
+async def _embed_async(
+    texts: str | List[str],
+    session: ClientSession,
+    chunking: bool = True,
+    truncate: bool = True,
+    html: bool = True,
+) -> EmbedResult | List[EmbedResult]:
+    return await backend.embed(texts, session, chunking=chunking, truncate=truncate, html=html)
 
 
 @retry_sync(delay=3)
@@ -75,29 +166,168 @@ def embed(
     raise Exception
 
 
-@retry_async(delay=3)
 async def rerank_async(
     query: str,
     texts: List[str],
     session: ClientSession,
     truncate: bool = True,
     truncation_direction="Right",
+    ids: Optional[Sequence[Hashable]] = None,
 ) -> List[RerankResult]:
+    """`ids`(chunk id)가 주어지면 캐시된 점수는 재사용하고 나머지만 리랭크 요청"""
     if not texts:
         return []
 
-    body = {
-        "query": query,
-        "texts": texts,
-        "truncate": truncate,
-        "truncation_direction": truncation_direction,
-    }
-    async with session.post(f"{TEI_URL}/rerank", json=body) as res:
-        if res.status == 200:
-            data = await res.json()
-            return data
+    if ids is None or rerank_cache is None:
+        return await _rerank_coalesced_async(
+            query,
+            texts,
+            session,
+            truncate=truncate,
+            truncation_direction=truncation_direction,
+        )
+
+    keys = [rerank_cache.key(query, _id, text, truncate, truncation_direction) for _id, text in zip(ids, texts)]
+    scores = rerank_cache.get_many(keys)
+
+    missing = [idx for idx in range(len(texts)) if idx not in scores]
+    if missing:
+        results = await _rerank_coalesced_async(
+            query,
+            [texts[idx] for idx in missing],
+            session,
+            truncate=truncate,
+            truncation_direction=truncation_direction,
+        )
+        fetched = {missing[res["index"]]: res["score"] for res in results}
+        rerank_cache.put_many([(keys[idx], score) for idx, score in fetched.items()])
+        scores.update(fetched)
 
-        raise Exception("Failed Reranking")
+    results = [RerankResult(index=idx, score=score) for idx, score in scores.items()]
+    return sorted(results, key=lambda res: res["score"], reverse=True)
+
+
+async def _rerank_coalesced_async(
+    query: str,
+    texts: List[str],
+    session: ClientSession,
+    truncate: bool = True,
+    truncation_direction="Right",
+) -> List[RerankResult]:
+    if not rerank_coalescer.enabled or len(texts) >= rerank_coalescer.max_batch_size:
+        return await _rerank_async(query, texts, session, truncate=truncate, truncation_direction=truncation_direction)
+
+    results = await rerank_coalescer.submit((query, truncate, truncation_direction), texts, session)
+    return sorted(results, key=lambda res: res["score"], reverse=True)
+
+
+async def _rerank_async(
+    query: str,
+    texts: List[str],
+    session: ClientSession,
+    truncate: bool = True,
+    truncation_direction="Right",
+) -> List[RerankResult]:
+    return await backend.rerank(query, texts, session, truncate=truncate, truncation_direction=truncation_direction)
+
+
+async def _send_embed_batch(key, texts, session):
+    chunking, truncate, html = key
+    return await _embed_async(texts, session, chunking=chunking, truncate=truncate, html=html)
+
+
+async def _send_rerank_batch(key, texts, session):
+    query, truncate, truncation_direction = key
+    return await _rerank_async(query, texts, session, truncate=truncate, truncation_direction=truncation_direction)
+
+
+embed_coalescer = Coalescer[EmbedResult](
+    "embed.coalescer",
+    send=_send_embed_batch,
+    scatter=scatter_in_order,
+    window=COALESCE_WINDOW_MS / 1000,
+    max_batch_size=COALESCE_MAX_BATCH,
+    upstream="embed",
+)
+
+rerank_coalescer = Coalescer[RerankResult](
+    "rerank.coalescer",
+    send=_send_rerank_batch,
+    scatter=scatter_by_index,
+    window=COALESCE_WINDOW_MS / 1000,
+    max_batch_size=COALESCE_MAX_BATCH,
+    upstream="rerank",
+)
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    import tiktoken
+    return tiktoken.get_encoding(PACK_ENCODING)
+
+
+def count_tokens(text: str) -> int:
+    return len(_get_encoding().encode_ordinary(text))
+
+
+def pack_texts(texts: List[str], max_tokens: int, max_items: int) -> List[List[str]]:
+    """토큰 수 합이 `max_tokens`를 넘지 않도록 텍스트를 요청 단위로 묶음 (상한을 넘는 텍스트는 단독 요청)"""
+    groups: List[List[str]] = []
+    group: List[str] = []
+    group_tokens = 0
+
+    for text in texts:
+        tokens = count_tokens(text)
+        if group and (group_tokens + tokens > max_tokens or len(group) >= max_items):
+            groups.append(group)
+            group, group_tokens = [], 0
+
+        group.append(text)
+        group_tokens += tokens
+
+    if group:
+        groups.append(group)
+
+    return groups
+
+
+async def embed_packed_async(
+    texts: List[str],
+    session: ClientSession,
+    max_tokens: int = PACK_MAX_TOKENS,
+    max_items: int = PACK_MAX_ITEMS,
+    concurrency: int = PACK_CONCURRENCY,
+    truncate: bool = True,
+    html: bool = True,
+    reuse: Optional[Dict[str, EmbedResult]] = None,
+) -> List[EmbedResult]:
+    """중복 제거 후 토큰 수 기준으로 묶어 병렬 요청하고, 결과를 입력 순서대로 반환 (chunking=False)
+
+    `reuse`(`render.content_hash` → 저장된 임베딩)에 있는 텍스트는 요청하지 않고 저장된 임베딩을 사용합니다.
+    """
+
+    unique_texts = list(dict.fromkeys(texts))
+
+    reused: Dict[str, EmbedResult] = {}
+    if reuse:
+        hashes = {text: render.content_hash(text) for text in unique_texts}
+        reused = {text: reuse[key] for text, key in hashes.items() if key in reuse}
+        unique_texts = [text for text in unique_texts if text not in reused]
+        metrics.counter("embed.reused").inc(len(reused))
+
+    groups = pack_texts(unique_texts, max_tokens=max_tokens, max_items=max_items)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def embed_group(group: List[str]) -> List[EmbedResult]:
+        async with semaphore:
+            # 묶음 처리(coalescer)로 다른 그룹과 합치면 `max_tokens`를 넘을 수 있으므로 그대로 요청
+            return await embed_async(group, session, chunking=False, truncate=truncate, html=html, coalesce=False)
+
+    results = await asyncio.gather(*[embed_group(group) for group in groups])
+
+    embeddings = {**reused, **dict(zip(unique_texts, chain(*results)))}
+    return [embeddings[text] for text in texts]
 
 
 class BaseEmbedder(ABC, Generic[DTO], metaclass=HTTPMetaclass):
@@ -112,7 +342,13 @@ class BaseEmbedder(ABC, Generic[DTO], metaclass=HTTPMetaclass):
     async def _embed_dtos_async(self, dtos: List[DTO], session: ClientSession, **kwargs) -> List[DTO]:
         pass
 
-    async def embed_dtos_batch_async(self, dtos: List[DTO], batch_size: int = 30, **kwargs) -> List[DTO]:
+    async def embed_dtos_batch_async(
+        self,
+        dtos: List[DTO],
+        batch_size: int = 30,
+        concurrency: int = 2,
+        **kwargs,
+    ) -> List[DTO]:
         session = kwargs.get("session")
         if not isinstance(session, ClientSession):
             raise ValueError("'session' argument must be provided.")
@@ -123,6 +359,12 @@ class BaseEmbedder(ABC, Generic[DTO], metaclass=HTTPMetaclass):
 
         parted_items = list(parts(dtos, batch_size))
 
-        xss = [await self.embed_dtos_async(_items, session=session) for _items in parted_items]
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def embed_part(_items: List[DTO]):
+            async with semaphore:
+                return await self.embed_dtos_async(_items, session=session)
+
+        xss = await asyncio.gather(*[embed_part(_items) for _items in parted_items])
 
         return [x for xs in xss for x in xs]
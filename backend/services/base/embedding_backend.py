@@ -0,0 +1,295 @@
+"""임베딩 / 리랭크 backend
+
+`EMBED_BACKEND`로 선택합니다.
+
+- `http` (default): `EMBED_URL`(`/embed`), `TEI_URL`(`/rerank`) 서버 호출
+- `hashing`: 프로세스 내 결정적 해싱 임베더 (외부 서버 없이 검색 경로 테스트 / 벤치마크)
+- `standin`: 해싱 임베더로 응답하는 로컬 aiohttp 서버(`services.base.standin`)를 띄우고 HTTP로 호출
+"""
+
+from abc import ABC, abstractmethod
+import asyncio
+from collections import Counter
+import math
+import os
+import re
+from typing import List, Optional
+import zlib
+
+from aiohttp import ClientSession
+import numpy as np
+
+from db.common import N_DIM, V_DIM
+from mixins.asyncio import limiter
+from mixins.http_client import UpstreamStatusError, sessions
+from mixins.resilience import Policy
+from services.base import vector_codec
+from services.base.dto import EmbedResult, RerankResult
+
+# 크롤링 시 배치 크기에 따라 지연 편차가 커서 임베딩은 hedging하지 않음
+EMBED_POLICY = Policy("embed", attempts=5, base_delay=0.5, max_delay=8, timeout=120, breaker="embed")
+RERANK_POLICY = Policy(
+    "rerank",
+    attempts=4,
+    base_delay=0.3,
+    max_delay=4,
+    timeout=10,
+    hedge_quantile=0.95,
+    breaker="rerank",
+)
+
+
+class EmbeddingBackend(ABC):
+    """`embed_async` / `rerank_async`가 실제로 호출하는 backend
+
+    `embed`는 `texts`가 문자열이면 결과 하나, 리스트면 입력 순서대로 결과 리스트를 반환합니다.
+    `chunking=True`이면 텍스트마다 청크별 결과 리스트를 반환합니다.
+    """
+
+    model: str
+
+    @abstractmethod
+    async def embed(
+        self,
+        texts: str | List[str],
+        session: ClientSession,
+        chunking: bool = True,
+        truncate: bool = True,
+        html: bool = True,
+    ):
+        pass
+
+    @abstractmethod
+    async def rerank(
+        self,
+        query: str,
+        texts: List[str],
+        session: ClientSession,
+        truncate: bool = True,
+        truncation_direction="Right",
+    ) -> List[RerankResult]:
+        pass
+
+    async def close(self):
+        pass
+
+
+class HTTPEmbeddingBackend(EmbeddingBackend):
+
+    def __init__(
+        self,
+        embed_url: Optional[str],
+        rerank_url: Optional[str],
+        model: str = "bge-m3",
+        encoding: vector_codec.Encoding = "json",
+        dtype: vector_codec.DType = "float32",
+    ):
+        if encoding not in vector_codec.ENCODINGS:
+            raise ValueError(f"지원하지 않는 EMBED_ENCODING입니다: {encoding}")
+
+        self.embed_url = embed_url
+        self.rerank_url = rerank_url
+        self.model = model
+        self.encoding = encoding
+        self.dtype = dtype
+
+    @EMBED_POLICY
+    async def embed(self, texts, session, chunking=True, truncate=True, html=True):
+        body = {
+            "inputs": texts,
+            "chunking": chunking,
+            "truncate": truncate,
+            "html": html,
+        }
+        # 청킹 결과(텍스트별 청크 리스트)는 vector_codec 형식이 아니므로 json으로 받음
+        encoding = "json" if chunking else self.encoding
+        if encoding != "json":
+            body.update(encoding=encoding, dtype=self.dtype)
+
+        async with limiter("embed").acquire(), \
+                sessions.resolve("embed", session).post(f"{self.embed_url}/embed", json=body) as res:
+            if res.status == 200:
+                if encoding == "binary":
+                    return vector_codec.decode_binary(await res.read())
+
+                data = await res.json()
+                if encoding == "base64":
+                    return vector_codec.decode_base64(data, dtype=self.dtype)
+
+                return data
+
+            raise UpstreamStatusError(res.status, "텍스트 임베딩에 실패했습니다.")
+
+    @RERANK_POLICY
+    async def rerank(self, query, texts, session, truncate=True, truncation_direction="Right"):
+        if not texts:
+            return []
+
+        body = {
+            "query": query,
+            "texts": texts,
+            "truncate": truncate,
+            "truncation_direction": truncation_direction,
+        }
+        async with limiter("rerank").acquire(), \
+                sessions.resolve("rerank", session).post(f"{self.rerank_url}/rerank", json=body) as res:
+            if res.status == 200:
+                data = await res.json()
+                return data
+
+            raise UpstreamStatusError(res.status, "Failed Reranking")
+
+
+_TAG = re.compile(r"<[^>]+>")
+_WORD = re.compile(r"\w+")
+
+
+class HashingEmbedder:
+    """단어와 글자 3-gram을 feature hashing하여 결정적인 dense / sparse 벡터를 만드는 임베더
+
+    같은 텍스트는 항상 같은 벡터가 되고, 단어를 공유하는 텍스트끼리는 유사도가 높아 검색 경로를 실제와 비슷하게 태울 수
+    있습니다. 의미 유사도는 반영하지 않습니다.
+    """
+
+    def __init__(self, dim: int = N_DIM, vocab_size: int = V_DIM, chunk_size: int = 1000, max_chars: int = 16384):
+        self.dim = dim
+        self.vocab_size = vocab_size
+        self.chunk_size = chunk_size
+        self.max_chars = max_chars
+
+    @staticmethod
+    def _hash(feature: str) -> int:
+        return zlib.crc32(feature.encode("utf-8"))
+
+    def _words(self, text: str) -> List[str]:
+        return _WORD.findall(text.lower())
+
+    def dense(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for word in self._words(text):
+            padded = f" {word} "
+            features = [word] + [padded[idx:idx + 3] for idx in range(len(padded) - 2)]
+            for feature in features:
+                h = self._hash(feature)
+                vector[h % self.dim] += 1.0 if h & 0x80000000 else -1.0
+
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else vector
+
+    def sparse(self, text: str):
+        counts = Counter(self._hash(f"s:{word}") % self.vocab_size for word in self._words(text))
+        if not counts:
+            return {}
+
+        scale = 1 + math.log(max(counts.values()))
+        return {idx: round(0.3 * (1 + math.log(tf)) / scale, 4) for idx, tf in counts.items()}
+
+    def _prepare(self, text: str, truncate: bool, html: bool) -> str:
+        text = _TAG.sub(" ", text) if html else text
+        return text[:self.max_chars] if truncate else text
+
+    def _chunks(self, text: str) -> List[str]:
+        chunks, chunk = [], ""
+        for paragraph in re.split(r"\n\s*\n", text):
+            if chunk and len(chunk) + len(paragraph) > self.chunk_size:
+                chunks.append(chunk)
+                chunk = ""
+            chunk = f"{chunk}\n\n{paragraph}" if chunk else paragraph
+        if chunk or not chunks:
+            chunks.append(chunk)
+        return [piece for chunk in chunks for piece in self._split(chunk)]
+
+    def _split(self, chunk: str) -> List[str]:
+        return [chunk[st:st + self.chunk_size] for st in range(0, len(chunk), self.chunk_size)] or [chunk]
+
+    def embed_text(self, text: str) -> EmbedResult:
+        return EmbedResult(chunk=text, dense=self.dense(text).tolist(), sparse=self.sparse(text))
+
+    def embed(self, texts: str | List[str], chunking: bool = True, truncate: bool = True, html: bool = True):
+
+        def embed_one(text: str):
+            text = self._prepare(text, truncate, html)
+            return [self.embed_text(chunk) for chunk in self._chunks(text)] if chunking else self.embed_text(text)
+
+        return embed_one(texts) if isinstance(texts, str) else [embed_one(text) for text in texts]
+
+    def score(self, query: str, text: str) -> float:
+        return max(0.0, float(np.dot(self.dense(query), self.dense(text))))
+
+    def rerank(self, query: str, texts: List[str]) -> List[RerankResult]:
+        results = [RerankResult(index=idx, score=self.score(query, text)) for idx, text in enumerate(texts)]
+        return sorted(results, key=lambda res: res["score"], reverse=True)
+
+
+class HashingEmbeddingBackend(EmbeddingBackend):
+
+    def __init__(self, embedder: Optional[HashingEmbedder] = None):
+        self.embedder = embedder or HashingEmbedder()
+        self.model = "hashing"
+
+    async def embed(self, texts, session, chunking=True, truncate=True, html=True):
+        return self.embedder.embed(texts, chunking=chunking, truncate=truncate, html=html)
+
+    async def rerank(self, query, texts, session, truncate=True, truncation_direction="Right"):
+        return self.embedder.rerank(query, texts)
+
+
+class StandinEmbeddingBackend(EmbeddingBackend):
+    """첫 호출 시 현재 이벤트 루프에 로컬 stand-in 서버를 띄우고 `HTTPEmbeddingBackend`로 호출"""
+
+    def __init__(self, latency: float = 0.02, per_item_latency: float = 0.0005, max_concurrency: int = 4):
+        self.options = dict(latency=latency, per_item_latency=per_item_latency, max_concurrency=max_concurrency)
+        self.model = "hashing"
+        self._http: Optional[HTTPEmbeddingBackend] = None
+        self._server = None
+        # 동시에 들어온 첫 호출들이 서버를 여러 개 띄우지 않도록 보호
+        self._lock = asyncio.Lock()
+
+    async def _backend(self) -> HTTPEmbeddingBackend:
+        if self._http is not None:
+            return self._http
+
+        async with self._lock:
+            if self._http is None:
+                from services.base.standin import serve
+
+                server = serve(port=0, **self.options)
+                base_url, _ = await server.__aenter__()
+                self._server, self._http = server, HTTPEmbeddingBackend(base_url, base_url, model=self.model)
+        return self._http
+
+    async def embed(self, texts, session, chunking=True, truncate=True, html=True):
+        backend = await self._backend()
+        return await backend.embed(texts, session, chunking=chunking, truncate=truncate, html=html)
+
+    async def rerank(self, query, texts, session, truncate=True, truncation_direction="Right"):
+        backend = await self._backend()
+        return await backend.rerank(query, texts, session, truncate=truncate, truncation_direction=truncation_direction)
+
+    async def close(self):
+        if self._server is not None:
+            await self._server.__aexit__(None, None, None)
+            self._server, self._http = None, None
+        # 다음 이벤트 루프에서 다시 띄울 수 있도록 새 lock 사용
+        self._lock = asyncio.Lock()
+
+
+def load_embedding_backend() -> EmbeddingBackend:
+    name = os.environ.get("EMBED_BACKEND", "http")
+    if name == "hashing":
+        return HashingEmbeddingBackend()
+
+    if name == "standin":
+        latency = float(os.environ.get("EMBED_STANDIN_LATENCY_MS", 20)) / 1000
+        return StandinEmbeddingBackend(latency=latency)
+
+    if name != "http":
+        raise ValueError(f"지원하지 않는 EMBED_BACKEND입니다: {name}")
+
+    return HTTPEmbeddingBackend(
+        os.environ.get("EMBED_URL"),
+        os.environ.get("TEI_URL"),
+        model=os.environ.get("EMBED_MODEL", "bge-m3"),
+        encoding=os.environ.get("EMBED_ENCODING", "json"),  # type: ignore
+        dtype=os.environ.get("EMBED_DTYPE", "float32"),  # type: ignore
+    )
@@ -0,0 +1,100 @@
+"""크롤링 작업(학과 / 게시판 분류) 동시 실행
+
+```python
+jobs = [*notice_service.crawl_jobs(department="정보컴퓨터공학부", ...), *me_notice_service.crawl_jobs(...)]
+results = await Orchestrator().run(jobs)
+logger(summary_table(results))
+```
+
+- 전체 동시 작업 수는 `CRAWL_CONCURRENCY`, 같은 호스트의 동시 작업 수는 `CRAWL_HOST_CONCURRENCY`로 제한합니다.
+  (한 작업 안의 요청 수는 기존과 같이 `university` limiter가 호스트별로 제한)
+- 작업에서 발생한 예외는 해당 작업의 결과로 기록하고 나머지 작업은 계속 실행합니다.
+"""
+
+import asyncio
+from dataclasses import dataclass
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from config.logger import _logger
+from mixins import metrics
+
+logger = _logger(__name__)
+
+CRAWL_CONCURRENCY = int(os.environ.get("CRAWL_CONCURRENCY", 4))
+CRAWL_HOST_CONCURRENCY = int(os.environ.get("CRAWL_HOST_CONCURRENCY", 1))
+
+
+@dataclass
+class CrawlJob:
+    """`run`은 (저장된 DTO 목록, 파싱한 첨부파일 페이지 수)를 반환"""
+    name: str
+    host: str
+    run: Callable[[], Awaitable[Tuple[List[Any], int]]]
+
+
+@dataclass
+class JobResult:
+    name: str
+    host: str
+    duration: float = 0.0
+    items: int = 0
+    pages: int = 0
+    error: Optional[BaseException] = None
+
+
+class Orchestrator:
+
+    def __init__(self, concurrency: int = CRAWL_CONCURRENCY, host_concurrency: int = CRAWL_HOST_CONCURRENCY):
+        self.concurrency = max(1, concurrency)
+        self.host_concurrency = max(1, host_concurrency)
+
+        self._running = metrics.gauge("crawl.jobs.running")
+        self._failed = metrics.counter("crawl.jobs.failed")
+
+    async def run(self, jobs: List[CrawlJob]) -> List[JobResult]:
+        """모든 작업을 실행하고 입력 순서대로 결과 반환 (실패한 작업은 `error`에 예외 기록)"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        hosts: Dict[str, asyncio.Semaphore] = {}
+
+        async def run_job(job: CrawlJob) -> JobResult:
+            result = JobResult(job.name, job.host)
+            host = hosts.setdefault(job.host, asyncio.Semaphore(self.host_concurrency))
+
+            async with host, semaphore:
+                self._running.inc()
+                st = time.perf_counter()
+                try:
+                    dtos, pages = await job.run()
+                    result.items, result.pages = len(dtos), pages
+                except Exception as e:
+                    self._failed.inc()
+                    result.error = e
+                    logger(f"[{job.name}] 일시적인 오류가 발생했습니다. {e}", logging.ERROR)
+                finally:
+                    result.duration = time.perf_counter() - st
+                    self._running.dec()
+
+            logger(f"[{job.name}] {'실패' if result.error else '완료'} ({result.duration:.0f}s)")
+            return result
+
+        return list(await asyncio.gather(*[run_job(job) for job in jobs]))
+
+
+def summary_table(results: List[JobResult]) -> str:
+    """작업별 소요 시간 / 게시글 수 / 첨부파일 페이지 수 / 오류 표"""
+    width = max([len(result.name) for result in results] + [3])
+    lines = [f"{'job':<{width}} | {'host':<24} | {'time(s)':>7} | {'notices':>7} | {'pages':>5} | error"]
+    lines.append("-" * len(lines[0]))
+
+    for result in results:
+        error = f"{type(result.error).__name__}: {result.error}"[:80] if result.error else ""
+        lines.append(f"{result.name:<{width}} | {result.host:<24} | {result.duration:>7.0f} | {result.items:>7} | "
+                     f"{result.pages:>5} | {error}")
+
+    failed = sum(1 for result in results if result.error)
+    lines.append(f"total {len(results)} jobs, {failed} failed, {sum(result.items for result in results)} notices, "
+                 f"{sum(result.pages for result in results)} pages")
+    return "\n".join(lines)
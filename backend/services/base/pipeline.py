@@ -0,0 +1,211 @@
+"""큐 기반 단계별(staged) 크롤링 파이프라인
+
+```python
+pipeline = Pipeline([
+    Stage("scrape", scrape_batch, workers=2),
+    Stage("embed", embed_batch, workers=2),
+    Stage("persist", persist_batch, blocking=True),
+], name="[정보컴퓨터공학부-공지사항]")
+results = await pipeline.run([urls[st:st + interval] for st in range(0, len(urls), interval)])
+```
+
+각 단계는 독립된 worker들이 자기 입력 큐에서 배치를 꺼내 처리하고 다음 단계의 큐에 넣습니다. 큐 크기가 제한되어 있어
+뒤 단계가 밀리면 앞 단계도 멈추므로(backpressure) 메모리에 쌓이는 배치 수가 제한되며, 배치 N을 임베딩하는 동안
+배치 N+1을 스크랩하고 배치 N-1을 저장합니다. 진행 상황(단계별 처리량, 큐 점유)은 `PIPELINE_REPORT_INTERVAL`초마다 로그로 출력합니다.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+from dataclasses import dataclass, field
+from functools import partial
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sized, TypeVar
+
+from config.logger import _logger
+from mixins import metrics
+from mixins.asyncio import _parse_limits
+
+logger = _logger(__name__)
+
+# 단계별 worker 수 (예: "scrape=2,parse=2,embed=2"), 지정하지 않은 단계는 `Stage.workers`
+PIPELINE_WORKERS: Dict[str, int] = _parse_limits(os.environ.get("PIPELINE_WORKERS", ""))
+# 단계별 입력 큐에 대기할 수 있는 배치 수
+PIPELINE_QUEUE_SIZE = int(os.environ.get("PIPELINE_QUEUE_SIZE", 2))
+PIPELINE_REPORT_INTERVAL = float(os.environ.get("PIPELINE_REPORT_INTERVAL", 10))
+
+T = TypeVar("T")
+
+_DONE = object()
+
+_blocking_executor: Optional[ThreadPoolExecutor] = None
+
+
+async def run_blocking(func: Callable[..., T], *args, **kwargs) -> T:
+    """동기 함수(DB 작업)를 이벤트 루프 밖의 하나의 스레드에서 차례로 실행
+
+    모든 파이프라인의 `blocking` 단계도 같은 스레드를 사용하므로, 여러 크롤링 작업이 동시에 실행되어도
+    세션을 공유하는 DB 작업은 겹치지 않습니다. 호출한 쪽의 contextvar(세션 등)를 그대로 사용합니다.
+    """
+    global _blocking_executor
+    if _blocking_executor is None:
+        _blocking_executor = ThreadPoolExecutor(1, thread_name_prefix="pipeline-blocking")
+
+    context = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(
+        _blocking_executor,
+        partial(context.run, func, *args, **kwargs),
+    )
+
+
+def _count(batch: Any) -> int:
+    return len(batch) if isinstance(batch, Sized) else 1
+
+
+@dataclass
+class Stage:
+    """
+    - `func`: 배치를 받아 다음 단계로 넘길 배치를 반환
+    - `blocking`: 동기 함수(DB 쓰기 등)를 `run_blocking`으로 실행, worker 수는 `PIPELINE_WORKERS`로 바꿀 수 없음
+    - `count`: 처리량 단위 (default: 결과 배치의 길이)
+    """
+    name: str
+    func: Callable[[Any], Awaitable[Any] | Any]
+    workers: int = 1
+    blocking: bool = False
+    count: Callable[[Any], int] = _count
+
+    def __post_init__(self):
+        if not self.blocking:
+            self.workers = PIPELINE_WORKERS.get(self.name, self.workers)
+        self.workers = max(1, self.workers)
+
+
+@dataclass
+class StageStats:
+    batches: int = 0
+    items: int = 0
+    busy: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    def throughput(self, now: float) -> float:
+        if self.started_at is None:
+            return 0.0
+        elapsed = (self.finished_at or now) - self.started_at
+        return self.items / elapsed if elapsed > 0 else 0.0
+
+
+@dataclass
+class Pipeline:
+    stages: List[Stage]
+    name: str = "pipeline"
+    queue_size: int = PIPELINE_QUEUE_SIZE
+    report_interval: float = PIPELINE_REPORT_INTERVAL
+    delay: float = 0.0
+    stats: Dict[str, StageStats] = field(default_factory=dict)
+
+    def __post_init__(self):
+        if not self.stages:
+            raise ValueError("'stages' must not be empty")
+
+        self.stats = {stage.name: StageStats() for stage in self.stages}
+        self._queues: List[asyncio.Queue] = []
+        self._total = 0
+
+    async def run(self, batches: Iterable[Any]) -> List[Any]:
+        """모든 배치를 처리하고 마지막 단계의 결과를 완료된 순서대로 반환
+
+        한 단계에서 예외가 발생하면 나머지 단계를 취소하고 해당 예외를 그대로 발생시킵니다.
+        """
+        batches = list(batches)
+        self._total = sum(_count(batch) for batch in batches)
+        self._queues = [asyncio.Queue(maxsize=self.queue_size) for _ in self.stages]
+        results: List[Any] = []
+
+        st = time.perf_counter()
+        reporter = asyncio.create_task(self._report_periodically()) if self.report_interval > 0 else None
+        try:
+            async with asyncio.TaskGroup() as group:
+                group.create_task(self._feed(batches))
+                for idx in range(len(self.stages)):
+                    group.create_task(self._run_stage(idx, results))
+
+        except* Exception as eg:
+            raise eg.exceptions[0]
+
+        finally:
+            if reporter:
+                reporter.cancel()
+
+        logger(f"{self.name} 완료 ({time.perf_counter() - st:.1f}s) {self.report()}")
+        return results
+
+    async def _feed(self, batches: List[Any]):
+        for idx, batch in enumerate(batches):
+            if idx > 0 and self.delay > 0:
+                await asyncio.sleep(self.delay)
+            await self._queues[0].put(batch)
+
+        for _ in range(self.stages[0].workers):
+            await self._queues[0].put(_DONE)
+
+    async def _run_stage(self, idx: int, results: List[Any]):
+        stage = self.stages[idx]
+        await asyncio.gather(*[self._work(idx, results) for _ in range(stage.workers)])
+
+        if idx + 1 < len(self.stages):
+            for _ in range(self.stages[idx + 1].workers):
+                await self._queues[idx + 1].put(_DONE)
+
+        self.stats[stage.name].finished_at = time.perf_counter()
+
+    async def _work(self, idx: int, results: List[Any]):
+        stage, stats = self.stages[idx], self.stats[self.stages[idx].name]
+        queue = self._queues[idx]
+        depth = metrics.gauge(f"pipeline.{stage.name}.queue_depth")
+        items = metrics.counter(f"pipeline.{stage.name}.items")
+
+        while True:
+            batch = await queue.get()
+            depth.set(queue.qsize())
+            if batch is _DONE:
+                return
+
+            st = time.perf_counter()
+            if stats.started_at is None:
+                stats.started_at = st
+
+            if stage.blocking:
+                output = await run_blocking(stage.func, batch)
+            else:
+                output = await stage.func(batch)
+
+            count = stage.count(output)
+            stats.batches += 1
+            stats.items += count
+            stats.busy += time.perf_counter() - st
+            items.inc(count)
+
+            if idx + 1 < len(self.stages):
+                await self._queues[idx + 1].put(output)
+            else:
+                results.append(output)
+
+    async def _report_periodically(self):
+        while True:
+            await asyncio.sleep(self.report_interval)
+            logger(f"{self.name} {self.report()}")
+
+    def report(self) -> str:
+        """`scrape 3.1/s q=1/2 | ... | 완료 40/120` 형식의 진행 상황"""
+        now = time.perf_counter()
+        parts = []
+        for stage, queue in zip(self.stages, self._queues or [None] * len(self.stages)):
+            stats = self.stats[stage.name]
+            occupancy = f" q={queue.qsize()}/{queue.maxsize}" if queue is not None else ""
+            parts.append(f"{stage.name} {stats.throughput(now):.1f}/s{occupancy}")
+
+        done = self.stats[self.stages[-1].name].items
+        return " | ".join(parts) + f" | 완료 {done}/{self._total}"
@@ -0,0 +1,133 @@
+"""로컬 임베딩/리랭크 stand-in 서버
+
+`EMBED_URL`(`/embed`)과 `TEI_URL`(`/rerank`) 응답 형식을 흉내내며, `HashingEmbedder`로 결정적인 벡터와 점수를 생성합니다.
+`/embed`는 요청 body의 `encoding`(json | base64 | binary)과 `dtype`(float32 | float16)에 따라 응답합니다.
+요청당 고정 지연(`latency`), 텍스트당 지연(`per_item_latency`), 동시 처리 가능한 요청 수(`max_concurrency`)로
+실제 서버의 배치 특성을 모사합니다. 대기 요청이 `max_queue`를 넘으면 429를, `failure_rate` 확률로 503을 반환합니다.
+
+CLI는 `scripts/bench/embed_server.py`, 프로세스 내 실행은 `EMBED_BACKEND=standin`을 사용합니다.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+import random
+from typing import List, Optional
+
+from aiohttp import web
+
+from services.base import vector_codec
+from services.base.embedding_backend import HashingEmbedder
+
+
+class EmbedServerStats:
+
+    def __init__(self):
+        self.embed_requests = 0
+        self.embed_texts = 0
+        self.rerank_requests = 0
+        self.rerank_texts = 0
+        self.rejected = 0
+        self.failed = 0
+
+
+def create_app(
+    latency: float = 0.02,
+    per_item_latency: float = 0.0005,
+    max_concurrency: int = 4,
+    max_queue: int = 0,
+    failure_rate: float = 0.0,
+    embedder: Optional[HashingEmbedder] = None,
+) -> web.Application:
+    app = web.Application(client_max_size=256 * 1024**2)
+    stats = EmbedServerStats()
+    app["stats"] = stats
+
+    hashing = embedder or HashingEmbedder()
+    workers = asyncio.Semaphore(max_concurrency)
+    waiting = 0
+
+    async def process(n_items: int):
+        nonlocal waiting
+        if max_queue and waiting >= max_queue:
+            stats.rejected += 1
+            raise web.HTTPTooManyRequests()
+
+        waiting += 1
+        try:
+            await workers.acquire()
+        finally:
+            waiting -= 1
+
+        try:
+            await asyncio.sleep(latency + per_item_latency * n_items)
+        finally:
+            workers.release()
+
+        if failure_rate and random.random() < failure_rate:
+            stats.failed += 1
+            raise web.HTTPServiceUnavailable()
+
+    async def embed(req: web.Request):
+        body = await req.json()
+        inputs = body["inputs"]
+        texts: List[str] = [inputs] if isinstance(inputs, str) else inputs
+
+        stats.embed_requests += 1
+        stats.embed_texts += len(texts)
+
+        await process(len(texts))
+
+        payload = hashing.embed(
+            inputs,
+            chunking=body.get("chunking", True),
+            truncate=body.get("truncate", True),
+            html=body.get("html", True),
+        )
+
+        encoding, dtype = body.get("encoding", "json"), body.get("dtype", "float32")
+        if encoding == "binary":
+            return web.Response(body=vector_codec.encode_binary(payload, dtype), content_type="application/octet-stream")
+        if encoding == "base64":
+            return web.json_response(vector_codec.encode_base64(payload, dtype))
+
+        return web.json_response(payload)
+
+    async def rerank(req: web.Request):
+        body = await req.json()
+        query, texts = body["query"], body["texts"]
+
+        stats.rerank_requests += 1
+        stats.rerank_texts += len(texts)
+
+        await process(len(texts))
+
+        return web.json_response(hashing.rerank(query, texts))
+
+    async def get_stats(_: web.Request):
+        return web.json_response(vars(stats))
+
+    async def reset_stats(_: web.Request):
+        stats.__init__()
+        return web.json_response(vars(stats))
+
+    app.router.add_post("/embed", embed)
+    app.router.add_post("/rerank", rerank)
+    app.router.add_get("/stats", get_stats)
+    app.router.add_post("/stats/reset", reset_stats)
+
+    return app
+
+
+@asynccontextmanager
+async def serve(host: str = "127.0.0.1", port: int = 8090, **kwargs):
+    """현재 이벤트 루프에서 서버를 띄우고 `(base_url, app)`을 반환 (`port=0`이면 빈 포트 사용)"""
+    app = create_app(**kwargs)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    try:
+        _, port = runner.addresses[0][:2]
+        yield f"http://{host}:{port}", app
+    finally:
+        await runner.cleanup()
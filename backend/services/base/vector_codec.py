@@ -0,0 +1,170 @@
+"""임베딩 응답 바이너리 인코딩/디코딩
+
+`/embed` 요청 body의 `encoding`으로 응답 형식을 지정합니다.
+
+- `json`: 기존 형식 (`dense`: float 리스트, `sparse`: {index: value})
+- `base64`: JSON 구조는 같고 `dense`는 little-endian float32/float16 base64 문자열,
+  `sparse`는 `{"indices": int32 base64, "values": float32 base64}`
+- `binary`: `application/octet-stream` 프레임 (아래 `HEADER`, `encode_binary` 참고)
+
+dense 벡터는 응답 버퍼를 복사하지 않고 `np.frombuffer`로 읽습니다.
+sparse 벡터는 `SparseVector(dict, V_DIM)`로 저장되므로 dict로 변환합니다.
+"""
+
+import base64
+import struct
+from typing import Any, Dict, List, Literal, Optional, Tuple
+
+import numpy as np
+
+from services.base.dto import EmbedResult
+
+Encoding = Literal["json", "base64", "binary"]
+DType = Literal["float32", "float16"]
+
+ENCODINGS: Tuple[Encoding, ...] = ("json", "base64", "binary")
+
+MAGIC = b"EMBV"
+VERSION = 1
+
+# magic, version, dtype 코드, flags, count, dim
+HEADER = struct.Struct("<4sBBBxII")
+U32 = struct.Struct("<I")
+
+FLAG_SINGLE = 0x01
+NO_CHUNK = 0xFFFFFFFF
+
+_DTYPES: Dict[str, np.dtype] = {"float32": np.dtype("<f4"), "float16": np.dtype("<f2")}
+_DTYPE_CODES: Dict[str, int] = {"float32": 0, "float16": 1}
+_CODE_DTYPES: Dict[int, np.dtype] = {code: _DTYPES[name] for name, code in _DTYPE_CODES.items()}
+
+_INDEX_DTYPE = np.dtype("<i4")
+_VALUE_DTYPE = np.dtype("<f4")
+
+
+def _sparse_dict(indices: np.ndarray, values: np.ndarray) -> Dict[int, float]:
+    return dict(zip(indices.tolist(), values.tolist()))
+
+
+def decode_stored(dense: Any, sparse: Any) -> EmbedResult:
+    """DB에 저장된 벡터(`Vector`, `SPARSEVEC`)를 임베딩 결과로 변환 (변경되지 않은 텍스트의 임베딩 재사용)"""
+    return EmbedResult(
+        dense=np.asarray(dense, dtype=_VALUE_DTYPE),
+        sparse=dict(zip(sparse.indices(), sparse.values())),
+    )
+
+
+def decode_base64(data: Dict[str, Any] | List[Dict[str, Any]], dtype: DType = "float32"):
+    """`encoding=base64` 응답을 디코딩"""
+    dense_dtype = _DTYPES[dtype]
+
+    def decode(item: Dict[str, Any]) -> EmbedResult:
+        sparse = item["sparse"]
+        result = EmbedResult(
+            dense=np.frombuffer(base64.b64decode(item["dense"]), dtype=dense_dtype),
+            sparse=_sparse_dict(
+                np.frombuffer(base64.b64decode(sparse["indices"]), dtype=_INDEX_DTYPE),
+                np.frombuffer(base64.b64decode(sparse["values"]), dtype=_VALUE_DTYPE),
+            ),
+        )
+        if item.get("chunk") is not None:
+            result["chunk"] = item["chunk"]
+        return result
+
+    return decode(data) if isinstance(data, dict) else [decode(item) for item in data]
+
+
+def _b64(array: np.ndarray) -> str:
+    return base64.b64encode(array.tobytes()).decode("ascii")
+
+
+def encode_base64(results: EmbedResult | List[EmbedResult], dtype: DType = "float32"):
+    dense_dtype = _DTYPES[dtype]
+
+    def encode(result: EmbedResult) -> Dict[str, Any]:
+        sparse = result["sparse"]
+        return {
+            "chunk": result.get("chunk"),
+            "dense": _b64(np.asarray(result["dense"], dtype=dense_dtype)),
+            "sparse": {
+                "indices": _b64(np.fromiter(map(int, sparse.keys()), dtype=_INDEX_DTYPE)),
+                "values": _b64(np.fromiter(sparse.values(), dtype=_VALUE_DTYPE)),
+            },
+        }
+
+    return encode(results) if isinstance(results, dict) else [encode(result) for result in results]
+
+
+def decode_binary(buf: bytes):
+    """`encoding=binary` 응답 프레임을 디코딩
+
+    Layout (little-endian):
+        header: magic(4s) version(u8) dtype(u8) flags(u8) pad(1) count(u32) dim(u32)
+        item * count:
+            chunk_len(u32, 없으면 0xFFFFFFFF) chunk(utf-8) pad(4바이트 정렬)
+            dense(dtype * dim) nnz(u32) indices(i32 * nnz) values(f32 * nnz)
+    """
+    magic, version, dtype_code, flags, count, dim = HEADER.unpack_from(buf, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("지원하지 않는 임베딩 응답 형식입니다.")
+
+    dense_dtype = _CODE_DTYPES[dtype_code]
+    dense_size = dense_dtype.itemsize * dim
+    offset = HEADER.size
+
+    results: List[EmbedResult] = []
+    for _ in range(count):
+        (chunk_len, ) = U32.unpack_from(buf, offset)
+        offset += U32.size
+
+        chunk: Optional[str] = None
+        if chunk_len != NO_CHUNK:
+            chunk = bytes(buf[offset:offset + chunk_len]).decode("utf-8")
+            offset += chunk_len
+            offset += -offset % 4
+
+        dense = np.frombuffer(buf, dtype=dense_dtype, count=dim, offset=offset)
+        offset += dense_size
+
+        (nnz, ) = U32.unpack_from(buf, offset)
+        offset += U32.size
+        indices = np.frombuffer(buf, dtype=_INDEX_DTYPE, count=nnz, offset=offset)
+        offset += _INDEX_DTYPE.itemsize * nnz
+        values = np.frombuffer(buf, dtype=_VALUE_DTYPE, count=nnz, offset=offset)
+        offset += _VALUE_DTYPE.itemsize * nnz
+
+        result = EmbedResult(dense=dense, sparse=_sparse_dict(indices, values))
+        if chunk is not None:
+            result["chunk"] = chunk
+        results.append(result)
+
+    return results[0] if flags & FLAG_SINGLE else results
+
+
+def encode_binary(results: EmbedResult | List[EmbedResult], dtype: DType = "float32") -> bytes:
+    single = isinstance(results, dict)
+    items: List[EmbedResult] = [results] if single else results
+    dense_dtype = _DTYPES[dtype]
+    dim = len(items[0]["dense"]) if items else 0
+
+    parts = [HEADER.pack(MAGIC, VERSION, _DTYPE_CODES[dtype], FLAG_SINGLE if single else 0, len(items), dim)]
+    size = HEADER.size
+    for item in items:
+        chunk = item.get("chunk")
+        if chunk is None:
+            parts.append(U32.pack(NO_CHUNK))
+            size += U32.size
+        else:
+            encoded = chunk.encode("utf-8")
+            size += U32.size + len(encoded)
+            parts += [U32.pack(len(encoded)), encoded, b"\x00" * (-size % 4)]
+            size += -size % 4
+
+        sparse = item["sparse"]
+        dense = np.asarray(item["dense"], dtype=dense_dtype).tobytes()
+        indices = np.fromiter(map(int, sparse.keys()), dtype=_INDEX_DTYPE).tobytes()
+        values = np.fromiter(sparse.values(), dtype=_VALUE_DTYPE).tobytes()
+        parts += [dense, U32.pack(len(sparse)), indices, values]
+        size += len(dense) + U32.size + len(indices) + len(values)
+
+    return b"".join(parts)
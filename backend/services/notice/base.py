@@ -1,5 +1,5 @@
 import textwrap
-from typing import Generic, Optional, TypeVar
+from typing import Dict, Generic, List, Optional, Tuple, TypeVar
 from pgvector.sqlalchemy import SparseVector
 
 from db.common import V_DIM
@@ -12,7 +12,9 @@ from db.repositories.university import UniversityRepository
 
 from db.repositories.calendar import SemesterRepository
 
-from services.base import BaseDomainService
+from services.base import BaseDomainService, EmbedResult
+from services.base.crawler import render
+from services.base.vector_codec import decode_stored
 from services.notice import AttachmentDTO, NoticeDTO
 from services.university import CalendarService
 
@@ -40,6 +42,40 @@ class BaseNoticeService(
         info = dto.get("info")
         return info if info else {}
 
+    def notice_hash(self, dto: NoticeDTO) -> str:
+        """제목 / 본문 / 작성일 / 작성자 / 첨부파일 목록(이름, url) 해시
+
+        첨부파일 내용은 포함하지 않으며, 파싱 결과가 없는 첨부파일은 `diff_batch`에서 따로 확인합니다.
+        """
+        info = dto["info"]
+        attachments = [part for att in dto["attachments"] for part in (att["name"], att["url"])]
+        return render.content_hash(info["title"], info["content"], info["date"], info["author"], *attachments)
+
+    def source_seq(self, url: str) -> Optional[int]:
+        """게시판의 글 번호 (증분 크롤링 기준), 크롤링 서비스에서 crawler의 url 파서로 구현"""
+        return None
+
+    def embedding_reuse(self, orm: NoticeModelT) -> Dict[str, EmbedResult]:
+        """저장된 게시글의 제목 / 청크 임베딩 (원문 해시 → 임베딩), 변경된 게시글을 다시 임베딩할 때 재사용"""
+        reuse = {
+            chunk.content_hash: decode_stored(chunk.chunk_vector, chunk.chunk_sparse_vector)
+            for chunk in orm.content_chunks
+            if chunk.content_hash and chunk.chunk_vector is not None and chunk.chunk_sparse_vector is not None
+        }
+        if orm.title_vector is not None and orm.title_sparse_vector is not None:
+            reuse[render.content_hash(orm.title)] = decode_stored(orm.title_vector, orm.title_sparse_vector)
+        return reuse
+
+    def _attachment_pages(self, dto: NoticeDTO) -> List[List[Tuple[str, EmbedResult]]]:
+        """첨부파일별 (페이지 내용, 임베딩) 목록
+
+        `attachment_embeddings`는 게시글의 모든 첨부파일 페이지를 순서대로 펼친 목록입니다. (`NoticeEmbedder`)
+        """
+        pages = iter(dto["embeddings"]["attachment_embeddings"])
+        contents = [att.get("content", []) for att in dto["attachments"]]
+        contents = [content if isinstance(content, list) else [content] for content in contents]
+        return [list(zip(content, pages)) for content in contents]
+
     def _parse_attachments(self, dto: NoticeDTO):
 
         attachments = dto.get("attachments")
@@ -53,20 +89,14 @@ class BaseNoticeService(
                 chunk_vector=embedding["dense"],
                 chunk_sparse_vector=SparseVector(embedding["sparse"], V_DIM),
                 chunk_content=content,
-            ) for content in att["content"]
-        ] for embedding, att in zip(embeddings["attachment_embeddings"], attachments) if "content" in att]
+                content_hash=render.content_hash(content),
+            ) for content, embedding in pages
+        ] for pages in self._attachment_pages(dto)]
 
-        if not chunk_models:
-            attachment_models = [AttachmentModel(
-                name=att["name"],
-                url=att["url"],
-            ) for att in attachments]
-
-        else:
-            attachment_models = [
-                AttachmentModel(name=att["name"], url=att["url"], content_chunks=chunks)
-                for att, chunks in zip(attachments, chunk_models)
-            ]
+        attachment_models = [
+            AttachmentModel(name=att["name"], url=att["url"], content_chunks=chunks)
+            for att, chunks in zip(attachments, chunk_models)
+        ]
 
         return {
             "attachments": attachment_models,
@@ -86,6 +116,7 @@ class BaseNoticeService(
                 chunk_content=content_vector["chunk"],
                 chunk_vector=content_vector["dense"],
                 chunk_sparse_vector=SparseVector(content_vector["sparse"], V_DIM),
+                content_hash=render.content_hash(dto["info"]["content"]),
             ) for content_vector in content_embeddings if "chunk" in content_vector
         ]
 
@@ -102,7 +133,7 @@ class BaseNoticeService(
                 <name>{dto["name"]}</name>
                 <url>{dto['url']}</url>
                 <content>
-                    {dto["content"]}
+                    {render.context_content(dto["content"])}
                 </content>
             </attachment>"""
         ) if "content" in dto else None
@@ -131,7 +162,7 @@ class BaseNoticeService(
                 </metadata>
                 {att_content}
                 <content>
-                    {info["content"]}
+                    {render.context_content(info["content"])}
                 </content>
             </Notice>
             """
@@ -185,6 +216,8 @@ class BaseDepartmentNoticeService(BaseNoticeService[NoticeModel]):
             "department_id": department_model.id,
             "url": dto["url"],
             "is_important": is_important,
+            "content_hash": self.notice_hash(dto),
+            "source_seq": self.source_seq(dto["url"]),
         }
 
         return NoticeModel(**notice_dict)
@@ -205,8 +238,9 @@ class BasePNUNoticeService(BaseNoticeService[PNUNoticeModel]):
                 chunk_vector=embedding["dense"],
                 chunk_sparse_vector=SparseVector(embedding["sparse"], V_DIM),
                 chunk_content=content,
-            ) for content in att["content"]
-        ] for embedding, att in zip(embeddings["attachment_embeddings"], attachments) if "content" in att]
+                content_hash=render.content_hash(content),
+            ) for content, embedding in pages
+        ] for pages in self._attachment_pages(dto)]
 
         attachment_models = [
             PNUNoticeAttachmentModel(name=att["name"], url=att["url"], content_chunks=chunks)
@@ -231,6 +265,7 @@ class BasePNUNoticeService(BaseNoticeService[PNUNoticeModel]):
                 chunk_content=content_vector["chunk"],
                 chunk_vector=content_vector["dense"],
                 chunk_sparse_vector=SparseVector(content_vector["sparse"], V_DIM),
+                content_hash=render.content_hash(dto["info"]["content"]),
             ) for content_vector in content_embeddings if "chunk" in content_vector
         ]
 
@@ -253,7 +288,7 @@ class BasePNUNoticeService(BaseNoticeService[PNUNoticeModel]):
 
         return NoticeDTO(**{"info": info, "attachments": attachments, "url": orm.url})
 
-    def dto2orm(self, dto, **_):
+    def dto2orm(self, dto, **kwargs):
         info = self._parse_info(dto)
         attachments = self._parse_attachments(dto)
         embeddings = self._parse_embeddings(dto)
@@ -268,6 +303,9 @@ class BasePNUNoticeService(BaseNoticeService[PNUNoticeModel]):
             "title_sparse_vector": embeddings["title_sparse_vector"],
             "content_chunks": [*embeddings["content_chunks"], *attachments["content_chunks"]],
             "url": dto["url"],
+            "is_important": kwargs.get("is_important", False),
+            "content_hash": self.notice_hash(dto),
+            "source_seq": self.source_seq(dto["url"]),
         }
 
         return PNUNoticeModel(**notice_dict)
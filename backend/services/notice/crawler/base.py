@@ -1,20 +1,53 @@
 from abc import abstractmethod
-import asyncio
-from datetime import date
-from typing import Callable, Generic, List, Optional, Tuple
+from datetime import date, datetime
+from functools import partial
+from itertools import chain
+from typing import Awaitable, Callable, Dict, Generic, List, Optional, Tuple
+from uuid import uuid4
 
 from aiohttp import ClientSession
 from bs4 import Tag
-from services.base.crawler import preprocess, scrape
+from config.logger import _logger
+from db.models.calendar import SemesterTypeEnum
+from db.models.crawl import CrawlStatusEnum
+from db.repositories import bulk
+from db.repositories.base import transaction
+from db.repositories.crawl import CrawlCheckpointRepository
+from mixins import metrics
+from services.base.coalescer import scatter_in_order
+from services.base.crawler import attachment, render, scrape
 from services.base.crawler.crawler import BaseCrawler, ParseHTMLException
+from services.base.pipeline import Pipeline, Stage, run_blocking
 from services.base.service import BaseCrawlerService
 from services.base.types.calendar import SemesterType
 from services.notice.base import NoticeModelT
 from services.notice.dto import NoticeDTO
+from services.notice.embedder import NoticeEmbedder
+
+logger = _logger(__name__)
+
+# 이번 실행에서 새로 기록하는 체크포인트의 실행 ID
+RUN_ID = f"{datetime.now():%Y%m%d%H%M%S}-{uuid4().hex[:6]}"
+
+# 학기 정보를 지정할 기본 학기 (2023 ~ 2025학년도 1학기 / 여름방학 / 2학기 / 겨울방학)
+DEFAULT_SEMESTERS: List[SemesterType] = [
+    SemesterType(year=year, type_=type_)
+    for year in [2023, 2024, 2025]
+    for type_ in [
+        SemesterTypeEnum.spring_semester,
+        SemesterTypeEnum.summer_vacation,
+        SemesterTypeEnum.fall_semester,
+        SemesterTypeEnum.winter_vacation,
+    ]
+]
 
 
 class BaseNoticeCrawler(BaseCrawler[NoticeDTO]):
 
+    def source_seq(self, url: str) -> Optional[int]:
+        """게시글 url의 글 번호, 게시판마다 구현 (없으면 None)"""
+        return None
+
     async def parse_documents_async(
         self,
         dtos: List[NoticeDTO],
@@ -25,19 +58,15 @@ class BaseNoticeCrawler(BaseCrawler[NoticeDTO]):
         if not session:
             raise ValueError("'session' must be provided")
 
-        parsed_content_future = [
-            scrape.parse_document_async(
-                [att["url"] for att in dto["attachments"]],
-                session,
-            ) for dto in dtos
-        ]
-
-        parsed_content = await asyncio.gather(*parsed_content_future)
+        # 게시글 간 중복 첨부파일은 한 번만 파싱, 이미지 / 큰 파일은 분류 후 건너뛰거나 낮은 우선순위로 파싱
+        sizes = [len(dto["attachments"]) for dto in dtos]
+        urls = [att["url"] for dto in dtos for att in dto["attachments"]]
+        parsed_content = scatter_in_order(await attachment.parse_attachments_async(urls, session), sizes)
 
         attachment_dtos = [[{
             "name": att["name"],
             "url": att["url"],
-            "content": [str(preprocess.clean_html(content).prettify()) for content in list(ps.values())]
+            "content": [render.render_content(content) for content in list(ps.values())]
         } for ps, att in zip(pss, dto["attachments"])] for pss, dto in zip(parsed_content, dtos)]
 
         dtos = [NoticeDTO(**{**dto, "attachments": att}) for dto, att, in zip(dtos, attachment_dtos)]
@@ -73,7 +102,6 @@ class BaseNoticeCrawler(BaseCrawler[NoticeDTO]):
         index_url: str,
         batch_size: int,
         filter: Callable[[str, date], bool],
-        delay_range: Tuple[float, float] = (1, 2),
         session: Optional[ClientSession] = None,
         **kwargs
     ) -> List[str]:
@@ -94,7 +122,8 @@ class BaseNoticeCrawler(BaseCrawler[NoticeDTO]):
                 url=urls,
                 session=session,
                 post_process=self._parse_paths_from_table_element,
-                delay_range=delay_range,
+                parser=self.parser,
+                parse_only=self.list_strainer,
             )
 
             results: List[Tuple[str, date]] = []
@@ -124,11 +153,277 @@ class BaseNoticeCrawlerService(
     BaseCrawlerService[NoticeDTO, NoticeModelT],
     Generic[NoticeModelT],
 ):
+    """공지사항 크롤링 서비스
+
+    게시글 url 배치를 스크랩(`prepare_batch`) → 변경 감지(`diff_batch`) → 첨부파일 파싱 → 임베딩 → 저장 단계로 처리하며,
+    `crawling_pipeline`은 각 단계가 다른 배치를 동시에 처리하는 `Pipeline`을 만듭니다.
+    이미 저장된 게시글은 `content_hash`가 같으면 다시 파싱 / 임베딩하지 않습니다.
+
+    `checkpoint_repo`가 있으면 목록 페이지에서 찾은 url과 url별 처리 단계를 `crawl_checkpoints` 테이블에 기록하고,
+    `resume=True`로 실행하면 중단된 크롤링의 저장하지 못한 url부터 이어서 처리합니다. (목록 페이지를 다시 스크랩하지 않음)
+    """
+
+    notice_crawler: BaseNoticeCrawler
+    notice_embedder: NoticeEmbedder
+
+    checkpoint_repo: Optional[CrawlCheckpointRepository] = None
+    # `crawl_checkpoints.source`
+    checkpoint_source: str = "notice"
+
+    def checkpoint_key(self, department: str = "", category: str = "") -> Dict[str, str]:
+        return {"source": self.checkpoint_source, "department": department, "category": category}
+
+    def source_seq(self, url: str) -> Optional[int]:
+        return self.notice_crawler.source_seq(url)
+
+    async def resume_frontier(self, checkpoint: Dict[str, str]) -> Optional[List[str]]:
+        """중단된 크롤링에서 저장하지 못한 url 목록 (체크포인트가 없으면 None)"""
+        if self.checkpoint_repo is None:
+            return None
+
+        rows = await run_blocking(self.checkpoint_repo.find_frontier, **checkpoint)
+        if not rows:
+            return None
+
+        urls = [row.url for row in rows if row.status != CrawlStatusEnum.persisted]
+        name = "-".join(value for value in (checkpoint["department"], checkpoint["category"]) if value)
+        logger(f"[{name or checkpoint['source']}] 이전 크롤링(run {rows[0].run_id})에서 이어서 진행 "
+               f"({len(rows) - len(urls)}/{len(rows)} 저장됨)")
+        return urls
+
+    async def deferred_urls(self, **kwargs) -> List[str]:
+        """파싱이 연기되었던 첨부파일(`attachment.parse_attachments_async`)의 결과가 캐시에 저장된 게시글 url
+
+        저장된 게시글에는 해당 첨부파일의 청크가 없으므로 다시 크롤링 대상에 추가하면 `diff_batch`가 변경된 게시글로 처리하고,
+        파싱 단계에서 캐시된 결과를 사용합니다. `kwargs`는 `find_unparsed_attachments`의 필터
+        """
+        cache = scrape.document_cache()
+        if cache is None:
+            return []
+
+        rows = await run_blocking(self.notice_repo.find_unparsed_attachments, **kwargs)
+        cached = cache.cached_urls([row.attachment_url for row in rows])
+        return list(dict.fromkeys(row.url for row in rows if row.attachment_url in cached))
+
+    async def start_frontier(self, urls: List[str], checkpoint: Dict[str, str]):
+        """목록 페이지에서 찾은 url 기록 (이전 체크포인트는 삭제)"""
+        if self.checkpoint_repo is not None:
+            await run_blocking(self.checkpoint_repo.create_frontier, RUN_ID, urls, **checkpoint)
+
+    async def finish_frontier(self, checkpoint: Dict[str, str]):
+        """모든 url을 저장했으면 체크포인트 삭제"""
+        if self.checkpoint_repo is not None:
+            await run_blocking(self.checkpoint_repo.delete_frontier, **checkpoint)
+
+    def _checkpointed(
+        self,
+        func: Callable[[List[NoticeDTO]], Awaitable[List[NoticeDTO]]],
+        status: CrawlStatusEnum,
+        checkpoint: Dict[str, str],
+    ) -> Callable[[List[NoticeDTO]], Awaitable[List[NoticeDTO]]]:
+        """단계를 마친 배치의 url 상태 기록"""
+        repo = self.checkpoint_repo
+        assert repo is not None
+
+        async def wrapper(notices: List[NoticeDTO]) -> List[NoticeDTO]:
+            notices = await func(notices)
+            await run_blocking(repo.update_status, [notice["url"] for notice in notices], status, **checkpoint)
+            return notices
+
+        return wrapper
 
     @abstractmethod
+    async def prepare_batch(self, urls: List[str], **kwargs) -> List[NoticeDTO]:
+        """상세 페이지 스크랩 후 학과 / 분류 정보와 첨부파일 절대 경로 추가"""
+        pass
+
+    def diff_batch(
+        self,
+        notices: List[NoticeDTO],
+        is_important: bool = False,
+        checkpoint: Optional[Dict[str, str]] = None,
+        parse_attachment: bool = False,
+    ) -> List[NoticeDTO]:
+        """저장된 게시글과 해시(`notice_hash`)를 비교해 새 게시글과 변경된 게시글만 반환
+
+        - 내용이 같으면 건너뜀 (중요 공지 배치에서는 `is_important`만 갱신, 체크포인트는 persisted)
+        - 내용이 바뀌었으면 저장된 제목 / 청크 임베딩을 `embedding_reuse`로 넘겨 바뀐 텍스트만 다시 임베딩
+        - 해시에는 첨부파일 내용이 없으므로, `parse_attachment`이면 내용이 같아도 파싱 결과가 저장되지 않은
+          첨부파일(건너뜀 / 연기 / 파싱 실패 / 파싱하지 않고 저장)이 있는 게시글은 변경된 게시글로 처리
+        """
+        notices = [NoticeDTO(**notice, content_hash=self.notice_hash(notice)) for notice in notices]
+
+        with transaction():
+            rows = self.notice_repo.find_content_hashes([notice["url"] for notice in notices])
+            hashes = {row.url: row.content_hash for row in rows}
+            unchanged = [n["url"] for n in notices if hashes.get(n["url"]) == n["content_hash"]]
+            if parse_attachment:
+                unparsed = {
+                    row.url
+                    for row in self.notice_repo.find_unparsed_attachments(urls=unchanged)
+                    if attachment.parseable(row.name, row.attachment_url)
+                }
+                unchanged = [url for url in unchanged if url not in unparsed]
+                metrics.counter("crawl.notices.unparsed").inc(len(unparsed))
+            changed = [n["url"] for n in notices if n["url"] in hashes and n["url"] not in unchanged]
+
+            promoted = [row.url for row in rows if is_important and not row.is_important and row.url in unchanged]
+            if promoted:
+                self.notice_repo.update_important(promoted, True)
+
+            if unchanged and checkpoint and self.checkpoint_repo is not None:
+                self.checkpoint_repo.update_status(unchanged, CrawlStatusEnum.persisted, **checkpoint)
+
+            reuse = {orm.url: self.embedding_reuse(orm) for orm in self.notice_repo.find_all_by_urls(changed)}
+
+        metrics.counter("crawl.notices.unchanged").inc(len(unchanged))
+        metrics.counter("crawl.notices.changed").inc(len(changed))
+
+        return [
+            NoticeDTO(**notice, embedding_reuse=reuse[notice["url"]]) if notice["url"] in reuse else notice
+            for notice in notices if notice["url"] not in unchanged
+        ]
+
+    async def parse_batch(self, notices: List[NoticeDTO]) -> List[NoticeDTO]:
+        return await self.notice_crawler.parse_documents_async(notices)
+
+    async def embed_batch(self, notices: List[NoticeDTO]) -> List[NoticeDTO]:
+        return await self.notice_embedder.embed_dtos_async(dtos=notices)
+
+    def persist_batch(
+        self,
+        notices: List[NoticeDTO],
+        is_important: bool = False,
+        checkpoint: Optional[Dict[str, str]] = None,
+    ) -> List[NoticeDTO]:
+        """게시글 저장, 체크포인트 상태(persisted)도 같은 트랜잭션에서 기록
+
+        변경된 게시글은 기존 행을 지우고 다시 저장합니다. (주요 공지였으면 `is_important` 유지)
+        `DB_INGEST_MODE=copy`이면 ORM 객체를 세션에 추가하지 않고 `upsert_bulk`(binary COPY)로 저장합니다.
+        """
+        with transaction():
+            stored = self.notice_repo.find_content_hashes([notice["url"] for notice in notices])
+            important_urls = {row.url for row in stored if row.is_important}
+
+            # `dto2orm`이 info를 수정하므로 먼저 복사 (임베딩 제외)
+            persisted = [NoticeDTO(
+                url=n["url"],
+                info={**n["info"]},
+                attachments=[{"name": att["name"], "url": att["url"]} for att in n["attachments"]],
+            ) for n in notices]
+
+            notice_models = [self.dto2orm(n, is_important=is_important or n["url"] in important_urls) for n in notices]
+            notice_models = [n for n in notice_models if n is not None]
+
+            if bulk.INGEST_MODE == "copy":
+                ids = self.notice_repo.upsert_bulk(notice_models)
+                dtos = [dto for dto in persisted if dto["url"] in ids]
+
+            else:
+                if stored:
+                    self.notice_repo.delete_all(urls=[row.url for row in stored])
+                notice_models = self.notice_repo.create_all(notice_models)
+                dtos = list(map(self.orm2dto, notice_models))
+
+            if checkpoint and self.checkpoint_repo is not None:
+                self.checkpoint_repo.update_status(
+                    [notice["url"] for notice in notices], CrawlStatusEnum.persisted, **checkpoint
+                )
+
+        if dtos:
+            self.add_semester_info(urls=[dto["url"] for dto in dtos])
+
+        return dtos
+
+    def crawling_pipeline(
+        self,
+        name: str,
+        parse_attachment: bool = False,
+        is_important: bool = False,
+        delay: float = 0.0,
+        checkpoint: Optional[Dict[str, str]] = None,
+        **kwargs,
+    ) -> Pipeline:
+        """`kwargs`는 `prepare_batch`에 전달, DB 작업(변경 감지 / 저장 단계)은 하나의 worker가 스레드에서 차례로 실행
+
+        `checkpoint`(`checkpoint_key`)가 있으면 scrape / embed / persist 단계를 마친 url의 상태를 기록합니다.
+        """
+        if self.checkpoint_repo is None:
+            checkpoint = None
+
+        scrape_batch, embed_batch = partial(self.prepare_batch, **kwargs), self.embed_batch
+        if checkpoint:
+            scrape_batch = self._checkpointed(scrape_batch, CrawlStatusEnum.scraped, checkpoint)
+            embed_batch = self._checkpointed(embed_batch, CrawlStatusEnum.embedded, checkpoint)
+
+        diff_batch = partial(
+            self.diff_batch, is_important=is_important, checkpoint=checkpoint, parse_attachment=parse_attachment
+        )
+        stages = [
+            Stage("scrape", scrape_batch, workers=2),
+            Stage("diff", diff_batch, blocking=True),
+        ]
+        if parse_attachment:
+            stages.append(Stage("parse", self.parse_batch, workers=2, count=attachment.count_pages))
+        persist_batch = partial(self.persist_batch, is_important=is_important, checkpoint=checkpoint)
+        stages += [
+            Stage("embed", embed_batch, workers=2),
+            Stage("persist", persist_batch, blocking=True),
+        ]
+        return Pipeline(stages, name=name, delay=delay)
+
+    async def run_crawling_batch(
+        self,
+        urls: List[str],
+        is_important: bool = False,
+        parse_attachment: bool = False,
+        **kwargs,
+    ) -> Tuple[List[NoticeDTO], int]:
+        """url 배치 하나를 처리하고 (저장된 게시글, 파싱한 첨부파일 페이지 수) 반환"""
+        if not urls:
+            return [], 0
+
+        pipeline = self.crawling_pipeline(
+            name="[주요 공지사항]" if is_important else "[배치]",
+            parse_attachment=parse_attachment,
+            is_important=is_important,
+            **kwargs,
+        )
+        results = await pipeline.run([urls])
+        pages = pipeline.stats["parse"].items if "parse" in pipeline.stats else 0
+        return list(chain(*results)), pages
+
+    async def run_batches(
+        self,
+        urls: List[str],
+        interval: int,
+        name: str,
+        **kwargs,
+    ) -> Tuple[List[NoticeDTO], int]:
+        """`interval`개씩 나눈 url 배치를 파이프라인으로 처리하고 (저장된 게시글, 파싱한 첨부파일 페이지 수) 반환"""
+        if not urls:
+            return [], 0
+
+        pipeline = self.crawling_pipeline(name=name, **kwargs)
+        results = await pipeline.run([urls[st:st + interval] for st in range(0, len(urls), interval)])
+        pages = pipeline.stats["parse"].items if "parse" in pipeline.stats else 0
+        return list(chain(*results)), pages
+
     def add_semester_info(
         self,
-        semesters: List[SemesterType],
-        batch_size: int = 500,
+        semesters: List[SemesterType] = DEFAULT_SEMESTERS,
+        urls: Optional[List[str]] = None,
     ) -> int:
-        pass
+        """작성일로 게시글의 학기(`semester_id`)를 지정하고 변경된 게시글 수 반환
+
+        `urls`가 없으면 테이블 전체를 대상으로 합니다. 학기마다 게시글을 불러오지 않고 UPDATE 한 번으로 처리합니다.
+        """
+        if not self.semester_repo:
+            raise ValueError("'semester_repo' not provided")
+
+        with transaction():
+            semester_models = self.semester_repo.search_semester_by_dtos(semesters)
+            filters = {"urls": urls} if urls is not None else {}
+            affected = self.notice_repo.update_semesters(semester_models, **filters)
+
+        return affected
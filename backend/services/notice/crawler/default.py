@@ -1,31 +1,41 @@
 """학과 공지사항 크롤러(기계공학부 제외)"""
 
-import asyncio
-from typing import List, Tuple
+from functools import partial
+from typing import List, Optional, Tuple
 from urllib.parse import urlparse
 
-from tqdm import tqdm
+from bs4 import SoupStrainer
 
 from config.config import get_notice_urls
-from db.models.calendar import SemesterTypeEnum
 from db.models.notice import NoticeModel
-from db.repositories.base import transaction
+from db.repositories.crawl import CrawlCheckpointRepository
 from db.repositories.notice import NoticeRepository
 from services.base import ParseHTMLException
-from services.base.crawler import preprocess, scrape
+from services.base.crawler import preprocess, render, scrape
+from services.base.crawler.selector import compile_selectors, has_class
+from services.base.orchestrator import CrawlJob
+from services.base.pipeline import run_blocking
 
 from urllib3.util import parse_url
 
-from services.base.types.calendar import DateRangeType, SemesterType
 from services.notice import NoticeDTO, crawler
 from config.logger import _logger
 from services.notice.base import BaseDepartmentNoticeService
 from services.notice.crawler.base import BaseNoticeCrawlerService
 from services.notice.embedder import NoticeEmbedder
 
-SELECTORs = {
-    "list": "div._articleTable > form:nth-child(2) table > tbody > tr:not(.headline)",
-    "list_important": "div._articleTable > form:nth-child(2) table > tbody > tr.headline",
+# tbody가 없는 목록 표도 부분 파싱(lxml)에서 같은 행을 선택하도록 tbody 유무 모두 허용
+SELECTORs = compile_selectors({
+    "list": "div._articleTable > form:nth-child(2) table > tbody > tr:not(.headline), "
+            "div._articleTable > form:nth-child(2) table > tr:not(.headline)",
+    "list_important": "div._articleTable > form:nth-child(2) table > tbody > tr.headline, "
+                      "div._articleTable > form:nth-child(2) table > tr.headline",
+    "row": {
+        "anchor": "td._artclTdTitle > a",
+        "date": "td._artclTdRdate",
+        "common": "td > span._artclTnotice",
+        "department": "td > span._artclNnotice",
+    },
     "detail": {
         "info": {
             "title": "div.artclViewTitleWrap > h2",
@@ -34,7 +44,7 @@ SELECTORs = {
         },
         "attachments": "div.artclItem > dl > dd > ul > li"
     }
-}
+})
 
 logger = _logger(__name__)
 
@@ -43,6 +53,8 @@ from datetime import datetime, date
 
 class NoticeCrawler(crawler.BaseNoticeCrawler):
 
+    list_strainer = SoupStrainer("div", class_=has_class("_articleTable"))
+
     def _parse_paths_from_table_element(self, table_element, **kwargs):
         table = table_element.select_one("table")
 
@@ -56,11 +68,11 @@ class NoticeCrawler(crawler.BaseNoticeCrawler):
 
         results = []
         for row in table_rows:
-            anchor = row.select_one("td._artclTdTitle > a")
+            anchor = row.select_one(SELECTORs["row"]["anchor"])
             if anchor is None or not anchor.has_attr("href"):
                 continue
 
-            date = row.select_one("td._artclTdRdate")
+            date = row.select_one(SELECTORs["row"]["date"])
             if not date:
                 continue
 
@@ -69,23 +81,29 @@ class NoticeCrawler(crawler.BaseNoticeCrawler):
 
             href = str(anchor["href"])
 
-            if is_important and is_common and row.select_one("td > span._artclTnotice") is None:
+            if is_important and is_common and row.select_one(SELECTORs["row"]["common"]) is None:
                 continue
 
-            if is_important and not is_common and row.select_one("td > span._artclNnotice") is None:
+            if is_important and not is_common and row.select_one(SELECTORs["row"]["department"]) is None:
                 continue
 
             results.append((href, date))
 
         return results
 
+    def source_seq(self, url: str) -> Optional[int]:
+        """`/bbs/{site}/{board}/{seq}/artclView.do`의 seq"""
+        path = parse_url(url).path or ""
+        parts = path.split("/")
+        return int(parts[4]) if len(parts) > 4 and parts[4].isdigit() else None
+
     def _validate_detail_path(self, path, **kwargs) -> bool:
         last_id: int | None = kwargs.get("last_id")
         if last_id is None:
             return True
 
-        ss = path.split('/')[4]
-        return int(ss) > int(last_id)
+        seq = self.source_seq(path)
+        return seq is not None and seq > int(last_id)
 
     async def scrape_important_urls_async(self, **kwargs) -> List[str]:
         url = kwargs.get("url")
@@ -99,8 +117,8 @@ class NoticeCrawler(crawler.BaseNoticeCrawler):
 
         _url = parse_url(url)
 
-        parse_paths = lambda soup: self._parse_paths_from_table_element(
-            soup,
+        parse_paths = partial(
+            self._parse_paths_from_table_element,
             is_important=True,
             is_common=kwargs.get("is_common", False),
         )
@@ -109,6 +127,8 @@ class NoticeCrawler(crawler.BaseNoticeCrawler):
             url=[url],
             session=session,
             post_process=parse_paths,
+            parser=self.parser,
+            parse_only=self.list_strainer,
         )
 
         results: List[Tuple[str, date]] = []
@@ -179,7 +199,7 @@ class NoticeCrawler(crawler.BaseNoticeCrawler):
                             img_urls.append(str(src))
                         img.extract()
 
-                    info["content"] = str(preprocess.clean_html(element).prettify())
+                    info["content"] = render.render_content(element)
 
                 case (_, dls):
                     for dl in dls:
@@ -224,27 +244,18 @@ class DepartmentNoticeCrawlerService(
         notice_crawler: NoticeCrawler,
         notice_embedder: NoticeEmbedder,
         *args,
+        checkpoint_repo: Optional[CrawlCheckpointRepository] = None,
         **kwargs,
     ):
         super().__init__(*args, **kwargs)
         self.notice_crawler = notice_crawler
         self.notice_embedder = notice_embedder
+        self.checkpoint_repo = checkpoint_repo
 
-    async def run_crawling_batch(
-        self,
-        urls: List[str],
-        department: str,
-        base_url: str,
-        category: str,
-        is_important: bool = False,
-        parse_attachment: bool = False,
-    ):
-        if type(self.notice_repo) is not NoticeRepository:
-            raise ValueError
+    async def prepare_batch(self, urls: List[str], **kwargs) -> List[NoticeDTO]:
+        department, base_url, category = kwargs["department"], kwargs["base_url"], kwargs["category"]
 
-        logger("Scrape notices...")
         notices = await self.notice_crawler.scrape_detail_async(urls)
-        logger("Done.")
 
         def add_info(notice: NoticeDTO) -> NoticeDTO:
             notice["info"]["department"] = department
@@ -257,186 +268,119 @@ class DepartmentNoticeCrawlerService(
 
             return notice
 
-        notices = list(map(add_info, notices))
-
-        curr_pages = 0
-
-        if parse_attachment:
-            logger("Parse attachments...")
-            notices = await self.notice_crawler.parse_documents_async(notices)
-            logger("Done.")
-
-            curr_pages = sum([
-                sum([len(att["content"]) for att in dto["attachments"] if "content" in att]) for dto in notices
-                if "attachments" in dto
-            ])
-
-        logger("Embed notices...")
-        notices = await self.notice_embedder.embed_dtos_async(dtos=notices)
-        logger("Done.")
-
-        notice_models = [self.dto2orm(n, is_important=is_important) for n in notices]
-        notice_models = [n for n in notice_models if n is not None]
+        return list(map(add_info, notices))
 
-        with transaction():
-            logger("Create notices...")
-            notice_models = self.notice_repo.create_all(notice_models)
-            dtos = list(map(self.orm2dto, notice_models))
-            logger("Done.")
-
-        with transaction():
-            logger("Update semester indexes...")
-            urls = [dto["url"] for dto in dtos]
-            self.add_semester_info(urls=urls)
-            logger("Done.")
-
-        return dtos, curr_pages
+    def _crawl_options(self, **kwargs):
+        interval = kwargs.get('interval', 30)
+        rows = kwargs.get('rows', 500)
 
-    async def run_crawling_pipeline(self, **kwargs):
+        return {
+            "reset": kwargs.get("reset", False),
+            "resume": kwargs.get("resume", False),
+            "interval": min(interval, rows),
+            "rows": rows,
+            "st_date": datetime.strptime(kwargs.get("st_date", "2000-01-01"), "%Y-%m-%d").date(),
+            "parse_attachment": kwargs.get("parse_attachment", False),
+            "delay": kwargs.get('delay', 0),
+        }
+
+    async def crawl_category(
+        self,
+        department: str,
+        category: str,
+        url: str,
+        **kwargs,
+    ) -> Tuple[List[NoticeDTO], int]:
+        """학과의 게시판 분류 하나를 크롤링하고 (저장된 게시글, 파싱한 첨부파일 페이지 수) 반환"""
 
         if type(self.notice_repo) is not NoticeRepository:
             raise ValueError
 
-        department = kwargs.get("department")
-        if not department:
-            raise ValueError("'department' must be provided")
+        options = self._crawl_options(**kwargs)
+        reset, interval, parse_attachment = options["reset"], options["interval"], options["parse_attachment"]
 
-        url_dict = get_notice_urls(department)
+        url_instance = urlparse(url)
+        base_url = f"{url_instance.scheme}://{url_instance.netloc}"
 
-        reset = kwargs.get("reset", False)
-        interval = kwargs.get('interval', 30)
-        rows = kwargs.get('rows', 500)
-
-        if interval > rows:
-            interval = rows
-
-        dtos: List[NoticeDTO] = []
-        st_date = datetime.strptime(kwargs.get("st_date", "2000-01-01"), "%Y-%m-%d").date()
-        ed_date = datetime.strptime(kwargs.get("ed_date", "2100-12-31"), "%Y-%m-%d").date()
-
-        parse_attachment = kwargs.get("parse_attachment", False)
+        search_filter = {
+            "departments": [department],
+            "categories": [category],
+        }
 
-        for category, url in url_dict.items():
-            url_instance = urlparse(url)
-            base_url = f"{url_instance.scheme}://{url_instance.netloc}"
-
-            search_filter = {
-                "departments": [department],
-                "categories": [category],
-            }
+        checkpoint = self.checkpoint_key(department, category)
+        urls = await self.resume_frontier(checkpoint) if options["resume"] else None
 
+        if urls is None:
             last_id = None
             if reset:
-                affected = self.notice_repo.delete_all(**search_filter)
+                affected = await run_blocking(self.notice_repo.delete_all, **search_filter)
                 logger(f"[{department}-{category}] {affected} rows deleted.")
 
             else:
-                last_notice = self.notice_repo.find_last_notice(**search_filter)
-                if last_notice:
-                    last_path = parse_url(last_notice.url).path
-                    if not last_path:
-                        raise ValueError(f"잘못된 url입니다: {last_notice.url}")
-                    last_id = int(last_path.split("/")[4])
+                last_id = await run_blocking(self.notice_repo.find_last_seq, **search_filter)
 
             urls = await self.notice_crawler.scrape_urls_async(
                 url=url,
-                rows=rows,
+                rows=options["rows"],
                 last_id=last_id,
-                last_year=st_date,
+                last_year=options["st_date"],
             )
+            if parse_attachment:
+                urls += [url for url in await self.deferred_urls(**search_filter) if url not in urls]
+            await self.start_frontier(urls, checkpoint)
+
+        batch_options = {
+            "department": department,
+            "category": category,
+            "base_url": base_url,
+            "parse_attachment": parse_attachment,
+        }
+
+        dtos, pages = await self.run_batches(
+            urls,
+            interval=interval,
+            name=f"[{department}-{category}]",
+            delay=options["delay"],
+            checkpoint=checkpoint,
+            **batch_options,
+        )
+        await self.finish_frontier(checkpoint)
 
-            with tqdm(total=len(urls), desc=f"[{department}-{category}]") as pbar:
-                for st in range(0, len(urls), interval):
-                    ed = min(st + interval, len(urls))
-                    pbar.set_postfix({'range': f"{st + 1}-{ed}"})
-
-                    _dtos, _ = await self.run_crawling_batch(
-                        urls=urls[st:ed],
-                        department=department,
-                        category=category,
-                        base_url=base_url,
-                        parse_attachment=parse_attachment,
-                    )
-                    dtos += _dtos
-
-                    await asyncio.sleep(kwargs.get('delay', 0))
-
-                    pbar.update(len(_dtos))
-
-            logger(f"[{department}-{category}] 주요 공지사항 수집중...")
-            important_urls = await self.notice_crawler.scrape_important_urls_async(url=url)
-            affected = self.notice_repo.delete_all(urls=important_urls)
-            logger(f"[{department}-{category}] {affected} rows deleted (important notice)")
-
-            important_dtos, _ = await self.run_crawling_batch(
-                urls=important_urls,
-                department=department,
-                category=category,
-                base_url=base_url,
-                is_important=True,
-                parse_attachment=parse_attachment,
-            )
+        logger(f"[{department}-{category}] 주요 공지사항 수집중...")
+        important_urls = await self.notice_crawler.scrape_important_urls_async(url=url)
 
-            common_urls = await self.notice_crawler.scrape_important_urls_async(url=url)
-            affected = self.notice_repo.delete_all(urls=common_urls)
+        # 변경되지 않은 주요 공지사항은 `diff_batch`에서 건너뜀 (`is_important`만 갱신)
+        important_dtos, important_pages = await self.run_crawling_batch(
+            urls=important_urls,
+            is_important=True,
+            **batch_options,
+        )
+        logger(f"[{department}-{category}] 주요 공지사항 {len(important_dtos)}/{len(important_urls)} 저장 (나머지는 변경 없음)")
 
-            logger(f"[{department}] {affected} rows deleted (important notice)")
+        logger(f"[{department}-{category}] Done.")
 
-            common_dtos, _ = await self.run_crawling_batch(
-                urls=common_urls,
-                department=department,
-                category=category,
-                base_url=base_url,
-                is_important=True,
-                parse_attachment=parse_attachment,
-            )
+        return [*dtos, *important_dtos], pages + important_pages
 
-            logger("Done.")
+    def crawl_jobs(self, **kwargs) -> List[CrawlJob]:
+        """`department`의 게시판 분류별 크롤링 작업 (`Orchestrator`로 실행)"""
 
-            dtos += important_dtos
-            dtos += common_dtos
+        department = kwargs.get("department")
+        if not department:
+            raise ValueError("'department' must be provided")
 
-        return dtos
+        return [
+            CrawlJob(
+                name=f"{department}-{category}",
+                host=urlparse(url).hostname or "",
+                run=partial(self.crawl_category, department, category, url, **kwargs),
+            ) for category, url in get_notice_urls(department).items()
+        ]
 
-    def add_semester_info(
-        self,
-        semesters: List[SemesterType] = [],
-        batch_size: int = 500,
-        urls: List[str] = [],
-    ):
-        if type(self.notice_repo) is not NoticeRepository:
-            raise ValueError
+    async def run_crawling_pipeline(self, **kwargs):
 
-        if not semesters:
-            years = [2023, 2024, 2025]
-            types: List[SemesterTypeEnum] = [
-                SemesterTypeEnum.spring_semester,
-                SemesterTypeEnum.summer_vacation,
-                SemesterTypeEnum.fall_semester,
-                SemesterTypeEnum.winter_vacation,
-            ]
-            semesters = [SemesterType(year=year, type_=type_) for year in years for type_ in types]
-
-        if not self.semester_repo:
-            raise ValueError("'semester_repo' not provided")
-
-        with transaction():
-            semester_models = self.semester_repo.search_semester_by_dtos(semesters)
-
-        affected = 0
-        for semester_model in semester_models:
-
-            st, ed = semester_model.st_date, semester_model.ed_date
-            date_range = DateRangeType(st_date=st, ed_date=ed)
-            total_records = self.notice_repo.search_total_records(date_ranges=[date_range], urls=urls)
-
-            from tqdm import tqdm
-            pbar = tqdm(
-                range(0, total_records, batch_size),
-                desc=f"학기 정보 추가({semester_model.year}-{semester_model.type_})",
-            )
-            for offset in pbar:
-                notices = self.notice_repo.update_semester(semester_model, batch_size, offset, urls=urls)
-                affected += len(notices)
+        dtos: List[NoticeDTO] = []
+        for job in self.crawl_jobs(**kwargs):
+            _dtos, _ = await job.run()
+            dtos += _dtos
 
-        return affected
+        return dtos
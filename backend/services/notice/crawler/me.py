@@ -1,22 +1,22 @@
 """기계공학부 공지사항 크롤러"""
 
-import asyncio
+from functools import partial
 from datetime import date, datetime
-from typing import List
-from urllib.parse import parse_qs
+from typing import List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import bs4
-from tqdm import tqdm
-from urllib3.util import parse_url
 
-from db.models.calendar import SemesterTypeEnum
 from db.models.notice import NoticeModel
-from db.repositories.base import transaction
+from db.repositories.crawl import CrawlCheckpointRepository
 from db.repositories.notice import NoticeRepository
-from services.base.crawler import preprocess, scrape
+from services.base.crawler import preprocess, render, scrape
 from services.base.crawler.crawler import ParseHTMLException
-from services.base.types.calendar import DateRangeType, SemesterType
+from services.base.crawler.selector import compile_selectors, has_class
+from services.base.orchestrator import CrawlJob
+from services.base.pipeline import run_blocking
+from services.base.types.calendar import DateRangeType
 from services.notice import NoticeDTO
 
 import re
@@ -63,9 +63,14 @@ URLs = {
     },
 }
 
-SELECTORs = {
-    "list": "#contents > div > div > div > div.board-list02 > table > tbody > tr:not(.notice)",
-    "list_important": "#contents > div > div > div > div.board-list02 > table > tbody > tr.notice",
+# 목록은 `div.board-list02`만 부분 파싱(lxml, tbody 보정 없음)하므로 tbody 유무 모두 허용
+SELECTORs = compile_selectors({
+    "list": "div.board-list02 > table > tbody > tr:not(.notice), div.board-list02 > table > tr:not(.notice)",
+    "list_important": "div.board-list02 > table > tbody > tr.notice, div.board-list02 > table > tr.notice",
+    "row": {
+        "anchor": "td > a:first-child",
+        "date": "td.date",
+    },
     "detail": {
         "info": {
             "title": "#contents > div > div > div.board-view dl:nth-child(1) > dd",
@@ -75,7 +80,7 @@ SELECTORs = {
         },
         "attachments": "#contents > div > div > div.board-view > dl.half-box01.none > dd",
     },
-}
+})
 
 DOMAIN = "https://me.pusan.ac.kr"
 DEPARTMENT = "기계공학부"
@@ -83,6 +88,13 @@ DEPARTMENT = "기계공학부"
 
 class MENoticeCrawler(BaseNoticeCrawler):
 
+    list_strainer = SoupStrainer("div", class_=has_class("board-list02"))
+
+    def source_seq(self, url: str) -> Optional[int]:
+        """`seq` 쿼리 값"""
+        seq = parse_qs(urlparse(url).query).get("seq")
+        return int(seq[0]) if seq and seq[0].isdigit() else None
+
     async def scrape_important_urls_async(self, **kwargs) -> List[str]:
         """게시글 url 목록 불러오기"""
         url_key = kwargs.get("url_key")
@@ -103,7 +115,8 @@ class MENoticeCrawler(BaseNoticeCrawler):
             url=url,
             session=session,
             post_process=self._parse_important_seqs,
-            delay_range=(0, 0),
+            parser=self.parser,
+            parse_only=self.list_strainer,
         )
 
         path = URLs[url_key]["path"]
@@ -119,7 +132,7 @@ class MENoticeCrawler(BaseNoticeCrawler):
         seqs: List[int] = []
         for row in table_rows:
 
-            anchor = row.select_one("td > a:first-child")
+            anchor = row.select_one(SELECTORs["row"]["anchor"])
             if anchor is None or not anchor.has_attr("href"):
                 continue
 
@@ -190,6 +203,8 @@ class MENoticeCrawler(BaseNoticeCrawler):
             url=url,
             session=session,
             post_process=self._parse_last_seq,
+            parser=self.parser,
+            parse_only=self.list_strainer,
         )
 
         path = URLs[url_key]["path"]
@@ -202,9 +217,15 @@ class MENoticeCrawler(BaseNoticeCrawler):
 
         url = f"{DOMAIN}{path}?perPage={recent_seq - last_id + 1}"
 
-        _parse_seq_list = lambda soup: self._parse_seq_list(soup, st_date, ed_date)
+        _parse_seq_list = partial(self._parse_seq_list, st_date=st_date, ed_date=ed_date)
 
-        seqs = await scrape.scrape_async(url=url, session=session, post_process=_parse_seq_list)
+        seqs = await scrape.scrape_async(
+            url=url,
+            session=session,
+            post_process=_parse_seq_list,
+            parser=self.parser,
+            parse_only=self.list_strainer,
+        )
 
         urls = [f"{DOMAIN}{path}?seq={seq}&db={db}&page_mode=view" for seq in seqs]
 
@@ -215,7 +236,7 @@ class MENoticeCrawler(BaseNoticeCrawler):
 
         for row in table_rows:
 
-            anchor = row.select_one("td > a:first-child")
+            anchor = row.select_one(SELECTORs["row"]["anchor"])
             if anchor is None or not anchor.has_attr("href"):
                 continue
 
@@ -237,7 +258,7 @@ class MENoticeCrawler(BaseNoticeCrawler):
         table_rows = soup.select(SELECTORs["list"])
 
         def tr2seq(table_row: bs4.Tag):
-            anchor = table_row.select_one("td > a:first-child")
+            anchor = table_row.select_one(SELECTORs["row"]["anchor"])
             if anchor is None or not anchor.has_attr("href"):
                 return None
 
@@ -247,7 +268,7 @@ class MENoticeCrawler(BaseNoticeCrawler):
             if seq_str is None:
                 return None
 
-            date_element = table_row.select_one("td.date")
+            date_element = table_row.select_one(SELECTORs["row"]["date"])
             if not date_element:
                 return None
 
@@ -284,7 +305,7 @@ class MENoticeCrawler(BaseNoticeCrawler):
                 img_urls.append(f"{DOMAIN}{url}")
             img.extract()
 
-        info["content"] = str(preprocess.clean_html(content_element).prettify())
+        info["content"] = render.render_content(content_element)
 
         for element in soup.select("#contents > div > div > div.board-view dl"):
             dt = element.select_one("dt:first-child")
@@ -334,7 +355,7 @@ class MENoticeCrawler(BaseNoticeCrawler):
                             img_urls.append(str(src))
                         img.extract()
 
-                    info["content"] = str(preprocess.clean_html(element).prettify())
+                    info["content"] = render.render_content(element)
 
                 case (_, [element, *_]):
                     info[key] = element.get_text(separator=" ", strip=True)
@@ -366,29 +387,16 @@ class MENoticeCrawlerService(
         notice_crawler: MENoticeCrawler,
         notice_embedder: NoticeEmbedder,
         *args,
+        checkpoint_repo: Optional[CrawlCheckpointRepository] = None,
         **kwargs,
     ):
         super().__init__(*args, **kwargs)
         self.notice_crawler = notice_crawler
         self.notice_embedder = notice_embedder
+        self.checkpoint_repo = checkpoint_repo
 
-    async def run_crawling_batch(
-        self,
-        urls: List[str],
-        department: str,
-        category: str,
-        is_important: bool = False,
-        parse_attachment: bool = False,
-    ):
-        if type(self.notice_repo) is not NoticeRepository:
-            raise ValueError
-
-        if not urls:
-            return [], None
-
-        logger("Scrape notices...")
+    async def prepare_batch(self, urls: List[str], **kwargs) -> List[NoticeDTO]:
         notices = await self.notice_crawler.scrape_detail_async(urls)
-        logger("Done.")
 
         curr_base_url = "/".join(urls[0].split("/")[:5])
 
@@ -413,78 +421,45 @@ class MENoticeCrawlerService(
 
             return notice
 
-        notices = list(
+        return list(
             map(lambda notice: add_info(
                 notice=notice,
-                department=department,
-                category=category,
+                department=kwargs["department"],
+                category=kwargs["category"],
             ), notices)
         )
 
-        curr_pages = 0
-
-        if parse_attachment:
-            logger("Parse attachments...")
-            notices = await self.notice_crawler.parse_documents_async(notices)
-            logger("Done.")
-
-            curr_pages = sum([
-                sum([len(att["content"]) for att in dto["attachments"] if "content" in att]) for dto in notices
-                if "attachments" in dto
-            ])
-
-        logger("Embed notices...")
-        notices = await self.notice_embedder.embed_dtos_async(dtos=notices)
-        logger("Done.")
-
-        notice_models = [self.dto2orm(n, is_important=is_important) for n in notices]
-        notice_models = [n for n in notice_models if n is not None]
-
-        with transaction():
-            logger("Create notices...")
-            notice_models = self.notice_repo.create_all(notice_models)
-            dtos = list(map(self.orm2dto, notice_models))
-            logger("Done.")
-
-        with transaction():
-            logger("Update semester indexes...")
-            urls = [dto["url"] for dto in dtos]
-            self.add_semester_info(urls=urls)
-            logger("Done.")
-
-        return dtos, curr_pages
-
-    async def run_crawling_pipeline(self, **kwargs):
+    async def crawl_category(self, url_key: str, **kwargs) -> Tuple[List[NoticeDTO], int]:
+        """게시판(`URLs`) 하나를 크롤링하고 (저장된 게시글, 파싱한 첨부파일 페이지 수) 반환"""
 
         if type(self.notice_repo) is not NoticeRepository:
             raise ValueError
 
         reset = kwargs.get("reset", False)
+        resume = kwargs.get("resume", False)
         interval = kwargs.get('interval', 30)
         st_date = datetime.strptime(kwargs.get("st_date", "2000-01-01"), "%Y-%m-%d").date()
         ed_date = datetime.strptime(kwargs.get("ed_date", "2100-12-31"), "%Y-%m-%d").date()
 
-        dtos: List[NoticeDTO] = []
-
         parse_attachment = kwargs.get("parse_attachment", False)
 
-        for url_key in URLs.keys():
+        search_filter = {
+            "departments": [DEPARTMENT],
+            "categories": [url_key],
+        }
 
-            search_filter = {
-                "departments": [DEPARTMENT],
-                "categories": [url_key],
-            }
+        checkpoint = self.checkpoint_key(DEPARTMENT, url_key)
+        urls = await self.resume_frontier(checkpoint) if resume else None
 
+        if urls is None:
             last_id = None
             if reset:
                 date_range = DateRangeType(st_date=st_date, ed_date=ed_date)
-                affected = self.notice_repo.delete_all(**search_filter, date_ranges=[date_range])
+                affected = await run_blocking(self.notice_repo.delete_all, **search_filter, date_ranges=[date_range])
                 logger(f"[{DEPARTMENT}-{url_key}] {affected} rows deleted.")
 
             else:
-                last_notice = self.notice_repo.find_last_notice(is_me=True, **search_filter)
-                if last_notice:
-                    last_id = int(parse_qs(parse_url(last_notice.url).query)["seq"][0])
+                last_id = await run_blocking(self.notice_repo.find_last_seq, **search_filter)
 
             urls = await self.notice_crawler.scrape_urls_async(
                 url_key=url_key,
@@ -492,85 +467,54 @@ class MENoticeCrawlerService(
                 st_date=st_date,
                 ed_date=ed_date,
             )
+            if parse_attachment:
+                urls += [url for url in await self.deferred_urls(**search_filter) if url not in urls]
+            await self.start_frontier(urls, checkpoint)
+
+        dtos, pages = await self.run_batches(
+            urls,
+            interval=interval,
+            name=f"[{DEPARTMENT}-{url_key}]",
+            department=DEPARTMENT,
+            category=url_key,
+            parse_attachment=parse_attachment,
+            delay=kwargs.get('delay', 0),
+            checkpoint=checkpoint,
+        )
+        await self.finish_frontier(checkpoint)
+
+        logger(f"[{DEPARTMENT}-{url_key}] 주요 공지사항 수집중...")
+        important_urls = await self.notice_crawler.scrape_important_urls_async(url_key=url_key)
+
+        # 변경되지 않은 주요 공지사항은 `diff_batch`에서 건너뜀 (`is_important`만 갱신)
+        important_dtos, important_pages = await self.run_crawling_batch(
+            urls=important_urls,
+            department=DEPARTMENT,
+            category=url_key,
+            is_important=True,
+            parse_attachment=parse_attachment
+        )
+        logger(f"[{DEPARTMENT}-{url_key}] 주요 공지사항 {len(important_dtos)}/{len(important_urls)} 저장 (나머지는 변경 없음)")
 
-            with tqdm(total=len(urls), desc=f"[{DEPARTMENT}-{url_key}]") as pbar:
-                for st in range(0, len(urls), interval):
-                    ed = min(st + interval, len(urls))
-                    pbar.set_postfix({'range': f"{st + 1}-{ed}"})
-
-                    _dtos, _ = await self.run_crawling_batch(
-                        urls=urls[st:ed],
-                        department=DEPARTMENT,
-                        category=url_key,
-                        parse_attachment=parse_attachment,
-                    )
-                    dtos += _dtos
-
-                    if len(_dtos) < interval:
-                        break
-
-                    await asyncio.sleep(kwargs.get('delay', 0))
-
-                    pbar.update(len(_dtos))
-
-            logger(f"[{DEPARTMENT}-{url_key}] 주요 공지사항 수집중...")
-            important_urls = await self.notice_crawler.scrape_important_urls_async(url_key=url_key)
-            affected = self.notice_repo.delete_all(urls=important_urls)
-            logger(f"[{DEPARTMENT}-{url_key}] {affected} rows deleted (important notice)")
-
-            important_dtos, _ = await self.run_crawling_batch(
-                urls=important_urls,
-                department=DEPARTMENT,
-                category=url_key,
-                is_important=True,
-                parse_attachment=parse_attachment
-            )
+        logger(f"[{DEPARTMENT}-{url_key}] Done.")
 
-            logger("Done.")
+        return [*dtos, *important_dtos], pages + important_pages
 
-            dtos += important_dtos
+    def crawl_jobs(self, **kwargs) -> List[CrawlJob]:
+        """게시판별 크롤링 작업 (`Orchestrator`로 실행)"""
+        return [
+            CrawlJob(
+                name=f"{DEPARTMENT}-{url_key}",
+                host=urlparse(DOMAIN).hostname or "",
+                run=partial(self.crawl_category, url_key, **kwargs),
+            ) for url_key in URLs.keys()
+        ]
 
-        return dtos
-
-    def add_semester_info(
-        self,
-        semesters: List[SemesterType] = [],
-        batch_size: int = 500,
-        urls: List[str] = [],
-    ):
-        if type(self.notice_repo) is not NoticeRepository:
-            raise ValueError
+    async def run_crawling_pipeline(self, **kwargs):
 
-        if not semesters:
-            years = [2023, 2024, 2025]
-            types: List[SemesterTypeEnum] = [
-                SemesterTypeEnum.spring_semester,
-                SemesterTypeEnum.summer_vacation,
-                SemesterTypeEnum.fall_semester,
-                SemesterTypeEnum.winter_vacation,
-            ]
-            semesters = [SemesterType(year=year, type_=type_) for year in years for type_ in types]
-
-        if not self.semester_repo:
-            raise ValueError("'semester_repo' not provided")
-
-        with transaction():
-            semester_models = self.semester_repo.search_semester_by_dtos(semesters)
-
-        affected = 0
-        for semester_model in semester_models:
-
-            st, ed = semester_model.st_date, semester_model.ed_date
-            date_range = DateRangeType(st_date=st, ed_date=ed)
-            total_records = self.notice_repo.search_total_records(date_ranges=[date_range], urls=urls)
-
-            from tqdm import tqdm
-            pbar = tqdm(
-                range(0, total_records, batch_size),
-                desc=f"학기 정보 추가({semester_model.year}-{semester_model.type_.value})",
-            )
-            for offset in pbar:
-                notices = self.notice_repo.update_semester(semester_model, batch_size, offset, urls=urls)
-                affected += len(notices)
+        dtos: List[NoticeDTO] = []
+        for job in self.crawl_jobs(**kwargs):
+            _dtos, _ = await job.run()
+            dtos += _dtos
 
-        return affected
+        return dtos
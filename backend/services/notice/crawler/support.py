@@ -1,28 +1,30 @@
-import asyncio
+from functools import partial
 from typing import Callable, List, Optional, Tuple
 from urllib.parse import parse_qs
 
 from aiohttp import ClientSession
-from tqdm import tqdm
+from bs4 import SoupStrainer
 
-from db.models.calendar import SemesterTypeEnum
 from db.models.notice import PNUNoticeModel
-from db.repositories.base import transaction
-from db.repositories.notice import PNUNoticeRepository
+from db.repositories.crawl import CrawlCheckpointRepository
 from services.base import ParseHTMLException
-from services.base.crawler import preprocess, scrape
+from services.base.crawler import preprocess, render, scrape
+from services.base.crawler.selector import compile_selectors, has_class
 
 from urllib3.util import parse_url
 
-from services.base.types.calendar import DateRangeType, SemesterType
 from services.notice import NoticeDTO
 from config.logger import _logger
 from services.notice.crawler.base import BaseNoticeCrawler, BaseNoticeCrawlerService
 from services.notice.embedder import NoticeEmbedder
 
-SELECTORs = {
+SELECTORs = compile_selectors({
     "list": "tr:not(.isnotice)",
     "list_important": "tr.isnotice",
+    "row": {
+        "anchor": "td.subject > p.stitle > a",
+        "date": "td.date",
+    },
     "detail": {
         "info": {
             "title": "#board-wrap > div.board-view-head > div.board-view-title > h4",
@@ -32,7 +34,7 @@ SELECTORs = {
         },
         "attachments": "#board-wrap > div:nth-child(3) > div > div > ul > li"
     }
-}
+})
 
 logger = _logger(__name__)
 
@@ -44,6 +46,8 @@ NOTICE_INDEX_URL = f"{BASE_URL}/page?menuCD=000000000000386"
 
 class SupportNoticeCrawler(BaseNoticeCrawler):
 
+    list_strainer = SoupStrainer("table", class_=has_class("board-list-table"))
+
     def _parse_paths_from_table_element(self, table_element, **kwargs):
 
         table = table_element.select_one("table.board-list-table")
@@ -57,12 +61,12 @@ class SupportNoticeCrawler(BaseNoticeCrawler):
         results = []
 
         for row in table_rows:
-            anchor = row.select_one("td.subject > p.stitle > a")
+            anchor = row.select_one(SELECTORs["row"]["anchor"])
 
             if anchor is None or not anchor.has_attr("href"):
                 continue
 
-            date = row.select_one("td.date")
+            date = row.select_one(SELECTORs["row"]["date"])
 
             if not date:
                 continue
@@ -75,6 +79,15 @@ class SupportNoticeCrawler(BaseNoticeCrawler):
 
         return results
 
+    def source_seq(self, url: str) -> Optional[int]:
+        """`board_seq` 쿼리 값"""
+        board_seq = parse_qs(parse_url(url).query or "").get("board_seq")
+
+        if board_seq is None or len(board_seq) != 1 or not board_seq[0].isdigit():
+            return None
+
+        return int(board_seq[0])
+
     def _validate_detail_path(self, path, **kwargs) -> bool:
 
         last_id: int | None = kwargs.get("last_id")
@@ -82,21 +95,14 @@ class SupportNoticeCrawler(BaseNoticeCrawler):
         if last_id is None:
             return True
 
-        parsed = parse_url(path)
-        queries = parse_qs(parsed.query)
-        board_seq = queries.get("board_seq")
-
-        if board_seq is None or len(board_seq) != 1:
-            return False
-
-        return int(board_seq[0]) > int(last_id)
+        seq = self.source_seq(path)
+        return seq is not None and seq > int(last_id)
 
     async def fetch_paths_async(
         self,
         index_url: str,
         batch_size: int,
         filter: Callable[[str, date], bool],
-        delay_range: Tuple[float, float] = (1, 2),
         session: Optional[ClientSession] = None,
         **_,
     ) -> List[str]:
@@ -115,7 +121,8 @@ class SupportNoticeCrawler(BaseNoticeCrawler):
                 url=urls,
                 session=session,
                 post_process=self._parse_paths_from_table_element,
-                delay_range=delay_range,
+                parser=self.parser,
+                parse_only=self.list_strainer,
             )
 
             results: List[Tuple[str, date]] = []
@@ -145,12 +152,14 @@ class SupportNoticeCrawler(BaseNoticeCrawler):
         if not session:
             raise ValueError("'session' must be provided")
 
-        parse_paths = lambda soup: self._parse_paths_from_table_element(soup, is_important=True)
+        parse_paths = partial(self._parse_paths_from_table_element, is_important=True)
 
         results_with_error = await scrape.scrape_async(
             url=[NOTICE_INDEX_URL + f"?mCode={M_CODE}"],
             session=session,
             post_process=parse_paths,
+            parser=self.parser,
+            parse_only=self.list_strainer,
         )
 
         results: List[Tuple[str, date]] = []
@@ -210,7 +219,7 @@ class SupportNoticeCrawler(BaseNoticeCrawler):
                             img_urls.append(str(src))
                         img.extract()
 
-                    info["content"] = str(preprocess.clean_html(element).prettify())
+                    info["content"] = render.render_content(element)
 
                 case ("author", [element, *_]):
                     inner_text = element.get_text(separator=" ", strip=True)
@@ -246,30 +255,23 @@ class SupportNoticeCrawlerSerivce(
     BaseSupportNoticeService,
 ):
 
+    checkpoint_source = "support_notice"
+
     def __init__(
         self,
         notice_crawler: SupportNoticeCrawler,
         notice_embedder: NoticeEmbedder,
         *args,
+        checkpoint_repo: Optional[CrawlCheckpointRepository] = None,
         **kwargs,
     ):
         super().__init__(*args, **kwargs)
         self.notice_crawler = notice_crawler
         self.notice_embedder = notice_embedder
+        self.checkpoint_repo = checkpoint_repo
 
-    async def run_crawling_batch(
-        self,
-        urls: List[str],
-        is_important: bool = False,
-        parse_attachment: bool = False,
-    ) -> Tuple[List[NoticeDTO], int]:
-
-        if type(self.notice_repo) is not SupportNoticeRepository:
-            raise ValueError
-
-        logger("Scrape notices...")
+    async def prepare_batch(self, urls: List[str], **kwargs) -> List[NoticeDTO]:
         notices = await self.notice_crawler.scrape_detail_async(urls)
-        logger("Done.")
 
         def add_info(notice: NoticeDTO, **kwargs) -> NoticeDTO:
             for key, value in kwargs.items():
@@ -282,127 +284,54 @@ class SupportNoticeCrawlerSerivce(
 
             return notice
 
-        notices = list(map(lambda notice: add_info(notice=notice), notices))
-
-        curr_pages = 0
-
-        if parse_attachment:
-            logger("Parse attachments...")
-            notices = await self.notice_crawler.parse_documents_async(notices)
-            logger("Done.")
-
-            curr_pages = sum([
-                sum([len(att["content"]) for att in dto["attachments"] if "content" in att]) for dto in notices
-                if "attachments" in dto
-            ])
-
-        logger("Embed notices...")
-        notices = await self.notice_embedder.embed_dtos_async(dtos=notices)
-        logger("Done.")
-
-        notice_models = [self.dto2orm(n, is_important=is_important) for n in notices]
-        notice_models = [n for n in notice_models if n]
+        return list(map(lambda notice: add_info(notice=notice), notices))
 
-        with transaction():
-            logger("Create notices...")
-            notice_models = self.notice_repo.create_all(notice_models)
-            dtos = list(map(self.orm2dto, notice_models))
-            logger("Done.")
-
-        with transaction():
-            logger("Update semester indexes...")
-            urls = [dto["url"] for dto in dtos]
-            self.add_semester_info(urls=urls)
-            logger("Done.")
+    async def run_crawling_pipeline(self, **kwargs):
 
-        return dtos, curr_pages
+        checkpoint = self.checkpoint_key()
+        urls = await self.resume_frontier(checkpoint) if kwargs.get("resume", False) else None
 
-    async def run_crawling_pipeline(self, **kwargs):
+        if urls is None:
+            last_id = None
 
-        last_id = None
+            if kwargs.get("reset", False):
+                affected = self.notice_repo.delete_all()
+                logger(f"{affected} rows deleted.")
 
-        if kwargs.get("reset", False):
-            affected = self.notice_repo.delete_all()
-            logger(f"{affected} rows deleted.")
+            else:
+                last_id = self.notice_repo.find_last_seq()
 
-        else:
-            last_notice = self.notice_repo.find_last_notice()
-            if last_notice:
-                last_path = parse_url(last_notice.url).path
-                if not last_path:
-                    raise ValueError(f"잘못된 url입니다: {last_notice.url}")
-                last_id = int(last_path.split("=")[5])
+            urls = await self.notice_crawler.scrape_urls_async(last_id=last_id)
+            await self.start_frontier(urls, checkpoint)
 
         interval = kwargs.get('interval', 30)
 
-        urls = await self.notice_crawler.scrape_urls_async(last_id=last_id)
-
         dtos: List[NoticeDTO] = []
 
-        with tqdm(total=len(urls)) as pbar:
-            for st in range(0, len(urls), interval):
-                ed = min(st + interval, len(urls))
-                pbar.set_postfix({'range': f"{st + 1}-{ed}"})
-
-                _dtos, _ = await self.run_crawling_batch(urls=urls[st:ed], parse_attachment=True)
-                dtos += _dtos
-
-                await asyncio.sleep(kwargs.get('delay', 0))
-
-                pbar.update(len(_dtos))
+        _dtos, _ = await self.run_batches(
+            urls,
+            interval=interval,
+            name="[학생지원시스템 공지사항]",
+            parse_attachment=True,
+            delay=kwargs.get('delay', 0),
+            checkpoint=checkpoint,
+        )
+        dtos += _dtos
+        await self.finish_frontier(checkpoint)
 
         logger(f"주요 공지사항 수집중...")
         important_urls = await self.notice_crawler.scrape_important_urls_async()
-        affected = self.notice_repo.delete_all(urls=important_urls)
-        logger(f"{affected} rows deleted (important notice)")
 
+        # 변경되지 않은 주요 공지사항은 `diff_batch`에서 건너뜀 (`is_important`만 갱신)
         important_dtos, _ = await self.run_crawling_batch(
             urls=important_urls,
             is_important=True,
             parse_attachment=True,
         )
+        logger(f"주요 공지사항 {len(important_dtos)}/{len(important_urls)} 저장 (나머지는 변경 없음)")
 
         logger("Done.")
 
         dtos += important_dtos
 
         return dtos
-
-    def add_semester_info(
-        self,
-        semesters: List[SemesterType] = [],
-        batch_size: int = 500,
-        urls: List[str] = [],
-    ) -> int:
-        if not semesters:
-            years = [2023, 2024, 2025]
-            types: List[SemesterTypeEnum] = [
-                SemesterTypeEnum.spring_semester,
-                SemesterTypeEnum.summer_vacation,
-                SemesterTypeEnum.fall_semester,
-                SemesterTypeEnum.winter_vacation,
-            ]
-            semesters = [SemesterType(year=year, type_=type_) for year in years for type_ in types]
-
-        if not self.semester_repo:
-            raise ValueError("'semester_repo' not provided")
-        with transaction():
-            semester_models = self.semester_repo.search_semester_by_dtos(semesters)
-
-        affected = 0
-        for semester_model in semester_models:
-
-            st, ed = semester_model.st_date, semester_model.ed_date
-            date_range = DateRangeType(st_date=st, ed_date=ed)
-            total_records = self.notice_repo.search_total_records(date_ranges=[date_range], urls=urls)
-
-            from tqdm import tqdm
-            pbar = tqdm(
-                range(0, total_records, batch_size),
-                desc=f"학기 정보 추가({semester_model.year}-{semester_model.type_})",
-            )
-            for offset in pbar:
-                notices = self.notice_repo.update_semester(semester_model, batch_size, offset, urls=urls)
-                affected += len(notices)
-
-        return affected
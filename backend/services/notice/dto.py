@@ -1,4 +1,4 @@
-from typing import NotRequired, Required, TypedDict, List
+from typing import Dict, NotRequired, Required, TypedDict, List
 
 from services.base import EmbedResult
 from services.base.dto import BaseDTO
@@ -29,3 +29,6 @@ class NoticeDTO(BaseDTO, total=False):
     info: Required[NoticeInfoDTO]
     attachments: Required[List[AttachmentDTO]]
     embeddings: NoticeEmbeddingsDTO
+    # 저장된 게시글과 비교한 변경 감지 결과 (`render.content_hash`), 재사용할 임베딩 (원문 해시 → 임베딩)
+    content_hash: str
+    embedding_reuse: Dict[str, EmbedResult]
@@ -151,7 +151,8 @@ class PNUNoticeSearchServiceV2(IPNUNoticeSearchService):
             )
 
             texts = [notice.chunk_content for notice in pre_ranked]
-            ranks = await rerank_async(query, texts, session=session)
+            ids = [(notice.__tablename__, notice.id) for notice in pre_ranked]
+            ranks = await rerank_async(query, texts, session=session, ids=ids)
             ranks = sorted(ranks, key=lambda res: res["score"], reverse=True)[:opts.get("count", 5)]
             ranks = filter(lambda rank: rank["score"] >= opts.get("threshold", 0.3), ranks)
 
@@ -1,6 +1,7 @@
 from typing import List
 
 from bs4 import BeautifulSoup
+from services.base.crawler import preprocess
 from services.professor.crawler.base import ProfessorCrawlerBase
 from urllib3.util import parse_url
 
@@ -74,7 +75,7 @@ class ProfessorCrawler(ProfessorCrawlerBase):
             src = thumbnail_element["src"]
             _info["profile_img"] = str(src)
 
-        _info["name"] = self._preprocess_text(name_element.text)
+        _info["name"] = preprocess.preprocess_text(name_element.text)
 
         common_elements = soup.select(SELECTORs["detail"]["common"])
         for e in common_elements:
@@ -94,12 +95,12 @@ class ProfessorCrawler(ProfessorCrawlerBase):
 
         detail_elements = soup.select("div._prFlDetail")
 
-        def preprocess(element):
+        def _detail_text(element):
             text = element.get_text(separator=" ", strip=True)
-            return self._preprocess_text(md(text))
+            return preprocess.preprocess_text(md(text))
 
         if len(detail_elements) > 0:
-            details = [preprocess(e) for e in detail_elements]
+            details = [_detail_text(e) for e in detail_elements]
             _info["detail"] = "\n\n".join(details)
 
         _info = {**_info, **dto["info"]}
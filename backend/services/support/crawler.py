@@ -1,13 +1,13 @@
-import asyncio
 from typing import List, Optional
 from aiohttp import ClientSession
 from bs4 import Tag
 from bs4.element import NavigableString
 from services.base.crawler.crawler import BaseCrawler
 
-from services.base.crawler.scrape import parse_document_async
+from services.base.coalescer import scatter_in_order
+from services.base.crawler.attachment import parse_attachments_async
 from services.support.dto import SupportDTO
-from services.base.crawler import preprocess
+from services.base.crawler import render
 
 DOMAIN = "https://onestop.pusan.ac.kr"
 
@@ -22,19 +22,15 @@ class SupportCrawler(BaseCrawler[SupportDTO]):
         if not session:
             raise ValueError("'session' must be provided")
 
-        parsed_content_future = [
-            parse_document_async(
-                [att["url"] for att in dto["attachments"]],
-                session,
-            ) for dto in dtos
-        ]
-
-        parsed_content = await asyncio.gather(*parsed_content_future)
+        # 게시글 간 중복 첨부파일은 한 번만 파싱, 이미지 / 큰 파일은 분류 후 건너뛰거나 낮은 우선순위로 파싱
+        sizes = [len(dto["attachments"]) for dto in dtos]
+        urls = [att["url"] for dto in dtos for att in dto["attachments"]]
+        parsed_content = scatter_in_order(await parse_attachments_async(urls, session), sizes)
 
         attachment_dtos = [[{
             "name": att["name"],
             "url": att["url"],
-            "content": [str(preprocess.clean_html(content).prettify()) for content in list(ps.values())]
+            "content": [render.render_content(content) for content in list(ps.values())]
         } for ps, att in zip(pss, dto["attachments"])] for pss, dto in zip(parsed_content, dtos)]
 
         dtos = [SupportDTO(**{**dto, "attachments": att}) for dto, att, in zip(dtos, attachment_dtos)]
@@ -93,7 +89,7 @@ class SupportCrawler(BaseCrawler[SupportDTO]):
                     e.extract()
                     name_element.extract()
 
-            content_str = str(preprocess.clean_html(content_section).prettify())
+            content_str = render.render_content(content_section)
             content.append(content_str)
 
         for e in soup.select(".my-2"):
@@ -1,4 +1,4 @@
-from typing import NotRequired, Required, TypedDict, List
+from typing import Dict, NotRequired, Required, TypedDict, List
 
 from services.base.dto import BaseDTO
 from services.base.embedder import EmbedResult
@@ -28,3 +28,6 @@ class SupportDTO(BaseDTO, total=False):
     info: Required[SupportInfoDTO]
     embeddings: SupportEmbeddingsDTO
     attachments: Required[List[SupportAttachmentDTO]]
+    # 저장된 항목과 비교한 변경 감지 결과 (`render.content_hash`), 재사용할 임베딩 (원문 해시 → 임베딩)
+    content_hash: str
+    embedding_reuse: Dict[str, EmbedResult]
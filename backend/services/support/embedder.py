@@ -1,8 +1,9 @@
-import asyncio
 from itertools import chain
 
 from services.base import BaseEmbedder
-from services.base.embedder import embed_async
+from services.base.coalescer import scatter_in_order
+from services.base.crawler import render
+from services.base.embedder import embed_packed_async
 from services.support.dto import SupportDTO
 
 
@@ -11,32 +12,42 @@ class SupportEmbedder(BaseEmbedder[SupportDTO]):
     async def _embed_dtos_async(self, dtos, session, **kwargs):
         infos = [support["info"] for support in dtos]
 
-        embed = lambda data: embed_async(
-            texts=data if isinstance(data, list) else [data],
-            session=session,
-            chunking=False,
-        )
+        titles = [info["title"] for info in infos]
 
-        titles_future = embed([info["title"] for info in infos])
-
-        contents = [info["content"] for info in infos]
-        contents_future = asyncio.gather(*[embed(content) for content in contents])
+        # 학지시 항목별 탭 본문 목록
+        contents = [info["content"] if isinstance(info["content"], list) else [info["content"]] for info in infos]
 
         attachments = [support["attachments"] for support in dtos]
         attachments = [[att["content"] for att in atts if "content" in att] for atts in attachments]
-        attachments_future = asyncio.gather(*[asyncio.gather(*[embed(att) for att in atts]) for atts in attachments])
+        attachments = [list(chain(*[att if isinstance(att, list) else [att] for att in atts])) for atts in attachments]
+
+        # 변경된 게시글은 바뀌지 않은 제목 / 본문 / 첨부파일 페이지의 저장된 임베딩 재사용
+        reuse = {key: embedding for dto in dtos for key, embedding in dto.get("embedding_reuse", {}).items()}
 
-        embeddings = await asyncio.gather(
-            titles_future,
-            contents_future,
-            attachments_future,
+        # 배치 내 모든 텍스트를 한 번에 packing 하여 요청
+        embeddings = await embed_packed_async(
+            [*titles, *chain(*contents), *chain(*attachments)],
+            session=session,
+            html=render.CONTENT_FORMAT == "html",
+            reuse=reuse,
+        )
+
+        n_contents = sum(len(content) for content in contents)
+        title_embeddings = embeddings[:len(titles)]
+        content_embeddings = scatter_in_order(
+            embeddings[len(titles):len(titles) + n_contents],
+            [len(content) for content in contents],
+        )
+        attachment_embeddings = scatter_in_order(
+            embeddings[len(titles) + n_contents:],
+            [len(atts) for atts in attachments],
         )
 
         embedding_dtos = [{
             "title_embeddings": te,
             "content_embeddings": ce,
-            "attachment_embeddings": list(chain(*ae))
-        } for te, ce, ae in zip(*embeddings)]
+            "attachment_embeddings": ae,
+        } for te, ce, ae in zip(title_embeddings, content_embeddings, attachment_embeddings)]
 
         return [SupportDTO(**{
             **dto,
@@ -6,8 +6,10 @@ from db.common import V_DIM
 from db.models.support import SupportAttachmentModel, SupportChunkModel, SupportModel
 from db.repositories.base import transaction
 from db.repositories.support import ISupportRepository
+from services.base.crawler import render
 from services.base.dto import EmbedResult
 from services.base.embedder import embed_async, rerank_async
+from services.base.vector_codec import decode_stored
 from services.base.service import BaseDomainService
 from typing import Dict, List, Optional, TypedDict, NotRequired, Unpack
 
@@ -34,6 +36,23 @@ class BaseSupportService(BaseDomainService[SupportDTO, SupportModel]):
         self.support_crawler = support_crawler
         self.support_embedder = support_embedder
 
+    def support_hash(self, dto: SupportDTO) -> str:
+        """분류 / 제목 / 본문 / 첨부파일 목록(이름, url) 해시, 첨부파일 내용은 포함하지 않음"""
+        info = dto["info"]
+        attachments = [part for att in dto.get("attachments", []) for part in (att["name"], att["url"])]
+        return render.content_hash(info["category"], info["sub_category"], info["title"], info["content"], *attachments)
+
+    def embedding_reuse(self, orm: SupportModel) -> Dict[str, EmbedResult]:
+        """저장된 항목의 제목 / 청크 임베딩 (원문 해시 → 임베딩), 변경된 항목을 다시 임베딩할 때 재사용"""
+        reuse = {
+            chunk.content_hash: decode_stored(chunk.chunk_vector, chunk.chunk_sparse_vector)
+            for chunk in orm.content_chunks
+            if chunk.content_hash and chunk.chunk_vector is not None and chunk.chunk_sparse_vector is not None
+        }
+        if orm.title_vector is not None and orm.title_sparse_vector is not None:
+            reuse[render.content_hash(orm.title)] = decode_stored(orm.title_vector, orm.title_sparse_vector)
+        return reuse
+
     def dto2orm(self, dto, **_) -> Optional[SupportModel]:
 
         def parse_info(dto: SupportDTO):
@@ -46,16 +65,17 @@ class BaseSupportService(BaseDomainService[SupportDTO, SupportModel]):
             if not embeddings or not attachments:
                 return {"attachments": [], "content_chunks": []}
 
-            att_embeddings = [{
-                "chunk_vector": embedding["dense"],
-                "chunk_sparse_vector": SparseVector(embedding["sparse"], V_DIM),
-            } for embedding in embeddings["attachment_embeddings"]]
+            # `attachment_embeddings`는 모든 첨부파일 페이지를 순서대로 펼친 목록 (`SupportEmbedder`)
+            pages = iter(embeddings["attachment_embeddings"])
+            contents = [att.get("content", []) for att in attachments]
+            contents = [content if isinstance(content, list) else [content] for content in contents]
 
             content_chunks = [[SupportChunkModel(
-                **_embeddings,
+                chunk_vector=embedding["dense"],
+                chunk_sparse_vector=SparseVector(embedding["sparse"], V_DIM),
                 chunk_content=content,
-            ) for content in att["content"]] for _embeddings, att in zip(att_embeddings, attachments)
-                              if "content" in att]
+                content_hash=render.content_hash(content),
+            ) for content, embedding in zip(_contents, pages)] for _contents in contents]
 
             attachment_models = [
                 SupportAttachmentModel(name=att["name"], url=att["url"], content_chunks=chunks)
@@ -66,6 +86,8 @@ class BaseSupportService(BaseDomainService[SupportDTO, SupportModel]):
 
         def parse_embeddings(dto: SupportDTO):
             embeddings = dto.get("embeddings")
+            contents = dto["info"]["content"]
+            contents = contents if isinstance(contents, list) else [contents]
             return {
                 "title_vector": embeddings["title_embeddings"]["dense"],
                 "title_sparse_vector": SparseVector(embeddings["title_embeddings"]["sparse"], V_DIM),
@@ -74,7 +96,8 @@ class BaseSupportService(BaseDomainService[SupportDTO, SupportModel]):
                         chunk_content=content_vector["chunk"],
                         chunk_vector=content_vector["dense"],
                         chunk_sparse_vector=SparseVector(content_vector["sparse"], V_DIM),
-                    ) for content_vector in embeddings["content_embeddings"]
+                        content_hash=render.content_hash(content),
+                    ) for content, content_vector in zip(contents, embeddings["content_embeddings"])
                     if "chunk" in content_vector and content_vector["chunk"] is not None
                 ]
             } if embeddings else {}
@@ -91,7 +114,8 @@ class BaseSupportService(BaseDomainService[SupportDTO, SupportModel]):
             "title_vector": embeddings["title_vector"],
             "title_sparse_vector": embeddings["title_sparse_vector"],
             "content_chunks": [*embeddings["content_chunks"], *attachments["content_chunks"]],
-            "url": dto["url"]
+            "url": dto["url"],
+            "content_hash": self.support_hash(dto),
         }
 
         return SupportModel(**support_dict)
@@ -117,7 +141,7 @@ class BaseSupportService(BaseDomainService[SupportDTO, SupportModel]):
                 <name>{dto["name"]}</name>
                 <url>{dto['url']}</url>
                 <content>
-                    {dto["content"]}
+                    {render.context_content(dto["content"])}
                 </content>
             </attachment>"""
         ) if "content" in dto else None
@@ -141,7 +165,7 @@ class BaseSupportService(BaseDomainService[SupportDTO, SupportModel]):
                     {"\n".join(att_contexts)}
                 </attachments>
                 <content>
-                    {"\n".join(info["content"])}
+                    {render.context_content(info["content"])}
                 </content>
             </Support>"""
         )
@@ -244,7 +268,8 @@ class SupportServiceV2(BaseSupportSearchService):
         )
 
         texts = [support.chunk_content for support in pre_ranked]
-        ranks = await rerank_async(query, texts, session=session)
+        ids = [(support.__tablename__, support.id) for support in pre_ranked]
+        ranks = await rerank_async(query, texts, session=session, ids=ids)
         ranks = sorted(ranks, key=lambda res: res["score"], reverse=True)[:opts.get("count", 5)]
         ranks = filter(lambda rank: rank["score"] >= opts.get("threshold", 0.3), ranks)
 
@@ -1,13 +1,16 @@
 from typing import Dict, List, Union
 from db.models.support import SupportModel
+from db.repositories import bulk
+from db.repositories.base import transaction
 from services.base.service import BaseCrawlerService
 from services.support.dto import SupportDTO
 from services.support.service.base import BaseSupportService
 import json
+from itertools import chain
 from config.logger import _logger
-import asyncio
-
-from tqdm import tqdm
+from mixins import metrics
+from services.base.crawler.attachment import count_pages, parseable
+from services.base.pipeline import Pipeline, Stage
 
 logger = _logger(__name__)
 
@@ -47,6 +50,36 @@ class SupportCrawlerService(
         result = [help(k, v, [], []) for k, v in url_dict.items()]
         return list(chain(*result))
 
+    def diff_batch(self, supports: List[SupportDTO]) -> List[SupportDTO]:
+        """저장된 항목과 해시(`support_hash`)를 비교해 새 항목과 변경된 항목만 반환
+
+        변경된 항목은 저장된 제목 / 청크 임베딩을 `embedding_reuse`로 넘겨 바뀐 텍스트만 다시 임베딩합니다.
+        해시에는 첨부파일 내용이 없으므로, 파싱 결과가 저장되지 않은 첨부파일이 있는 항목은 변경된 항목으로 처리합니다.
+        """
+        supports = [SupportDTO(**support, content_hash=self.support_hash(support)) for support in supports]
+
+        with transaction():
+            rows = self.support_repo.find_content_hashes([support["url"] for support in supports])
+            hashes = {row.url: row.content_hash for row in rows}
+            unchanged = [s["url"] for s in supports if hashes.get(s["url"]) == s["content_hash"]]
+            unparsed = {
+                row.url
+                for row in self.support_repo.find_unparsed_attachments(unchanged)
+                if parseable(row.name, row.attachment_url)
+            }
+            unchanged = [url for url in unchanged if url not in unparsed]
+            changed = [s["url"] for s in supports if s["url"] in hashes and s["url"] not in unchanged]
+
+            reuse = {orm.url: self.embedding_reuse(orm) for orm in self.support_repo.find_all_by_urls(changed)}
+
+        metrics.counter("crawl.supports.unchanged").inc(len(unchanged))
+        metrics.counter("crawl.supports.changed").inc(len(changed))
+
+        return [
+            SupportDTO(**support, embedding_reuse=reuse[support["url"]]) if support["url"] in reuse else support
+            for support in supports if support["url"] not in unchanged
+        ]
+
     async def run_crawling_pipeline(self, **kwargs):
 
         with open("config/onestop.json", "r") as f:
@@ -71,44 +104,36 @@ class SupportCrawlerService(
                 "url": d1["url"],
             })
 
-        try:
-            pbar = tqdm(range(0, len(dtos), interval), total=len(dtos))
-
-            total_document_pages = 0
-
-            for st in pbar:
-                ed = min(st + interval, len(dtos))
-                pbar.set_postfix({'range': f"{st + 1} ~ {ed}"})
+        async def scrape_batch(batch: List[SupportDTO]) -> List[SupportDTO]:
+            supports = await self.support_crawler.scrape_detail_async([dto["url"] for dto in batch])
+            return list(map(merge_dto, batch, supports))
+
+        def persist_batch(supports: List[SupportDTO]) -> List[SupportModel]:
+            support_models = [self.dto2orm(n) for n in supports]
+            support_models = [n for n in support_models if n]
+            with transaction():
+                if bulk.INGEST_MODE == "copy":
+                    ids = self.support_repo.upsert_bulk(support_models)
+                    return [support for support in support_models if support.url in ids]
+
+                stored = self.support_repo.find_content_hashes([support.url for support in support_models])
+                if stored:
+                    self.support_repo.delete_all(urls=[row.url for row in stored])
+                return self.support_repo.create_all(support_models)
+
+        pipeline = Pipeline([
+            Stage("scrape", scrape_batch, workers=2),
+            Stage("diff", self.diff_batch, blocking=True),
+            Stage("parse", self.support_crawler.parse_documents_async, workers=2, count=count_pages),
+            Stage("embed", lambda supports: self.support_embedder.embed_dtos_async(dtos=supports), workers=2),
+            Stage("persist", persist_batch, blocking=True),
+        ], name="[학생지원시스템]", delay=kwargs.get('delay', 0))
 
-                urls_batch = [dto["url"] for dto in dtos[st:ed]]
-
-                pbar.set_description("상세페이지 크롤링")
-                supports = await self.support_crawler.scrape_detail_async(urls_batch)
-                supports = list(map(merge_dto, dtos[st:ed], supports))
-
-                pbar.set_description("첨부파일 파싱")
-                supports = await self.support_crawler.parse_documents_async(supports)
-
-                curr_pages = sum([
-                    sum([len(att["content"]) for att in dto["attachments"] if "content" in att]) for dto in supports
-                    if "attachments" in dto
-                ])
-                total_document_pages += curr_pages
-
-                pbar.set_description("임베딩")
-                supports = await self.support_embedder.embed_dtos_async(dtos=supports)
-
-                support_models = [self.dto2orm(n) for n in supports]
-                support_models = [n for n in support_models if n]
-                support_models = self.support_repo.create_all(support_models)
-
-                models += support_models
-
-                pbar.update(interval)
-
-                await asyncio.sleep(kwargs.get('delay', 0))
+        try:
+            results = await pipeline.run([dtos[st:st + interval] for st in range(0, len(dtos), interval)])
+            models = list(chain(*results))
 
-            logger(f"total pages: {total_document_pages}")
+            logger(f"total pages: {pipeline.stats['parse'].items}")
 
         except TimeoutError as e:
             logger(f"크롤링에 실패하였습니다.")